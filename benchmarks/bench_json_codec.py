@@ -0,0 +1,79 @@
+"""Compare JSONCodec backends on a large synthetic get members result.
+
+Run from the repository root with
+``python -m benchmarks.bench_json_codec [number of members]``.
+Backends that are not installed fall back to the standard library, and are
+reported with the backend actually used.
+"""
+
+from __future__ import annotations
+from typing import Any
+import sys
+import timeit
+from grouper_python import JSONCodec
+
+
+def make_members_result(count: int) -> dict[str, Any]:
+    """Build a WsGetMembersResults payload with the given number of members.
+
+    :param count: The number of members in the result
+    :type count: int
+    :return: The synthetic payload
+    :rtype: dict[str, Any]
+    """
+    return {
+        "WsGetMembersResults": {
+            "resultMetadata": {"success": "T"},
+            "subjectAttributeNames": ["description", "name"],
+            "results": [
+                {
+                    "resultMetadata": {"success": "T"},
+                    "wsGroup": {
+                        "extension": "GROUP1",
+                        "displayName": "Test Stem:Group 1",
+                        "uuid": "1ab0482715c74f51bc32822a70bf8f77",
+                        "name": "test:GROUP1",
+                        "typeOfGroup": "group",
+                    },
+                    "wsSubjects": [
+                        {
+                            "sourceId": "ldap",
+                            "attributeValues": [f"user{i:07d}", f"User {i} Name"],
+                            "name": f"User {i} Name",
+                            "id": f"{i:032x}",
+                            "resultCode": "SUCCESS",
+                            "success": "T",
+                            "memberId": f"{i:032x}"[::-1],
+                        }
+                        for i in range(count)
+                    ],
+                }
+            ],
+        }
+    }
+
+
+def main(count: int) -> None:
+    """Time encoding and decoding the synthetic payload with each backend.
+
+    :param count: The number of members in the synthetic payload
+    :type count: int
+    """
+    payload = make_members_result(count)
+    encoded = JSONCodec("json").dumps(payload)
+    print(f"{count} members, {len(encoded) / 1_000_000:.1f} MB of JSON")
+    for backend in ("json", "orjson", "msgspec"):
+        codec = JSONCodec(backend)
+        if codec.backend != backend:
+            print(f"{backend:>8}: not installed")
+            continue
+        decode = min(timeit.repeat(lambda: codec.loads(encoded), number=1, repeat=5))
+        encode = min(timeit.repeat(lambda: codec.dumps(payload), number=1, repeat=5))
+        print(
+            f"{backend:>8}: decode {decode * 1000:8.1f} ms"
+            f"  encode {encode * 1000:8.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,519 @@
+"""Benchmark building objects from Grouper results, with a regression gate.
+
+Run from the repository root with
+``python -m benchmarks.bench_parsing [--sizes 1000 100000 1000000]``.
+Each benchmark builds objects from a synthetic payload of the given number
+of entries, and reports the throughput (entries per second, best of
+--repeat runs) and the peak memory allocated while building them
+(measured by tracemalloc in a separate run).
+The client functions (get_members_for_groups and so on) include decoding the
+JSON result, as they are called through an httpx transport that returns the
+encoded payload in chunks, as it would arrive from the network, without
+touching the network.
+
+With --baseline, results are compared to the stored baseline, and the command
+exits with status 1 if any benchmark is slower or uses more memory than the
+baseline by more than the tolerances. Throughput depends on the machine, so the
+baseline should be saved (with --save) on the machine that checks against it.
+CI runs with --tolerance 1, which only checks peak memory.
+
+The default sizes are 1,000 and 100,000 entries. 1,000,000 entries can be
+given with --sizes, but is left out of the defaults and the baseline, as the
+client functions then peak at several GB of memory and take minutes, more
+than CI agents have. Time and memory grow about linearly with the entries,
+so the 100,000 entry benchmarks catch the same regressions.
+"""
+
+from __future__ import annotations
+from typing import Any
+from collections.abc import Callable
+import argparse
+import gc
+import json
+import sys
+import time
+import tracemalloc
+import httpx
+from grouper_python import GrouperClient, JSONCodec
+from grouper_python.attribute import get_attribute_assignments
+from grouper_python.membership import (
+    get_members_for_groups,
+    get_memberships_for_groups,
+    get_membership_table_for_groups,
+)
+from grouper_python.objects import Group, Person
+from grouper_python.objects.attribute import (
+    AttributeAssignment,
+    AttributeDefinition,
+    AttributeDefinitionName,
+)
+from grouper_python.objects.privilege import Privilege
+
+BASE_URL = "https://grouper/grouper-ws/servicesRest/v2_6_000"
+ATTRIBUTE_NAMES = ["description", "name"]
+DEFAULT_BASELINE = "benchmarks/baseline_parsing.json"
+CHUNK_SIZE = 65536
+
+ATTRIBUTE_DEF = {
+    "uuid": "24b93ca5c9234d1ab8da393afcc24c60",
+    "name": "etc:attr_def",
+    "extension": "attr_def",
+    "attributeDefType": "attr",
+    "valueType": "string",
+    "multiAssignable": "F",
+    "multiValued": "F",
+    "idIndex": "1000017",
+}
+ATTRIBUTE_DEF_NAME = {
+    "uuid": "04d2177a412648b7a084f72f503bba4d",
+    "attributeDefId": ATTRIBUTE_DEF["uuid"],
+    "attributeDefName": ATTRIBUTE_DEF["name"],
+    "name": "etc:attr",
+    "extension": "attr",
+    "displayExtension": "attr",
+    "displayName": "etc:attr",
+    "idIndex": "1000076",
+}
+
+
+def group_body(i: int) -> dict[str, Any]:
+    """Build the body of a group.
+
+    :param i: The number of the group
+    :type i: int
+    :return: The group body
+    :rtype: dict[str, Any]
+    """
+    return {
+        "extension": f"GROUP{i}",
+        "displayName": f"Test Stem:Group {i}",
+        "description": f"Group {i} description",
+        "uuid": f"{i:032x}",
+        "enabled": "T",
+        "displayExtension": f"Group {i}",
+        "name": f"test:GROUP{i}",
+        "typeOfGroup": "group",
+        "idIndex": str(10000 + i),
+    }
+
+
+def person_body(i: int) -> dict[str, Any]:
+    """Build the body of a subject that is a person.
+
+    :param i: The number of the person
+    :type i: int
+    :return: The subject body
+    :rtype: dict[str, Any]
+    """
+    return {
+        "sourceId": "ldap",
+        "attributeValues": [f"user{i:07d}", f"User {i} Name"],
+        "name": f"User {i} Name",
+        "id": f"{i:032x}"[::-1],
+        "resultCode": "SUCCESS",
+        "success": "T",
+    }
+
+
+def privilege_body(i: int) -> dict[str, Any]:
+    """Build the body of a privilege on a group.
+
+    :param i: The number of the privilege
+    :type i: int
+    :return: The privilege body
+    :rtype: dict[str, Any]
+    """
+    return {
+        "revokable": "T",
+        "allowed": "T",
+        "ownerSubject": person_body(0),
+        "wsSubject": person_body(i),
+        "wsGroup": group_body(i % 1000),
+        "privilegeType": "access",
+        "privilegeName": "update",
+    }
+
+
+def assignment_body(i: int) -> dict[str, Any]:
+    """Build the body of an attribute assignment on a group.
+
+    :param i: The number of the assignment
+    :type i: int
+    :return: The assignment body
+    :rtype: dict[str, Any]
+    """
+    return {
+        "id": f"{i:032x}",
+        "attributeAssignType": "group",
+        "attributeAssignDelegatable": "FALSE",
+        "disallowed": "F",
+        "enabled": "T",
+        "createdOn": "2023/06/12 09:53:52.253",
+        "lastUpdated": "2023/06/12 09:53:52.253",
+        "attributeAssignActionId": "ae72ff8bf5414933a9bf7fb6fdf04a28",
+        "attributeAssignActionName": "assign",
+        "attributeAssignActionType": "immediate",
+        "attributeDefId": ATTRIBUTE_DEF["uuid"],
+        "attributeDefName": ATTRIBUTE_DEF["name"],
+        "attributeDefNameId": ATTRIBUTE_DEF_NAME["uuid"],
+        "attributeDefNameName": ATTRIBUTE_DEF_NAME["name"],
+        "ownerGroupId": f"{i % 1000:032x}",
+        "ownerGroupName": f"test:GROUP{i % 1000}",
+        "wsAttributeAssignValues": [{"id": f"{i:032x}", "valueSystem": str(i)}],
+    }
+
+
+def fake_client(result: dict[str, Any], lazy: bool = False) -> GrouperClient:
+    """Build a client whose every call returns the given result.
+
+    :param result: The result to return
+    :type result: dict[str, Any]
+    :param lazy: Whether the client builds entities lazily, defaults to False
+    :type lazy: bool, optional
+    :return: The client
+    :rtype: GrouperClient
+    """
+    content = JSONCodec("json").dumps(result)
+    return GrouperClient(
+        BASE_URL,
+        "username",
+        "password",
+        transport=httpx.MockTransport(
+            lambda request: httpx.Response(
+                200,
+                content=(
+                    content[i:i + CHUNK_SIZE]
+                    for i in range(0, len(content), CHUNK_SIZE)
+                ),
+            )
+        ),
+        lazy_entities=lazy,
+    )
+
+
+def bench_group_init(count: int) -> Callable[[], Any]:
+    """Set up building Groups.
+
+    :param count: The number of groups
+    :type count: int
+    :return: Function that builds the groups
+    :rtype: Callable[[], Any]
+    """
+    client = fake_client({})
+    bodies = [group_body(i) for i in range(count)]
+    return lambda: [Group(client, body) for body in bodies]
+
+
+def bench_person_init(count: int) -> Callable[[], Any]:
+    """Set up building Persons.
+
+    :param count: The number of people
+    :type count: int
+    :return: Function that builds the people
+    :rtype: Callable[[], Any]
+    """
+    client = fake_client({})
+    bodies = [person_body(i) for i in range(count)]
+    return lambda: [Person(client, body, ATTRIBUTE_NAMES) for body in bodies]
+
+
+def bench_group_init_lazy(count: int) -> Callable[[], Any]:
+    """Set up building Groups with a client that builds entities lazily.
+
+    :param count: The number of groups
+    :type count: int
+    :return: Function that builds the groups
+    :rtype: Callable[[], Any]
+    """
+    client = fake_client({}, lazy=True)
+    bodies = [group_body(i) for i in range(count)]
+    return lambda: [client._entity(Group, body) for body in bodies]
+
+
+def bench_person_init_lazy(count: int) -> Callable[[], Any]:
+    """Set up building Persons with a client that builds entities lazily.
+
+    :param count: The number of people
+    :type count: int
+    :return: Function that builds the people
+    :rtype: Callable[[], Any]
+    """
+    client = fake_client({}, lazy=True)
+    bodies = [person_body(i) for i in range(count)]
+    return lambda: [
+        client._entity(Person, body, ATTRIBUTE_NAMES) for body in bodies
+    ]
+
+
+def bench_privilege_init(count: int) -> Callable[[], Any]:
+    """Set up building Privileges.
+
+    :param count: The number of privileges
+    :type count: int
+    :return: Function that builds the privileges
+    :rtype: Callable[[], Any]
+    """
+    client = fake_client({})
+    bodies = [privilege_body(i) for i in range(count)]
+    return lambda: [Privilege(client, body, ATTRIBUTE_NAMES) for body in bodies]
+
+
+def bench_attribute_assignment_init(count: int) -> Callable[[], Any]:
+    """Set up building AttributeAssignments.
+
+    :param count: The number of assignments
+    :type count: int
+    :return: Function that builds the assignments
+    :rtype: Callable[[], Any]
+    """
+    client = fake_client({})
+    attribute_def = AttributeDefinition(client, ATTRIBUTE_DEF)
+    attribute_def_name = AttributeDefinitionName(
+        client, ATTRIBUTE_DEF_NAME, attribute_def
+    )
+    group = Group(client, group_body(0))
+    bodies = [assignment_body(i) for i in range(count)]
+    return lambda: [
+        AttributeAssignment(
+            client, body, attribute_def, attribute_def_name, group=group
+        )
+        for body in bodies
+    ]
+
+
+def bench_get_members_for_groups(count: int) -> Callable[[], Any]:
+    """Set up getting the members of a group with the given number of members.
+
+    :param count: The number of members
+    :type count: int
+    :return: Function that gets the members
+    :rtype: Callable[[], Any]
+    """
+    client = fake_client(
+        {
+            "WsGetMembersResults": {
+                "resultMetadata": {"success": "T"},
+                "subjectAttributeNames": ATTRIBUTE_NAMES,
+                "results": [
+                    {
+                        "resultMetadata": {"success": "T"},
+                        "wsGroup": group_body(0),
+                        "wsSubjects": [person_body(i) for i in range(count)],
+                    }
+                ],
+            }
+        }
+    )
+    return lambda: get_members_for_groups(["test:GROUP0"], client)
+
+
+def memberships_client(count: int) -> GrouperClient:
+    """Build a client that gets a group with the given number of members.
+
+    :param count: The number of memberships
+    :type count: int
+    :return: The client
+    :rtype: GrouperClient
+    """
+    group = group_body(0)
+    subjects = [person_body(i) for i in range(count)]
+    return fake_client(
+        {
+            "WsGetMembershipsResults": {
+                "resultMetadata": {"success": "T"},
+                "subjectAttributeNames": ATTRIBUTE_NAMES,
+                "wsGroups": [group],
+                "wsSubjects": subjects,
+                "wsMemberships": [
+                    {
+                        "membershipType": "immediate",
+                        "groupId": group["uuid"],
+                        "subjectId": subject["id"],
+                        "subjectSourceId": "ldap",
+                    }
+                    for subject in subjects
+                ],
+            }
+        }
+    )
+
+
+def bench_get_memberships_for_groups(count: int) -> Callable[[], Any]:
+    """Set up getting the memberships of a group with the given number of members.
+
+    :param count: The number of memberships
+    :type count: int
+    :return: Function that gets the memberships
+    :rtype: Callable[[], Any]
+    """
+    client = memberships_client(count)
+    return lambda: get_memberships_for_groups(["test:GROUP0"], client)
+
+
+def bench_get_membership_table_for_groups(count: int) -> Callable[[], Any]:
+    """Set up getting a MembershipTable of a group with the given number of members.
+
+    :param count: The number of memberships
+    :type count: int
+    :return: Function that gets the MembershipTable
+    :rtype: Callable[[], Any]
+    """
+    client = memberships_client(count)
+    return lambda: get_membership_table_for_groups(["test:GROUP0"], client)
+
+
+def bench_get_attribute_assignments(count: int) -> Callable[[], Any]:
+    """Set up getting the given number of attribute assignments on groups.
+
+    :param count: The number of assignments
+    :type count: int
+    :return: Function that gets the assignments
+    :rtype: Callable[[], Any]
+    """
+    client = fake_client(
+        {
+            "WsGetAttributeAssignmentsResults": {
+                "resultMetadata": {"success": "T"},
+                "wsAttributeAssigns": [assignment_body(i) for i in range(count)],
+                "wsAttributeDefs": [ATTRIBUTE_DEF],
+                "wsAttributeDefNames": [ATTRIBUTE_DEF_NAME],
+                "wsGroups": [group_body(i) for i in range(min(count, 1000))],
+            }
+        }
+    )
+    return lambda: get_attribute_assignments(
+        "group", client, attribute_def_name_names=["etc:attr"]
+    )
+
+
+BENCHMARKS: dict[str, Callable[[int], Callable[[], Any]]] = {
+    "Group.__init__": bench_group_init,
+    "Person.__init__": bench_person_init,
+    "Group.__init__ (lazy)": bench_group_init_lazy,
+    "Person.__init__ (lazy)": bench_person_init_lazy,
+    "Privilege.__init__": bench_privilege_init,
+    "AttributeAssignment.__init__": bench_attribute_assignment_init,
+    "get_members_for_groups": bench_get_members_for_groups,
+    "get_memberships_for_groups": bench_get_memberships_for_groups,
+    "get_membership_table_for_groups": bench_get_membership_table_for_groups,
+    "get_attribute_assignments": bench_get_attribute_assignments,
+}
+
+
+def measure(run: Callable[[], Any], count: int, repeat: int) -> dict[str, float]:
+    """Measure the throughput and peak memory of a benchmark.
+
+    :param run: The function to measure
+    :type run: Callable[[], Any]
+    :param count: The number of entries the function builds
+    :type count: int
+    :param repeat: The number of timed runs, the fastest of which is reported
+    :type repeat: int
+    :return: "seconds", "per_second" and "peak_bytes" of the benchmark
+    :rtype: dict[str, float]
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        result = run()
+        best = min(best, time.perf_counter() - started)
+        del result
+    gc.collect()
+    tracemalloc.start()
+    result = run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return {"seconds": best, "per_second": count / best, "peak_bytes": peak}
+
+
+def compare(
+    results: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    tolerance: float,
+    memory_tolerance: float,
+) -> list[str]:
+    """Compare results to a baseline.
+
+    :param results: The results, keyed by "benchmark[size]"
+    :type results: dict[str, dict[str, float]]
+    :param baseline: The baseline, in the same form as results
+    :type baseline: dict[str, dict[str, float]]
+    :param tolerance: The fraction of throughput that can be lost
+    :type tolerance: float
+    :param memory_tolerance: The fraction of peak memory that can be gained
+    :type memory_tolerance: float
+    :return: A description of each regression
+    :rtype: list[str]
+    """
+    regressions = []
+    for key, result in results.items():
+        if key not in baseline:
+            continue
+        expected = baseline[key]
+        if result["per_second"] < expected["per_second"] * (1 - tolerance):
+            regressions.append(
+                f"{key}: {result['per_second']:,.0f}/s is slower than the"
+                f" baseline {expected['per_second']:,.0f}/s"
+            )
+        if result["peak_bytes"] > expected["peak_bytes"] * (1 + memory_tolerance):
+            regressions.append(
+                f"{key}: peak {result['peak_bytes'] / 1e6:,.1f} MB is more than the"
+                f" baseline {expected['peak_bytes'] / 1e6:,.1f} MB"
+            )
+    return regressions
+
+
+def main(argv: list[str]) -> int:
+    """Run the benchmarks, and compare them to or save them as the baseline.
+
+    :param argv: The command line arguments
+    :type argv: list[str]
+    :return: The exit status, 1 if there were regressions
+    :rtype: int
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", nargs="+", choices=BENCHMARKS, default=BENCHMARKS)
+    parser.add_argument("--baseline", nargs="?", const=DEFAULT_BASELINE)
+    parser.add_argument("--save", action="store_true", help="save as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.3)
+    parser.add_argument("--memory-tolerance", type=float, default=0.1)
+    args = parser.parse_args(argv)
+
+    results: dict[str, dict[str, float]] = {}
+    for name in args.only:
+        for size in args.sizes:
+            result = measure(BENCHMARKS[name](size), size, args.repeat)
+            results[f"{name}[{size}]"] = result
+            print(
+                f"{name:>30} {size:>9,}: {result['seconds'] * 1000:9.1f} ms"
+                f" {result['per_second']:>12,.0f}/s"
+                f" peak {result['peak_bytes'] / 1e6:8.1f} MB"
+            )
+
+    path = args.baseline or DEFAULT_BASELINE
+    if args.save:
+        with open(path, "w") as file:
+            json.dump(results, file, indent=2, sort_keys=True)
+            file.write("\n")
+        print(f"Saved baseline to {path}")
+        return 0
+    if args.baseline:
+        with open(path) as file:
+            baseline = json.load(file)
+        regressions = compare(
+            results, baseline, args.tolerance, args.memory_tolerance
+        )
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+        print(f"No regressions against {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -1,8 +1,23 @@
 """grouper_python, a Python package for interacting with Grouper Web Services."""
 
-from .objects.client import GrouperClient
+from .objects.client import GrouperClient, AsyncGrouperClient
+from .objects.cache import GrouperCache
+from .objects.batch import HasMemberBatcher
+from .objects.codec import JSONCodec
+from .objects.retry import RetryPolicy, CircuitBreaker
+from .objects.stats import CallEvent, CallStats
 
 Client = GrouperClient
 
 __version__ = "0.1.4"
-__all__ = ["GrouperClient"]
+__all__ = [
+    "GrouperClient",
+    "AsyncGrouperClient",
+    "GrouperCache",
+    "HasMemberBatcher",
+    "JSONCodec",
+    "RetryPolicy",
+    "CircuitBreaker",
+    "CallEvent",
+    "CallStats",
+]
@@ -0,0 +1,5 @@
+"""grouper_python.aio, asyncio helper functions for the grouper_python package.
+
+These mirror the helper modules at the top level of grouper_python, but take an
+AsyncGrouperClient and must be awaited.
+"""
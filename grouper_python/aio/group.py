@@ -0,0 +1,324 @@
+"""grouper-python.aio.group - async functions to interact with group objects.
+
+These are the asyncio versions of the helper functions in grouper_python.group.
+Most likely they will not be called directly. Instead, an AsyncGrouperClient
+should be created, then from there use that AsyncGrouperClient's methods to find
+and create objects, and use those objects' awaitable methods.
+These helper functions can be called directly if needed.
+"""
+
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any
+import asyncio
+
+if TYPE_CHECKING:  # pragma: no cover
+    from ..objects.group import CreateGroup, AsyncGroup
+    from ..objects.client import AsyncGrouperClient
+    from ..objects.subject import SubjectBase
+from ..objects.exceptions import (
+    GrouperGroupNotFoundException,
+    GrouperSuccessException,
+    GrouperStemNotFoundException,
+    GrouperPermissionDenied,
+)
+from ..group import find_groups_bodies
+
+
+async def find_group_by_name(
+    group_name: str,
+    client: AsyncGrouperClient,
+    stem: str | None = None,
+    act_as_subject: SubjectBase | None = None,
+) -> list[AsyncGroup]:
+    """Find a group or groups by approximate name.
+
+    :param group_name: The group name to search for
+    :type group_name: str
+    :param client: The AsyncGrouperClient to use
+    :type client: AsyncGrouperClient
+    :param stem: Optional stem to limit the search to, defaults to None
+    :type stem: str | None, optional
+    :param act_as_subject: Optional subject to act as, defaults to None
+    :type act_as_subject: SubjectBase | None, optional
+    :raises GrouperStemNotFoundException: The specified stem cannot be found
+    :raises GrouperSuccessException: An otherwise unhandled issue with the result
+    :return: List of found groups, will be an empty list if no groups are found
+    :rtype: list[AsyncGroup]
+    """
+    from ..objects.group import AsyncGroup
+
+    body = {
+        "WsRestFindGroupsLiteRequest": {
+            "groupName": group_name,
+            "queryFilterType": "FIND_BY_GROUP_NAME_APPROXIMATE",
+            "includeGroupDetail": "T",
+        }
+    }
+    if stem:
+        body["WsRestFindGroupsLiteRequest"]["stemName"] = stem
+    try:
+        r = await client._call_grouper(
+            "/groups",
+            body,
+            act_as_subject=act_as_subject,
+        )
+    except GrouperSuccessException as err:
+        r = err.grouper_result
+        r_metadata = r["WsFindGroupsResults"]["resultMetadata"]
+        if r_metadata["resultCode"] == "INVALID_QUERY" and r_metadata[
+            "resultMessage"
+        ].startswith("Cant find stem"):
+            raise GrouperStemNotFoundException(str(stem), r)
+        else:  # pragma: no cover
+            # Some other issue, so pass the failure through
+            raise err
+    if "groupResults" in r["WsFindGroupsResults"]:
+        return [
+            client._entity(AsyncGroup, grp)
+            for grp in r["WsFindGroupsResults"]["groupResults"]
+        ]
+    else:
+        return []
+
+
+async def create_groups(
+    groups: list[CreateGroup],
+    client: AsyncGrouperClient,
+    act_as_subject: SubjectBase | None = None,
+) -> list[AsyncGroup]:
+    """Create groups.
+
+    :param groups: List of groups to create
+    :type groups: list[CreateGroup]
+    :param client: The AsyncGrouperClient to use
+    :type client: AsyncGrouperClient
+    :param act_as_subject: Optional subject to act as, defaults to None
+    :type act_as_subject: SubjectBase | None, optional
+    :return: Group objects representing the created groups
+    :rtype: list[AsyncGroup]
+    """
+    from ..objects.group import AsyncGroup
+
+    groups_to_save = []
+    for group in groups:
+        group_to_save: dict[str, Any] = {
+            "wsGroup": {
+                "description": group.description,
+                "displayExtension": group.display_extension,
+                "name": group.name,
+            },
+            "wsGroupLookup": {"groupName": group.name},
+        }
+        if group.detail:
+            group_to_save["wsGroup"]["detail"] = group.detail
+        groups_to_save.append(group_to_save)
+    body = {
+        "WsRestGroupSaveRequest": {
+            "wsGroupToSaves": groups_to_save,
+            "includeGroupDetail": "T",
+        }
+    }
+    r = await client._call_grouper(
+        "/groups",
+        body,
+        act_as_subject=act_as_subject,
+    )
+    return [
+        client._entity(AsyncGroup, result["wsGroup"])
+        for result in r["WsGroupSaveResults"]["results"]
+    ]
+
+
+async def delete_groups(
+    group_names: list[str],
+    client: AsyncGrouperClient,
+    act_as_subject: SubjectBase | None = None,
+) -> None:
+    """Delete the given groups.
+
+    :param group_names: The names of groups to delete
+    :type group_names: list[str]
+    :param client: The AsyncGrouperClient to use
+    :type client: AsyncGrouperClient
+    :param act_as_subject: Optional subject to act as, defaults to None
+    :type act_as_subject: SubjectBase | None, optional
+    :raises GrouperPermissionDenied: Permission denied to complete the operation
+    :raises GrouperGroupNotFoundException: A group with the given name cannot
+    be found
+    :raises GrouperSuccessException: An otherwise unhandled issue with the result
+    """
+    group_lookup = [{"groupName": group} for group in group_names]
+    body = {
+        "WsRestGroupDeleteRequest": {
+            "wsGroupLookups": group_lookup,
+        }
+    }
+    try:
+        r = await client._call_grouper(
+            "/groups",
+            body,
+            act_as_subject=act_as_subject,
+        )
+    except GrouperSuccessException as err:
+        r = err.grouper_result
+        r_metadata = r["WsGroupDeleteResults"]["resultMetadata"]
+        if r_metadata["resultCode"] == "PROBLEM_DELETING_GROUPS":
+            raise GrouperPermissionDenied(r)
+        else:  # pragma: no cover
+            # Some other issue, so pass the failure through
+            raise
+    for result in r["WsGroupDeleteResults"]["results"]:
+        meta = result["resultMetadata"]
+        if meta["resultCode"] == "SUCCESS_GROUP_NOT_FOUND":
+            try:
+                result_message = meta["resultMessage"]
+                split_message = result_message.split(",")
+                group_name = split_message[1].split("=")[1]
+            except Exception:  # pragma: no cover
+                # The try above feels fragile, so if it fails,
+                # throw a SuccessException
+                raise GrouperSuccessException(r)
+            raise GrouperGroupNotFoundException(group_name, r)
+        elif meta["resultCode"] != "SUCCESS":  # pragma: no cover
+            # Whatever the error here, we don't understand it
+            # well enough to process it into something more specific
+            raise GrouperSuccessException(r)
+        else:
+            pass
+
+
+async def get_groups_by_parent(
+    parent_name: str,
+    client: AsyncGrouperClient,
+    recursive: bool = False,
+    act_as_subject: SubjectBase | None = None,
+) -> list[AsyncGroup]:
+    """Get Groups within the given parent stem.
+
+    :param parent_name: The parent stem to look in
+    :type parent_name: str
+    :param client: The AsyncGrouperClient to use
+    :type client: AsyncGrouperClient
+    :param recursive: Whether to look recursively through the entire subtree (True),
+    or only one level in the given parent (False), defaults to False
+    :type recursive: bool, optional
+    :param act_as_subject: Optional subject to act as, defaults to None
+    :type act_as_subject: SubjectBase | None, optional
+    :raises GrouperSuccessException: An otherwise unhandled issue with the result
+    :return: The list of Groups found
+    :rtype: list[AsyncGroup]
+    """
+    from ..objects.group import AsyncGroup
+
+    body = {
+        "WsRestFindGroupsLiteRequest": {
+            "stemName": parent_name,
+            "queryFilterType": "FIND_BY_STEM_NAME",
+        }
+    }
+    if recursive:
+        body["WsRestFindGroupsLiteRequest"]["stemNameScope"] = "ALL_IN_SUBTREE"
+    else:
+        body["WsRestFindGroupsLiteRequest"]["stemNameScope"] = "ONE_LEVEL"
+    r = await client._call_grouper(
+        "/groups",
+        body,
+        act_as_subject=act_as_subject,
+    )
+    if "groupResults" in r["WsFindGroupsResults"]:
+        return [
+            client._entity(AsyncGroup, grp)
+            for grp in r["WsFindGroupsResults"]["groupResults"]
+        ]
+    else:
+        return []
+
+
+async def get_group_by_name(
+    group_name: str,
+    client: AsyncGrouperClient,
+    act_as_subject: SubjectBase | None = None,
+) -> AsyncGroup:
+    """Get a group with the given name.
+
+    :param group_name: The name of the group to get
+    :type group_name: str
+    :param client: The AsyncGrouperClient to use
+    :type client: AsyncGrouperClient
+    :param act_as_subject: Optional subject to act as, defaults to None
+    :type act_as_subject: SubjectBase | None, optional
+    :raises GrouperGroupNotFoundException: A group with the given name cannot
+    be found
+    :raises GrouperSuccessException: An otherwise unhandled issue with the result
+    :return: The group with the given name
+    :rtype: AsyncGroup
+    """
+    from ..objects.group import AsyncGroup
+
+    body = {
+        "WsRestFindGroupsLiteRequest": {
+            "groupName": group_name,
+            "queryFilterType": "FIND_BY_GROUP_NAME_EXACT",
+            "includeGroupDetail": "T",
+        }
+    }
+    r = await client._call_grouper("/groups", body, act_as_subject=act_as_subject)
+    if "groupResults" not in r["WsFindGroupsResults"]:
+        raise GrouperGroupNotFoundException(group_name, r)
+    return client._entity(AsyncGroup, r["WsFindGroupsResults"]["groupResults"][0])
+
+
+async def get_groups_by_names(
+    group_names: list[str],
+    client: AsyncGrouperClient,
+    act_as_subject: SubjectBase | None = None,
+    chunk_size: int = 100,
+    max_concurrency: int = 4,
+) -> dict[str, AsyncGroup]:
+    """Get the groups with the given names, using as few API calls as possible.
+
+    The names are looked up in chunks of chunk_size, with one API call per chunk,
+    and up to max_concurrency chunks are sent to Grouper at the same time.
+    Names that are not found are left out of the returned dict.
+
+    :param group_names: The names of the groups to get
+    :type group_names: list[str]
+    :param client: The AsyncGrouperClient to use
+    :type client: AsyncGrouperClient
+    :param act_as_subject: Optional subject to act as, defaults to None
+    :type act_as_subject: SubjectBase | None, optional
+    :param chunk_size: The maximum number of groups to look up in one API call,
+    defaults to 100
+    :type chunk_size: int, optional
+    :param max_concurrency: The maximum number of API calls to make at the same
+    time, defaults to 4
+    :type max_concurrency: int, optional
+    :raises GrouperSuccessException: An otherwise unhandled issue with the result
+    :return: A dictionary with group names as the keys and AsyncGroups as the values
+    :rtype: dict[str, AsyncGroup]
+    """
+    from ..objects.group import AsyncGroup
+
+    semaphore = asyncio.Semaphore(max(max_concurrency, 1))
+
+    async def find_chunk(body: dict[str, Any]) -> dict[str, Any]:
+        """Send one chunk to Grouper.
+
+        :param body: The request body for the chunk
+        :type body: dict[str, Any]
+        :return: The result returned by Grouper
+        :rtype: dict[str, Any]
+        """
+        async with semaphore:
+            return await client._call_grouper(
+                "/groups", body, act_as_subject=act_as_subject
+            )
+
+    results = await asyncio.gather(
+        *[find_chunk(body) for body in find_groups_bodies(group_names, chunk_size)]
+    )
+    r_dict: dict[str, AsyncGroup] = {}
+    for r in results:
+        for grp in r["WsFindGroupsResults"].get("groupResults", []):
+            r_dict[grp["name"]] = client._entity(AsyncGroup, grp)
+    return r_dict
@@ -0,0 +1,1303 @@
+"""grouper-python.aio.membership - async functions to interact with grouper membership.
+
+These are the asyncio versions of the helper functions in grouper_python.membership.
+Most likely they will not be called directly. Instead, an AsyncGrouperClient
+should be created, then from there use that AsyncGrouperClient's methods to find
+and create objects, and use those objects' awaitable methods.
+These helper functions can be called directly if needed.
+"""
+
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any
+import asyncio
+
+if TYPE_CHECKING:  # pragma: no cover
+    from ..objects.group import AsyncGroup
+    from collections.abc import AsyncIterator
+    from ..objects.client import AsyncGrouperClient
+    from ..objects.membership import (
+        AsyncMembership,
+        AsyncMembershipTable,
+        MembershipMatrix,
+        HasMember,
+        MemberChangeResult,
+    )
+    from ..objects.subject import AsyncSubject, SubjectBase
+from ..objects.exceptions import (
+    GrouperGroupNotFoundException,
+    GrouperSuccessException,
+    GrouperPermissionDenied,
+)
+from ..util import subject_lookup_chunks
+from ..membership import (
+    MEMBERSHIPS_STREAM_PATHS,
+    MembershipStream,
+    MembershipTableBuilder,
+    memberships_body,
+    classify_membership,
+    raise_memberships_error,
+    bulk_member_body,
+    bulk_member_error_result,
+    bulk_member_chunk_failed,
+    bulk_member_results,
+    sync_changes,
+    matrix_strategy,
+    matrix_memberships_bodies,
+    set_matrix_memberships,
+)
+from .util import resolve_subjects
+
+
+async def get_memberships_for_groups(
+    group_names: list[str],
+    client: AsyncGrouperClient,
+    attributes: list[str] = [],
+    member_filter: str = "all",
+    resolve_groups: bool = True,
+    act_as_subject: SubjectBase | None = None,
+) -> dict[AsyncGroup, list[AsyncMembership]]:
+    """Get memberships for the given groups.
+
+    Note that a "membership" includes more detail than a "member".
+
+    :param group_names: Group names to retreive memberships for
+    :type group_names: list[str]
+    :param client: The AsyncGrouperClient to use
+    :type client: AsyncGrouperClient
+    :param attributes: Additional attributes to retrieve for the Subjects,
+    defaults to []
+    :type attributes: list[str], optional
+    :param member_filter: Type of mebership to return (all, immediate, effective),
+    defaults to "all"
+    :type member_filter: str, optional
+    :param resolve_groups: Whether to resolve subjects that are groups into Group
+    objects, which will require additional API calls, defaults to True
+    :type resolve_groups: bool, optional
+    :param act_as_subject: Optional subject to act as, defaults to None
+    :type act_as_subject: SubjectBase | None, optional
+    :raises GrouperGroupNotFoundException: A group with the given name cannot
+    be found
+    :raises GrouperSuccessException: An otherwise unhandled issue with the result
+    :return: A dictionary with Groups as the keys
+    and those groups' memberships list as the value
+    :rtype: dict[AsyncGroup, list[AsyncMembership]]
+    """
+    from ..objects.membership import AsyncMembership
+    from ..objects.group import AsyncGroup
+
+    body = memberships_body(
+        group_names,
+        attributes + [client.universal_identifier_attr, "name"],
+        member_filter,
+    )
+    try:
+        r = await client._call_grouper(
+            "/memberships",
+            body,
+            act_as_subject=act_as_subject,
+        )
+    except GrouperSuccessException as err:
+        raise_memberships_error(err)
+    if "wsGroups" not in r["WsGetMembershipsResults"].keys():
+        # if "wsGroups" is not in the result but it was succesful,
+        # that means the group(s) exist but have no memberships
+        # This function will only return groups with memberships,
+        # so this means there are no memberships and we return
+        # an empty dict
+        return {}
+    ws_memberships = r["WsGetMembershipsResults"].get("wsMemberships", [])
+    ws_groups = r["WsGetMembershipsResults"]["wsGroups"]
+    ws_subjects = r["WsGetMembershipsResults"].get("wsSubjects", [])
+    subjects = {ws_subject["id"]: ws_subject for ws_subject in ws_subjects}
+    groups = {
+        ws_group["uuid"]: client._entity(AsyncGroup, ws_group) for ws_group in ws_groups
+    }
+    subject_attr_names = r["WsGetMembershipsResults"].get("subjectAttributeNames", [])
+    member_bodies = {
+        ws_membership["subjectId"]: subjects[ws_membership["subjectId"]]
+        for ws_membership in ws_memberships
+    }
+    members = dict(
+        zip(
+            member_bodies.keys(),
+            await resolve_subjects(
+                subject_bodies=list(member_bodies.values()),
+                client=client,
+                subject_attr_names=subject_attr_names,
+                resolve_groups=resolve_groups,
+            ),
+        )
+    )
+    r_dict: dict[AsyncGroup, list[AsyncMembership]] = {
+        group: [] for group in groups.values()
+    }
+    for ws_membership in ws_memberships:
+        subject = members[ws_membership["subjectId"]]
+        member_type, membership_type = classify_membership(ws_membership, r)
+        membership = AsyncMembership(
+            member=subject, member_type=member_type, membership_type=membership_type
+        )
+        group = groups[ws_membership["groupId"]]
+        r_dict[group].append(membership)
+    return r_dict
+
+
+async def iter_memberships_for_group(
+    group_name: str,
+    client: AsyncGrouperClient,
+    attributes: list[str] = [],
+    member_filter: str = "all",
+    resolve_groups: bool = True,
+    page_size: int = 1000,
+    act_as_subject: SubjectBase | None = None,
+) -> AsyncIterator[AsyncMembership]:
+    """Iterate over the memberships of the given group, one page at a time.
+
+    Each page is parsed as it is received rather than all at once.
+    Grouper sends the memberships of a page before its subjects,
+    so the memberships of a page are held until its subjects arrive,
+    but only one page is held at a time, so memory use does not grow with
+    the size of the group. Iteration can be stopped at any point
+    without fetching the remaining pages.
+    Memberships are not given in any particular order.
+
+    :param group_name: Name of the group to retreive memberships for
+    :type group_name: str
+    :param client: The AsyncGrouperClient to use
+    :type client: AsyncGrouperClient
+    :param attributes: Additional attributes to retrieve for the Subjects,
+    defaults to []
+    :type attributes: list[str], optional
+    :param member_filter: Type of mebership to return (all, immediate, effective),
+    defaults to "all"
+    :type member_filter: str, optional
+    :param resolve_groups: Whether to resolve subjects that are groups into AsyncGroup
+    objects, which will require additional API calls, defaults to True
+    :type resolve_groups: bool, optional
+    :param page_size: The number of memberships to request per page,
+    defaults to 1000
+    :type page_size: int, optional
+    :param act_as_subject: Optional subject to act as, defaults to None
+    :type act_as_subject: SubjectBase | None, optional
+    :raises GrouperGroupNotFoundException: A group with the given name cannot
+    be found
+    :raises GrouperSuccessException: An otherwise unhandled issue with the result
+    :return: An iterator over the memberships of the group
+    :rtype: AsyncIterator[AsyncMembership]
+    """
+    body = memberships_body(
+        [group_name],
+        attributes + [client.universal_identifier_attr, "name"],
+        member_filter,
+    )
+    request = body["WsRestGetMembershipsRequest"]
+    request["pageSize"] = str(page_size)
+    page_number = 1
+    while True:
+        request["pageNumber"] = str(page_number)
+        given = 0
+        async for membership in _stream_memberships(
+            client, body, resolve_groups, act_as_subject
+        ):
+            given += 1
+            yield membership
+        # Only an empty page means there are no more memberships,
+        # see iter_memberships_for_group in grouper_python.membership
+        if not given:
+            return
+        page_number += 1
+
+
+async def _stream_memberships(
+    client: AsyncGrouperClient,
+    body: dict[str, Any],
+    resolve_groups: bool,
+    act_as_subject: SubjectBase | None,
+) -> AsyncIterator[AsyncMembership]:
+    """Give the memberships of one memberships result as it downloads.
+
+    :param client: The AsyncGrouperClient to use
+    :type client: AsyncGrouperClient
+    :param body: The body of the memberships request
+    :type body: dict[str, Any]
+    :param resolve_groups: Whether to resolve subjects that are groups into
+    AsyncGroup objects
+    :type resolve_groups: bool
+    :param act_as_subject: Optional subject to act as
+    :type act_as_subject: SubjectBase | None
+    :raises GrouperGroupNotFoundException: A group with the given name cannot
+    be found
+    :raises GrouperSuccessException: An otherwise unhandled issue with the result
+    :return: An iterator over the memberships of the result
+    :rtype: AsyncIterator[AsyncMembership]
+    """
+    from ..objects.membership import AsyncMembership
+
+    stream = MembershipStream()
+    batches = client._stream_grouper(
+        "/memberships",
+        body,
+        MEMBERSHIPS_STREAM_PATHS,
+        act_as_subject=act_as_subject,
+    )
+    parsed: list[tuple[tuple[str, ...], Any]] | None = []
+    while parsed is not None:
+        try:
+            parsed = await anext(batches, None)
+        except GrouperSuccessException as err:
+            raise_memberships_error(err)
+        ready = stream.add(parsed) if parsed is not None else stream.close()
+        if not ready:
+            continue
+        subject_bodies = {subject["id"]: subject for _, subject in ready}
+        members = dict(
+            zip(
+                subject_bodies.keys(),
+                await resolve_subjects(
+                    subject_bodies=list(subject_bodies.values()),
+                    client=client,
+                    subject_attr_names=stream.subject_attr_names,
+                    resolve_groups=resolve_groups,
+                ),
+            )
+        )
+        for ws_membership, _ in ready:
+            member_type, membership_type = classify_membership(
+                ws_membership, stream.full_result
+            )
+            yield AsyncMembership(
+                member=members[ws_membership["subjectId"]],
+                member_type=member_type,
+                membership_type=membership_type,
+            )
+
+
+async def get_membership_table_for_groups(
+    group_names: list[str],
+    client: AsyncGrouperClient,
+    attributes: list[str] = [],
+    member_filter: str = "all",
+    act_as_subject: SubjectBase | None = None,
+) -> AsyncMembershipTable:
+    """Get memberships for the given groups as a columnar AsyncMembershipTable.
+
+    Rather than building a Membership and Subject for each membership,
+    the memberships are held as rows of parallel arrays, with each group
+    and subject held once. The result is parsed as it is received, so neither
+    the full result nor an object per membership is ever held, which makes
+    this suited to very large numbers of memberships.
+    AsyncMembershipTable.to_memberships can build the AsyncMembership objects later.
+
+    :param group_names: Group names to retreive memberships for
+    :type group_names: list[str]
+    :param client: The AsyncGrouperClient to use
+    :type client: AsyncGrouperClient
+    :param attributes: Additional attributes to retrieve for the Subjects,
+    defaults to []
+    :type attributes: list[str], optional
+    :param member_filter: Type of mebership to return (all, immediate, effective),
+    defaults to "all"
+    :type member_filter: str, optional
+    :param act_as_subject: Optional subject to act as, defaults to None
+    :type act_as_subject: SubjectBase | None, optional
+    :raises GrouperGroupNotFoundException: A group with the given name cannot
+    be found
+    :raises GrouperSuccessException: An otherwise unhandled issue with the result
+    :return: The memberships of the groups
+    :rtype: AsyncMembershipTable
+    """
+    from ..objects.membership import AsyncMembershipTable
+    from ..objects.group import AsyncGroup
+
+    body = memberships_body(
+        group_names,
+        attributes + [client.universal_identifier_attr, "name"],
+        member_filter,
+    )
+    builder = MembershipTableBuilder()
+    try:
+        async for parsed in client._stream_grouper(
+            "/memberships",
+            body,
+            MEMBERSHIPS_STREAM_PATHS,
+            act_as_subject=act_as_subject,
+        ):
+            builder.add(parsed)
+    except GrouperSuccessException as err:
+        raise_memberships_error(err)
+    group_bodies = builder.close()
+    return AsyncMembershipTable(
+        client,
+        [client._entity(AsyncGroup, group_body) for group_body in group_bodies],
+        builder.subjects,
+        builder.group_index,
+        builder.subject_index,
+        builder.member_types,
+        builder.membership_types,
+    )
+
+
+async def has_members(
+    group_name: str,
+    client: AsyncGrouperClient,
+    subject_identifiers: list[str] = [],
+    subject_ids: list[str] = [],
+    member_filter: str = "all",
+    act_as_subject: SubjectBase | None = None,
+) -> dict[str, HasMember]:
+    """Determine if the given subjects are members of the given group.
+
+    :param group_name: Name of group to check members
+    :type group_name: str
+    :param client: The AsyncGrouperClient to use
+    :type client: AsyncGrouperClient
+    :param subject_identifiers: Subject identifiers to check for membership,
+    defaults to []
+    :type subject_identifiers: list[str], optional
+    :param subject_ids: Subject ids to check for membership,
+    defaults to [], defaults to []
+    :type subject_ids: list[str], optional
+    :param member_filter: Type of mebership to return (all, immediate, effective),
+    defaults to "all"
+    :type member_filter: str, optional
+    :param act_as_subject: Optional subject to act as, defaults to None
+    :type act_as_subject: SubjectBase | None, optional
+    :raises ValueError: No subjects were specified
+    :raises GrouperGroupNotFoundException: A group with the given name cannot
+    be found
+    :raises GrouperSuccessException: An otherwise unhandled issue with the result
+    :return: A dict with the key being the subject (either identifier or id)
+    and the value being a HasMember enum.
+    :rtype: dict[str, HasMember]
+    """
+    if not subject_identifiers and not subject_ids:
+        raise ValueError(
+            "At least one of subject_identifiers or subject_ids must be specified"
+        )
+    if client.has_member_batcher is not None:
+        # Coalesce with checks of the same group made at about the same time
+        return await client.has_member_batcher.arun(
+            (
+                client,
+                group_name,
+                member_filter,
+                act_as_subject.id if act_as_subject else None,
+            ),
+            subject_identifiers,
+            subject_ids,
+            lambda identifiers, ids: _has_members(
+                group_name, client, identifiers, ids, member_filter, act_as_subject
+            ),
+        )
+    return await _has_members(
+        group_name,
+        client,
+        subject_identifiers,
+        subject_ids,
+        member_filter,
+        act_as_subject,
+    )
+
+
+async def _has_members(
+    group_name: str,
+    client: AsyncGrouperClient,
+    subject_identifiers: list[str],
+    subject_ids: list[str],
+    member_filter: str,
+    act_as_subject: SubjectBase | None,
+) -> dict[str, HasMember]:
+    """Send a has_members request for the given subjects.
+
+    :param group_name: Name of group to check members
+    :type group_name: str
+    :param client: The AsyncGrouperClient to use
+    :type client: AsyncGrouperClient
+    :param subject_identifiers: Subject identifiers to check for membership
+    :type subject_identifiers: list[str]
+    :param subject_ids: Subject ids to check for membership
+    :type subject_ids: list[str]
+    :param member_filter: Type of mebership to return (all, immediate, effective)
+    :type member_filter: str
+    :param act_as_subject: Optional subject to act as
+    :type act_as_subject: SubjectBase | None
+    :raises GrouperGroupNotFoundException: A group with the given name cannot
+    be found
+    :raises GrouperSuccessException: An otherwise unhandled issue with the result
+    :return: A dict with the key being the subject (either identifier or id)
+    and the value being a HasMember enum.
+    :rtype: dict[str, HasMember]
+    """
+    from ..objects.membership import HasMember
+
+    subject_identifier_lookups = [
+        {"subjectIdentifier": ident} for ident in subject_identifiers
+    ]
+    subject_id_lookups = [{"subjectId": ident} for ident in subject_ids]
+    body = {
+        "WsRestHasMemberRequest": {
+            "subjectLookups": subject_identifier_lookups + subject_id_lookups,
+            "memberFilter": member_filter,
+        }
+    }
+    try:
+        r = await client._call_grouper(
+            f"/groups/{group_name}/members",
+            body,
+            act_as_subject=act_as_subject,
+        )
+    except GrouperSuccessException as err:
+        r = err.grouper_result
+        if r["WsHasMemberResults"]["resultMetadata"]["resultCode"] == "GROUP_NOT_FOUND":
+            raise GrouperGroupNotFoundException(group_name, r)
+        else:  # pragma: no cover
+            # We're not sure what exactly has happened here,
+            # So raise the original SuccessException
+            raise err
+    results = r["WsHasMemberResults"]["results"]
+    r_dict = {}
+    for result in results:
+        meta_keys = result["resultMetadata"].keys()
+        if "resultCode2" in meta_keys:
+            if result["resultMetadata"]["resultCode2"] == "SUBJECT_NOT_FOUND":
+                is_member = HasMember.SUBJECT_NOT_FOUND
+                ident = result["wsSubject"]["id"]
+            else:  # pragma: no cover
+                # We're not sure what exactly has happened here,
+                # So raise a SuccessException
+                raise GrouperSuccessException(r)
+        else:
+            if "identifierLookup" in result["wsSubject"]:
+                ident_key = "identifierLookup"
+            elif "id" in result["wsSubject"]:
+                ident_key = "id"
+            else:  # pragma: no cover
+                # We're not sure what exactly has happened here,
+                # So raise a SuccessException
+                raise GrouperSuccessException(r)
+            if result["resultMetadata"]["resultCode"] == "IS_NOT_MEMBER":
+                is_member = HasMember.IS_NOT_MEMBER
+                ident = result["wsSubject"][ident_key]
+            elif result["resultMetadata"]["resultCode"] == "IS_MEMBER":
+                is_member = HasMember.IS_MEMBER
+                ident = result["wsSubject"][ident_key]
+            else:  # pragma: no cover
+                # We're not sure what exactly has happened here,
+                # So raise a SuccessException
+                raise GrouperSuccessException(r)
+        r_dict[ident] = is_member
+    return r_dict
+
+
+async def get_membership_matrix(
+    group_names: list[str],
+    client: AsyncGrouperClient,
+    subject_identifiers: list[str] = [],
+    subject_ids: list[str] = [],
+    member_filter: str = "all",
+    strategy: str = "auto",
+    chunk_size: int = 100,
+    max_concurrency: int = 4,
+    act_as_subject: SubjectBase | None = None,
+) -> MembershipMatrix:
+    """Determine which of the given subjects are members of which of the given groups.
+
+    There are two ways of answering this, chosen with strategy:
+    "memberships" sends memberships requests filtered to both the subjects and
+    the groups, after looking up the ids of any subject identifiers, while
+    "has_members" sends has_members requests for each group. "auto" chooses
+    whichever needs fewer requests, so for example one subject checked against
+    many groups uses a single memberships request, while many subjects checked
+    against one group use has_members. Up to max_concurrency requests are sent
+    to Grouper at the same time.
+
+    :param group_names: Names of groups to check members of
+    :type group_names: list[str]
+    :param client: The AsyncGrouperClient to use
+    :type client: AsyncGrouperClient
+    :param subject_identifiers: Subject identifiers to check for membership,
+    defaults to []
+    :type subject_identifiers: list[str], optional
+    :param subject_ids: Subject ids to check for membership, defaults to []
+    :type subject_ids: list[str], optional
+    :param member_filter: Type of mebership to check (all, immediate, effective),
+    defaults to "all"
+    :type member_filter: str, optional
+    :param strategy: How to get the memberships
+    ("auto", "memberships" or "has_members"), defaults to "auto"
+    :type strategy: str, optional
+    :param chunk_size: The maximum number of subjects, or groups, to send in one
+    API call, defaults to 100
+    :type chunk_size: int, optional
+    :param max_concurrency: The maximum number of API calls to make at the same
+    time, defaults to 4
+    :type max_concurrency: int, optional
+    :param act_as_subject: Optional subject to act as, defaults to None
+    :type act_as_subject: SubjectBase | None, optional
+    :raises ValueError: The strategy is not known, or chunk_size is less than 1
+    :raises GrouperGroupNotFoundException: A group with the given name cannot
+    be found
+    :raises GrouperSuccessException: An otherwise unhandled issue with the result
+    :return: The matrix of memberships, where subjects that cannot be found
+    are not members of any group
+    :rtype: MembershipMatrix
+    """
+    from ..objects.membership import MembershipMatrix, HasMember
+    from .subject import get_subjects
+
+    group_names = list(dict.fromkeys(group_names))
+    subject_identifiers = list(dict.fromkeys(subject_identifiers))
+    subject_ids = list(dict.fromkeys(subject_ids))
+    chunks = subject_lookup_chunks(subject_identifiers, subject_ids, chunk_size)
+    matrix = MembershipMatrix(
+        group_names, [key for chunk in chunks for key, _ in chunk]
+    )
+    if not chunks or not group_names:
+        return matrix
+    strategy = matrix_strategy(
+        strategy, len(group_names), len(subject_identifiers), len(chunks), chunk_size
+    )
+    semaphore = asyncio.Semaphore(max(max_concurrency, 1))
+
+    if strategy == "has_members":
+
+        async def check_chunk(
+            group_name: str, chunk: list[tuple[str, dict[str, str]]]
+        ) -> dict[str, HasMember]:
+            """Check one chunk of subjects against one group.
+
+            :param group_name: The name of the group
+            :type group_name: str
+            :param chunk: The chunk of subject lookups
+            :type chunk: list[tuple[str, dict[str, str]]]
+            :return: The result for each subject in the chunk
+            :rtype: dict[str, HasMember]
+            """
+            async with semaphore:
+                return await has_members(
+                    group_name,
+                    client,
+                    subject_identifiers=[
+                        key for key, lookup in chunk if "subjectIdentifier" in lookup
+                    ],
+                    subject_ids=[
+                        key for key, lookup in chunk if "subjectId" in lookup
+                    ],
+                    member_filter=member_filter,
+                    act_as_subject=act_as_subject,
+                )
+
+        tasks = [(group_name, chunk) for group_name in group_names for chunk in chunks]
+        results = await asyncio.gather(
+            *(check_chunk(group_name, chunk) for group_name, chunk in tasks)
+        )
+        for (group_name, _), result in zip(tasks, results):
+            for key, is_member in result.items():
+                if is_member is HasMember.IS_MEMBER:
+                    matrix._set(group_name, key)
+        return matrix
+
+    keys_by_id: dict[str, list[str]] = {
+        subject_id: [subject_id] for subject_id in subject_ids
+    }
+    if subject_identifiers:
+        found = (
+            await get_subjects(
+                client,
+                subject_identifiers=subject_identifiers,
+                resolve_groups=False,
+                chunk_size=chunk_size,
+                max_concurrency=max_concurrency,
+                act_as_subject=act_as_subject,
+            )
+        ).found
+        for identifier, subject in found.items():
+            keys_by_id.setdefault(subject.id, []).append(identifier)
+    bodies = matrix_memberships_bodies(
+        list(keys_by_id), group_names, member_filter, chunk_size
+    )
+
+    async def get_memberships(body: dict[str, Any]) -> dict[str, Any]:
+        """Send one memberships request to Grouper.
+
+        :param body: The request body
+        :type body: dict[str, Any]
+        :raises GrouperGroupNotFoundException: A group with the given name cannot
+        be found
+        :return: The result returned by Grouper
+        :rtype: dict[str, Any]
+        """
+        async with semaphore:
+            try:
+                return await client._call_grouper(
+                    "/memberships", body, act_as_subject=act_as_subject
+                )
+            except GrouperSuccessException as err:
+                raise_memberships_error(err)
+
+    for r in await asyncio.gather(*(get_memberships(body) for body in bodies)):
+        set_matrix_memberships(matrix, r, keys_by_id)
+    return matrix
+
+
+async def add_members_to_group(
+    group_name: str,
+    client: AsyncGrouperClient,
+    subject_identifiers: list[str] = [],
+    subject_ids: list[str] = [],
+    replace_all_existing: str = "F",
+    act_as_subject: SubjectBase | None = None,
+) -> AsyncGroup:
+    """Add members to a group.
+
+    :param group_name: The group to add members to
+    :type group_name: str
+    :param client: The AsyncGrouperClient to use
+    :type client: AsyncGrouperClient
+    :param subject_identifiers: Subject identifiers of members to add, defaults to []
+    :type subject_identifiers: list[str], optional
+    :param subject_ids: Subject ids of members to add, defaults to []
+    :type subject_ids: list[str], optional
+    :param replace_all_existing: Whether to replace existing membership of group,
+    "T" will replace, "F" will only add members, defaults to "F"
+    :type replace_all_existing: str, optional
+    :param act_as_subject: Optional subject to act as, defaults to None
+    :type act_as_subject: SubjectBase | None, optional
+    :raises GrouperGroupNotFoundException: A group with the given name cannot
+    be found
+    :raises GrouperPermissionDenied: Permission denied to complete the operation
+    :raises GrouperSuccessException: An otherwise unhandled issue with the result
+    :return: A Group object representing the group that members were added to
+    :rtype: AsyncGroup
+    """
+    from ..objects.group import AsyncGroup
+
+    identifiers_to_add = [{"subjectIdentifier": ident} for ident in subject_identifiers]
+    ids_to_add = [{"subjectId": sid} for sid in subject_ids]
+    subjects_to_add = identifiers_to_add + ids_to_add
+    body = {
+        "WsRestAddMemberRequest": {
+            "subjectLookups": subjects_to_add,
+            "wsGroupLookup": {"groupName": group_name},
+            "replaceAllExisting": replace_all_existing,
+            "includeGroupDetail": "T",
+        }
+    }
+    try:
+        r = await client._call_grouper(
+            "/groups",
+            body,
+            act_as_subject=act_as_subject,
+        )
+    except GrouperSuccessException as err:
+        r = err.grouper_result
+        if r["WsAddMemberResults"]["resultMetadata"]["resultCode"] == "GROUP_NOT_FOUND":
+            raise GrouperGroupNotFoundException(group_name, r)
+        elif (
+            r["WsAddMemberResults"]["resultMetadata"]["resultCode"]
+            == "PROBLEM_WITH_ASSIGNMENT"
+            and r["WsAddMemberResults"]["results"][0]["resultMetadata"]["resultCode"]
+            == "INSUFFICIENT_PRIVILEGES"
+        ):
+            raise GrouperPermissionDenied(r)
+        else:  # pragma: no cover
+            # We're not sure what exactly has happened here,
+            # So raise the original SuccessException
+            raise err
+    return client._entity(AsyncGroup, r["WsAddMemberResults"]["wsGroupAssigned"])
+
+
+async def delete_members_from_group(
+    group_name: str,
+    client: AsyncGrouperClient,
+    subject_identifiers: list[str] = [],
+    subject_ids: list[str] = [],
+    act_as_subject: SubjectBase | None = None,
+) -> AsyncGroup:
+    """Remove members from a group.
+
+    :param group_name: The name of the group to remove members from
+    :type group_name: str
+    :param client: The AsyncGrouperClient to use
+    :type client: AsyncGrouperClient
+    :param subject_identifiers: Subject identifiers of members to remove, defaults to []
+    :type subject_identifiers: list[str], optional
+    :param subject_ids: Subject ids of members to remove, defaults to []
+    :type subject_ids: list[str], optional
+    :param act_as_subject: Optional subject to act as, defaults to None
+    :type act_as_subject: SubjectBase | None, optional
+    :raises GrouperGroupNotFoundException: A group with the given name cannot
+    be found
+    :raises GrouperPermissionDenied: Permission denied to complete the operation
+    :raises GrouperSuccessException: An otherwise unhandled issue with the result
+    :return: A Group object representing the group that members were removed from
+    :rtype: AsyncGroup
+    """
+    from ..objects.group import AsyncGroup
+
+    identifiers_to_delete = [
+        {"subjectIdentifier": ident} for ident in subject_identifiers
+    ]
+    ids_to_delete = [{"subjectId": sid} for sid in subject_ids]
+    subjects_to_delete = identifiers_to_delete + ids_to_delete
+    body = {
+        "WsRestDeleteMemberRequest": {
+            "subjectLookups": subjects_to_delete,
+            "wsGroupLookup": {"groupName": group_name},
+            "includeGroupDetail": "T",
+        }
+    }
+    try:
+        r = await client._call_grouper(
+            "/groups",
+            body,
+            act_as_subject=act_as_subject,
+        )
+    except GrouperSuccessException as err:
+        r = err.grouper_result
+        if (
+            r["WsDeleteMemberResults"]["resultMetadata"]["resultCode"]
+            == "GROUP_NOT_FOUND"
+        ):
+            raise GrouperGroupNotFoundException(group_name, r)
+        elif (
+            r["WsDeleteMemberResults"]["resultMetadata"]["resultCode"]
+            == "PROBLEM_DELETING_MEMBERS"
+            and r["WsDeleteMemberResults"]["results"][0]["resultMetadata"]["resultCode"]
+            == "INSUFFICIENT_PRIVILEGES"
+        ):
+            raise GrouperPermissionDenied(r)
+        else:  # pragma: no cover
+            # We're not sure what exactly has happened here,
+            # So raise the original SuccessException
+            raise err
+    return client._entity(AsyncGroup, r["WsDeleteMemberResults"]["wsGroup"])
+
+
+async def bulk_add_members_to_group(
+    group_name: str,
+    client: AsyncGrouperClient,
+    subject_identifiers: list[str] = [],
+    subject_ids: list[str] = [],
+    chunk_size: int = 1000,
+    max_concurrency: int = 4,
+    act_as_subject: SubjectBase | None = None,
+) -> dict[str, MemberChangeResult]:
+    """Add a large number of members to a group, reporting a result per subject.
+
+    The subjects are split into chunks of chunk_size, and up to max_concurrency
+    chunks are sent to Grouper at the same time. Unlike add_members_to_group,
+    a subject that cannot be added does not raise an exception, instead the
+    result for that subject says why it was not added. If a chunk fails as a
+    whole, such as when Grouper cannot be reached, its subjects are given
+    MemberChangeResult.ERROR and the exception is logged.
+
+    :param group_name: The group to add members to
+    :type group_name: str
+    :param client: The AsyncGrouperClient to use
+    :type client: AsyncGrouperClient
+    :param subject_identifiers: Subject identifiers of members to add, defaults to []
+    :type subject_identifiers: list[str], optional
+    :param subject_ids: Subject ids of members to add, defaults to []
+    :type subject_ids: list[str], optional
+    :param chunk_size: The number of subjects to send in each request,
+    defaults to 1000
+    :type chunk_size: int, optional
+    :param max_concurrency: The maximum number of requests to send at the same
+    time, defaults to 4
+    :type max_concurrency: int, optional
+    :param act_as_subject: Optional subject to act as, defaults to None
+    :type act_as_subject: SubjectBase | None, optional
+    :raises GrouperGroupNotFoundException: A group with the given name cannot
+    be found
+    :return: Dict keyed by the given subject identifiers and ids,
+    with the result for each subject
+    :rtype: dict[str, MemberChangeResult]
+    """
+    return await _bulk_change_members(
+        "add",
+        group_name,
+        client,
+        subject_identifiers,
+        subject_ids,
+        chunk_size,
+        max_concurrency,
+        act_as_subject,
+    )
+
+
+async def bulk_delete_members_from_group(
+    group_name: str,
+    client: AsyncGrouperClient,
+    subject_identifiers: list[str] = [],
+    subject_ids: list[str] = [],
+    chunk_size: int = 1000,
+    max_concurrency: int = 4,
+    act_as_subject: SubjectBase | None = None,
+) -> dict[str, MemberChangeResult]:
+    """Remove a large number of members from a group, reporting a result per subject.
+
+    The subjects are split into chunks of chunk_size, and up to max_concurrency
+    chunks are sent to Grouper at the same time. Unlike delete_members_from_group,
+    a subject that cannot be removed does not raise an exception, instead the
+    result for that subject says why it was not removed. If a chunk fails as a
+    whole, such as when Grouper cannot be reached, its subjects are given
+    MemberChangeResult.ERROR and the exception is logged.
+
+    :param group_name: The name of the group to remove members from
+    :type group_name: str
+    :param client: The AsyncGrouperClient to use
+    :type client: AsyncGrouperClient
+    :param subject_identifiers: Subject identifiers of members to remove, defaults to []
+    :type subject_identifiers: list[str], optional
+    :param subject_ids: Subject ids of members to remove, defaults to []
+    :type subject_ids: list[str], optional
+    :param chunk_size: The number of subjects to send in each request,
+    defaults to 1000
+    :type chunk_size: int, optional
+    :param max_concurrency: The maximum number of requests to send at the same
+    time, defaults to 4
+    :type max_concurrency: int, optional
+    :param act_as_subject: Optional subject to act as, defaults to None
+    :type act_as_subject: SubjectBase | None, optional
+    :raises GrouperGroupNotFoundException: A group with the given name cannot
+    be found
+    :return: Dict keyed by the given subject identifiers and ids,
+    with the result for each subject
+    :rtype: dict[str, MemberChangeResult]
+    """
+    return await _bulk_change_members(
+        "delete",
+        group_name,
+        client,
+        subject_identifiers,
+        subject_ids,
+        chunk_size,
+        max_concurrency,
+        act_as_subject,
+    )
+
+
+async def sync_members_of_group(
+    group_name: str,
+    client: AsyncGrouperClient,
+    subject_identifiers: list[str] = [],
+    subject_ids: list[str] = [],
+    chunk_size: int = 1000,
+    max_concurrency: int = 4,
+    allow_empty: bool = False,
+    allow_missing: bool = False,
+    act_as_subject: SubjectBase | None = None,
+) -> dict[str, MemberChangeResult]:
+    """Make the immediate members of a group match the given subjects.
+
+    The current immediate members of the group are retrieved, and only the
+    subjects that are missing are added, and only the members that are not
+    wanted are removed, rather than replacing the whole membership of the group.
+    Subject identifiers are first looked up to get their subject ids, and
+    members are compared by id, so a wanted member is never removed because
+    its identifier is held in another attribute. Identifiers that cannot be
+    found are given as SUBJECT_NOT_FOUND, and are not added.
+    So that a truncated or empty list of subjects cannot empty the group,
+    no members are removed while any identifier cannot be found, unless
+    allow_missing is True, and ValueError is raised if no subjects are wanted
+    at all, unless allow_empty is True.
+
+    :param group_name: The name of the group to sync members of
+    :type group_name: str
+    :param client: The AsyncGrouperClient to use
+    :type client: AsyncGrouperClient
+    :param subject_identifiers: Subject identifiers of the wanted members,
+    defaults to []
+    :type subject_identifiers: list[str], optional
+    :param subject_ids: Subject ids of the wanted members, defaults to []
+    :type subject_ids: list[str], optional
+    :param chunk_size: The number of subjects to send in each add or delete
+    request, defaults to 1000
+    :type chunk_size: int, optional
+    :param max_concurrency: The maximum number of requests to send at the same
+    time, defaults to 4
+    :type max_concurrency: int, optional
+    :param allow_empty: Whether to remove every member when no subjects are
+    wanted, defaults to False
+    :type allow_empty: bool, optional
+    :param allow_missing: Whether to remove members that are not wanted even
+    when some subject identifiers cannot be found, defaults to False
+    :type allow_missing: bool, optional
+    :param act_as_subject: Optional subject to act as, defaults to None
+    :type act_as_subject: SubjectBase | None, optional
+    :raises ValueError: No subjects are wanted, and allow_empty is False
+    :raises GrouperGroupNotFoundException: A group with the given name cannot
+    be found
+    :raises GrouperSuccessException: An otherwise unhandled issue with the result
+    :return: Dict with the result for each subject that was added or removed,
+    keyed by the given subject identifier or id for added subjects,
+    and by subject id for removed members. Members that were already correct
+    are not included.
+    :rtype: dict[str, MemberChangeResult]
+    """
+    from ..objects.membership import MemberChangeResult
+    from .subject import get_subjects
+
+    current = await get_members_for_groups(
+        group_names=[group_name],
+        client=client,
+        member_filter="immediate",
+        resolve_groups=False,
+        act_as_subject=act_as_subject,
+    )
+    found_ids: dict[str, str] = {}
+    if subject_identifiers:
+        lookup = await get_subjects(
+            client,
+            subject_identifiers=subject_identifiers,
+            resolve_groups=False,
+            chunk_size=chunk_size,
+            max_concurrency=max_concurrency,
+            act_as_subject=act_as_subject,
+        )
+        found_ids = {ident: subject.id for ident, subject in lookup.found.items()}
+    identifiers_to_add, ids_to_add, ids_to_delete, id_for_key = sync_changes(
+        [member.id for group_members in current.values() for member in group_members],
+        subject_identifiers,
+        subject_ids,
+        found_ids,
+        allow_empty,
+        allow_missing,
+    )
+
+    results = await bulk_add_members_to_group(
+        group_name=group_name,
+        client=client,
+        subject_identifiers=identifiers_to_add,
+        subject_ids=ids_to_add,
+        chunk_size=chunk_size,
+        max_concurrency=max_concurrency,
+        act_as_subject=act_as_subject,
+    )
+    # Never remove a member that was just added or found to be a member already
+    kept = {
+        id_for_key[key]
+        for key, result in results.items()
+        if result in (MemberChangeResult.ADDED, MemberChangeResult.ALREADY_MEMBER)
+    }
+    results.update(
+        await bulk_delete_members_from_group(
+            group_name=group_name,
+            client=client,
+            subject_ids=[sid for sid in ids_to_delete if sid not in kept],
+            chunk_size=chunk_size,
+            max_concurrency=max_concurrency,
+            act_as_subject=act_as_subject,
+        )
+    )
+    results.update(
+        dict.fromkeys(
+            (ident for ident in subject_identifiers if ident not in found_ids),
+            MemberChangeResult.SUBJECT_NOT_FOUND,
+        )
+    )
+    return results
+
+
+async def _bulk_change_members(
+    action: str,
+    group_name: str,
+    client: AsyncGrouperClient,
+    subject_identifiers: list[str],
+    subject_ids: list[str],
+    chunk_size: int,
+    max_concurrency: int,
+    act_as_subject: SubjectBase | None,
+) -> dict[str, MemberChangeResult]:
+    """Add or delete members in chunks, limiting how many chunks are in flight.
+
+    :param action: "add" or "delete"
+    :type action: str
+    :param group_name: The name of the group to change members of
+    :type group_name: str
+    :param client: The AsyncGrouperClient to use
+    :type client: AsyncGrouperClient
+    :param subject_identifiers: Subject identifiers of members to change
+    :type subject_identifiers: list[str]
+    :param subject_ids: Subject ids of members to change
+    :type subject_ids: list[str]
+    :param chunk_size: The number of subjects to send in each request
+    :type chunk_size: int
+    :param max_concurrency: The maximum number of requests to send at the same time
+    :type max_concurrency: int
+    :param act_as_subject: Optional subject to act as
+    :type act_as_subject: SubjectBase | None
+    :return: Dict keyed by the given subject identifiers and ids,
+    with the result for each subject
+    :rtype: dict[str, MemberChangeResult]
+    """
+    chunks = subject_lookup_chunks(subject_identifiers, subject_ids, chunk_size)
+    semaphore = asyncio.Semaphore(max(max_concurrency, 1))
+
+    async def change_chunk(
+        chunk: list[tuple[str, dict[str, str]]]
+    ) -> dict[str, MemberChangeResult]:
+        """Send one chunk to Grouper.
+
+        :param chunk: The chunk of subject lookups
+        :type chunk: list[tuple[str, dict[str, str]]]
+        :return: The result for each subject in the chunk
+        :rtype: dict[str, MemberChangeResult]
+        """
+        body = bulk_member_body(action, group_name, chunk)
+        async with semaphore:
+            try:
+                r = await client._call_grouper(
+                    "/groups", body, act_as_subject=act_as_subject
+                )
+            except GrouperSuccessException as err:
+                error_result = bulk_member_error_result(action, group_name, err)
+                if error_result is None:
+                    return bulk_member_chunk_failed(chunk, err)
+                r = error_result
+            except Exception as err:
+                return bulk_member_chunk_failed(chunk, err)
+        return bulk_member_results(action, chunk, r)
+
+    # Wait for every chunk before raising, so no chunk is left running
+    # unobserved if one of them raises
+    chunk_results = await asyncio.gather(
+        *(change_chunk(chunk) for chunk in chunks), return_exceptions=True
+    )
+    results: dict[str, MemberChangeResult] = {}
+    for chunk_result in chunk_results:
+        if isinstance(chunk_result, BaseException):
+            raise chunk_result
+        results.update(chunk_result)
+    return results
+
+
+async def get_members_for_groups(
+    group_names: list[str],
+    client: AsyncGrouperClient,
+    attributes: list[str] = [],
+    member_filter: str = "all",
+    resolve_groups: bool = True,
+    act_as_subject: SubjectBase | None = None,
+) -> dict[AsyncGroup, list[AsyncSubject]]:
+    """Get members for the given groups.
+
+    :param group_names: Group names to retreive members for
+    :type group_names: list[str]
+    :param client: The AsyncGrouperClient to use
+    :type client: AsyncGrouperClient
+    :param attributes: Additional attributes to retrieve for the Subjects,
+    defaults to []
+    :type attributes: list[str], optional
+    :param member_filter: Type of mebership to return (all, immediate, effective),
+    defaults to "all"
+    :type member_filter: str, optional
+    :param resolve_groups: Whether to resolve subjects that are groups into Group
+    objects, which will require additional API calls, defaults to True
+    :type resolve_groups: bool, optional
+    :param act_as_subject: Optional subject to act as, defaults to None
+    :type act_as_subject: SubjectBase | None, optional
+    :raises GrouperGroupNotFoundException: A group with the given name cannot
+    be found
+    :raises GrouperSuccessException: An otherwise unhandled issue with the result
+    :return: A dictionary with Groups as the keys
+    and those groups' member list as the value
+    :rtype: dict[AsyncGroup, list[AsyncSubject]]
+    """
+    from ..objects.group import AsyncGroup
+
+    r = await _get_members_results(
+        group_names=group_names,
+        client=client,
+        attributes=attributes,
+        member_filter=member_filter,
+        act_as_subject=act_as_subject,
+    )
+    r_dict: dict[AsyncGroup, list[AsyncSubject]] = {}
+    subject_attr_names = r["WsGetMembersResults"]["subjectAttributeNames"]
+    results = r["WsGetMembersResults"]["results"]
+    for result in results:
+        if result["resultMetadata"]["success"] != "T":  # pragma: no cover
+            # we don't know what's going on,
+            # so raise a SuccessException
+            raise GrouperSuccessException(r)
+    # Resolve the members of every group together, so subjects that are
+    # groups can be looked up in as few calls as possible
+    member_bodies = [
+        subject for result in results for subject in result.get("wsSubjects", [])
+    ]
+    members = iter(
+        await resolve_subjects(
+            subject_bodies=member_bodies,
+            client=client,
+            subject_attr_names=subject_attr_names,
+            resolve_groups=resolve_groups,
+        )
+    )
+    for result in results:
+        key = client._entity(AsyncGroup, result["wsGroup"])
+        r_dict[key] = [next(members) for _ in result.get("wsSubjects", [])]
+    return r_dict
+
+
+async def _get_members_results(
+    group_names: list[str],
+    client: AsyncGrouperClient,
+    attributes: list[str],
+    member_filter: str,
+    act_as_subject: SubjectBase | None,
+    paging: dict[str, str] = {},
+) -> dict[str, Any]:
+    """Call Grouper to get members for the given groups, and check the result.
+
+    :param group_names: Group names to retreive members for
+    :type group_names: list[str]
+    :param client: The AsyncGrouperClient to use
+    :type client: AsyncGrouperClient
+    :param attributes: Additional attributes to retrieve for the Subjects
+    :type attributes: list[str]
+    :param member_filter: Type of mebership to return (all, immediate, effective)
+    :type member_filter: str
+    :param act_as_subject: Optional subject to act as
+    :type act_as_subject: SubjectBase | None
+    :param paging: Paging parameters to add to the request, defaults to {}
+    :type paging: dict[str, str], optional
+    :raises GrouperGroupNotFoundException: A group with the given name cannot
+    be found
+    :raises GrouperSuccessException: An otherwise unhandled issue with the result
+    :return: the full payload returned from Grouper
+    :rtype: dict[str, Any]
+    """
+    group_lookup = [{"groupName": group} for group in group_names]
+    body = {
+        "WsRestGetMembersRequest": {
+            "subjectAttributeNames": attributes,
+            "wsGroupLookups": group_lookup,
+            "memberFilter": member_filter,
+            "includeSubjectDetail": "T",
+            **paging,
+        }
+    }
+    try:
+        r = await client._call_grouper(
+            "/groups",
+            body,
+            act_as_subject=act_as_subject,
+        )
+    except GrouperSuccessException as err:
+        r = err.grouper_result
+        for result in r["WsGetMembersResults"]["results"]:
+            meta = result["resultMetadata"]
+            if meta["success"] == "F":
+                if meta["resultCode"] == "GROUP_NOT_FOUND":
+                    try:
+                        result_message = meta["resultMessage"]
+                        split_message = result_message.split(",")
+                        group_name = split_message[2].split("=")[1]
+                    except Exception:  # pragma: no cover
+                        # The try above feels fragile, so if it fails,
+                        # throw the original SuccessException
+                        raise err
+                    raise GrouperGroupNotFoundException(group_name, r)
+                else:  # pragma: no cover
+                    # We're not sure what exactly has happened here,
+                    # So raise the original SuccessException
+                    raise err
+            else:
+                pass
+        # If we've gotten here, we don't know what's going on,
+        # So raise the original SuccessException
+        raise err  # pragma: no cover
+    return r
+
+
+async def iter_members_for_group(
+    group_name: str,
+    client: AsyncGrouperClient,
+    attributes: list[str] = [],
+    member_filter: str = "all",
+    resolve_groups: bool = True,
+    page_size: int = 1000,
+    cursor: bool = False,
+    act_as_subject: SubjectBase | None = None,
+) -> AsyncIterator[AsyncSubject]:
+    """Iterate over the members of the given group, one page at a time.
+
+    Only one page of members is requested and held at a time, so this can be
+    used for very large groups, and iteration can be stopped at any point
+    without fetching the remaining pages.
+
+    :param group_name: Name of the group to retreive members for
+    :type group_name: str
+    :param client: The AsyncGrouperClient to use
+    :type client: AsyncGrouperClient
+    :param attributes: Additional attributes to retrieve for the Subjects,
+    defaults to []
+    :type attributes: list[str], optional
+    :param member_filter: Type of mebership to return (all, immediate, effective),
+    defaults to "all"
+    :type member_filter: str, optional
+    :param resolve_groups: Whether to resolve subjects that are groups into AsyncGroup
+    objects, which will require additional API calls, defaults to True
+    :type resolve_groups: bool, optional
+    :param page_size: The number of members to request per page, defaults to 1000
+    :type page_size: int, optional
+    :param cursor: Whether to use cursor paging (continuing after the id of the
+    last member retrieved) rather than page numbers, defaults to False.
+    Cursor paging avoids the cost of deep page offsets on very large groups.
+    :type cursor: bool, optional
+    :param act_as_subject: Optional subject to act as, defaults to None
+    :type act_as_subject: SubjectBase | None, optional
+    :raises GrouperGroupNotFoundException: A group with the given name cannot
+    be found
+    :raises GrouperSuccessException: An otherwise unhandled issue with the result
+    :return: An iterator over the members of the group
+    :rtype: AsyncIterator[AsyncSubject]
+    """
+    paging = {
+        "pageSize": str(page_size),
+        "sortString": "subjectId",
+        "ascending": "T",
+    }
+    if cursor:
+        paging["pageIsCursor"] = "T"
+        paging["pageLastCursorFieldType"] = "string"
+        paging["pageCursorFieldIncludesLastRetrieved"] = "F"
+    else:
+        paging["pageNumber"] = "1"
+    while True:
+        r = await _get_members_results(
+            group_names=[group_name],
+            client=client,
+            attributes=attributes,
+            member_filter=member_filter,
+            act_as_subject=act_as_subject,
+            paging=paging,
+        )
+        result = r["WsGetMembersResults"]["results"][0]
+        if result["resultMetadata"]["success"] != "T":  # pragma: no cover
+            # we don't know what's going on,
+            # so raise a SuccessException
+            raise GrouperSuccessException(r)
+        page = result.get("wsSubjects", [])
+        # Grouper may answer with fewer members than page_size asks for,
+        # when its maximum page size is smaller, so only an empty page
+        # (or a cursor that does not move on) means there are no more members.
+        # Check before yielding, as a page that does not move the cursor on
+        # repeats members that were already yielded.
+        if not page:
+            return
+        if cursor and paging.get("pageLastCursorField") == page[-1]["id"]:
+            return
+        for member in await resolve_subjects(
+            subject_bodies=page,
+            client=client,
+            subject_attr_names=r["WsGetMembersResults"]["subjectAttributeNames"],
+            resolve_groups=resolve_groups,
+        ):
+            yield member
+        if cursor:
+            paging["pageLastCursorField"] = page[-1]["id"]
+        else:
+            paging["pageNumber"] = str(int(paging["pageNumber"]) + 1)
@@ -0,0 +1,321 @@
+"""grouper-python.aio.subject - async functions to interact with subject objects.
+
+These are the asyncio versions of the helper functions in grouper_python.subject.
+Most likely they will not be called directly. Instead, an AsyncGrouperClient
+should be created, then from there use that AsyncGrouperClient's methods to find
+and create objects, and use those objects' awaitable methods.
+These helper functions can be called directly if needed.
+"""
+
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:  # pragma: no cover
+    from ..objects.group import AsyncGroup
+    from ..objects.client import AsyncGrouperClient
+    from ..objects.subject import AsyncSubject, SubjectBase
+    from ..objects.lookup import LookupResult
+from ..objects.exceptions import GrouperSubjectNotFoundException
+from ..util import subject_lookup_chunks
+from ..subject import (
+    get_subjects_body,
+    found_subjects,
+    groups_for_subjects_body,
+    groups_by_subject,
+)
+from .util import resolve_subject, resolve_subjects
+import asyncio
+
+
+async def get_groups_for_subject(
+    subject_id: str,
+    client: AsyncGrouperClient,
+    stem: str | None = None,
+    substems: bool = True,
+    act_as_subject: SubjectBase | None = None,
+) -> list[AsyncGroup]:
+    """Get groups the given subject is a member of.
+
+    :param subject_id: Subject id of subject to get groups
+    :type subject_id: str
+    :param client: The AsyncGrouperClient to use
+    :type client: AsyncGrouperClient
+    :param stem: Optional stem to limit the search to, defaults to None
+    :type stem: str | None, optional
+    :param substems: Whether to look recursively through substems
+    of the given stem (True), or only one level in the given stem (False),
+    defaults to True
+    :type substems: bool, optional
+    :param act_as_subject: Optional subject to act as, defaults to None
+    :type act_as_subject: SubjectBase | None, optional
+    :return: List of found groups, will be an empty list if no groups are found
+    :rtype: list[AsyncGroup]
+    """
+    from ..objects.group import AsyncGroup
+
+    body = groups_for_subjects_body([subject_id], stem, substems)
+    r = await client._call_grouper(
+        "/memberships",
+        body,
+        act_as_subject=act_as_subject,
+    )
+    if "wsGroups" in r["WsGetMembershipsResults"]:
+        return [
+            client._entity(AsyncGroup, grp)
+            for grp in r["WsGetMembershipsResults"]["wsGroups"]
+        ]
+    else:
+        return []
+
+
+async def get_groups_for_subjects(
+    subject_ids: list[str],
+    client: AsyncGrouperClient,
+    stem: str | None = None,
+    substems: bool = True,
+    chunk_size: int = 100,
+    max_concurrency: int = 4,
+    act_as_subject: SubjectBase | None = None,
+) -> dict[str, list[AsyncGroup]]:
+    """Get the groups that each of the given subjects is a member of.
+
+    The subjects are sent in chunks of chunk_size, with one API call per chunk,
+    and up to max_concurrency chunks are sent to Grouper at the same time.
+    A group that several subjects are members of is the same AsyncGroup object
+    in each of their lists.
+
+    :param subject_ids: Subject ids of subjects to get groups
+    :type subject_ids: list[str]
+    :param client: The AsyncGrouperClient to use
+    :type client: AsyncGrouperClient
+    :param stem: Optional stem to limit the search to, defaults to None
+    :type stem: str | None, optional
+    :param substems: Whether to look recursively through substems
+    of the given stem (True), or only one level in the given stem (False),
+    defaults to True
+    :type substems: bool, optional
+    :param chunk_size: The maximum number of subjects to send in one API call,
+    defaults to 100
+    :type chunk_size: int, optional
+    :param max_concurrency: The maximum number of API calls to make at the same
+    time, defaults to 4
+    :type max_concurrency: int, optional
+    :param act_as_subject: Optional subject to act as, defaults to None
+    :type act_as_subject: SubjectBase | None, optional
+    :raises ValueError: chunk_size is less than 1
+    :return: Dict keyed by the given subject ids, with the list of groups
+    each subject is a member of, which will be empty if it is in no groups
+    :rtype: dict[str, list[AsyncGroup]]
+    """
+    from ..objects.group import AsyncGroup
+
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    unique_ids = list(dict.fromkeys(subject_ids))
+    semaphore = asyncio.Semaphore(max(max_concurrency, 1))
+
+    async def get_chunk(chunk: list[str]) -> dict[str, Any]:
+        """Send one chunk to Grouper.
+
+        :param chunk: The chunk of subject ids
+        :type chunk: list[str]
+        :return: The result returned by Grouper
+        :rtype: dict[str, Any]
+        """
+        async with semaphore:
+            return await client._call_grouper(
+                "/memberships",
+                groups_for_subjects_body(chunk, stem, substems),
+                act_as_subject=act_as_subject,
+            )
+
+    results = await asyncio.gather(
+        *(
+            get_chunk(unique_ids[i:i + chunk_size])
+            for i in range(0, len(unique_ids), chunk_size)
+        )
+    )
+    return groups_by_subject(
+        unique_ids,
+        list(results),
+        lambda group_body: client._entity(AsyncGroup, group_body),
+    )
+
+
+async def get_subject_by_identifier(
+    subject_identifier: str,
+    client: AsyncGrouperClient,
+    resolve_group: bool = True,
+    attributes: list[str] = [],
+    act_as_subject: SubjectBase | None = None,
+) -> AsyncSubject:
+    """Get the subject with the given identifier.
+
+    :param subject_identifier: Identifier of subject to get
+    :type subject_identifier: str
+    :param client: The AsyncGrouperClient to use
+    :type client: AsyncGrouperClient
+    :param resolve_group: Whether to resolve subject that is a group into a Group
+    object, which will require an additional API for each found group,
+    defaults to True
+    :type resolve_group: bool, optional
+    :param attributes: Additional attributes to return for the Subject,
+    defaults to []
+    :type attributes: list[str], optional
+    :param act_as_subject:  Optional subject to act as, defaults to None
+    :type act_as_subject: SubjectBase | None, optional
+    :raises GrouperSubjectNotFoundException: A subject cannot be found
+    with the given identifier
+    :raises GrouperSuccessException: An otherwise unhandled issue with the result
+    :return: The subject with the given name
+    :rtype: AsyncSubject
+    """
+    attribute_set = set(attributes + [client.universal_identifier_attr, "name"])
+    body = {
+        "WsRestGetSubjectsRequest": {
+            "wsSubjectLookups": [{"subjectIdentifier": subject_identifier}],
+            "includeSubjectDetail": "T",
+            "subjectAttributeNames": [*attribute_set],
+        }
+    }
+    r = await client._call_grouper("/subjects", body, act_as_subject=act_as_subject)
+    subject = r["WsGetSubjectsResults"]["wsSubjects"][0]
+    if subject["success"] == "F":
+        raise GrouperSubjectNotFoundException(subject_identifier, r)
+    return await resolve_subject(
+        subject_body=subject,
+        client=client,
+        subject_attr_names=r["WsGetSubjectsResults"]["subjectAttributeNames"],
+        resolve_group=resolve_group,
+    )
+
+
+async def get_subjects(
+    client: AsyncGrouperClient,
+    subject_identifiers: list[str] = [],
+    subject_ids: list[str] = [],
+    resolve_groups: bool = True,
+    attributes: list[str] = [],
+    chunk_size: int = 1000,
+    max_concurrency: int = 4,
+    act_as_subject: SubjectBase | None = None,
+) -> LookupResult[AsyncSubject]:
+    """Get many subjects by identifier or id, using as few API calls as possible.
+
+    The subjects are looked up in chunks of chunk_size, with one API call per
+    chunk, and up to max_concurrency chunks are sent to Grouper at the same time.
+    Subjects that are groups are then resolved together, rather than with one
+    API call per group. Subjects that cannot be found do not raise an exception,
+    but are listed in the missing identifiers and ids of the result.
+
+    :param client: The AsyncGrouperClient to use
+    :type client: AsyncGrouperClient
+    :param subject_identifiers: Identifiers of subjects to get, defaults to []
+    :type subject_identifiers: list[str], optional
+    :param subject_ids: Ids of subjects to get, defaults to []
+    :type subject_ids: list[str], optional
+    :param resolve_groups: Whether to resolve subjects that are groups into
+    AsyncGroup objects, which will require additional API calls, defaults to True
+    :type resolve_groups: bool, optional
+    :param attributes: Additional attributes to return for the Subjects,
+    defaults to []
+    :type attributes: list[str], optional
+    :param chunk_size: The maximum number of subjects to look up in one API call,
+    defaults to 1000
+    :type chunk_size: int, optional
+    :param max_concurrency: The maximum number of API calls to make at the same
+    time, defaults to 4
+    :type max_concurrency: int, optional
+    :param act_as_subject: Optional subject to act as, defaults to None
+    :type act_as_subject: SubjectBase | None, optional
+    :raises GrouperSuccessException: An otherwise unhandled issue with the result
+    :return: The subjects found keyed by the given identifier or id,
+    and the identifiers and ids not found
+    :rtype: LookupResult[AsyncSubject]
+    """
+    from ..objects.lookup import LookupResult
+
+    chunks = subject_lookup_chunks(
+        list(dict.fromkeys(subject_identifiers)),
+        list(dict.fromkeys(subject_ids)),
+        chunk_size,
+    )
+    if not chunks:
+        return LookupResult(found={}, missing=[])
+    attribute_names = [
+        *set(attributes + [client.universal_identifier_attr, "name"])
+    ]
+    semaphore = asyncio.Semaphore(max(max_concurrency, 1))
+
+    async def get_chunk(chunk: list[tuple[str, dict[str, str]]]) -> dict[str, Any]:
+        """Send one chunk to Grouper.
+
+        :param chunk: The chunk of subject lookups
+        :type chunk: list[tuple[str, dict[str, str]]]
+        :return: The result returned by Grouper
+        :rtype: dict[str, Any]
+        """
+        async with semaphore:
+            return await client._call_grouper(
+                "/subjects",
+                get_subjects_body(chunk, attribute_names),
+                act_as_subject=act_as_subject,
+            )
+
+    results = await asyncio.gather(*(get_chunk(chunk) for chunk in chunks))
+    keys, subject_bodies, subject_attr_names, missing = found_subjects(
+        chunks, list(results)
+    )
+    subjects = await resolve_subjects(
+        subject_bodies=subject_bodies,
+        client=client,
+        subject_attr_names=subject_attr_names,
+        resolve_groups=resolve_groups,
+    )
+    return LookupResult(found=dict(zip(keys, subjects)), missing=missing)
+
+
+async def find_subjects(
+    search_string: str,
+    client: AsyncGrouperClient,
+    resolve_groups: bool = True,
+    attributes: list[str] = [],
+    act_as_subject: SubjectBase | None = None,
+) -> list[AsyncSubject]:
+    """Find subjects with the given search string.
+
+    :param search_string: Free-form string tos earch for
+    :type search_string: str
+    :param client: The AsyncGrouperClient to use
+    :type client: AsyncGrouperClient
+    :param resolve_groups: Whether to resolve subjects that are groups into Group
+    objects, which will require additional API calls, defaults to True
+    :type resolve_groups: bool, optional
+    :param attributes: Additional attributes to return for the Subject,
+    defaults to []
+    :type attributes: list[str], optional
+    :param act_as_subject: Optional subject to act as, defaults to None
+    :type act_as_subject: SubjectBase | None, optional
+    :raises GrouperSuccessException: An otherwise unhandled issue with the result
+    :return: List of found Subjects, will be an empty list if no subjects are found
+    :rtype: list[AsyncSubject]
+    """
+    attribute_set = set(attributes + [client.universal_identifier_attr, "name"])
+    body = {
+        "WsRestGetSubjectsRequest": {
+            "searchString": search_string,
+            "includeSubjectDetail": "T",
+            "subjectAttributeNames": [*attribute_set],
+        }
+    }
+    r = await client._call_grouper("/subjects", body, act_as_subject=act_as_subject)
+    if "wsSubjects" in r["WsGetSubjectsResults"]:
+        subject_attr_names = r["WsGetSubjectsResults"]["subjectAttributeNames"]
+        return await resolve_subjects(
+            subject_bodies=r["WsGetSubjectsResults"]["wsSubjects"],
+            client=client,
+            subject_attr_names=subject_attr_names,
+            resolve_groups=resolve_groups,
+        )
+    else:
+        return []
@@ -0,0 +1,392 @@
+"""grouper-python.aio.util - async utility functions for interacting with Grouper.
+
+These are the asyncio versions of the helper functions in grouper_python.util.
+Most likely they will not be called directly. Instead, an AsyncGrouperClient
+should be created, then from there use that AsyncGrouperClient's methods to find
+and create objects, and use those objects' awaitable methods.
+These helper functions can be called directly if needed.
+"""
+
+from __future__ import annotations
+from typing import Any, TYPE_CHECKING
+import asyncio
+import time
+
+if TYPE_CHECKING:  # pragma: no cover
+    from ..objects.client import AsyncGrouperClient
+    from ..objects.codec import JSONCodec
+    from ..objects.retry import RetryPolicy, CircuitBreaker
+    from collections.abc import AsyncIterator, Callable
+    from ..objects.group import AsyncGroup
+    from ..objects.subject import AsyncSubject
+import httpx
+from ..objects.exceptions import (
+    GrouperAuthException,
+    GrouperCircuitOpenException,
+    GrouperSuccessException,
+)
+from ..objects.stats import CallEvent
+from .. import tracing
+from ..util import prepare_body, process_result, send_event, StreamedResult
+from .group import get_group_by_name, get_groups_by_names
+
+
+async def call_grouper(
+    client: httpx.AsyncClient,
+    path: str,
+    body: dict[str, Any],
+    method: str = "POST",
+    act_as_subject_id: str | None = None,
+    act_as_subject_identifier: str | None = None,
+    codec: JSONCodec | None = None,
+    retry: RetryPolicy | None = None,
+    circuit_breaker: CircuitBreaker | None = None,
+    on_event: Callable[[CallEvent], None] | None = None,
+) -> dict[str, Any]:
+    """Call the Grouper API.
+
+    :param client: httpx AsyncClient object to use
+    :type client: httpx.AsyncClient
+    :param path: API url suffix to call
+    :type path: str
+    :param body: body to be sent with API call
+    :type body: dict[str, Any]
+    :param method: HTTP method, defaults to "POST"
+    :type method: str, optional
+    :param act_as_subject_id: Optional subject id to act as,
+    cannot be specified if act_as_subject_identifer is specified,
+    defaults to None
+    :type act_as_subject_id: str | None, optional
+    :param act_as_subject_identifier: Optional subject identifier to act as,
+    cannot be specified if act_as_subject_id is specified
+    defaults to None
+    :type act_as_subject_identifier: str | None, optional
+    :param codec: Optional JSONCodec to encode the body and decode the result,
+    defaults to None (use httpx's JSON handling)
+    :type codec: JSONCodec | None, optional
+    :param retry: Optional RetryPolicy for retrying transient failures,
+    defaults to None (make a single attempt)
+    :type retry: RetryPolicy | None, optional
+    :param circuit_breaker: Optional CircuitBreaker to fail fast while Grouper
+    is unavailable, defaults to None
+    :type circuit_breaker: CircuitBreaker | None, optional
+    :param on_event: Optional function to call with a CallEvent describing
+    the call once it finishes, whether or not it succeeded. An exception it
+    raises is logged rather than raised. Defaults to None
+    :type on_event: Callable[[CallEvent], None] | None, optional
+    :raises ValueError: Both act_as_subject_id and act_as_subject_identifier
+    were specified, or the result is not valid JSON.
+    :raises GrouperCircuitOpenException: The circuit breaker is open
+    :raises httpx.TransportError: Grouper could not be reached,
+    and the call was not retried or ran out of attempts
+    :raises GrouperAuthException: There is an issue authenticating to the Grouper API
+    :raises GrouperSuccessException: The result was not "succesful"
+    :return: the full payload returned from Grouper
+    :rtype: dict[str, Any]
+    """
+    body = prepare_body(body, act_as_subject_id, act_as_subject_identifier)
+    event = CallEvent(request_type=next(iter(body), ""), path=path, method=method)
+    content = codec.dumps(body) if codec is not None else None
+    try:
+        while True:
+            event.attempts += 1
+            if circuit_breaker is not None:
+                try:
+                    circuit_breaker.before_call()
+                except GrouperCircuitOpenException as err:
+                    event.error = err
+                    raise
+            started = time.perf_counter()
+            try:
+                if content is None:
+                    result = await client.request(method=method, url=path, json=body)
+                else:
+                    result = await client.request(
+                        method=method, url=path, content=content
+                    )
+            except httpx.TransportError as err:
+                event.network_seconds += time.perf_counter() - started
+                if circuit_breaker is not None:
+                    circuit_breaker.record_failure()
+                delay = (
+                    retry.retry_delay(event.attempts, body, error=err)
+                    if retry
+                    else None
+                )
+                if delay is None:
+                    event.error = err
+                    raise
+                await asyncio.sleep(delay)
+                continue
+            event.network_seconds += time.perf_counter() - started
+            event.status_code = result.status_code
+            event.request_bytes += len(result.request.content)
+            event.response_bytes += len(result.content)
+            if circuit_breaker is not None:
+                circuit_breaker.record_response(result)
+            delay = (
+                retry.retry_delay(event.attempts, body, response=result)
+                if retry
+                else None
+            )
+            if delay is None:
+                try:
+                    return process_result(result, codec, event)
+                except (
+                    GrouperAuthException,
+                    GrouperSuccessException,
+                    ValueError,
+                ) as err:
+                    event.error = err
+                    raise
+            await asyncio.sleep(delay)
+    finally:
+        if on_event is not None:
+            send_event(on_event, event)
+
+
+async def stream_grouper(
+    client: httpx.AsyncClient,
+    path: str,
+    body: dict[str, Any],
+    stream_paths: list[tuple[str, ...]],
+    method: str = "POST",
+    act_as_subject_id: str | None = None,
+    act_as_subject_identifier: str | None = None,
+    codec: JSONCodec | None = None,
+    retry: RetryPolicy | None = None,
+    circuit_breaker: CircuitBreaker | None = None,
+    on_event: Callable[[CallEvent], None] | None = None,
+) -> AsyncIterator[list[tuple[tuple[str, ...], Any]]]:
+    """Call the Grouper API, and parse the result as it downloads.
+
+    Works like call_grouper, but rather than returning the full payload,
+    gives the parts of it that have been parsed after each chunk of the result
+    is received, as (path, value) pairs from a JSONStreamParser.
+    The items of the arrays at stream_paths are given one at a time,
+    so the full payload is never held in memory.
+    Nothing is given until the resultMetadata of the result shows it was
+    succesful. Retries are only made before any of the result is given.
+
+    :param client: httpx AsyncClient object to use
+    :type client: httpx.AsyncClient
+    :param path: API url suffix to call
+    :type path: str
+    :param body: body to be sent with API call
+    :type body: dict[str, Any]
+    :param stream_paths: Paths of the arrays in the result to give the items
+    of one at a time, such as ("WsGetMembershipsResults", "wsSubjects")
+    :type stream_paths: list[tuple[str, ...]]
+    :param method: HTTP method, defaults to "POST"
+    :type method: str, optional
+    :param act_as_subject_id: Optional subject id to act as,
+    cannot be specified if act_as_subject_identifer is specified,
+    defaults to None
+    :type act_as_subject_id: str | None, optional
+    :param act_as_subject_identifier: Optional subject identifier to act as,
+    cannot be specified if act_as_subject_id is specified
+    defaults to None
+    :type act_as_subject_identifier: str | None, optional
+    :param codec: Optional JSONCodec to encode the body and decode
+    an unsuccesful result, defaults to None (use the standard library)
+    :type codec: JSONCodec | None, optional
+    :param retry: Optional RetryPolicy for retrying transient failures,
+    defaults to None (make a single attempt)
+    :type retry: RetryPolicy | None, optional
+    :param circuit_breaker: Optional CircuitBreaker to fail fast while Grouper
+    is unavailable, defaults to None
+    :type circuit_breaker: CircuitBreaker | None, optional
+    :param on_event: Optional function to call with a CallEvent describing
+    the call once it finishes, whether or not it succeeded. An exception it
+    raises is logged rather than raised. Defaults to None
+    :type on_event: Callable[[CallEvent], None] | None, optional
+    :raises ValueError: Both act_as_subject_id and act_as_subject_identifier
+    were specified, or the result is not valid JSON.
+    :raises GrouperCircuitOpenException: The circuit breaker is open
+    :raises httpx.TransportError: Grouper could not be reached,
+    and the call was not retried or ran out of attempts,
+    or the connection failed while receiving the result
+    :raises GrouperAuthException: There is an issue authenticating to the Grouper API
+    :raises GrouperSuccessException: The result was not "succesful"
+    :return: An iterator over lists of the (path, value) pairs
+    parsed from each chunk of the result
+    :rtype: AsyncIterator[list[tuple[tuple[str, ...], Any]]]
+    """
+    body = prepare_body(body, act_as_subject_id, act_as_subject_identifier)
+    event = CallEvent(request_type=next(iter(body), ""), path=path, method=method)
+    request = client.build_request(
+        method=method,
+        url=path,
+        **({"json": body} if codec is None else {"content": codec.dumps(body)}),
+    )
+    try:
+        while True:
+            event.attempts += 1
+            if circuit_breaker is not None:
+                try:
+                    circuit_breaker.before_call()
+                except GrouperCircuitOpenException as err:
+                    event.error = err
+                    raise
+            started = time.perf_counter()
+            try:
+                result = await client.send(request, stream=True)
+            except httpx.TransportError as err:
+                event.network_seconds += time.perf_counter() - started
+                if circuit_breaker is not None:
+                    circuit_breaker.record_failure()
+                delay = (
+                    retry.retry_delay(event.attempts, body, error=err)
+                    if retry
+                    else None
+                )
+                if delay is None:
+                    event.error = err
+                    raise
+                await asyncio.sleep(delay)
+                continue
+            event.network_seconds += time.perf_counter() - started
+            event.status_code = result.status_code
+            event.request_bytes += len(request.content)
+            if circuit_breaker is not None:
+                circuit_breaker.record_response(result)
+            delay = (
+                retry.retry_delay(event.attempts, body, response=result)
+                if retry
+                else None
+            )
+            if delay is None:
+                break
+            await result.aclose()
+            await asyncio.sleep(delay)
+        streamed = StreamedResult(result, stream_paths, codec, event)
+        try:
+            chunks = result.aiter_bytes()
+            while True:
+                started = time.perf_counter()
+                try:
+                    chunk = await anext(chunks, None)
+                finally:
+                    event.network_seconds += time.perf_counter() - started
+                if chunk is None:
+                    break
+                parsed = streamed.feed(chunk)
+                if parsed:
+                    yield parsed
+            parsed = streamed.close()
+            if parsed:
+                yield parsed
+        finally:
+            await result.aclose()
+    except (
+        httpx.TransportError,
+        GrouperAuthException,
+        GrouperSuccessException,
+        ValueError,
+    ) as err:
+        if event.error is None:
+            event.error = err
+        raise
+    finally:
+        if on_event is not None:
+            send_event(on_event, event)
+
+
+async def resolve_subject(
+    subject_body: dict[str, Any],
+    client: AsyncGrouperClient,
+    subject_attr_names: list[str],
+    resolve_group: bool,
+) -> AsyncSubject:
+    """Resolve a given subject.
+
+    :param subject_body: The body of the subject to resolve
+    :type subject_body: dict[str, Any]
+    :param client: The AsyncGrouperClient to use
+    :type client: AsyncGrouperClient
+    :param subject_attr_names: Subject attribute names for the given subject body
+    :type subject_attr_names: list[str]
+    :param resolve_group: Whether to resolve the subject to an AsyncGroup object
+    if it is a group. Resolving will require an additional API call.
+    If True, the group will be resolved and returned as an AsyncGroup.
+    If False, the group will be returned as an AsyncSubject.
+    :type resolve_group: bool
+    :return: The final "resolved" AsyncSubject.
+    :rtype: AsyncSubject
+    """
+    from ..objects.person import AsyncPerson
+    from ..objects.subject import AsyncSubject
+
+    if subject_body["sourceId"] == "g:gsa":
+        if resolve_group:
+            with tracing.span(
+                "resolve_subject", {"grouper.group_name": subject_body["name"]}
+            ):
+                return await get_group_by_name(subject_body["name"], client)
+        else:
+            return client._entity(
+                AsyncSubject,
+                subject_body=subject_body,
+                subject_attr_names=subject_attr_names,
+            )
+    else:
+        return client._entity(
+            AsyncPerson,
+            person_body=subject_body,
+            subject_attr_names=subject_attr_names,
+        )
+
+
+async def resolve_subjects(
+    subject_bodies: list[dict[str, Any]],
+    client: AsyncGrouperClient,
+    subject_attr_names: list[str],
+    resolve_groups: bool,
+) -> list[AsyncSubject]:
+    """Resolve the given subjects.
+
+    Works like resolve_subject, but subjects that are groups are resolved together
+    using as few API calls as possible, rather than with one API call per group.
+    Groups that cannot be found this way are looked up individually.
+
+    :param subject_bodies: The bodies of the subjects to resolve
+    :type subject_bodies: list[dict[str, Any]]
+    :param client: The AsyncGrouperClient to use
+    :type client: AsyncGrouperClient
+    :param subject_attr_names: Subject attribute names for the given subject bodies
+    :type subject_attr_names: list[str]
+    :param resolve_groups: Whether to resolve subjects that are groups to AsyncGroup
+    objects. If False, groups will be returned as AsyncSubjects.
+    :type resolve_groups: bool
+    :return: The final "resolved" AsyncSubjects, in the same order as the given bodies
+    :rtype: list[AsyncSubject]
+    """
+    groups: dict[str, AsyncGroup] = {}
+    if resolve_groups:
+        group_names = [
+            body["name"] for body in subject_bodies if body["sourceId"] == "g:gsa"
+        ]
+        if group_names:
+            with tracing.span(
+                "resolve_subjects", {"grouper.group_count": len(group_names)}
+            ):
+                try:
+                    groups = await get_groups_by_names(group_names, client)
+                except GrouperSuccessException:
+                    groups = {}
+                for group_name in group_names:
+                    if group_name not in groups:
+                        groups[group_name] = await get_group_by_name(
+                            group_name, client
+                        )
+    return [
+        groups[body["name"]]
+        if resolve_groups and body["sourceId"] == "g:gsa"
+        else await resolve_subject(
+            subject_body=body,
+            client=client,
+            subject_attr_names=subject_attr_names,
+            resolve_group=False,
+        )
+        for body in subject_bodies
+    ]
@@ -173,7 +173,9 @@ def assign_attribute(
     r_list: list[AttributeAssignment] = []
 
     if attribute_assign_type == "group":
-        groups = {group["uuid"]: Group(client, group) for group in results["wsGroups"]}
+        groups = {
+            group["uuid"]: client._entity(Group, group) for group in results["wsGroups"]
+        }
         for assign_result in results["wsAttributeAssignResults"]:
             for assg in assign_result["wsAttributeAssigns"]:
                 r_list.append(
@@ -186,7 +188,9 @@ def assign_attribute(
                     )
                 )
     elif attribute_assign_type == "stem":
-        stems = {stem["uuid"]: Stem(client, stem) for stem in results["wsStems"]}
+        stems = {
+            stem["uuid"]: client._entity(Stem, stem) for stem in results["wsStems"]
+        }
         for assign_result in results["wsAttributeAssignResults"]:
             for assg in assign_result["wsAttributeAssigns"]:
                 r_list.append(
@@ -338,7 +342,9 @@ def get_attribute_assignments(
     }
 
     if attribute_assign_type == "group":
-        groups = {group["uuid"]: Group(client, group) for group in results["wsGroups"]}
+        groups = {
+            group["uuid"]: client._entity(Group, group) for group in results["wsGroups"]
+        }
         return [
             AttributeAssignment(
                 client,
@@ -350,7 +356,9 @@ def get_attribute_assignments(
             for assg in results["wsAttributeAssigns"]
         ]
     elif attribute_assign_type == "stem":
-        stems = {stem["uuid"]: Stem(client, stem) for stem in results["wsStems"]}
+        stems = {
+            stem["uuid"]: client._entity(Stem, stem) for stem in results["wsStems"]
+        }
         return [
             AttributeAssignment(
                 client,
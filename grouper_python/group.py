@@ -20,6 +20,8 @@ from .objects.exceptions import (
     GrouperStemNotFoundException,
     GrouperPermissionDenied,
 )
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
 
 
 def find_group_by_name(
@@ -72,7 +74,7 @@ def find_group_by_name(
             raise err
     if "groupResults" in r["WsFindGroupsResults"]:
         return [
-            Group(client, grp)
+            client._entity(Group, grp)
             for grp in r["WsFindGroupsResults"]["groupResults"]
         ]
     else:
@@ -122,7 +124,7 @@ def create_groups(
         act_as_subject=act_as_subject,
     )
     return [
-        Group(client, result["wsGroup"])
+        client._entity(Group, result["wsGroup"])
         for result in r["WsGroupSaveResults"]["results"]
     ]
 
@@ -225,7 +227,7 @@ def get_groups_by_parent(
     )
     if "groupResults" in r["WsFindGroupsResults"]:
         return [
-            Group(client, grp)
+            client._entity(Group, grp)
             for grp in r["WsFindGroupsResults"]["groupResults"]
         ]
     else:
@@ -263,4 +265,90 @@ def get_group_by_name(
     r = client._call_grouper("/groups", body, act_as_subject=act_as_subject)
     if "groupResults" not in r["WsFindGroupsResults"]:
         raise GrouperGroupNotFoundException(group_name, r)
-    return Group(client, r["WsFindGroupsResults"]["groupResults"][0])
+    return client._entity(Group, r["WsFindGroupsResults"]["groupResults"][0])
+
+
+def get_groups_by_names(
+    group_names: list[str],
+    client: GrouperClient,
+    act_as_subject: Subject | None = None,
+    chunk_size: int = 100,
+    max_concurrency: int = 4,
+) -> dict[str, Group]:
+    """Get the groups with the given names, using as few API calls as possible.
+
+    The names are looked up in chunks of chunk_size, with one API call per chunk,
+    and up to max_concurrency chunks are sent to Grouper at the same time.
+    Names that are not found are left out of the returned dict.
+
+    :param group_names: The names of the groups to get
+    :type group_names: list[str]
+    :param client: The GrouperClient to use
+    :type client: GrouperClient
+    :param act_as_subject: Optional subject to act as, defaults to None
+    :type act_as_subject: Subject | None, optional
+    :param chunk_size: The maximum number of groups to look up in one API call,
+    defaults to 100
+    :type chunk_size: int, optional
+    :param max_concurrency: The maximum number of API calls to make at the same
+    time, defaults to 4
+    :type max_concurrency: int, optional
+    :raises GrouperSuccessException: An otherwise unhandled issue with the result
+    :return: A dictionary with group names as the keys and Groups as the values
+    :rtype: dict[str, Group]
+    """
+    from .objects.group import Group
+
+    bodies = find_groups_bodies(group_names, chunk_size)
+    if not bodies:
+        return {}
+
+    def find_chunk(body: dict[str, Any]) -> dict[str, Any]:
+        """Send one chunk to Grouper.
+
+        :param body: The request body for the chunk
+        :type body: dict[str, Any]
+        :return: The result returned by Grouper
+        :rtype: dict[str, Any]
+        """
+        return client._call_grouper("/groups", body, act_as_subject=act_as_subject)
+
+    r_dict: dict[str, Group] = {}
+    max_workers = min(max(max_concurrency, 1), len(bodies))
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        # Run each chunk in a copy of the current context,
+        # so its tracing spans are children of the current span
+        futures = [
+            pool.submit(copy_context().run, find_chunk, body) for body in bodies
+        ]
+        for future in futures:
+            r = future.result()
+            for grp in r["WsFindGroupsResults"].get("groupResults", []):
+                r_dict[grp["name"]] = client._entity(Group, grp)
+    return r_dict
+
+
+def find_groups_bodies(
+    group_names: list[str], chunk_size: int
+) -> list[dict[str, Any]]:
+    """Build the request bodies to find the given groups in chunks.
+
+    :param group_names: The names of the groups to find, duplicates are ignored
+    :type group_names: list[str]
+    :param chunk_size: The maximum number of groups to look up in one request
+    :type chunk_size: int
+    :return: The request body for each chunk
+    :rtype: list[dict[str, Any]]
+    """
+    unique_names = list(dict.fromkeys(group_names))
+    return [
+        {
+            "WsRestFindGroupsRequest": {
+                "wsGroupLookups": [
+                    {"groupName": name} for name in unique_names[i:i + chunk_size]
+                ],
+                "includeGroupDetail": "T",
+            }
+        }
+        for i in range(0, len(unique_names), chunk_size)
+    ]
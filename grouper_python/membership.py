@@ -8,19 +8,45 @@ directly if needed.
 """
 
 from __future__ import annotations
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, NoReturn
 
 if TYPE_CHECKING:  # pragma: no cover
     from .objects.group import Group
+    from collections.abc import Iterator
     from .objects.client import GrouperClient
-    from .objects.membership import Membership, HasMember
+    from .objects.membership import (
+        Membership,
+        MembershipTable,
+        MembershipMatrix,
+        HasMember,
+        MemberChangeResult,
+        MembershipType,
+        MemberType,
+    )
     from .objects.subject import Subject
 from .objects.exceptions import (
     GrouperGroupNotFoundException,
     GrouperSuccessException,
     GrouperPermissionDenied,
 )
-from .util import resolve_subject
+from .util import resolve_subjects, subject_lookup_chunks
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from array import array
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Arrays of a memberships result to parse one item at a time
+MEMBERSHIPS_STREAM_PATHS: list[tuple[str, ...]] = [
+    ("WsGetMembershipsResults", "wsMemberships"),
+    ("WsGetMembershipsResults", "wsSubjects"),
+]
+# Request and result types for the bulk add and delete member actions
+_BULK_MEMBER_TYPES = {
+    "add": ("WsRestAddMemberRequest", "WsAddMemberResults"),
+    "delete": ("WsRestDeleteMemberRequest", "WsDeleteMemberResults"),
+}
 
 
 def get_memberships_for_groups(
@@ -46,7 +72,7 @@ def get_memberships_for_groups(
     defaults to "all"
     :type member_filter: str, optional
     :param resolve_groups: Whether to resolve subjects that are groups into Group
-    objects, which will require an additional API call per group, defaults to True
+    objects, which will require additional API calls, defaults to True
     :type resolve_groups: bool, optional
     :param act_as_subject: Optional subject to act as, defaults to None
     :type act_as_subject: Subject | None, optional
@@ -57,21 +83,14 @@ def get_memberships_for_groups(
     and those groups' memberships list as the value
     :rtype: dict[Group, list[Membership]]
     """
-    from .objects.membership import Membership, MembershipType, MemberType
+    from .objects.membership import Membership
     from .objects.group import Group
 
-    attribute_set = set(attributes + [client.universal_identifier_attr, "name"])
-
-    group_lookup = [{"groupName": group} for group in group_names]
-    body = {
-        "WsRestGetMembershipsRequest": {
-            "subjectAttributeNames": [*attribute_set],
-            "includeSubjectDetail": "T",
-            "includeGroupDetail": "T",
-            "memberFilter": member_filter,
-            "wsGroupLookups": group_lookup,
-        }
-    }
+    body = memberships_body(
+        group_names,
+        attributes + [client.universal_identifier_attr, "name"],
+        member_filter,
+    )
     try:
         r = client._call_grouper(
             "/memberships",
@@ -79,21 +98,7 @@ def get_memberships_for_groups(
             act_as_subject=act_as_subject,
         )
     except GrouperSuccessException as err:
-        r = err.grouper_result
-        meta = r["WsGetMembershipsResults"]["resultMetadata"]
-        if meta["resultCode"] == "GROUP_NOT_FOUND":
-            try:
-                result_message = meta["resultMessage"]
-                split_message = result_message.split(",")
-                group_name = split_message[2].split("=")[1]
-            except Exception:  # pragma: no cover
-                # The try above feels fragile, so if it fails,
-                # throw the original SuccessException
-                raise err
-            raise GrouperGroupNotFoundException(group_name, r)
-        else:  # pragma: no cover
-            # We don't know what exactly has happened here
-            raise err
+        raise_memberships_error(err)
     if "wsGroups" not in r["WsGetMembershipsResults"].keys():
         # if "wsGroups" is not in the result but it was succesful,
         # that means the group(s) exist but have no memberships
@@ -106,31 +111,28 @@ def get_memberships_for_groups(
     ws_subjects = r["WsGetMembershipsResults"].get("wsSubjects", [])
     subjects = {ws_subject["id"]: ws_subject for ws_subject in ws_subjects}
     groups = {
-        ws_group["uuid"]: Group(client, ws_group) for ws_group in ws_groups
+        ws_group["uuid"]: client._entity(Group, ws_group) for ws_group in ws_groups
     }
     subject_attr_names = r["WsGetMembershipsResults"].get("subjectAttributeNames", [])
+    member_bodies = {
+        ws_membership["subjectId"]: subjects[ws_membership["subjectId"]]
+        for ws_membership in ws_memberships
+    }
+    members = dict(
+        zip(
+            member_bodies.keys(),
+            resolve_subjects(
+                subject_bodies=list(member_bodies.values()),
+                client=client,
+                subject_attr_names=subject_attr_names,
+                resolve_groups=resolve_groups,
+            ),
+        )
+    )
     r_dict: dict[Group, list[Membership]] = {group: [] for group in groups.values()}
     for ws_membership in ws_memberships:
-        subject = resolve_subject(
-            subject_body=subjects[ws_membership["subjectId"]],
-            client=client,
-            subject_attr_names=subject_attr_names,
-            resolve_group=resolve_groups,
-        )
-        if ws_membership["subjectSourceId"] == "g:gsa":
-            member_type = MemberType.GROUP
-        else:
-            member_type = MemberType.PERSON
-
-        if ws_membership["membershipType"] == "immediate":
-            membership_type = MembershipType.DIRECT
-        elif ws_membership["membershipType"] == "effective":
-            membership_type = MembershipType.INDIRECT
-        else:  # pragma: no cover
-            # Unknown membershipType, we don't know what's going on,
-            # so raise a SuccessException
-            raise GrouperSuccessException(r)
-
+        subject = members[ws_membership["subjectId"]]
+        member_type, membership_type = classify_membership(ws_membership, r)
         membership = Membership(
             member=subject, member_type=member_type, membership_type=membership_type
         )
@@ -139,6 +141,476 @@ def get_memberships_for_groups(
     return r_dict
 
 
+def iter_memberships_for_group(
+    group_name: str,
+    client: GrouperClient,
+    attributes: list[str] = [],
+    member_filter: str = "all",
+    resolve_groups: bool = True,
+    page_size: int = 1000,
+    act_as_subject: Subject | None = None,
+) -> Iterator[Membership]:
+    """Iterate over the memberships of the given group, one page at a time.
+
+    Each page is parsed as it is received rather than all at once.
+    Grouper sends the memberships of a page before its subjects,
+    so the memberships of a page are held until its subjects arrive,
+    but only one page is held at a time, so memory use does not grow with
+    the size of the group. Iteration can be stopped at any point
+    without fetching the remaining pages.
+    Memberships are not given in any particular order.
+
+    :param group_name: Name of the group to retreive memberships for
+    :type group_name: str
+    :param client: The GrouperClient to use
+    :type client: GrouperClient
+    :param attributes: Additional attributes to retrieve for the Subjects,
+    defaults to []
+    :type attributes: list[str], optional
+    :param member_filter: Type of mebership to return (all, immediate, effective),
+    defaults to "all"
+    :type member_filter: str, optional
+    :param resolve_groups: Whether to resolve subjects that are groups into Group
+    objects, which will require additional API calls, defaults to True
+    :type resolve_groups: bool, optional
+    :param page_size: The number of memberships to request per page,
+    defaults to 1000
+    :type page_size: int, optional
+    :param act_as_subject: Optional subject to act as, defaults to None
+    :type act_as_subject: Subject | None, optional
+    :raises GrouperGroupNotFoundException: A group with the given name cannot
+    be found
+    :raises GrouperSuccessException: An otherwise unhandled issue with the result
+    :return: An iterator over the memberships of the group
+    :rtype: Iterator[Membership]
+    """
+    body = memberships_body(
+        [group_name],
+        attributes + [client.universal_identifier_attr, "name"],
+        member_filter,
+    )
+    request = body["WsRestGetMembershipsRequest"]
+    request["pageSize"] = str(page_size)
+    page_number = 1
+    while True:
+        request["pageNumber"] = str(page_number)
+        given = 0
+        for membership in _stream_memberships(
+            client, body, resolve_groups, act_as_subject
+        ):
+            given += 1
+            yield membership
+        # Grouper may answer with fewer memberships than page_size asks for,
+        # when its maximum page size is smaller,
+        # so only an empty page means there are no more memberships.
+        if not given:
+            return
+        page_number += 1
+
+
+def _stream_memberships(
+    client: GrouperClient,
+    body: dict[str, Any],
+    resolve_groups: bool,
+    act_as_subject: Subject | None,
+) -> Iterator[Membership]:
+    """Give the memberships of one memberships result as it downloads.
+
+    :param client: The GrouperClient to use
+    :type client: GrouperClient
+    :param body: The body of the memberships request
+    :type body: dict[str, Any]
+    :param resolve_groups: Whether to resolve subjects that are groups into Group
+    objects
+    :type resolve_groups: bool
+    :param act_as_subject: Optional subject to act as
+    :type act_as_subject: Subject | None
+    :raises GrouperGroupNotFoundException: A group with the given name cannot
+    be found
+    :raises GrouperSuccessException: An otherwise unhandled issue with the result
+    :return: An iterator over the memberships of the result
+    :rtype: Iterator[Membership]
+    """
+    from .objects.membership import Membership
+
+    stream = MembershipStream()
+    batches = client._stream_grouper(
+        "/memberships",
+        body,
+        MEMBERSHIPS_STREAM_PATHS,
+        act_as_subject=act_as_subject,
+    )
+    parsed: list[tuple[tuple[str, ...], Any]] | None = []
+    while parsed is not None:
+        try:
+            parsed = next(batches, None)
+        except GrouperSuccessException as err:
+            raise_memberships_error(err)
+        ready = stream.add(parsed) if parsed is not None else stream.close()
+        if not ready:
+            continue
+        subject_bodies = {subject["id"]: subject for _, subject in ready}
+        members = dict(
+            zip(
+                subject_bodies.keys(),
+                resolve_subjects(
+                    subject_bodies=list(subject_bodies.values()),
+                    client=client,
+                    subject_attr_names=stream.subject_attr_names,
+                    resolve_groups=resolve_groups,
+                ),
+            )
+        )
+        for ws_membership, _ in ready:
+            member_type, membership_type = classify_membership(
+                ws_membership, stream.full_result
+            )
+            yield Membership(
+                member=members[ws_membership["subjectId"]],
+                member_type=member_type,
+                membership_type=membership_type,
+            )
+
+
+def get_membership_table_for_groups(
+    group_names: list[str],
+    client: GrouperClient,
+    attributes: list[str] = [],
+    member_filter: str = "all",
+    act_as_subject: Subject | None = None,
+) -> MembershipTable:
+    """Get memberships for the given groups as a columnar MembershipTable.
+
+    Rather than building a Membership and Subject for each membership,
+    the memberships are held as rows of parallel arrays, with each group
+    and subject held once. The result is parsed as it is received, so neither
+    the full result nor an object per membership is ever held, which makes
+    this suited to very large numbers of memberships.
+    MembershipTable.to_memberships can build the Membership objects later.
+
+    :param group_names: Group names to retreive memberships for
+    :type group_names: list[str]
+    :param client: The GrouperClient to use
+    :type client: GrouperClient
+    :param attributes: Additional attributes to retrieve for the Subjects,
+    defaults to []
+    :type attributes: list[str], optional
+    :param member_filter: Type of mebership to return (all, immediate, effective),
+    defaults to "all"
+    :type member_filter: str, optional
+    :param act_as_subject: Optional subject to act as, defaults to None
+    :type act_as_subject: Subject | None, optional
+    :raises GrouperGroupNotFoundException: A group with the given name cannot
+    be found
+    :raises GrouperSuccessException: An otherwise unhandled issue with the result
+    :return: The memberships of the groups
+    :rtype: MembershipTable
+    """
+    from .objects.membership import MembershipTable
+    from .objects.group import Group
+
+    body = memberships_body(
+        group_names,
+        attributes + [client.universal_identifier_attr, "name"],
+        member_filter,
+    )
+    builder = MembershipTableBuilder()
+    try:
+        for parsed in client._stream_grouper(
+            "/memberships",
+            body,
+            MEMBERSHIPS_STREAM_PATHS,
+            act_as_subject=act_as_subject,
+        ):
+            builder.add(parsed)
+    except GrouperSuccessException as err:
+        raise_memberships_error(err)
+    group_bodies = builder.close()
+    return MembershipTable(
+        client,
+        [client._entity(Group, group_body) for group_body in group_bodies],
+        builder.subjects,
+        builder.group_index,
+        builder.subject_index,
+        builder.member_types,
+        builder.membership_types,
+    )
+
+
+def memberships_body(
+    group_names: list[str], attributes: list[str], member_filter: str
+) -> dict[str, Any]:
+    """Build the request body to get memberships for the given groups.
+
+    :param group_names: Group names to retreive memberships for
+    :type group_names: list[str]
+    :param attributes: Attributes to retrieve for the Subjects
+    :type attributes: list[str]
+    :param member_filter: Type of mebership to return (all, immediate, effective)
+    :type member_filter: str
+    :return: The request body
+    :rtype: dict[str, Any]
+    """
+    return {
+        "WsRestGetMembershipsRequest": {
+            "subjectAttributeNames": [*set(attributes)],
+            "includeSubjectDetail": "T",
+            "includeGroupDetail": "T",
+            "memberFilter": member_filter,
+            "wsGroupLookups": [{"groupName": group} for group in group_names],
+        }
+    }
+
+
+def raise_memberships_error(err: GrouperSuccessException) -> NoReturn:
+    """Raise the exception for a memberships result that was not succesful.
+
+    :param err: The exception raised for the request
+    :type err: GrouperSuccessException
+    :raises GrouperGroupNotFoundException: A group with the given name cannot
+    be found
+    :raises GrouperSuccessException: An otherwise unhandled issue with the result
+    """
+    r = err.grouper_result
+    meta = r["WsGetMembershipsResults"]["resultMetadata"]
+    if meta["resultCode"] == "GROUP_NOT_FOUND":
+        try:
+            result_message = meta["resultMessage"]
+            split_message = result_message.split(",")
+            group_name = split_message[2].split("=")[1]
+        except Exception:  # pragma: no cover
+            # The try above feels fragile, so if it fails,
+            # throw the original SuccessException
+            raise err
+        raise GrouperGroupNotFoundException(group_name, r)
+    else:  # pragma: no cover
+        # We don't know what exactly has happened here
+        raise err
+
+
+def classify_membership(
+    ws_membership: dict[str, Any], r: dict[str, Any]
+) -> tuple[MemberType, MembershipType]:
+    """Get the member and membership types of a membership.
+
+    :param ws_membership: The body of the membership
+    :type ws_membership: dict[str, Any]
+    :param r: The result the membership is from
+    :type r: dict[str, Any]
+    :raises GrouperSuccessException: The membership type is not known
+    :return: The member type and membership type
+    :rtype: tuple[MemberType, MembershipType]
+    """
+    from .objects.membership import MembershipType, MemberType
+
+    if ws_membership["subjectSourceId"] == "g:gsa":
+        member_type = MemberType.GROUP
+    else:
+        member_type = MemberType.PERSON
+
+    if ws_membership["membershipType"] == "immediate":
+        membership_type = MembershipType.DIRECT
+    elif ws_membership["membershipType"] == "effective":
+        membership_type = MembershipType.INDIRECT
+    else:  # pragma: no cover
+        # Unknown membershipType, we don't know what's going on,
+        # so raise a SuccessException
+        raise GrouperSuccessException(r)
+    return member_type, membership_type
+
+
+class MembershipStream:
+    """Match up the memberships and subjects of a streamed memberships result.
+
+    Each membership is held until its subject has been parsed, and each subject
+    is held only while memberships for it may still be parsed. Memberships are
+    also held until the subjectAttributeNames of the result have been parsed,
+    as they are needed to build the subjects.
+    Grouper gives wsMemberships (then subjectAttributeNames) before wsSubjects,
+    so in practice every membership of the result is held until the subjects
+    are parsed, which is why iter_memberships_for_group requests one page
+    of memberships at a time.
+    Only a result with its subjects first gives memberships as they arrive.
+    Other values in the result are kept in result.
+    """
+
+    def __init__(self) -> None:
+        """Construct a MembershipStream."""
+        self.result: dict[str, Any] = {}
+        self._subjects: dict[str, dict[str, Any]] = {}
+        self._pending: dict[str, list[dict[str, Any]]] = {}
+        self._changed: dict[str, None] = {}
+        self._memberships_done = False
+
+    @property
+    def full_result(self) -> dict[str, Any]:
+        """Get the values of the result other than memberships and subjects.
+
+        :return: The result, in the form returned by Grouper
+        :rtype: dict[str, Any]
+        """
+        return {"WsGetMembershipsResults": self.result}
+
+    @property
+    def subject_attr_names(self) -> list[str]:
+        """Get the subject attribute names of the result.
+
+        :return: The subject attribute names, or [] if not in the result
+        :rtype: list[str]
+        """
+        names: list[str] = self.result.get("subjectAttributeNames", [])
+        return names
+
+    def add(
+        self, parsed: list[tuple[tuple[str, ...], Any]]
+    ) -> list[tuple[dict[str, Any], dict[str, Any]]]:
+        """Add parsed values, and get the memberships that are now complete.
+
+        :param parsed: (path, value) pairs parsed from the result
+        :type parsed: list[tuple[tuple[str, ...], Any]]
+        :return: (membership body, subject body) for each complete membership
+        :rtype: list[tuple[dict[str, Any], dict[str, Any]]]
+        """
+        from .objects.stream import END
+
+        for path, value in parsed:
+            key = path[-1]
+            if key == "wsMemberships":
+                if value is END:
+                    self._memberships_done = True
+                    self._subjects = {
+                        subject_id: body
+                        for subject_id, body in self._subjects.items()
+                        if subject_id in self._pending
+                    }
+                else:
+                    self._pending.setdefault(value["subjectId"], []).append(value)
+                    self._changed[value["subjectId"]] = None
+            elif key == "wsSubjects":
+                if value is not END and (
+                    not self._memberships_done or value["id"] in self._pending
+                ):
+                    self._subjects[value["id"]] = value
+                    self._changed[value["id"]] = None
+            else:
+                self.result[key] = value
+        if "subjectAttributeNames" not in self.result:
+            return []
+        return self._complete()
+
+    def close(self) -> list[tuple[dict[str, Any], dict[str, Any]]]:
+        """Get the remaining memberships once the whole result has been parsed.
+
+        :raises GrouperSuccessException: A membership's subject was not in
+        the result
+        :return: (membership body, subject body) for each complete membership
+        :rtype: list[tuple[dict[str, Any], dict[str, Any]]]
+        """
+        ready = self._complete()
+        if self._pending:  # pragma: no cover
+            raise GrouperSuccessException(self.full_result)
+        return ready
+
+    def _complete(self) -> list[tuple[dict[str, Any], dict[str, Any]]]:
+        """Get the memberships completed since this was last called.
+
+        :return: (membership body, subject body) for each complete membership
+        :rtype: list[tuple[dict[str, Any], dict[str, Any]]]
+        """
+        ready = []
+        for subject_id in self._changed:
+            if subject_id in self._subjects and subject_id in self._pending:
+                subject = (
+                    self._subjects.pop(subject_id)
+                    if self._memberships_done
+                    else self._subjects[subject_id]
+                )
+                for ws_membership in self._pending.pop(subject_id):
+                    ready.append((ws_membership, subject))
+        self._changed = {}
+        return ready
+
+
+class MembershipTableBuilder:
+    """Build the columns of a MembershipTable from a streamed memberships result.
+
+    Memberships are added as rows as soon as they are parsed, as only the ids
+    of their group and subject are needed, and the details of each subject are
+    filled in when it is parsed.
+    Other values in the result are kept in result.
+    """
+
+    def __init__(self) -> None:
+        """Construct a MembershipTableBuilder."""
+        from .objects.membership import SubjectTable
+
+        self.result: dict[str, Any] = {}
+        self.subjects = SubjectTable()
+        self.group_ids: dict[str, int] = {}
+        self.group_index: array[int] = array("I")
+        self.subject_index: array[int] = array("I")
+        self.member_types = bytearray()
+        self.membership_types = bytearray()
+        self._described: set[int] = set()
+
+    def add(self, parsed: list[tuple[tuple[str, ...], Any]]) -> None:
+        """Add parsed values of the result.
+
+        :param parsed: (path, value) pairs parsed from the result
+        :type parsed: list[tuple[tuple[str, ...], Any]]
+        :raises GrouperSuccessException: The membership type is not known
+        """
+        from .objects.stream import END
+
+        for path, value in parsed:
+            key = path[-1]
+            if value is END:
+                continue
+            if key == "wsMemberships":
+                if value["membershipType"] == "immediate":
+                    membership_type = 0
+                elif value["membershipType"] == "effective":
+                    membership_type = 1
+                else:  # pragma: no cover
+                    # Unknown membershipType, we don't know what's going on,
+                    # so raise a SuccessException
+                    raise GrouperSuccessException(
+                        {"WsGetMembershipsResults": self.result}
+                    )
+                group_id = value["groupId"]
+                group_i = self.group_ids.setdefault(group_id, len(self.group_ids))
+                self.group_index.append(group_i)
+                self.subject_index.append(self.subjects.intern(value["subjectId"]))
+                self.member_types.append(
+                    1 if value["subjectSourceId"] == "g:gsa" else 0
+                )
+                self.membership_types.append(membership_type)
+            elif key == "wsSubjects":
+                self._described.add(self.subjects.add(value))
+            else:
+                self.result[key] = value
+
+    def close(self) -> list[dict[str, Any]]:
+        """Finish building the table once the whole result has been parsed.
+
+        :raises GrouperSuccessException: A membership's group or subject was not
+        in the result
+        :return: The body of each group, in the order of their indexes
+        :rtype: list[dict[str, Any]]
+        """
+        self.subjects.attr_names = self.result.get("subjectAttributeNames", [])
+        ws_groups = {
+            ws_group["uuid"]: ws_group for ws_group in self.result.get("wsGroups", [])
+        }
+        for group_id in ws_groups:
+            self.group_ids.setdefault(group_id, len(self.group_ids))
+        if len(ws_groups) < len(self.group_ids) or len(self._described) < len(
+            self.subjects
+        ):  # pragma: no cover
+            raise GrouperSuccessException({"WsGetMembershipsResults": self.result})
+        return [ws_groups[group_id] for group_id in self.group_ids]
+
+
 def has_members(
     group_name: str,
     client: GrouperClient,
@@ -172,12 +644,66 @@ def has_members(
     and the value being a HasMember enum.
     :rtype: dict[str, HasMember]
     """
-    from .objects.membership import HasMember
-
     if not subject_identifiers and not subject_ids:
         raise ValueError(
             "At least one of subject_identifiers or subject_ids must be specified"
         )
+    if client.has_member_batcher is not None:
+        # Coalesce with checks of the same group made at about the same time
+        return client.has_member_batcher.run(
+            (
+                client,
+                group_name,
+                member_filter,
+                act_as_subject.id if act_as_subject else None,
+            ),
+            subject_identifiers,
+            subject_ids,
+            lambda identifiers, ids: _has_members(
+                group_name, client, identifiers, ids, member_filter, act_as_subject
+            ),
+        )
+    return _has_members(
+        group_name,
+        client,
+        subject_identifiers,
+        subject_ids,
+        member_filter,
+        act_as_subject,
+    )
+
+
+def _has_members(
+    group_name: str,
+    client: GrouperClient,
+    subject_identifiers: list[str],
+    subject_ids: list[str],
+    member_filter: str,
+    act_as_subject: Subject | None,
+) -> dict[str, HasMember]:
+    """Send a has_members request for the given subjects.
+
+    :param group_name: Name of group to check members
+    :type group_name: str
+    :param client: The GrouperClient to use
+    :type client: GrouperClient
+    :param subject_identifiers: Subject identifiers to check for membership
+    :type subject_identifiers: list[str]
+    :param subject_ids: Subject ids to check for membership
+    :type subject_ids: list[str]
+    :param member_filter: Type of mebership to return (all, immediate, effective)
+    :type member_filter: str
+    :param act_as_subject: Optional subject to act as
+    :type act_as_subject: Subject | None
+    :raises GrouperGroupNotFoundException: A group with the given name cannot
+    be found
+    :raises GrouperSuccessException: An otherwise unhandled issue with the result
+    :return: A dict with the key being the subject (either identifier or id)
+    and the value being a HasMember enum.
+    :rtype: dict[str, HasMember]
+    """
+    from .objects.membership import HasMember
+
     subject_identifier_lookups = [
         {"subjectIdentifier": ident} for ident in subject_identifiers
     ]
@@ -237,6 +763,257 @@ def has_members(
     return r_dict
 
 
+def get_membership_matrix(
+    group_names: list[str],
+    client: GrouperClient,
+    subject_identifiers: list[str] = [],
+    subject_ids: list[str] = [],
+    member_filter: str = "all",
+    strategy: str = "auto",
+    chunk_size: int = 100,
+    max_concurrency: int = 4,
+    act_as_subject: Subject | None = None,
+) -> MembershipMatrix:
+    """Determine which of the given subjects are members of which of the given groups.
+
+    There are two ways of answering this, chosen with strategy:
+    "memberships" sends memberships requests filtered to both the subjects and
+    the groups, after looking up the ids of any subject identifiers, while
+    "has_members" sends has_members requests for each group. "auto" chooses
+    whichever needs fewer requests, so for example one subject checked against
+    many groups uses a single memberships request, while many subjects checked
+    against one group use has_members. Up to max_concurrency requests are sent
+    to Grouper at the same time.
+
+    :param group_names: Names of groups to check members of
+    :type group_names: list[str]
+    :param client: The GrouperClient to use
+    :type client: GrouperClient
+    :param subject_identifiers: Subject identifiers to check for membership,
+    defaults to []
+    :type subject_identifiers: list[str], optional
+    :param subject_ids: Subject ids to check for membership, defaults to []
+    :type subject_ids: list[str], optional
+    :param member_filter: Type of mebership to check (all, immediate, effective),
+    defaults to "all"
+    :type member_filter: str, optional
+    :param strategy: How to get the memberships
+    ("auto", "memberships" or "has_members"), defaults to "auto"
+    :type strategy: str, optional
+    :param chunk_size: The maximum number of subjects, or groups, to send in one
+    API call, defaults to 100
+    :type chunk_size: int, optional
+    :param max_concurrency: The maximum number of API calls to make at the same
+    time, defaults to 4
+    :type max_concurrency: int, optional
+    :param act_as_subject: Optional subject to act as, defaults to None
+    :type act_as_subject: Subject | None, optional
+    :raises ValueError: The strategy is not known, or chunk_size is less than 1
+    :raises GrouperGroupNotFoundException: A group with the given name cannot
+    be found
+    :raises GrouperSuccessException: An otherwise unhandled issue with the result
+    :return: The matrix of memberships, where subjects that cannot be found
+    are not members of any group
+    :rtype: MembershipMatrix
+    """
+    from .objects.membership import MembershipMatrix, HasMember
+    from .subject import get_subjects
+
+    group_names = list(dict.fromkeys(group_names))
+    subject_identifiers = list(dict.fromkeys(subject_identifiers))
+    subject_ids = list(dict.fromkeys(subject_ids))
+    chunks = subject_lookup_chunks(subject_identifiers, subject_ids, chunk_size)
+    matrix = MembershipMatrix(
+        group_names, [key for chunk in chunks for key, _ in chunk]
+    )
+    if not chunks or not group_names:
+        return matrix
+    strategy = matrix_strategy(
+        strategy, len(group_names), len(subject_identifiers), len(chunks), chunk_size
+    )
+
+    if strategy == "has_members":
+
+        def check_chunk(
+            task: tuple[str, list[tuple[str, dict[str, str]]]]
+        ) -> dict[str, HasMember]:
+            """Check one chunk of subjects against one group.
+
+            :param task: The group name and the chunk of subject lookups
+            :type task: tuple[str, list[tuple[str, dict[str, str]]]]
+            :return: The result for each subject in the chunk
+            :rtype: dict[str, HasMember]
+            """
+            group_name, chunk = task
+            return has_members(
+                group_name,
+                client,
+                subject_identifiers=[
+                    key for key, lookup in chunk if "subjectIdentifier" in lookup
+                ],
+                subject_ids=[key for key, lookup in chunk if "subjectId" in lookup],
+                member_filter=member_filter,
+                act_as_subject=act_as_subject,
+            )
+
+        tasks = [(group_name, chunk) for group_name in group_names for chunk in chunks]
+        with ThreadPoolExecutor(
+            max_workers=min(max(max_concurrency, 1), len(tasks))
+        ) as pool:
+            # Run each task in a copy of the current context,
+            # so its tracing spans are children of the current span
+            futures = [
+                pool.submit(copy_context().run, check_chunk, task) for task in tasks
+            ]
+            for (group_name, _), future in zip(tasks, futures):
+                for key, is_member in future.result().items():
+                    if is_member is HasMember.IS_MEMBER:
+                        matrix._set(group_name, key)
+        return matrix
+
+    keys_by_id: dict[str, list[str]] = {
+        subject_id: [subject_id] for subject_id in subject_ids
+    }
+    if subject_identifiers:
+        found = get_subjects(
+            client,
+            subject_identifiers=subject_identifiers,
+            resolve_groups=False,
+            chunk_size=chunk_size,
+            max_concurrency=max_concurrency,
+            act_as_subject=act_as_subject,
+        ).found
+        for identifier, subject in found.items():
+            keys_by_id.setdefault(subject.id, []).append(identifier)
+    bodies = matrix_memberships_bodies(
+        list(keys_by_id), group_names, member_filter, chunk_size
+    )
+    if not bodies:
+        return matrix
+
+    def get_memberships(body: dict[str, Any]) -> dict[str, Any]:
+        """Send one memberships request to Grouper.
+
+        :param body: The request body
+        :type body: dict[str, Any]
+        :raises GrouperGroupNotFoundException: A group with the given name cannot
+        be found
+        :return: The result returned by Grouper
+        :rtype: dict[str, Any]
+        """
+        try:
+            return client._call_grouper(
+                "/memberships", body, act_as_subject=act_as_subject
+            )
+        except GrouperSuccessException as err:
+            raise_memberships_error(err)
+
+    with ThreadPoolExecutor(
+        max_workers=min(max(max_concurrency, 1), len(bodies))
+    ) as pool:
+        futures = [
+            pool.submit(copy_context().run, get_memberships, body) for body in bodies
+        ]
+        for future in futures:
+            set_matrix_memberships(matrix, future.result(), keys_by_id)
+    return matrix
+
+
+def matrix_strategy(
+    strategy: str,
+    group_count: int,
+    identifier_count: int,
+    chunk_count: int,
+    chunk_size: int,
+) -> str:
+    """Choose how to get a membership matrix, from the shape of its input.
+
+    :param strategy: The requested strategy ("auto", "memberships" or "has_members")
+    :type strategy: str
+    :param group_count: The number of groups
+    :type group_count: int
+    :param identifier_count: The number of subjects given by identifier
+    :type identifier_count: int
+    :param chunk_count: The number of chunks the subjects are split into
+    :type chunk_count: int
+    :param chunk_size: The maximum number of subjects, or groups, in one API call
+    :type chunk_size: int
+    :raises ValueError: The strategy is not known
+    :return: "memberships" or "has_members"
+    :rtype: str
+    """
+    if strategy not in ("auto", "memberships", "has_members"):
+        raise ValueError(
+            f"Unknown strategy {strategy!r}, "
+            "must be one of 'auto', 'memberships' or 'has_members'"
+        )
+    if strategy != "auto":
+        return strategy
+    has_members_calls = group_count * chunk_count
+    memberships_calls = chunk_count * -(-group_count // chunk_size)
+    # Subject identifiers are looked up first, to get their ids
+    memberships_calls += -(-identifier_count // chunk_size)
+    if memberships_calls < has_members_calls:
+        return "memberships"
+    return "has_members"
+
+
+def matrix_memberships_bodies(
+    subject_ids: list[str], group_names: list[str], member_filter: str, chunk_size: int
+) -> list[dict[str, Any]]:
+    """Build memberships request bodies filtered to the given subjects and groups.
+
+    :param subject_ids: Subject ids to get memberships for
+    :type subject_ids: list[str]
+    :param group_names: Group names to get memberships in
+    :type group_names: list[str]
+    :param member_filter: Type of mebership to get (all, immediate, effective)
+    :type member_filter: str
+    :param chunk_size: The maximum number of subjects, and of groups,
+    in each request
+    :type chunk_size: int
+    :return: The request bodies
+    :rtype: list[dict[str, Any]]
+    """
+    return [
+        {
+            "WsRestGetMembershipsRequest": {
+                "includeSubjectDetail": "F",
+                "includeGroupDetail": "F",
+                "memberFilter": member_filter,
+                "wsSubjectLookups": [
+                    {"subjectId": subject_id}
+                    for subject_id in subject_ids[i:i + chunk_size]
+                ],
+                "wsGroupLookups": [
+                    {"groupName": group_name}
+                    for group_name in group_names[j:j + chunk_size]
+                ],
+            }
+        }
+        for i in range(0, len(subject_ids), chunk_size)
+        for j in range(0, len(group_names), chunk_size)
+    ]
+
+
+def set_matrix_memberships(
+    matrix: MembershipMatrix, r: dict[str, Any], keys_by_id: dict[str, list[str]]
+) -> None:
+    """Record the memberships of a memberships result in a matrix.
+
+    :param matrix: The matrix to record the memberships in
+    :type matrix: MembershipMatrix
+    :param r: The result returned by Grouper
+    :type r: dict[str, Any]
+    :param keys_by_id: The subject identifiers and ids in the matrix
+    for each subject id
+    :type keys_by_id: dict[str, list[str]]
+    """
+    for ws_membership in r["WsGetMembershipsResults"].get("wsMemberships", []):
+        for key in keys_by_id.get(ws_membership["subjectId"], []):
+            matrix._set(ws_membership["groupName"], key)
+
+
 def add_members_to_group(
     group_name: str,
     client: GrouperClient,
@@ -301,7 +1078,7 @@ def add_members_to_group(
             # We're not sure what exactly has happened here,
             # So raise the original SuccessException
             raise err
-    return Group(client, r["WsAddMemberResults"]["wsGroupAssigned"])
+    return client._entity(Group, r["WsAddMemberResults"]["wsGroupAssigned"])
 
 
 def delete_members_from_group(
@@ -368,7 +1145,479 @@ def delete_members_from_group(
             # We're not sure what exactly has happened here,
             # So raise the original SuccessException
             raise err
-    return Group(client, r["WsDeleteMemberResults"]["wsGroup"])
+    return client._entity(Group, r["WsDeleteMemberResults"]["wsGroup"])
+
+
+def bulk_add_members_to_group(
+    group_name: str,
+    client: GrouperClient,
+    subject_identifiers: list[str] = [],
+    subject_ids: list[str] = [],
+    chunk_size: int = 1000,
+    max_concurrency: int = 4,
+    act_as_subject: Subject | None = None,
+) -> dict[str, MemberChangeResult]:
+    """Add a large number of members to a group, reporting a result per subject.
+
+    The subjects are split into chunks of chunk_size, and up to max_concurrency
+    chunks are sent to Grouper at the same time. Unlike add_members_to_group,
+    a subject that cannot be added does not raise an exception, instead the
+    result for that subject says why it was not added. If a chunk fails as a
+    whole, such as when Grouper cannot be reached, its subjects are given
+    MemberChangeResult.ERROR and the exception is logged.
+
+    :param group_name: The group to add members to
+    :type group_name: str
+    :param client: The GrouperClient to use
+    :type client: GrouperClient
+    :param subject_identifiers: Subject identifiers of members to add, defaults to []
+    :type subject_identifiers: list[str], optional
+    :param subject_ids: Subject ids of members to add, defaults to []
+    :type subject_ids: list[str], optional
+    :param chunk_size: The number of subjects to send in each request,
+    defaults to 1000
+    :type chunk_size: int, optional
+    :param max_concurrency: The maximum number of requests to send at the same
+    time, defaults to 4
+    :type max_concurrency: int, optional
+    :param act_as_subject: Optional subject to act as, defaults to None
+    :type act_as_subject: Subject | None, optional
+    :raises GrouperGroupNotFoundException: A group with the given name cannot
+    be found
+    :return: Dict keyed by the given subject identifiers and ids,
+    with the result for each subject
+    :rtype: dict[str, MemberChangeResult]
+    """
+    return _bulk_change_members(
+        "add",
+        group_name,
+        client,
+        subject_identifiers,
+        subject_ids,
+        chunk_size,
+        max_concurrency,
+        act_as_subject,
+    )
+
+
+def bulk_delete_members_from_group(
+    group_name: str,
+    client: GrouperClient,
+    subject_identifiers: list[str] = [],
+    subject_ids: list[str] = [],
+    chunk_size: int = 1000,
+    max_concurrency: int = 4,
+    act_as_subject: Subject | None = None,
+) -> dict[str, MemberChangeResult]:
+    """Remove a large number of members from a group, reporting a result per subject.
+
+    The subjects are split into chunks of chunk_size, and up to max_concurrency
+    chunks are sent to Grouper at the same time. Unlike delete_members_from_group,
+    a subject that cannot be removed does not raise an exception, instead the
+    result for that subject says why it was not removed. If a chunk fails as a
+    whole, such as when Grouper cannot be reached, its subjects are given
+    MemberChangeResult.ERROR and the exception is logged.
+
+    :param group_name: The name of the group to remove members from
+    :type group_name: str
+    :param client: The GrouperClient to use
+    :type client: GrouperClient
+    :param subject_identifiers: Subject identifiers of members to remove, defaults to []
+    :type subject_identifiers: list[str], optional
+    :param subject_ids: Subject ids of members to remove, defaults to []
+    :type subject_ids: list[str], optional
+    :param chunk_size: The number of subjects to send in each request,
+    defaults to 1000
+    :type chunk_size: int, optional
+    :param max_concurrency: The maximum number of requests to send at the same
+    time, defaults to 4
+    :type max_concurrency: int, optional
+    :param act_as_subject: Optional subject to act as, defaults to None
+    :type act_as_subject: Subject | None, optional
+    :raises GrouperGroupNotFoundException: A group with the given name cannot
+    be found
+    :return: Dict keyed by the given subject identifiers and ids,
+    with the result for each subject
+    :rtype: dict[str, MemberChangeResult]
+    """
+    return _bulk_change_members(
+        "delete",
+        group_name,
+        client,
+        subject_identifiers,
+        subject_ids,
+        chunk_size,
+        max_concurrency,
+        act_as_subject,
+    )
+
+
+def sync_members_of_group(
+    group_name: str,
+    client: GrouperClient,
+    subject_identifiers: list[str] = [],
+    subject_ids: list[str] = [],
+    chunk_size: int = 1000,
+    max_concurrency: int = 4,
+    allow_empty: bool = False,
+    allow_missing: bool = False,
+    act_as_subject: Subject | None = None,
+) -> dict[str, MemberChangeResult]:
+    """Make the immediate members of a group match the given subjects.
+
+    The current immediate members of the group are retrieved, and only the
+    subjects that are missing are added, and only the members that are not
+    wanted are removed, rather than replacing the whole membership of the group.
+    Subject identifiers are first looked up to get their subject ids, and
+    members are compared by id, so a wanted member is never removed because
+    its identifier is held in another attribute. Identifiers that cannot be
+    found are given as SUBJECT_NOT_FOUND, and are not added.
+    So that a truncated or empty list of subjects cannot empty the group,
+    no members are removed while any identifier cannot be found, unless
+    allow_missing is True, and ValueError is raised if no subjects are wanted
+    at all, unless allow_empty is True.
+
+    :param group_name: The name of the group to sync members of
+    :type group_name: str
+    :param client: The GrouperClient to use
+    :type client: GrouperClient
+    :param subject_identifiers: Subject identifiers of the wanted members,
+    defaults to []
+    :type subject_identifiers: list[str], optional
+    :param subject_ids: Subject ids of the wanted members, defaults to []
+    :type subject_ids: list[str], optional
+    :param chunk_size: The number of subjects to send in each add or delete
+    request, defaults to 1000
+    :type chunk_size: int, optional
+    :param max_concurrency: The maximum number of requests to send at the same
+    time, defaults to 4
+    :type max_concurrency: int, optional
+    :param allow_empty: Whether to remove every member when no subjects are
+    wanted, defaults to False
+    :type allow_empty: bool, optional
+    :param allow_missing: Whether to remove members that are not wanted even
+    when some subject identifiers cannot be found, defaults to False
+    :type allow_missing: bool, optional
+    :param act_as_subject: Optional subject to act as, defaults to None
+    :type act_as_subject: Subject | None, optional
+    :raises ValueError: No subjects are wanted, and allow_empty is False
+    :raises GrouperGroupNotFoundException: A group with the given name cannot
+    be found
+    :raises GrouperSuccessException: An otherwise unhandled issue with the result
+    :return: Dict with the result for each subject that was added or removed,
+    keyed by the given subject identifier or id for added subjects,
+    and by subject id for removed members. Members that were already correct
+    are not included.
+    :rtype: dict[str, MemberChangeResult]
+    """
+    from .objects.membership import MemberChangeResult
+    from .subject import get_subjects
+
+    current = get_members_for_groups(
+        group_names=[group_name],
+        client=client,
+        member_filter="immediate",
+        resolve_groups=False,
+        act_as_subject=act_as_subject,
+    )
+    found_ids: dict[str, str] = {}
+    if subject_identifiers:
+        lookup = get_subjects(
+            client,
+            subject_identifiers=subject_identifiers,
+            resolve_groups=False,
+            chunk_size=chunk_size,
+            max_concurrency=max_concurrency,
+            act_as_subject=act_as_subject,
+        )
+        found_ids = {ident: subject.id for ident, subject in lookup.found.items()}
+    identifiers_to_add, ids_to_add, ids_to_delete, id_for_key = sync_changes(
+        [member.id for group_members in current.values() for member in group_members],
+        subject_identifiers,
+        subject_ids,
+        found_ids,
+        allow_empty,
+        allow_missing,
+    )
+
+    results = bulk_add_members_to_group(
+        group_name=group_name,
+        client=client,
+        subject_identifiers=identifiers_to_add,
+        subject_ids=ids_to_add,
+        chunk_size=chunk_size,
+        max_concurrency=max_concurrency,
+        act_as_subject=act_as_subject,
+    )
+    # Never remove a member that was just added or found to be a member already
+    kept = {
+        id_for_key[key]
+        for key, result in results.items()
+        if result in (MemberChangeResult.ADDED, MemberChangeResult.ALREADY_MEMBER)
+    }
+    results.update(
+        bulk_delete_members_from_group(
+            group_name=group_name,
+            client=client,
+            subject_ids=[sid for sid in ids_to_delete if sid not in kept],
+            chunk_size=chunk_size,
+            max_concurrency=max_concurrency,
+            act_as_subject=act_as_subject,
+        )
+    )
+    results.update(
+        dict.fromkeys(
+            (ident for ident in subject_identifiers if ident not in found_ids),
+            MemberChangeResult.SUBJECT_NOT_FOUND,
+        )
+    )
+    return results
+
+
+def sync_changes(
+    current_ids: list[str],
+    subject_identifiers: list[str],
+    subject_ids: list[str],
+    found_ids: dict[str, str],
+    allow_empty: bool,
+    allow_missing: bool,
+) -> tuple[list[str], list[str], list[str], dict[str, str]]:
+    """Work out the members to add and remove to sync the members of a group.
+
+    :param current_ids: The subject ids of the current immediate members
+    :type current_ids: list[str]
+    :param subject_identifiers: Subject identifiers of the wanted members
+    :type subject_identifiers: list[str]
+    :param subject_ids: Subject ids of the wanted members
+    :type subject_ids: list[str]
+    :param found_ids: The subject id of each subject identifier that was found
+    :type found_ids: dict[str, str]
+    :param allow_empty: Whether to remove every member if no subjects are wanted
+    :type allow_empty: bool
+    :param allow_missing: Whether to remove members while some subject
+    identifiers were not found
+    :type allow_missing: bool
+    :raises ValueError: No subjects are wanted, but allow_empty is False
+    :return: The subject identifiers and ids to add, the subject ids to remove,
+    and the subject id for each given identifier or id that was found
+    :rtype: tuple[list[str], list[str], list[str], dict[str, str]]
+    """
+    id_for_key = dict(found_ids)
+    id_for_key.update((sid, sid) for sid in subject_ids)
+    wanted_ids = set(id_for_key.values())
+    current = set(current_ids)
+    identifiers_to_add = [
+        ident
+        for ident in dict.fromkeys(subject_identifiers)
+        if ident in found_ids and found_ids[ident] not in current
+    ]
+    ids_to_add = [sid for sid in dict.fromkeys(subject_ids) if sid not in current]
+    ids_to_delete = [sid for sid in current_ids if sid not in wanted_ids]
+    missing = any(ident not in found_ids for ident in subject_identifiers)
+    if missing and not allow_missing:
+        # A member whose identifier was not found may still be wanted,
+        # such as when a lookup attribute is wrong or a source is down
+        ids_to_delete = []
+    if ids_to_delete and not wanted_ids and not allow_empty:
+        raise ValueError(
+            "No wanted subjects were given or found, "
+            "pass allow_empty=True to remove every member"
+        )
+    return identifiers_to_add, ids_to_add, ids_to_delete, id_for_key
+
+
+def _bulk_change_members(
+    action: str,
+    group_name: str,
+    client: GrouperClient,
+    subject_identifiers: list[str],
+    subject_ids: list[str],
+    chunk_size: int,
+    max_concurrency: int,
+    act_as_subject: Subject | None,
+) -> dict[str, MemberChangeResult]:
+    """Add or delete members in chunks, sending chunks on a pool of threads.
+
+    :param action: "add" or "delete"
+    :type action: str
+    :param group_name: The name of the group to change members of
+    :type group_name: str
+    :param client: The GrouperClient to use
+    :type client: GrouperClient
+    :param subject_identifiers: Subject identifiers of members to change
+    :type subject_identifiers: list[str]
+    :param subject_ids: Subject ids of members to change
+    :type subject_ids: list[str]
+    :param chunk_size: The number of subjects to send in each request
+    :type chunk_size: int
+    :param max_concurrency: The maximum number of requests to send at the same time
+    :type max_concurrency: int
+    :param act_as_subject: Optional subject to act as
+    :type act_as_subject: Subject | None
+    :return: Dict keyed by the given subject identifiers and ids,
+    with the result for each subject
+    :rtype: dict[str, MemberChangeResult]
+    """
+    chunks = subject_lookup_chunks(subject_identifiers, subject_ids, chunk_size)
+    if not chunks:
+        return {}
+
+    def change_chunk(
+        chunk: list[tuple[str, dict[str, str]]]
+    ) -> dict[str, MemberChangeResult]:
+        """Send one chunk to Grouper.
+
+        :param chunk: The chunk of subject lookups
+        :type chunk: list[tuple[str, dict[str, str]]]
+        :return: The result for each subject in the chunk
+        :rtype: dict[str, MemberChangeResult]
+        """
+        body = bulk_member_body(action, group_name, chunk)
+        try:
+            r = client._call_grouper("/groups", body, act_as_subject=act_as_subject)
+        except GrouperSuccessException as err:
+            error_result = bulk_member_error_result(action, group_name, err)
+            if error_result is None:
+                return bulk_member_chunk_failed(chunk, err)
+            r = error_result
+        except Exception as err:
+            return bulk_member_chunk_failed(chunk, err)
+        return bulk_member_results(action, chunk, r)
+
+    results: dict[str, MemberChangeResult] = {}
+    max_workers = min(max(max_concurrency, 1), len(chunks))
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        # Run each chunk in a copy of the current context, so retry policy
+        # overrides and tracing spans carry over to the worker threads
+        futures = [
+            pool.submit(copy_context().run, change_chunk, chunk) for chunk in chunks
+        ]
+        for future in futures:
+            results.update(future.result())
+    return results
+
+
+def bulk_member_body(
+    action: str, group_name: str, chunk: list[tuple[str, dict[str, str]]]
+) -> dict[str, Any]:
+    """Build the request body to add or delete one chunk of members.
+
+    :param action: "add" or "delete"
+    :type action: str
+    :param group_name: The name of the group to change members of
+    :type group_name: str
+    :param chunk: The chunk of subject lookups
+    :type chunk: list[tuple[str, dict[str, str]]]
+    :return: The request body
+    :rtype: dict[str, Any]
+    """
+    request_type = _BULK_MEMBER_TYPES[action][0]
+    request: dict[str, Any] = {
+        "subjectLookups": [lookup for _, lookup in chunk],
+        "wsGroupLookup": {"groupName": group_name},
+    }
+    if action == "add":
+        request["replaceAllExisting"] = "F"
+    return {request_type: request}
+
+
+def bulk_member_error_result(
+    action: str, group_name: str, err: GrouperSuccessException
+) -> dict[str, Any] | None:
+    """Get the result of a bulk member request that was not a full success.
+
+    Grouper marks the whole request as failed if any one subject fails,
+    but still includes the per subject results, so those are returned to be
+    reported per subject.
+
+    :param action: "add" or "delete"
+    :type action: str
+    :param group_name: The name of the group that members were changed in
+    :type group_name: str
+    :param err: The exception raised for the request
+    :type err: GrouperSuccessException
+    :raises GrouperGroupNotFoundException: A group with the given name cannot
+    be found
+    :return: The result returned by Grouper,
+    or None if it has no per subject results
+    :rtype: dict[str, Any] | None
+    """
+    r = err.grouper_result
+    result_type = _BULK_MEMBER_TYPES[action][1]
+    if result_type not in r:
+        # Grouper could not process the request at all, such as for a 5xx
+        return None
+    if r[result_type]["resultMetadata"]["resultCode"] == "GROUP_NOT_FOUND":
+        raise GrouperGroupNotFoundException(group_name, r)
+    if "results" not in r[result_type]:  # pragma: no cover
+        return None
+    return r
+
+
+def bulk_member_chunk_failed(
+    chunk: list[tuple[str, dict[str, str]]], err: Exception
+) -> dict[str, MemberChangeResult]:
+    """Give each subject in a chunk that could not be changed the ERROR result.
+
+    The exception is logged, so the results of the other chunks are still
+    returned to the caller.
+
+    :param chunk: The chunk of subject lookups that was sent
+    :type chunk: list[tuple[str, dict[str, str]]]
+    :param err: The exception raised for the chunk
+    :type err: Exception
+    :return: Dict keyed by the given subject identifiers and ids,
+    with MemberChangeResult.ERROR for each subject
+    :rtype: dict[str, MemberChangeResult]
+    """
+    from .objects.membership import MemberChangeResult
+
+    logger.warning("Changing a chunk of %d members failed", len(chunk), exc_info=err)
+    return {key: MemberChangeResult.ERROR for key, _ in chunk}
+
+
+def bulk_member_results(
+    action: str, chunk: list[tuple[str, dict[str, str]]], r: dict[str, Any]
+) -> dict[str, MemberChangeResult]:
+    """Map each subject in a chunk to its result.
+
+    Grouper returns results in the same order as the subject lookups sent.
+    A subject with no result, or with an unknown result code, is given
+    MemberChangeResult.ERROR.
+
+    :param action: "add" or "delete"
+    :type action: str
+    :param chunk: The chunk of subject lookups that was sent
+    :type chunk: list[tuple[str, dict[str, str]]]
+    :param r: The result returned by Grouper
+    :type r: dict[str, Any]
+    :return: Dict keyed by the given subject identifiers and ids,
+    with the result for each subject
+    :rtype: dict[str, MemberChangeResult]
+    """
+    from .objects.membership import MemberChangeResult
+
+    result_codes = {
+        "SUCCESS": (
+            MemberChangeResult.ADDED
+            if action == "add"
+            else MemberChangeResult.DELETED
+        ),
+        "SUCCESS_ALREADY_EXISTED": MemberChangeResult.ALREADY_MEMBER,
+        "SUCCESS_WASNT_IMMEDIATE": MemberChangeResult.NOT_MEMBER,
+        "SUCCESS_WASNT_IMMEDIATE_BUT_HAS_EFFECTIVE": MemberChangeResult.NOT_MEMBER,
+        "SUBJECT_NOT_FOUND": MemberChangeResult.SUBJECT_NOT_FOUND,
+        "INSUFFICIENT_PRIVILEGES": MemberChangeResult.PERMISSION_DENIED,
+    }
+    subject_results = r[_BULK_MEMBER_TYPES[action][1]].get("results", [])
+    results = {}
+    for i, (key, _) in enumerate(chunk):
+        if i < len(subject_results):
+            result_code = subject_results[i]["resultMetadata"]["resultCode"]
+            results[key] = result_codes.get(result_code, MemberChangeResult.ERROR)
+        else:  # pragma: no cover
+            results[key] = MemberChangeResult.ERROR
+    return results
 
 
 def get_members_for_groups(
@@ -392,7 +1641,7 @@ def get_members_for_groups(
     defaults to "all"
     :type member_filter: str, optional
     :param resolve_groups: Whether to resolve subjects that are groups into Group
-    objects, which will require an additional API call per group, defaults to True
+    objects, which will require additional API calls, defaults to True
     :type resolve_groups: bool, optional
     :param act_as_subject: Optional subject to act as, defaults to None
     :type act_as_subject: Subject | None, optional
@@ -405,6 +1654,68 @@ def get_members_for_groups(
     """
     from .objects.group import Group
 
+    r = _get_members_results(
+        group_names=group_names,
+        client=client,
+        attributes=attributes,
+        member_filter=member_filter,
+        act_as_subject=act_as_subject,
+    )
+    r_dict: dict[Group, list[Subject]] = {}
+    subject_attr_names = r["WsGetMembersResults"]["subjectAttributeNames"]
+    results = r["WsGetMembersResults"]["results"]
+    for result in results:
+        if result["resultMetadata"]["success"] != "T":  # pragma: no cover
+            # we don't know what's going on,
+            # so raise a SuccessException
+            raise GrouperSuccessException(r)
+    # Resolve the members of every group together, so subjects that are
+    # groups can be looked up in as few calls as possible
+    member_bodies = [
+        subject for result in results for subject in result.get("wsSubjects", [])
+    ]
+    members = iter(
+        resolve_subjects(
+            subject_bodies=member_bodies,
+            client=client,
+            subject_attr_names=subject_attr_names,
+            resolve_groups=resolve_groups,
+        )
+    )
+    for result in results:
+        key = client._entity(Group, result["wsGroup"])
+        r_dict[key] = [next(members) for _ in result.get("wsSubjects", [])]
+    return r_dict
+
+
+def _get_members_results(
+    group_names: list[str],
+    client: GrouperClient,
+    attributes: list[str],
+    member_filter: str,
+    act_as_subject: Subject | None,
+    paging: dict[str, str] = {},
+) -> dict[str, Any]:
+    """Call Grouper to get members for the given groups, and check the result.
+
+    :param group_names: Group names to retreive members for
+    :type group_names: list[str]
+    :param client: The GrouperClient to use
+    :type client: GrouperClient
+    :param attributes: Additional attributes to retrieve for the Subjects
+    :type attributes: list[str]
+    :param member_filter: Type of mebership to return (all, immediate, effective)
+    :type member_filter: str
+    :param act_as_subject: Optional subject to act as
+    :type act_as_subject: Subject | None
+    :param paging: Paging parameters to add to the request, defaults to {}
+    :type paging: dict[str, str], optional
+    :raises GrouperGroupNotFoundException: A group with the given name cannot
+    be found
+    :raises GrouperSuccessException: An otherwise unhandled issue with the result
+    :return: the full payload returned from Grouper
+    :rtype: dict[str, Any]
+    """
     group_lookup = [{"groupName": group} for group in group_names]
     body = {
         "WsRestGetMembersRequest": {
@@ -412,6 +1723,7 @@ def get_members_for_groups(
             "wsGroupLookups": group_lookup,
             "memberFilter": member_filter,
             "includeSubjectDetail": "T",
+            **paging,
         }
     }
     try:
@@ -444,27 +1756,95 @@ def get_members_for_groups(
         # If we've gotten here, we don't know what's going on,
         # So raise the original SuccessException
         raise err  # pragma: no cover
-    r_dict: dict[Group, list[Subject]] = {}
-    subject_attr_names = r["WsGetMembersResults"]["subjectAttributeNames"]
-    for result in r["WsGetMembersResults"]["results"]:
-        # members: list[Subject] = []
-        key = Group(client, result["wsGroup"])
-        if result["resultMetadata"]["success"] == "T":
-            if "wsSubjects" in result:
-                members = [
-                    resolve_subject(
-                        subject_body=subject,
-                        client=client,
-                        subject_attr_names=subject_attr_names,
-                        resolve_group=resolve_groups,
-                    )
-                    for subject in result["wsSubjects"]
-                ]
-            else:
-                members = []
-            r_dict[key] = members
-        else:  # pragma: no cover
+    return r
+
+
+def iter_members_for_group(
+    group_name: str,
+    client: GrouperClient,
+    attributes: list[str] = [],
+    member_filter: str = "all",
+    resolve_groups: bool = True,
+    page_size: int = 1000,
+    cursor: bool = False,
+    act_as_subject: Subject | None = None,
+) -> Iterator[Subject]:
+    """Iterate over the members of the given group, one page at a time.
+
+    Only one page of members is requested and held at a time, so this can be
+    used for very large groups, and iteration can be stopped at any point
+    without fetching the remaining pages.
+
+    :param group_name: Name of the group to retreive members for
+    :type group_name: str
+    :param client: The GrouperClient to use
+    :type client: GrouperClient
+    :param attributes: Additional attributes to retrieve for the Subjects,
+    defaults to []
+    :type attributes: list[str], optional
+    :param member_filter: Type of mebership to return (all, immediate, effective),
+    defaults to "all"
+    :type member_filter: str, optional
+    :param resolve_groups: Whether to resolve subjects that are groups into Group
+    objects, which will require additional API calls, defaults to True
+    :type resolve_groups: bool, optional
+    :param page_size: The number of members to request per page, defaults to 1000
+    :type page_size: int, optional
+    :param cursor: Whether to use cursor paging (continuing after the id of the
+    last member retrieved) rather than page numbers, defaults to False.
+    Cursor paging avoids the cost of deep page offsets on very large groups.
+    :type cursor: bool, optional
+    :param act_as_subject: Optional subject to act as, defaults to None
+    :type act_as_subject: Subject | None, optional
+    :raises GrouperGroupNotFoundException: A group with the given name cannot
+    be found
+    :raises GrouperSuccessException: An otherwise unhandled issue with the result
+    :return: An iterator over the members of the group
+    :rtype: Iterator[Subject]
+    """
+    paging = {
+        "pageSize": str(page_size),
+        "sortString": "subjectId",
+        "ascending": "T",
+    }
+    if cursor:
+        paging["pageIsCursor"] = "T"
+        paging["pageLastCursorFieldType"] = "string"
+        paging["pageCursorFieldIncludesLastRetrieved"] = "F"
+    else:
+        paging["pageNumber"] = "1"
+    while True:
+        r = _get_members_results(
+            group_names=[group_name],
+            client=client,
+            attributes=attributes,
+            member_filter=member_filter,
+            act_as_subject=act_as_subject,
+            paging=paging,
+        )
+        result = r["WsGetMembersResults"]["results"][0]
+        if result["resultMetadata"]["success"] != "T":  # pragma: no cover
             # we don't know what's going on,
             # so raise a SuccessException
             raise GrouperSuccessException(r)
-    return r_dict
+        page = result.get("wsSubjects", [])
+        # Grouper may answer with fewer members than page_size asks for,
+        # when its maximum page size is smaller, so only an empty page
+        # (or a cursor that does not move on) means there are no more members.
+        # Check before yielding, as a page that does not move the cursor on
+        # repeats members that were already yielded.
+        if not page:
+            return
+        if cursor and paging.get("pageLastCursorField") == page[-1]["id"]:
+            return
+        for member in resolve_subjects(
+            subject_bodies=page,
+            client=client,
+            subject_attr_names=r["WsGetMembersResults"]["subjectAttributeNames"],
+            resolve_groups=resolve_groups,
+        ):
+            yield member
+        if cursor:
+            paging["pageLastCursorField"] = page[-1]["id"]
+        else:
+            paging["pageNumber"] = str(int(paging["pageNumber"]) + 1)
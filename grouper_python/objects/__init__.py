@@ -1,15 +1,26 @@
 """grouper_python.objects, Classes for the grouper_python package."""
 
-from .group import Group, CreateGroup
-from .person import Person
-from .stem import Stem, CreateStem
-from .subject import Subject
-from .privilege import Privilege
-from .membership import Membership, MemberType, MembershipType
+from .group import Group, AsyncGroup, CreateGroup
+from .person import Person, AsyncPerson
+from .stem import Stem, AsyncStem, CreateStem
+from .subject import Subject, AsyncSubject
+from .privilege import Privilege, AsyncPrivilege
+from .membership import (
+    Membership,
+    AsyncMembership,
+    MembershipTable,
+    AsyncMembershipTable,
+    MembershipMatrix,
+    MemberType,
+    MembershipType,
+    MemberChangeResult,
+)
+from .lookup import LookupResult
 from .attribute import (
     AttributeDefinition,
     AttributeDefinitionName,
     AttributeAssignment,
+    AsyncAttributeAssignment,
     AttributeAssignmentValue
 )
 
@@ -22,10 +33,22 @@ __all__ = [
     "CreateGroup",
     "CreateStem",
     "Membership",
+    "MembershipTable",
+    "MembershipMatrix",
     "MemberType",
     "MembershipType",
+    "MemberChangeResult",
     "AttributeDefinition",
     "AttributeDefinitionName",
     "AttributeAssignment",
     "AttributeAssignmentValue",
+    "LookupResult",
+    "AsyncGroup",
+    "AsyncPerson",
+    "AsyncStem",
+    "AsyncSubject",
+    "AsyncPrivilege",
+    "AsyncMembership",
+    "AsyncMembershipTable",
+    "AsyncAttributeAssignment",
 ]
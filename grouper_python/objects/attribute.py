@@ -4,21 +4,24 @@ from __future__ import annotations
 from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:  # pragma: no cover
-    from .group import Group
-    from .stem import Stem
-    from .client import GrouperClient
-    from .subject import Subject
-from dataclasses import dataclass
+    from .group import GroupBase, Group, AsyncGroup
+    from .stem import StemBase, Stem, AsyncStem
+    from .client import GrouperClient, AsyncGrouperClient
+    from .subject import Subject, SubjectBase
+from dataclasses import dataclass, field
+from ..tracing import traced
 from .base import GrouperEntity, GrouperBase
 from ..attribute import assign_attribute
+from ..aio import attribute as aio_attribute
 
 
 @dataclass(slots=True, eq=False)
 class AttributeDefinition(GrouperEntity):
     """AttributeDefinition object representing a Grouper attribute definition.
 
-    :param client: A GrouperClient object containing connection information
-    :type client: GrouperClient
+    :param client: A GrouperClient or AsyncGrouperClient object
+    containing connection information
+    :type client: GrouperClient | AsyncGrouperClient
     :param attribute_def_body: Body of the attribute definition
     as returned by the Grouper API
     :type attribute_def_body: dict[str, str]
@@ -45,7 +48,7 @@ class AttributeDefinition(GrouperEntity):
 
     def __init__(
         self,
-        client: GrouperClient,
+        client: GrouperClient | AsyncGrouperClient,
         attribute_def_body: dict[str, str]
     ) -> None:
         """Construct an AttributeDefinition."""
@@ -61,8 +64,9 @@ class AttributeDefinition(GrouperEntity):
 class AttributeDefinitionName(GrouperEntity):
     """AttributeDefinitionName object representing a Grouper attribute definition name.
 
-    :param client: A GrouperClient object containing connection information
-    :type client: GrouperClient
+    :param client: A GrouperClient or AsyncGrouperClient object
+    containing connection information
+    :type client: GrouperClient | AsyncGrouperClient
     :param attribute_def_name_body: Body of the attribute definition name
     as returned by the Grouper API
     :type attribute_def_name_body: dict[str, str]
@@ -79,7 +83,7 @@ class AttributeDefinitionName(GrouperEntity):
 
     def __init__(
         self,
-        client: GrouperClient,
+        client: GrouperClient | AsyncGrouperClient,
         attribute_def_name_body: dict[str, str],
         attribute_def: AttributeDefinition
     ) -> None:
@@ -104,11 +108,12 @@ class AttributeAssignmentValue:
 
 
 @dataclass(slots=True, eq=False)
-class AttributeAssignment(GrouperBase):
-    """AttributeAssignemtn object representing a Grouper attribute assignment.
+class AttributeAssignmentBase(GrouperBase):
+    """Fields shared by AttributeAssignment and AsyncAttributeAssignment.
 
-    :param client: A GrouperClient object containing connection information
-    :type client: GrouperClient
+    :param client: A GrouperClient or AsyncGrouperClient object
+    containing connection information
+    :type client: GrouperClient | AsyncGrouperClient
     :param assign_body: Body of the assignment as returned by the Grouper API
     :type assign_body: dict[str, Any]
     :param attribute_def: AttributeDefinition object associated with this assignment
@@ -117,9 +122,9 @@ class AttributeAssignment(GrouperBase):
     associated with this assignment
     :type attribute_def_name: AttributeDefinitionName
     :param group: owner group of this assignment, defaults to None
-    :type group: Group | None, optional
+    :type group: GroupBase | None, optional
     :param stem: owner stem of this assignment, defaults to None
-    :type stem: Stem | None, optional
+    :type stem: StemBase | None, optional
     """
 
     attributeAssignDelegatable: str
@@ -132,22 +137,22 @@ class AttributeAssignment(GrouperBase):
     attributeAssignActionName: str
     attributeAssignActionType: str
     id: str
-    owner: Group | Stem
-    group: Group | None
-    stem: Stem | None
+    owner: GroupBase | StemBase
+    group: GroupBase | None
+    stem: StemBase | None
     values: list[AttributeAssignmentValue]
     attribute_definition: AttributeDefinition
     attribute_definition_name: AttributeDefinitionName
 
     def __init__(
         self,
-        client: GrouperClient,
+        client: GrouperClient | AsyncGrouperClient,
         assign_body: dict[str, Any],
         attribute_def: AttributeDefinition,
         attribute_def_name: AttributeDefinitionName,
         *,
-        group: Group | None = None,
-        stem: Stem | None = None
+        group: GroupBase | None = None,
+        stem: StemBase | None = None
     ) -> None:
         """Construct an AttributeAssignment."""
         self.client = client
@@ -174,6 +179,32 @@ class AttributeAssignment(GrouperBase):
         self.attribute_definition = attribute_def
         self.attribute_definition_name = attribute_def_name
 
+
+@dataclass(slots=True, eq=False, init=False)
+class AttributeAssignment(AttributeAssignmentBase):
+    """AttributeAssignemtn object representing a Grouper attribute assignment.
+
+    :param client: A GrouperClient object containing connection information
+    :type client: GrouperClient
+    :param assign_body: Body of the assignment as returned by the Grouper API
+    :type assign_body: dict[str, Any]
+    :param attribute_def: AttributeDefinition object associated with this assignment
+    :type attribute_def: AttributeDefinition
+    :param attribute_def_name: AttributeDefinitionName object
+    associated with this assignment
+    :type attribute_def_name: AttributeDefinitionName
+    :param group: owner group of this assignment, defaults to None
+    :type group: Group | None, optional
+    :param stem: owner stem of this assignment, defaults to None
+    :type stem: Stem | None, optional
+    """
+
+    client: GrouperClient = field(repr=False)
+    owner: Group | Stem
+    group: Group | None
+    stem: Stem | None
+
+    @traced
     def delete(
         self,
         act_as_subject: Subject | None = None,
@@ -190,3 +221,46 @@ class AttributeAssignment(GrouperBase):
             attribute_assign_id=self.id,
             act_as_subject=act_as_subject,
         )
+
+
+@dataclass(slots=True, eq=False, init=False)
+class AsyncAttributeAssignment(AttributeAssignmentBase):
+    """AttributeAssignment object with awaitable methods.
+
+    :param client: An AsyncGrouperClient object containing connection information
+    :type client: AsyncGrouperClient
+    :param assign_body: Body of the assignment as returned by the Grouper API
+    :type assign_body: dict[str, Any]
+    :param attribute_def: AttributeDefinition object associated with this assignment
+    :type attribute_def: AttributeDefinition
+    :param attribute_def_name: AttributeDefinitionName object
+    associated with this assignment
+    :type attribute_def_name: AttributeDefinitionName
+    :param group: owner group of this assignment, defaults to None
+    :type group: AsyncGroup | None, optional
+    :param stem: owner stem of this assignment, defaults to None
+    :type stem: AsyncStem | None, optional
+    """
+
+    client: AsyncGrouperClient = field(repr=False)
+    owner: AsyncGroup | AsyncStem
+    group: AsyncGroup | None
+    stem: AsyncStem | None
+
+    @traced
+    async def delete(
+        self,
+        act_as_subject: SubjectBase | None = None,
+    ) -> None:
+        """Delete this attribute assignment in Grouper.
+
+        :param act_as_subject: Optional subject to act as, defaults to None
+        :type act_as_subject: SubjectBase | None, optional
+        """
+        await aio_attribute.assign_attribute(
+            attribute_assign_type=self.attributeAssignType,
+            assign_operation="remove_attr",
+            client=self.client,
+            attribute_assign_id=self.id,
+            act_as_subject=act_as_subject,
+        )
@@ -1,38 +1,115 @@
 """grouper_python.objects.base, Base classes that other Grouper objects inherit."""
 
 from __future__ import annotations
-from dataclasses import dataclass, fields, field
+from dataclasses import dataclass, fields, field, is_dataclass
 from copy import deepcopy
-from typing import Any, TYPE_CHECKING
+from itertools import islice
+from typing import Any, TYPE_CHECKING, ClassVar, TypeVar
+import builtins
+from collections.abc import Callable, Iterable, Mapping
 
 if TYPE_CHECKING:  # pragma: no cover
-    from .client import GrouperClient
+    from .client import GrouperClient, AsyncGrouperClient
+    from .codec import JSONCodec
+    from typing import IO
+    from weakref import WeakValueDictionary
+
+
+E = TypeVar("E", bound="GrouperEntity")
+
+# Functions to read each field of a lazily built entity from its body
+LazyFields = dict[str, Callable[[Any, dict[str, Any]], Any]]
+_REQUIRED = object()
+# The lazy subclass of each entity class, by class
+_LAZY_CLASSES: dict[type, type] = {}
+# The names of the fields exported by GrouperBase.export, by class
+_EXPORT_FIELDS: dict[type, tuple[str, ...]] = {}
+# Types of field values that are exported as they are
+_PLAIN_TYPES = frozenset({str, int, float, bool, type(None)})
+
+
+def read_body(
+    key: str, default: Any = _REQUIRED
+) -> Callable[[Any, dict[str, Any]], Any]:
+    """Get a function that reads a field of a lazily built entity from its body.
+
+    :param key: The key of the field in the body
+    :type key: str
+    :param default: The value to use if the key is not in the body,
+    defaults to requiring the key
+    :type default: Any, optional
+    :return: Function to read the field, called with the entity and the body
+    :rtype: Callable[[Any, dict[str, Any]], Any]
+    """
+    if default is _REQUIRED:
+        return lambda entity, body: body[key]
+    return lambda entity, body: body.get(key, default)
 
 
 @dataclass(init=False, slots=True)
 class GrouperBase:
     """The root of all Grouper objects."""
 
-    client: GrouperClient = field(repr=False)
+    client: GrouperClient | AsyncGrouperClient = field(repr=False)
 
     def dict(self) -> dict[str, Any]:
         """Return a dictionary representation of this object.
 
-        Note that the GrouperClient object will not be included
-        in the dictionary.
+        Note that the GrouperClient (or AsyncGrouperClient) object
+        will not be included in the dictionary.
+        The values are deep copies, so use export instead when the dictionary
+        will not be changed, such as when serializing many objects.
+        Mappings that are not dicts, such as the SubjectAttributes of a Person,
+        are given as dicts.
 
         :return: A dictionary representation of this object,
         without the GrouperClient
         :rtype: dict[str, Any]
         """
+        # Nested objects (such as the target of a Privilege) are copied once
+        # however many times they appear
+        memo: builtins.dict[int, Any] = {}
         return {
-            field.name: deepcopy(getattr(self, field.name))
+            field.name: _copy_value(getattr(self, field.name), memo)
             for field in fields(self)
             if field.repr
         }
 
+    def export(
+        self, memo: builtins.dict[int, Any] | None = None
+    ) -> builtins.dict[str, Any]:
+        """Return a plain dictionary representation of this object, without copying.
 
-@dataclass(init=False, slots=True)
+        This is much faster than dict for serializing many objects. Nested Grouper
+        objects (such as the target of a Privilege) are exported as dictionaries
+        too, and an object that appears more than once is only exported once,
+        with the same dictionary used each time it appears.
+        Nothing else is copied, so the dictionary shares values such as lists
+        and dicts with this object, and must be treated as read-only.
+
+        :param memo: Objects already exported, to share between several exports,
+        defaults to None
+        :type memo: dict[int, Any] | None, optional
+        :return: A dictionary representation of this object,
+        without the GrouperClient
+        :rtype: dict[str, Any]
+        """
+        if memo is None:
+            memo = {}
+        exported = memo.get(id(self))
+        if exported is not None:
+            result: builtins.dict[str, Any] = exported[1]
+            return result
+        result = {}
+        # The object is kept in the memo, so its id is not reused while
+        # the memo is in use
+        memo[id(self)] = (self, result)
+        for name in _export_fields(type(self)):
+            result[name] = _export_value(getattr(self, name), memo)
+        return result
+
+
+@dataclass(init=False, slots=True, weakref_slot=True)
 class GrouperEntity(GrouperBase):
     """The root of all Grouper entities."""
 
@@ -40,6 +117,23 @@ class GrouperEntity(GrouperBase):
     description: str
     name: str
 
+    # The constructor argument holding the body of the entity, and the key in
+    # that body holding its id. Entities that do not set these are never added
+    # to an identity map.
+    _body_arg: ClassVar[str | None] = None
+    _body_id_key: ClassVar[str] = "id"
+    # How to read each field of a lazily built entity from its body.
+    # Entities that do not set these are never built lazily.
+    _lazy_fields: ClassVar[LazyFields] = {}
+    # The slots added to the lazy subclass of the entity, see lazy_class
+    _lazy_slots: ClassVar[tuple[str, ...]] = ("_body",)
+    # Whether this is the lazy subclass of an entity class
+    _lazy: ClassVar[bool] = False
+
+    if TYPE_CHECKING:
+        # The body of a lazily built entity, that its fields are read from
+        _body: dict[str, Any]
+
     def __hash__(self) -> int:
         """Return a hash of the object's id."""
         return hash(self.id)
@@ -49,3 +143,207 @@ class GrouperEntity(GrouperBase):
         if not isinstance(other, GrouperEntity):
             return NotImplemented
         return self.id == other.id
+
+
+def mapped_entity(
+    identity_map: WeakValueDictionary[tuple[type[GrouperEntity], str], GrouperEntity],
+    cls: type[E],
+    client: GrouperClient | AsyncGrouperClient,
+    *args: Any,
+    **kwargs: Any,
+) -> E:
+    """Return the instance of an entity in an identity map, or build a new one.
+
+    An entity that is already in the map has its fields refreshed
+    from the new body, rather than a new instance being created.
+
+    :param identity_map: The identity map of the client
+    :type identity_map: WeakValueDictionary[tuple[type[GrouperEntity], str],
+    GrouperEntity]
+    :param cls: The class of the entity
+    :type cls: type[E]
+    :param client: The client the entity is being built with
+    :type client: GrouperClient | AsyncGrouperClient
+    :param args: The remaining positional arguments to the constructor
+    :type args: Any
+    :param kwargs: The remaining keyword arguments to the constructor
+    :type kwargs: Any
+    :return: The instance of the entity
+    :rtype: E
+    """
+    # Entity classes take the client and body, but are declared with init=False
+    build: Callable[..., E] = cls
+    if cls._body_arg is None:
+        return build(client, *args, **kwargs)
+    body = args[0] if args else kwargs[cls._body_arg]
+    key = (cls, body[cls._body_id_key])
+    entity = identity_map.get(key)
+    if isinstance(entity, cls):
+        if cls._lazy:
+            # Forget the fields that were read from the previous body
+            for name in cls._lazy_fields:
+                try:
+                    object.__delattr__(entity, name)
+                except AttributeError:
+                    pass
+        init: Callable[..., None] = cls.__init__
+        init(entity, client, *args, **kwargs)
+        return entity
+    new_entity = build(client, *args, **kwargs)
+    identity_map[key] = new_entity
+    return new_entity
+
+
+def lazy_class(cls: type[E]) -> type[E]:
+    """Get the subclass of an entity class that builds its instances lazily.
+
+    Its instances only keep the client and the body they are built from,
+    and read each other field from the body when it is first accessed.
+    The subclass is built from the entity class on first use, with the same
+    name, and uses the _init_lazy method of the class as its constructor.
+    Keeping this out of the entity class itself means entities that are not
+    built lazily pay nothing for it.
+
+    :param cls: The entity class, which must set _lazy_fields
+    :type cls: type[E]
+    :return: The lazy subclass of the entity class
+    :rtype: type[E]
+    """
+    lazy = _LAZY_CLASSES.get(cls)
+    if lazy is None:
+        lazy = _LAZY_CLASSES.setdefault(
+            cls,
+            type(
+                cls.__name__,
+                (cls,),
+                {
+                    "__slots__": cls._lazy_slots,
+                    "__module__": cls.__module__,
+                    "__qualname__": cls.__qualname__,
+                    "__doc__": cls.__doc__,
+                    "__init__": getattr(cls, "_init_lazy"),
+                    "__getattr__": _read_lazy_field,
+                    "_lazy": True,
+                },
+            ),
+        )
+    return lazy
+
+
+def _read_lazy_field(entity: GrouperEntity, name: str) -> Any:
+    """Read a field of a lazily built entity from its body on first access.
+
+    :param entity: The lazily built entity
+    :type entity: GrouperEntity
+    :param name: The name of the attribute
+    :type name: str
+    :raises AttributeError: The attribute does not exist
+    :return: The value of the field
+    :rtype: Any
+    """
+    reader = entity._lazy_fields.get(name)
+    if reader is None:
+        raise AttributeError(
+            f"{type(entity).__name__!r} object has no attribute {name!r}"
+        )
+    value = reader(entity, entity._body)
+    object.__setattr__(entity, name, value)
+    return value
+
+
+def write_json(
+    objects: Iterable[GrouperBase],
+    stream: IO[bytes],
+    codec: JSONCodec | None = None,
+    batch_size: int = 1000,
+) -> None:
+    """Write Grouper objects to a stream as a JSON array.
+
+    The objects are exported as with GrouperBase.export, and encoded and written
+    batch_size at a time, so the whole document is never held in memory.
+    Nested objects that appear more than once in a batch are only exported once.
+
+    :param objects: The objects to write
+    :type objects: Iterable[GrouperBase]
+    :param stream: The binary stream to write to
+    :type stream: IO[bytes]
+    :param codec: The JSONCodec to encode with,
+    defaults to the fastest JSON library installed
+    :type codec: JSONCodec | None, optional
+    :param batch_size: The number of objects to encode at a time, defaults to 1000
+    :type batch_size: int, optional
+    """
+    from .codec import JSONCodec
+
+    codec = codec or JSONCodec()
+    iterator = iter(objects)
+    stream.write(b"[")
+    first = True
+    while batch := list(islice(iterator, batch_size)):
+        memo: dict[int, Any] = {}
+        encoded = codec.dumps([obj.export(memo) for obj in batch])
+        if not first:
+            stream.write(b",")
+        # Write the items of the encoded batch without its brackets
+        stream.write(encoded[1:-1])
+        first = False
+    stream.write(b"]")
+
+
+def _export_fields(cls: type[Any]) -> tuple[str, ...]:
+    """Get the names of the fields of a class that are exported.
+
+    :param cls: The class of the object being exported
+    :type cls: type[Any]
+    :return: The names of the fields to export, those that are shown in its repr
+    :rtype: tuple[str, ...]
+    """
+    names = _EXPORT_FIELDS.get(cls)
+    if names is None:
+        names = _EXPORT_FIELDS[cls] = tuple(
+            field.name for field in fields(cls) if field.repr
+        )
+    return names
+
+
+def _copy_value(value: Any, memo: dict[int, Any]) -> Any:
+    """Copy a field value for GrouperBase.dict.
+
+    :param value: The value of the field
+    :type value: Any
+    :param memo: Objects already copied, for deepcopy
+    :type memo: dict[int, Any]
+    :return: A deep copy of the value, or a dict for other mappings
+    :rtype: Any
+    """
+    if isinstance(value, Mapping) and not isinstance(value, dict):
+        # Such as the SubjectAttributes of a Person
+        return dict(value)
+    return deepcopy(value, memo)
+
+
+def _export_value(value: Any, memo: dict[int, Any]) -> Any:
+    """Export a field value for GrouperBase.export.
+
+    :param value: The value of the field
+    :type value: Any
+    :param memo: Objects already exported
+    :type memo: dict[int, Any]
+    :return: The value, with Grouper objects and other dataclasses exported
+    as dictionaries, and other mappings as dicts
+    :rtype: Any
+    """
+    if type(value) in _PLAIN_TYPES:
+        return value
+    if isinstance(value, GrouperBase):
+        return value.export(memo)
+    if isinstance(value, list):
+        if value and (isinstance(value[0], GrouperBase) or is_dataclass(value[0])):
+            return [_export_value(item, memo) for item in value]
+        return value
+    if isinstance(value, Mapping) and not isinstance(value, dict):
+        # Such as the SubjectAttributes of a Person
+        return dict(value)
+    if is_dataclass(value) and not isinstance(value, type):
+        return {field.name: getattr(value, field.name) for field in fields(value)}
+    return value
@@ -0,0 +1,216 @@
+"""grouper_python.objects.batch - Class definition for HasMemberBatcher."""
+
+from __future__ import annotations
+from typing import Any, TypeVar
+from collections.abc import Awaitable, Callable, Hashable
+from threading import Event, Lock
+import asyncio
+from .exceptions import copy_exception
+
+T = TypeVar("T")
+
+
+class _Batch:
+    """The subjects collected for one has_members request."""
+
+    __slots__ = ("identifiers", "ids", "full", "done", "result", "error")
+
+    def __init__(self, event_type: Callable[[], Any]) -> None:
+        """Construct a _Batch."""
+        self.identifiers: dict[str, None] = {}
+        self.ids: dict[str, None] = {}
+        # Set when the batch is full, and when it has been sent
+        self.full = event_type()
+        self.done = event_type()
+        self.result: dict[str, Any] = {}
+        self.error: BaseException | None = None
+
+    def __len__(self) -> int:
+        """Return the number of subjects in the batch."""
+        return len(self.identifiers) + len(self.ids)
+
+    def results_for(
+        self, subject_identifiers: list[str], subject_ids: list[str], leader: bool
+    ) -> dict[str, Any]:
+        """Get the results of the batch for the given subjects.
+
+        :param subject_identifiers: Subject identifiers to get results for
+        :type subject_identifiers: list[str]
+        :param subject_ids: Subject ids to get results for
+        :type subject_ids: list[str]
+        :param leader: Whether the caller sent the batch, so raises the
+        exception itself rather than a copy of it
+        :type leader: bool
+        :raises BaseException: The exception raised when sending the batch
+        :return: The results for the given subjects
+        :rtype: dict[str, Any]
+        """
+        if self.error is not None:
+            if leader:
+                raise self.error
+            raise copy_exception(self.error) from self.error
+        return {
+            key: self.result[key]
+            for key in (*subject_identifiers, *subject_ids)
+            if key in self.result
+        }
+
+
+class HasMemberBatcher:
+    """Coalesce concurrent membership checks into one request per group.
+
+    When a client has a HasMemberBatcher, has_members and is_member checks
+    made at about the same time for the same group (with the same member_filter
+    and act_as_subject) are collected for up to window seconds, or until
+    max_batch_size subjects have been collected, and then sent to Grouper as a
+    single has_members request. The result for each subject is given back
+    to the caller that asked about it, and if sending the batch fails,
+    each caller raises the exception (or a copy of it, chained from it,
+    for callers other than the one that sent the batch).
+    The first check of a batch waits for
+    the window, so this adds up to window seconds of latency to each check,
+    in return for far fewer requests when many checks are made at once.
+
+    A HasMemberBatcher works for both GrouperClient and AsyncGrouperClient.
+
+    :param window: Seconds to collect checks for before sending a batch,
+    defaults to 0.005
+    :type window: float, optional
+    :param max_batch_size: Number of subjects that sends a batch straight away,
+    defaults to 100
+    :type max_batch_size: int, optional
+    """
+
+    def __init__(self, window: float = 0.005, max_batch_size: int = 100) -> None:
+        """Construct a HasMemberBatcher."""
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self._pending: dict[Hashable, _Batch] = {}
+        self._lock = Lock()
+
+    def run(
+        self,
+        key: Hashable,
+        subject_identifiers: list[str],
+        subject_ids: list[str],
+        send: Callable[[list[str], list[str]], dict[str, T]],
+    ) -> dict[str, T]:
+        """Add subjects to the batch for key, and get their results once sent.
+
+        The caller that starts a batch waits for the window and then sends it,
+        while the other callers wait for it to be sent.
+
+        :param key: The key of the batch, such as the group and member filter
+        :type key: Hashable
+        :param subject_identifiers: Subject identifiers to check
+        :type subject_identifiers: list[str]
+        :param subject_ids: Subject ids to check
+        :type subject_ids: list[str]
+        :param send: Function to send a batch, called with the subject
+        identifiers and ids of the batch
+        :type send: Callable[[list[str], list[str]], dict[str, T]]
+        :return: The results for the given subjects
+        :rtype: dict[str, T]
+        """
+        batch, leader = self._join(key, subject_identifiers, subject_ids, Event)
+        if leader:
+            try:
+                batch.full.wait(self.window)
+                self._close(key, batch)
+                batch.result = send(list(batch.identifiers), list(batch.ids))
+            except BaseException as err:
+                batch.error = err
+            finally:
+                self._close(key, batch)
+                batch.done.set()
+        else:
+            batch.done.wait()
+        return batch.results_for(subject_identifiers, subject_ids, leader)
+
+    async def arun(
+        self,
+        key: Hashable,
+        subject_identifiers: list[str],
+        subject_ids: list[str],
+        send: Callable[[list[str], list[str]], Awaitable[dict[str, T]]],
+    ) -> dict[str, T]:
+        """Add subjects to the batch for key, and get their results once sent.
+
+        Works the same as run, but for an async send function.
+
+        :param key: The key of the batch, such as the group and member filter
+        :type key: Hashable
+        :param subject_identifiers: Subject identifiers to check
+        :type subject_identifiers: list[str]
+        :param subject_ids: Subject ids to check
+        :type subject_ids: list[str]
+        :param send: Async function to send a batch, called with the subject
+        identifiers and ids of the batch
+        :type send: Callable[[list[str], list[str]], Awaitable[dict[str, T]]]
+        :return: The results for the given subjects
+        :rtype: dict[str, T]
+        """
+        batch, leader = self._join(
+            key, subject_identifiers, subject_ids, asyncio.Event
+        )
+        if leader:
+            try:
+                try:
+                    await asyncio.wait_for(batch.full.wait(), self.window)
+                except asyncio.TimeoutError:
+                    pass
+                self._close(key, batch)
+                batch.result = await send(list(batch.identifiers), list(batch.ids))
+            except BaseException as err:
+                batch.error = err
+            finally:
+                self._close(key, batch)
+                batch.done.set()
+        else:
+            await batch.done.wait()
+        return batch.results_for(subject_identifiers, subject_ids, leader)
+
+    def _join(
+        self,
+        key: Hashable,
+        subject_identifiers: list[str],
+        subject_ids: list[str],
+        event_type: Callable[[], Any],
+    ) -> tuple[_Batch, bool]:
+        """Add subjects to the pending batch for key, starting one if needed.
+
+        :param key: The key of the batch
+        :type key: Hashable
+        :param subject_identifiers: Subject identifiers to add
+        :type subject_identifiers: list[str]
+        :param subject_ids: Subject ids to add
+        :type subject_ids: list[str]
+        :param event_type: The type of event to signal the batch with
+        :type event_type: Callable[[], Any]
+        :return: The batch, and whether the caller started it
+        :rtype: tuple[_Batch, bool]
+        """
+        with self._lock:
+            batch = self._pending.get(key)
+            leader = batch is None
+            if batch is None:
+                batch = self._pending[key] = _Batch(event_type)
+            batch.identifiers.update(dict.fromkeys(subject_identifiers))
+            batch.ids.update(dict.fromkeys(subject_ids))
+            if len(batch) >= self.max_batch_size:
+                # Send it now, and start a new batch for any further checks
+                del self._pending[key]
+                batch.full.set()
+        return batch, leader
+
+    def _close(self, key: Hashable, batch: _Batch) -> None:
+        """Stop adding subjects to the given batch.
+
+        :param key: The key of the batch
+        :type key: Hashable
+        :param batch: The batch
+        :type batch: _Batch
+        """
+        with self._lock:
+            if self._pending.get(key) is batch:
+                del self._pending[key]
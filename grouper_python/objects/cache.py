@@ -0,0 +1,213 @@
+"""grouper_python.objects.cache - Class definition for GrouperCache."""
+
+from __future__ import annotations
+from typing import Any, TypeVar, cast
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from threading import Lock
+import time
+from .exceptions import GrouperEntityNotFoundException
+
+T = TypeVar("T")
+
+# The kinds of cached entries that each write request can make stale.
+# Any write not listed here does not change the fields of cached entries.
+_WRITE_INVALIDATES: dict[str, tuple[str, ...]] = {
+    "WsRestGroupSaveRequest": ("group", "subject"),
+    "WsRestGroupDeleteRequest": ("group", "subject"),
+    "WsRestStemSaveRequest": ("stem", "group", "subject"),
+    "WsRestStemDeleteRequest": ("stem", "group", "subject"),
+    # Privileges change what an act as subject is able to see
+    "WsRestAssignGrouperPrivilegesRequest": ("stem", "group", "subject"),
+    "WsRestAssignGrouperPrivilegesLiteRequest": ("stem", "group", "subject"),
+}
+
+
+class GrouperCache:
+    """Read-through cache for the groups, stems and subjects a client gets.
+
+    Entries are kept for a per-kind time to live, and once maxsize entries are
+    cached, the least recently used entry is evicted. Lookups that raise a
+    GrouperEntityNotFoundException are cached too (for negative_ttl), and the
+    exception is raised again for as long as that entry is cached.
+
+    :param maxsize: The maximum number of entries to keep, defaults to 1024
+    :type maxsize: int, optional
+    :param group_ttl: Seconds to keep groups, defaults to 300.0
+    :type group_ttl: float, optional
+    :param stem_ttl: Seconds to keep stems, defaults to 300.0
+    :type stem_ttl: float, optional
+    :param subject_ttl: Seconds to keep subjects, defaults to 300.0
+    :type subject_ttl: float, optional
+    :param negative_ttl: Seconds to keep "not found" results,
+    set to 0 to not cache them, defaults to 60.0
+    :type negative_ttl: float, optional
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        group_ttl: float = 300.0,
+        stem_ttl: float = 300.0,
+        subject_ttl: float = 300.0,
+        negative_ttl: float = 60.0,
+    ) -> None:
+        """Construct a GrouperCache."""
+        self.maxsize = maxsize
+        self.ttls = {"group": group_ttl, "stem": stem_ttl, "subject": subject_ttl}
+        self.negative_ttl = negative_ttl
+        self._entries: OrderedDict[
+            tuple[Hashable, ...], tuple[float, Any, bool]
+        ] = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        """Return the number of entries currently cached."""
+        return len(self._entries)
+
+    def load(self, key: tuple[Hashable, ...], loader: Callable[[], T]) -> T:
+        """Get the value for key, calling loader to load it if not cached.
+
+        The first item of key is the kind of entry ("group", "stem" or "subject"),
+        which sets the time to live for the entry.
+
+        :param key: The key for the entry
+        :type key: tuple[Hashable, ...]
+        :param loader: Function that loads the value when it is not cached
+        :type loader: Callable[[], T]
+        :raises GrouperEntityNotFoundException: The entity was not found,
+        either now or when the cached "not found" result was loaded
+        :return: The cached or loaded value
+        :rtype: T
+        """
+        found, value = self._get(key)
+        if found:
+            return cast(T, value)
+        try:
+            value = loader()
+        except GrouperEntityNotFoundException as err:
+            self._set_missing(key, err)
+            raise
+        self._set(key, value)
+        return value
+
+    async def aload(
+        self, key: tuple[Hashable, ...], loader: Callable[[], Awaitable[T]]
+    ) -> T:
+        """Get the value for key, awaiting loader to load it if not cached.
+
+        Works the same as load, but for an async loader.
+
+        :param key: The key for the entry
+        :type key: tuple[Hashable, ...]
+        :param loader: Async function that loads the value when it is not cached
+        :type loader: Callable[[], Awaitable[T]]
+        :raises GrouperEntityNotFoundException: The entity was not found,
+        either now or when the cached "not found" result was loaded
+        :return: The cached or loaded value
+        :rtype: T
+        """
+        found, value = self._get(key)
+        if found:
+            return cast(T, value)
+        try:
+            value = await loader()
+        except GrouperEntityNotFoundException as err:
+            self._set_missing(key, err)
+            raise
+        self._set(key, value)
+        return value
+
+    def invalidate(self, *kinds: str) -> None:
+        """Remove cached entries of the given kinds, or all entries if none given.
+
+        :param kinds: The kinds of entries to remove ("group", "stem" or "subject")
+        :type kinds: str
+        """
+        with self._lock:
+            if not kinds:
+                self._entries.clear()
+                return
+            for key in [key for key in self._entries if key[0] in kinds]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        """Remove all cached entries."""
+        self.invalidate()
+
+    def invalidate_for_write(self, body: dict[str, Any]) -> None:
+        """Remove cached entries that the given request body could make stale.
+
+        :param body: The body of the request being sent to Grouper
+        :type body: dict[str, Any]
+        """
+        for request_type in body:
+            kinds = _WRITE_INVALIDATES.get(request_type)
+            if kinds:
+                self.invalidate(*kinds)
+
+    def _get(self, key: tuple[Hashable, ...]) -> tuple[bool, Any]:
+        """Look up key, returning whether it was found and its value.
+
+        :param key: The key for the entry
+        :type key: tuple[Hashable, ...]
+        :raises GrouperEntityNotFoundException: A cached "not found" result
+        :return: Whether a live entry was found, and the value if so
+        :rtype: tuple[bool, Any]
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            expires, value, missing = entry
+            if expires <= time.monotonic():
+                del self._entries[key]
+                return False, None
+            self._entries.move_to_end(key)
+        if missing:
+            raise value.with_traceback(None)
+        return True, value
+
+    def _set(self, key: tuple[Hashable, ...], value: Any) -> None:
+        """Cache value for key, for the time to live of its kind.
+
+        :param key: The key for the entry
+        :type key: tuple[Hashable, ...]
+        :param value: The value to cache
+        :type value: Any
+        """
+        self._store(key, self.ttls[str(key[0])], value, False)
+
+    def _set_missing(
+        self, key: tuple[Hashable, ...], err: GrouperEntityNotFoundException
+    ) -> None:
+        """Cache a "not found" result for key.
+
+        :param key: The key for the entry
+        :type key: tuple[Hashable, ...]
+        :param err: The exception raised when loading the entry
+        :type err: GrouperEntityNotFoundException
+        """
+        self._store(key, self.negative_ttl, err, True)
+
+    def _store(
+        self, key: tuple[Hashable, ...], ttl: float, value: Any, missing: bool
+    ) -> None:
+        """Store an entry, evicting the least recently used entries if needed.
+
+        :param key: The key for the entry
+        :type key: tuple[Hashable, ...]
+        :param ttl: Seconds to keep the entry
+        :type ttl: float
+        :param value: The value to cache
+        :type value: Any
+        :param missing: Whether value is a "not found" exception
+        :type missing: bool
+        """
+        if ttl <= 0 or self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value, missing)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
@@ -1,18 +1,63 @@
-"""grouper_python.objects.client - Class definition for GrouperClient."""
+"""grouper_python.objects.client - Class definitions for the Grouper clients."""
 
 from __future__ import annotations
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, TypeVar
 
 if TYPE_CHECKING:  # pragma: no cover
-    from .group import Group
-    from .stem import Stem
-    from .subject import Subject
+    from .group import Group, AsyncGroup
+    from .stem import Stem, AsyncStem
+    from .subject import Subject, SubjectBase, AsyncSubject
+    from .membership import MembershipTable, AsyncMembershipTable, MembershipMatrix
+    from .lookup import LookupResult
+    from .base import GrouperEntity
+    from .cache import GrouperCache
+    from .batch import HasMemberBatcher
+    from .codec import JSONCodec
+    from .retry import RetryPolicy, CircuitBreaker
+    from .stats import CallEvent
+    from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
     from types import TracebackType
+from weakref import WeakValueDictionary
+from contextlib import contextmanager
+from contextvars import ContextVar
+from .stats import CallStats
+from .flight import SingleFlight
+from .base import lazy_class, mapped_entity
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
 import httpx
-from ..util import call_grouper
-from ..group import get_group_by_name, find_group_by_name
+from ..util import call_grouper, stream_grouper, send_event
+from .. import tracing
+from ..tracing import traced
+from ..group import get_group_by_name, find_group_by_name, get_groups_by_names
 from ..stem import get_stem_by_name
-from ..subject import get_subject_by_identifier, find_subjects
+from ..subject import (
+    get_subject_by_identifier,
+    find_subjects,
+    get_subjects,
+    get_groups_for_subjects,
+)
+from ..membership import get_membership_table_for_groups, get_membership_matrix
+from ..aio import (
+    util as aio_util,
+    group as aio_group,
+    membership as aio_membership,
+    stem as aio_stem,
+    subject as aio_subject,
+)
+
+T = TypeVar("T")
+E = TypeVar("E", bound="GrouperEntity")
+
+# The most connections warmup opens, so that it never starts more threads
+# (or requests) at once than a connection pool would reasonably hold
+_MAX_WARMUP_CONNECTIONS = 32
+
+# The RetryPolicy set with retry_policy for each client (by id) in the
+# current context, which calls made by that client use in place of its own
+_retry_overrides: ContextVar[dict[int, RetryPolicy | None]] = ContextVar(
+    "retry_overrides", default={}
+)
 
 
 class GrouperClient:
@@ -33,6 +78,65 @@ class GrouperClient:
     This should be the attribute that holds "usernames" for your instance.
     Defaults to "description".
     :type universal_identifier_attr: str, optional
+    :param identity_map: Whether to keep an identity map of the groups, stems
+    and subjects returned through this client. When True, an entity that has
+    already been returned (and is still referenced elsewhere) is returned again
+    as the same instance, with its fields refreshed from the latest result,
+    rather than as a new object. Defaults to False.
+    :type identity_map: bool, optional
+    :param cache: Optional GrouperCache to use as a read-through cache for
+    get_group, get_stem and get_subject. Writes made through this client
+    invalidate the affected entries. Defaults to None (no caching).
+    :type cache: GrouperCache | None, optional
+    :param max_connections: Maximum number of connections to Grouper to open
+    at the same time, None for no limit, defaults to 100
+    :type max_connections: int | None, optional
+    :param max_keepalive_connections: Maximum number of idle connections to keep
+    open for reuse, None for no limit, defaults to 20
+    :type max_keepalive_connections: int | None, optional
+    :param keepalive_expiry: Seconds to keep an idle connection open for reuse,
+    None to keep it open indefinitely, defaults to 5.0
+    :type keepalive_expiry: float | None, optional
+    :param http2: Whether to use HTTP/2 when Grouper supports it, so that
+    concurrent requests can share one connection. This requires the h2 package,
+    installed with the "http2" extra. Defaults to False.
+    :type http2: bool, optional
+    :param json_codec: Optional JSONCodec used to encode requests and decode
+    results, for example JSONCodec("orjson") for faster handling of large
+    results. Defaults to None (use httpx's standard library JSON handling).
+    :type json_codec: JSONCodec | None, optional
+    :param retry: Optional RetryPolicy for retrying calls that fail with
+    a transient error, defaults to None (make a single attempt)
+    :type retry: RetryPolicy | None, optional
+    :param circuit_breaker: Optional CircuitBreaker to fail calls fast while
+    Grouper is unavailable, defaults to None
+    :type circuit_breaker: CircuitBreaker | None, optional
+    :param event_hooks: Functions to call with a CallEvent after each call to
+    Grouper, with its request type, sizes, times, result code and retries.
+    An exception raised by a hook is logged, and does not affect the call.
+    Defaults to []
+    :type event_hooks: list[Callable[[CallEvent], None]], optional
+    :param transport: Optional httpx transport to send requests with, such as a
+    FakeGrouper from grouper_python.testing for testing and benchmarking offline.
+    The connection pool and http2 options do not apply to a given transport.
+    Defaults to None (send requests over the network).
+    :type transport: httpx.BaseTransport | None, optional
+    :param lazy_entities: Whether to build groups, stems and people lazily.
+    A lazy entity keeps a reference to its body in the result, and only reads
+    each field from it when that field is first accessed, which makes building
+    large listings faster when few fields are used.
+    Defaults to False.
+    :type lazy_entities: bool, optional
+    :param has_member_batcher: Optional HasMemberBatcher to coalesce has_members
+    and is_member checks of the same group, made at about the same time from
+    many threads or tasks, into one request. Defaults to None (send each check
+    straight away).
+    :type has_member_batcher: HasMemberBatcher | None, optional
+    :param single_flight: Whether identical read requests (the same path, body
+    and act as subject) made while one is already in flight should wait for it
+    and share its result, rather than each being sent. Writes are always sent.
+    Defaults to False.
+    :type single_flight: bool, optional
     """
 
     def __init__(
@@ -42,6 +146,20 @@ class GrouperClient:
         password: str,
         timeout: float = 30.0,
         universal_identifier_attr: str = "description",
+        identity_map: bool = False,
+        cache: GrouperCache | None = None,
+        max_connections: int | None = 100,
+        max_keepalive_connections: int | None = 20,
+        keepalive_expiry: float | None = 5.0,
+        http2: bool = False,
+        json_codec: JSONCodec | None = None,
+        retry: RetryPolicy | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        event_hooks: list[Callable[[CallEvent], None]] = [],
+        transport: httpx.BaseTransport | None = None,
+        lazy_entities: bool = False,
+        has_member_batcher: HasMemberBatcher | None = None,
+        single_flight: bool = False,
     ) -> None:
         """Construct a GrouperClient."""
         self.httpx_client = httpx.Client(
@@ -49,8 +167,27 @@ class GrouperClient:
             base_url=grouper_base_url,
             headers={"Content-type": "text/x-json;charset=UTF-8"},
             timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+            http2=http2,
+            transport=transport,
         )
         self.universal_identifier_attr = universal_identifier_attr
+        self.identity_map: (
+            WeakValueDictionary[tuple[type[GrouperEntity], str], GrouperEntity] | None
+        ) = WeakValueDictionary() if identity_map else None
+        self.lazy_entities = lazy_entities
+        self.cache = cache
+        self.json_codec = json_codec
+        self.retry = retry
+        self.circuit_breaker = circuit_breaker
+        self.has_member_batcher = has_member_batcher
+        self.single_flight = SingleFlight() if single_flight else None
+        self.event_hooks = list(event_hooks)
+        self.call_stats = CallStats()
 
     def __enter__(self) -> GrouperClient:
         """Enter the context manager."""
@@ -65,10 +202,88 @@ class GrouperClient:
         """Close the underlying httpx Client and exit the context manager."""
         self.httpx_client.close()
 
+    def __deepcopy__(self, memo: dict[int, Any]) -> GrouperClient:
+        """Return this client, as its connections cannot be copied."""
+        return self
+
     def close(self) -> None:
         """Close the GrouperClient object by closing the underlying httpx Client."""
         self.httpx_client.close()
 
+    def warmup(self, connections: int = 1) -> None:
+        """Open connections to Grouper ahead of time, so they can be reused.
+
+        This sends the given number of requests to the base URL at the same time,
+        so that many connections (including their TLS handshakes) are ready in
+        the pool before a burst of concurrent requests.
+        The responses are discarded and their status is not checked.
+        At most 32 connections are opened.
+
+        :param connections: The number of connections to open, defaults to 1
+        :type connections: int, optional
+        """
+        connections = min(connections, _MAX_WARMUP_CONNECTIONS)
+        if connections < 1:
+            return
+        with ThreadPoolExecutor(max_workers=connections) as pool:
+            for _ in pool.map(lambda _: self.httpx_client.get(""), range(connections)):
+                pass
+
+    @contextmanager
+    def retry_policy(self, retry: RetryPolicy | None) -> Iterator[None]:
+        """Use a different RetryPolicy for the calls made in the enclosed code.
+
+        Calls made by this client inside the with block, including those made
+        concurrently on behalf of a method called inside it, use the given
+        RetryPolicy rather than the one of this client. Other code using this
+        client at the same time, in another thread, is not affected.
+
+        :param retry: The RetryPolicy to use, or None to make a single attempt
+        :type retry: RetryPolicy | None
+        :return: A context manager that uses the given RetryPolicy
+        :rtype: Iterator[None]
+        """
+        token = _retry_overrides.set({**_retry_overrides.get(), id(self): retry})
+        try:
+            yield
+        finally:
+            _retry_overrides.reset(token)
+
+    def _current_retry(self) -> RetryPolicy | None:
+        """Get the RetryPolicy for calls made in the current context.
+
+        :return: The RetryPolicy set with retry_policy,
+        or else the RetryPolicy of this client
+        :rtype: RetryPolicy | None
+        """
+        overrides = _retry_overrides.get()
+        return overrides[id(self)] if id(self) in overrides else self.retry
+
+    def _entity(self, cls: type[E], *args: Any, **kwargs: Any) -> E:
+        """Build an entity from a result with this client.
+
+        If this client builds entities lazily, the entity is an instance of
+        the lazy subclass of the given class (see lazy_class).
+        If this client has an identity map, an entity that is already in it
+        is refreshed from the new body and returned, rather than a new one.
+
+        :param cls: The class of the entity
+        :type cls: type[E]
+        :param args: The remaining positional arguments to the constructor
+        :type args: Any
+        :param kwargs: The remaining keyword arguments to the constructor
+        :type kwargs: Any
+        :return: The entity
+        :rtype: E
+        """
+        if self.lazy_entities and cls._lazy_fields:
+            cls = lazy_class(cls)
+        if self.identity_map is None:
+            build: Callable[..., E] = cls
+            return build(self, *args, **kwargs)
+        return mapped_entity(self.identity_map, cls, self, *args, **kwargs)
+
+    @traced
     def get_group(
         self,
         group_name: str,
@@ -85,10 +300,14 @@ class GrouperClient:
         :return: The group with the given name
         :rtype: Group
         """
-        return get_group_by_name(
-            group_name=group_name, client=self, act_as_subject=act_as_subject
+        return self._cached(
+            ("group", group_name, act_as_subject.id if act_as_subject else None),
+            lambda: get_group_by_name(
+                group_name=group_name, client=self, act_as_subject=act_as_subject
+            ),
         )
 
+    @traced
     def get_groups(
         self,
         group_name: str,
@@ -112,6 +331,51 @@ class GrouperClient:
             group_name=group_name, client=self, stem=stem, act_as_subject=act_as_subject
         )
 
+    @traced
+    def get_groups_by_names(
+        self,
+        group_names: list[str],
+        chunk_size: int = 100,
+        max_concurrency: int = 4,
+        act_as_subject: Subject | None = None,
+    ) -> LookupResult[Group]:
+        """Get many groups by their exact names, in as few API calls as possible.
+
+        The names are looked up in chunks of chunk_size, with one API call per
+        chunk, and up to max_concurrency chunks are sent to Grouper at the same
+        time. Names that cannot be found do not raise an exception,
+        but are listed in the missing names of the result.
+
+        :param group_names: The names of the groups to get
+        :type group_names: list[str]
+        :param chunk_size: The maximum number of groups to look up in one API call,
+        defaults to 100
+        :type chunk_size: int, optional
+        :param max_concurrency: The maximum number of API calls to make at the
+        same time, defaults to 4
+        :type max_concurrency: int, optional
+        :param act_as_subject: Optional subject to act as, defaults to None
+        :type act_as_subject: Subject | None, optional
+        :raises GrouperSuccessException: An otherwise unhandled issue with the result
+        :return: The groups found keyed by name, and the names not found
+        :rtype: LookupResult[Group]
+        """
+        from .lookup import LookupResult
+
+        groups = get_groups_by_names(
+            group_names=group_names,
+            client=self,
+            act_as_subject=act_as_subject,
+            chunk_size=chunk_size,
+            max_concurrency=max_concurrency,
+        )
+        unique_names = dict.fromkeys(group_names)
+        return LookupResult(
+            found={name: groups[name] for name in unique_names if name in groups},
+            missing=[name for name in unique_names if name not in groups],
+        )
+
+    @traced
     def get_stem(self, stem_name: str, act_as_subject: Subject | None = None) -> Stem:
         """Get a stem with the given name.
 
@@ -124,8 +388,12 @@ class GrouperClient:
         :return: The stem with the given name
         :rtype: Stem
         """
-        return get_stem_by_name(stem_name, self, act_as_subject=act_as_subject)
+        return self._cached(
+            ("stem", stem_name, act_as_subject.id if act_as_subject else None),
+            lambda: get_stem_by_name(stem_name, self, act_as_subject=act_as_subject),
+        )
 
+    @traced
     def get_subject(
         self,
         subject_identifier: str,
@@ -152,14 +420,124 @@ class GrouperClient:
         :return: The subject with the given name
         :rtype: Subject
         """
-        return get_subject_by_identifier(
-            subject_identifier=subject_identifier,
+        return self._cached(
+            (
+                "subject",
+                subject_identifier,
+                resolve_group,
+                frozenset(attributes),
+                act_as_subject.id if act_as_subject else None,
+            ),
+            lambda: get_subject_by_identifier(
+                subject_identifier=subject_identifier,
+                client=self,
+                resolve_group=resolve_group,
+                attributes=attributes,
+                act_as_subject=act_as_subject,
+            ),
+        )
+
+    @traced
+    def get_subjects(
+        self,
+        subject_identifiers: list[str] = [],
+        subject_ids: list[str] = [],
+        resolve_groups: bool = True,
+        attributes: list[str] = [],
+        chunk_size: int = 1000,
+        max_concurrency: int = 4,
+        act_as_subject: Subject | None = None,
+    ) -> LookupResult[Subject]:
+        """Get many subjects by identifier or id, in as few API calls as possible.
+
+        The subjects are looked up in chunks of chunk_size, with one API call per
+        chunk, and up to max_concurrency chunks are sent to Grouper at the same
+        time. Subjects that are groups are resolved together, rather than with
+        one API call per group. Subjects that cannot be found do not raise an
+        exception, but are listed in the missing identifiers and ids of the result.
+
+        :param subject_identifiers: Identifiers of subjects to get, defaults to []
+        :type subject_identifiers: list[str], optional
+        :param subject_ids: Ids of subjects to get, defaults to []
+        :type subject_ids: list[str], optional
+        :param resolve_groups: Whether to resolve subjects that are groups into
+        Group objects, which will require additional API calls, defaults to True
+        :type resolve_groups: bool, optional
+        :param attributes: Additional attributes to return for the Subjects,
+        defaults to []
+        :type attributes: list[str], optional
+        :param chunk_size: The maximum number of subjects to look up in one API
+        call, defaults to 1000
+        :type chunk_size: int, optional
+        :param max_concurrency: The maximum number of API calls to make at the
+        same time, defaults to 4
+        :type max_concurrency: int, optional
+        :param act_as_subject: Optional subject to act as, defaults to None
+        :type act_as_subject: Subject | None, optional
+        :raises GrouperSuccessException: An otherwise unhandled issue with the result
+        :return: The subjects found keyed by the given identifier or id,
+        and the identifiers and ids not found
+        :rtype: LookupResult[Subject]
+        """
+        return get_subjects(
             client=self,
-            resolve_group=resolve_group,
+            subject_identifiers=subject_identifiers,
+            subject_ids=subject_ids,
+            resolve_groups=resolve_groups,
             attributes=attributes,
+            chunk_size=chunk_size,
+            max_concurrency=max_concurrency,
             act_as_subject=act_as_subject,
         )
 
+    @traced
+    def get_groups_for_subjects(
+        self,
+        subject_ids: list[str],
+        stem: str | None = None,
+        substems: bool = True,
+        chunk_size: int = 100,
+        max_concurrency: int = 4,
+        act_as_subject: Subject | None = None,
+    ) -> dict[str, list[Group]]:
+        """Get the groups that each of the given subjects is a member of.
+
+        The subjects are sent in chunks of chunk_size, with one API call per
+        chunk, and up to max_concurrency chunks are sent to Grouper at the same
+        time. A group that several subjects are members of is the same Group
+        object in each of their lists.
+
+        :param subject_ids: Subject ids of subjects to get groups
+        :type subject_ids: list[str]
+        :param stem: Optional stem to limit the search to, defaults to None
+        :type stem: str | None, optional
+        :param substems: Whether to look recursively through substems
+        of the given stem (True), or only one level in the given stem (False),
+        defaults to True
+        :type substems: bool, optional
+        :param chunk_size: The maximum number of subjects to send in one API
+        call, defaults to 100
+        :type chunk_size: int, optional
+        :param max_concurrency: The maximum number of API calls to make at the
+        same time, defaults to 4
+        :type max_concurrency: int, optional
+        :param act_as_subject: Optional subject to act as, defaults to None
+        :type act_as_subject: Subject | None, optional
+        :return: Dict keyed by the given subject ids, with the list of groups
+        each subject is a member of, which will be empty if it is in no groups
+        :rtype: dict[str, list[Group]]
+        """
+        return get_groups_for_subjects(
+            subject_ids=subject_ids,
+            client=self,
+            stem=stem,
+            substems=substems,
+            chunk_size=chunk_size,
+            max_concurrency=max_concurrency,
+            act_as_subject=act_as_subject,
+        )
+
+    @traced
     def find_subjects(
         self,
         search_string: str,
@@ -191,12 +569,132 @@ class GrouperClient:
             act_as_subject=act_as_subject,
         )
 
+    @traced
+    def get_membership_table(
+        self,
+        group_names: list[str],
+        attributes: list[str] = [],
+        member_filter: str = "all",
+        act_as_subject: Subject | None = None,
+    ) -> MembershipTable:
+        """Get memberships for the given groups as a columnar MembershipTable.
+
+        This holds far less in memory than getting the memberships of each group,
+        as no object is built per membership. The table can be filtered, grouped
+        and counted, and Membership objects can be built from it when needed.
+
+        :param group_names: Group names to retreive memberships for
+        :type group_names: list[str]
+        :param attributes: Additional attributes to retrieve for the Subjects,
+        defaults to []
+        :type attributes: list[str], optional
+        :param member_filter: Type of mebership to return (all, immediate, effective),
+        defaults to "all"
+        :type member_filter: str, optional
+        :param act_as_subject: Optional subject to act as, defaults to None
+        :type act_as_subject: Subject | None, optional
+        :raises GrouperGroupNotFoundException: A group with the given name cannot
+        be found
+        :raises GrouperSuccessException: An otherwise unhandled issue with the result
+        :return: The memberships of the groups
+        :rtype: MembershipTable
+        """
+        return get_membership_table_for_groups(
+            group_names=group_names,
+            client=self,
+            attributes=attributes,
+            member_filter=member_filter,
+            act_as_subject=act_as_subject,
+        )
+
+    @traced
+    def get_membership_matrix(
+        self,
+        group_names: list[str],
+        subject_identifiers: list[str] = [],
+        subject_ids: list[str] = [],
+        member_filter: str = "all",
+        strategy: str = "auto",
+        chunk_size: int = 100,
+        max_concurrency: int = 4,
+        act_as_subject: Subject | None = None,
+    ) -> MembershipMatrix:
+        """Determine which of the given subjects are members of which groups.
+
+        By default this chooses between memberships requests filtered to the
+        subjects and groups, and has_members requests per group, whichever
+        needs fewer requests for the number of subjects and groups given.
+
+        :param group_names: Names of groups to check members of
+        :type group_names: list[str]
+        :param subject_identifiers: Subject identifiers to check for membership,
+        defaults to []
+        :type subject_identifiers: list[str], optional
+        :param subject_ids: Subject ids to check for membership, defaults to []
+        :type subject_ids: list[str], optional
+        :param member_filter: Type of mebership to check (all, immediate, effective),
+        defaults to "all"
+        :type member_filter: str, optional
+        :param strategy: How to get the memberships
+        ("auto", "memberships" or "has_members"), defaults to "auto"
+        :type strategy: str, optional
+        :param chunk_size: The maximum number of subjects, or groups, to send in
+        one API call, defaults to 100
+        :type chunk_size: int, optional
+        :param max_concurrency: The maximum number of API calls to make at the
+        same time, defaults to 4
+        :type max_concurrency: int, optional
+        :param act_as_subject: Optional subject to act as, defaults to None
+        :type act_as_subject: Subject | None, optional
+        :raises GrouperGroupNotFoundException: A group with the given name cannot
+        be found
+        :raises GrouperSuccessException: An otherwise unhandled issue with the result
+        :return: The matrix of memberships, where subjects that cannot be found
+        are not members of any group
+        :rtype: MembershipMatrix
+        """
+        return get_membership_matrix(
+            group_names=group_names,
+            client=self,
+            subject_identifiers=subject_identifiers,
+            subject_ids=subject_ids,
+            member_filter=member_filter,
+            strategy=strategy,
+            chunk_size=chunk_size,
+            max_concurrency=max_concurrency,
+            act_as_subject=act_as_subject,
+        )
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        """Get statistics of the calls made by this client, per request type.
+
+        See CallStats.summary for the statistics given for each request type.
+        Use call_stats.reset() to start collecting statistics again.
+
+        :return: Dict keyed by request type (such as "WsRestGetMembersRequest"),
+        with the statistics for that type
+        :rtype: dict[str, dict[str, float]]
+        """
+        return self.call_stats.summary()
+
+    def _record_event(self, event: CallEvent) -> None:
+        """Record a finished call in the statistics and pass it to the event hooks.
+
+        :param event: The event for the call
+        :type event: CallEvent
+        """
+        self.call_stats.record(event)
+        tracing.record_call(event)
+        for hook in self.event_hooks:
+            send_event(hook, event)
+
     def _call_grouper(
         self,
         path: str,
         body: dict[str, Any],
         method: str = "POST",
         act_as_subject: Subject | None = None,
+        retry: RetryPolicy | None = None,
     ) -> dict[str, Any]:
         """Call the Grouper API.
 
@@ -208,13 +706,889 @@ class GrouperClient:
         :type method: str, optional
         :param act_as_subject: Optional subject to act as, defaults to None
         :type act_as_subject: Subject | None, optional
+        :param retry: Optional RetryPolicy for this call only,
+        defaults to None (use the RetryPolicy set with retry_policy,
+        or else the RetryPolicy of this client)
+        :type retry: RetryPolicy | None, optional
+        :return: the full payload returned from Grouper
+        :rtype: dict[str, Any]
+        """
+        if self.single_flight is None:
+            return self._send_call(path, body, method, act_as_subject, retry)
+        return self.single_flight.run(
+            (method, path, act_as_subject.id if act_as_subject else None),
+            body,
+            lambda: self._send_call(path, body, method, act_as_subject, retry),
+        )
+
+    def _send_call(
+        self,
+        path: str,
+        body: dict[str, Any],
+        method: str,
+        act_as_subject: Subject | None,
+        retry: RetryPolicy | None,
+    ) -> dict[str, Any]:
+        """Send a call to the Grouper API.
+
+        :param path: API url suffix to call
+        :type path: str
+        :param body: body to be sent with API call
+        :type body: dict[str, Any]
+        :param method: HTTP method
+        :type method: str
+        :param act_as_subject: Optional subject to act as
+        :type act_as_subject: Subject | None
+        :param retry: Optional RetryPolicy for this call only
+        :type retry: RetryPolicy | None
+        :return: the full payload returned from Grouper
+        :rtype: dict[str, Any]
+        """
+        try:
+            with tracing.span(
+                next(iter(body), "call_grouper"),
+                {"http.request.method": method, "url.path": path},
+                client=True,
+            ):
+                return call_grouper(
+                    client=self.httpx_client,
+                    path=path,
+                    body=body,
+                    method=method,
+                    act_as_subject_id=(act_as_subject.id if act_as_subject else None),
+                    codec=self.json_codec,
+                    retry=retry or self._current_retry(),
+                    circuit_breaker=self.circuit_breaker,
+                    on_event=self._record_event,
+                )
+        finally:
+            if self.cache is not None:
+                self.cache.invalidate_for_write(body)
+
+    def _stream_grouper(
+        self,
+        path: str,
+        body: dict[str, Any],
+        stream_paths: list[tuple[str, ...]],
+        act_as_subject: Subject | None = None,
+    ) -> Iterator[list[tuple[tuple[str, ...], Any]]]:
+        """Call the Grouper API, and parse the result as it downloads.
+
+        See stream_grouper in grouper_python.util for what is given.
+        This should only be used for calls that do not make changes.
+        The call is made in a span that lasts until the result has been read,
+        and is only current while a chunk is being read.
+
+        :param path: API url suffix to call
+        :type path: str
+        :param body: body to be sent with API call
+        :type body: dict[str, Any]
+        :param stream_paths: Paths of the arrays in the result to give the items
+        of one at a time
+        :type stream_paths: list[tuple[str, ...]]
+        :param act_as_subject: Optional subject to act as, defaults to None
+        :type act_as_subject: Subject | None, optional
+        :return: An iterator over lists of the (path, value) pairs
+        parsed from each chunk of the result
+        :rtype: Iterator[list[tuple[tuple[str, ...], Any]]]
+        """
+        yield from tracing.span_iter(
+            next(iter(body), "call_grouper"),
+            {"http.request.method": "POST", "url.path": path},
+            stream_grouper(
+                client=self.httpx_client,
+                path=path,
+                body=body,
+                stream_paths=stream_paths,
+                act_as_subject_id=(act_as_subject.id if act_as_subject else None),
+                codec=self.json_codec,
+                retry=self._current_retry(),
+                circuit_breaker=self.circuit_breaker,
+                on_event=self._record_event,
+            ),
+        )
+
+    def _cached(self, key: tuple[Any, ...], loader: Callable[[], T]) -> T:
+        """Get a value through the cache, if this client has one.
+
+        :param key: The cache key, starting with the kind of entity
+        :type key: tuple[Any, ...]
+        :param loader: Function to load the value if it is not cached
+        :type loader: Callable[[], T]
+        :return: The cached or loaded value
+        :rtype: T
+        """
+        if self.cache is None:
+            return loader()
+        return self.cache.load(key, loader)
+
+
+class AsyncGrouperClient:
+    """Async client object for interacting with the grouper API.
+
+    Works like GrouperClient, but uses an httpx AsyncClient, and its methods
+    and the methods of the objects it returns must be awaited.
+
+    :param grouper_base_url: Base URL for web services in your Grouper instance,
+    will end in something like grouper-ws/servicesRest/v2_6_000 where v2_6_000 is
+    the version you are targeting.
+    :type grouper_base_url: str
+    :param username: Username for Basic Auth to Grouper WS
+    :type username: str
+    :param password: Password for Basic Auth to Grouper WS
+    :type password: str
+    :param timeout: Timeout for underlying httpx connections, defaults to 30.0
+    :type timeout: float, optional
+    :param universal_identifier_attr: The subject attribute to treat as a
+    "universal" identifer for subjects of type "person".
+    This should be the attribute that holds "usernames" for your instance.
+    Defaults to "description".
+    :type universal_identifier_attr: str, optional
+    :param identity_map: Whether to keep an identity map of the groups, stems
+    and subjects returned through this client. When True, an entity that has
+    already been returned (and is still referenced elsewhere) is returned again
+    as the same instance, with its fields refreshed from the latest result,
+    rather than as a new object. Defaults to False.
+    :type identity_map: bool, optional
+    :param cache: Optional GrouperCache to use as a read-through cache for
+    get_group, get_stem and get_subject. Writes made through this client
+    invalidate the affected entries. Defaults to None (no caching).
+    :type cache: GrouperCache | None, optional
+    :param max_connections: Maximum number of connections to Grouper to open
+    at the same time, None for no limit, defaults to 100
+    :type max_connections: int | None, optional
+    :param max_keepalive_connections: Maximum number of idle connections to keep
+    open for reuse, None for no limit, defaults to 20
+    :type max_keepalive_connections: int | None, optional
+    :param keepalive_expiry: Seconds to keep an idle connection open for reuse,
+    None to keep it open indefinitely, defaults to 5.0
+    :type keepalive_expiry: float | None, optional
+    :param http2: Whether to use HTTP/2 when Grouper supports it, so that
+    concurrent requests can share one connection. This requires the h2 package,
+    installed with the "http2" extra. Defaults to False.
+    :type http2: bool, optional
+    :param json_codec: Optional JSONCodec used to encode requests and decode
+    results, for example JSONCodec("orjson") for faster handling of large
+    results. Defaults to None (use httpx's standard library JSON handling).
+    :type json_codec: JSONCodec | None, optional
+    :param retry: Optional RetryPolicy for retrying calls that fail with
+    a transient error, defaults to None (make a single attempt)
+    :type retry: RetryPolicy | None, optional
+    :param circuit_breaker: Optional CircuitBreaker to fail calls fast while
+    Grouper is unavailable, defaults to None
+    :type circuit_breaker: CircuitBreaker | None, optional
+    :param event_hooks: Functions to call with a CallEvent after each call to
+    Grouper, with its request type, sizes, times, result code and retries.
+    An exception raised by a hook is logged, and does not affect the call.
+    Defaults to []
+    :type event_hooks: list[Callable[[CallEvent], None]], optional
+    :param transport: Optional httpx transport to send requests with, such as a
+    FakeGrouper from grouper_python.testing for testing and benchmarking offline.
+    The connection pool and http2 options do not apply to a given transport.
+    Defaults to None (send requests over the network).
+    :type transport: httpx.AsyncBaseTransport | None, optional
+    :param lazy_entities: Whether to build groups, stems and people lazily.
+    A lazy entity keeps a reference to its body in the result, and only reads
+    each field from it when that field is first accessed, which makes building
+    large listings faster when few fields are used.
+    Defaults to False.
+    :type lazy_entities: bool, optional
+    :param has_member_batcher: Optional HasMemberBatcher to coalesce has_members
+    and is_member checks of the same group, made at about the same time from
+    many threads or tasks, into one request. Defaults to None (send each check
+    straight away).
+    :type has_member_batcher: HasMemberBatcher | None, optional
+    :param single_flight: Whether identical read requests (the same path, body
+    and act as subject) made while one is already in flight should wait for it
+    and share its result, rather than each being sent. Writes are always sent.
+    Defaults to False.
+    :type single_flight: bool, optional
+    """
+
+    def __init__(
+        self,
+        grouper_base_url: str,
+        username: str,
+        password: str,
+        timeout: float = 30.0,
+        universal_identifier_attr: str = "description",
+        identity_map: bool = False,
+        cache: GrouperCache | None = None,
+        max_connections: int | None = 100,
+        max_keepalive_connections: int | None = 20,
+        keepalive_expiry: float | None = 5.0,
+        http2: bool = False,
+        json_codec: JSONCodec | None = None,
+        retry: RetryPolicy | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        event_hooks: list[Callable[[CallEvent], None]] = [],
+        transport: httpx.AsyncBaseTransport | None = None,
+        lazy_entities: bool = False,
+        has_member_batcher: HasMemberBatcher | None = None,
+        single_flight: bool = False,
+    ) -> None:
+        """Construct an AsyncGrouperClient."""
+        self.httpx_client = httpx.AsyncClient(
+            auth=httpx.BasicAuth(username=username, password=password),
+            base_url=grouper_base_url,
+            headers={"Content-type": "text/x-json;charset=UTF-8"},
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+            http2=http2,
+            transport=transport,
+        )
+        self.universal_identifier_attr = universal_identifier_attr
+        self.identity_map: (
+            WeakValueDictionary[tuple[type[GrouperEntity], str], GrouperEntity] | None
+        ) = WeakValueDictionary() if identity_map else None
+        self.lazy_entities = lazy_entities
+        self.cache = cache
+        self.json_codec = json_codec
+        self.retry = retry
+        self.circuit_breaker = circuit_breaker
+        self.has_member_batcher = has_member_batcher
+        self.single_flight = SingleFlight() if single_flight else None
+        self.event_hooks = list(event_hooks)
+        self.call_stats = CallStats()
+
+    async def __aenter__(self) -> AsyncGrouperClient:
+        """Enter the context manager."""
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Close the underlying httpx AsyncClient and exit the context manager."""
+        await self.httpx_client.aclose()
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> AsyncGrouperClient:
+        """Return this client, as its connections cannot be copied."""
+        return self
+
+    async def close(self) -> None:
+        """Close the AsyncGrouperClient by closing the underlying httpx AsyncClient."""
+        await self.httpx_client.aclose()
+
+    async def warmup(self, connections: int = 1) -> None:
+        """Open connections to Grouper ahead of time, so they can be reused.
+
+        This sends the given number of requests to the base URL at the same time,
+        so that many connections (including their TLS handshakes) are ready in
+        the pool before a burst of concurrent requests.
+        The responses are discarded and their status is not checked.
+        At most 32 connections are opened.
+
+        :param connections: The number of connections to open, defaults to 1
+        :type connections: int, optional
+        """
+        connections = min(connections, _MAX_WARMUP_CONNECTIONS)
+        await asyncio.gather(
+            *(self.httpx_client.get("") for _ in range(connections))
+        )
+
+    @contextmanager
+    def retry_policy(self, retry: RetryPolicy | None) -> Iterator[None]:
+        """Use a different RetryPolicy for the calls made in the enclosed code.
+
+        Calls made by this client inside the with block, including those made
+        concurrently on behalf of a method called inside it, use the given
+        RetryPolicy rather than the one of this client. Other code using this
+        client at the same time, such as in another task, is not affected.
+
+        :param retry: The RetryPolicy to use, or None to make a single attempt
+        :type retry: RetryPolicy | None
+        :return: A context manager that uses the given RetryPolicy
+        :rtype: Iterator[None]
+        """
+        token = _retry_overrides.set({**_retry_overrides.get(), id(self): retry})
+        try:
+            yield
+        finally:
+            _retry_overrides.reset(token)
+
+    def _current_retry(self) -> RetryPolicy | None:
+        """Get the RetryPolicy for calls made in the current context.
+
+        :return: The RetryPolicy set with retry_policy,
+        or else the RetryPolicy of this client
+        :rtype: RetryPolicy | None
+        """
+        overrides = _retry_overrides.get()
+        return overrides[id(self)] if id(self) in overrides else self.retry
+
+    def _entity(self, cls: type[E], *args: Any, **kwargs: Any) -> E:
+        """Build an entity from a result with this client.
+
+        If this client builds entities lazily, the entity is an instance of
+        the lazy subclass of the given class (see lazy_class).
+        If this client has an identity map, an entity that is already in it
+        is refreshed from the new body and returned, rather than a new one.
+
+        :param cls: The class of the entity
+        :type cls: type[E]
+        :param args: The remaining positional arguments to the constructor
+        :type args: Any
+        :param kwargs: The remaining keyword arguments to the constructor
+        :type kwargs: Any
+        :return: The entity
+        :rtype: E
+        """
+        if self.lazy_entities and cls._lazy_fields:
+            cls = lazy_class(cls)
+        if self.identity_map is None:
+            build: Callable[..., E] = cls
+            return build(self, *args, **kwargs)
+        return mapped_entity(self.identity_map, cls, self, *args, **kwargs)
+
+    @traced
+    async def get_group(
+        self,
+        group_name: str,
+        act_as_subject: SubjectBase | None = None,
+    ) -> AsyncGroup:
+        """Get a group with the given name.
+
+        :param group_name: The name of the group to get
+        :type group_name: str
+        :param act_as_subject: Optional subject to act as, defaults to None
+        :type act_as_subject: SubjectBase | None, optional
+        :raises GrouperGroupNotFoundException: A group with the given name cannot
+        be found
+        :return: The group with the given name
+        :rtype: AsyncGroup
+        """
+        return await self._cached(
+            ("group", group_name, act_as_subject.id if act_as_subject else None),
+            lambda: aio_group.get_group_by_name(
+                group_name=group_name, client=self, act_as_subject=act_as_subject
+            ),
+        )
+
+    @traced
+    async def get_groups(
+        self,
+        group_name: str,
+        stem: str | None = None,
+        act_as_subject: SubjectBase | None = None,
+    ) -> list[AsyncGroup]:
+        """Get groups by approximate name.
+
+        :param group_name: The group name to search for
+        :type group_name: str
+        :param stem: Optional stem to limit the search to, defaults to None
+        :type stem: str | None, optional
+        :param act_as_subject: Optional subject to act as, defaults to None
+        :type act_as_subject: SubjectBase | None, optional
+        :raises GrouperStemNotFoundException: The specified stem cannot be found
+        :raises GrouperSuccessException: An otherwise unhandled issue with the result
+        :return: List of found groups, will be an empty list if no groups are found
+        :rtype: list[AsyncGroup]
+        """
+        return await aio_group.find_group_by_name(
+            group_name=group_name, client=self, stem=stem, act_as_subject=act_as_subject
+        )
+
+    @traced
+    async def get_groups_by_names(
+        self,
+        group_names: list[str],
+        chunk_size: int = 100,
+        max_concurrency: int = 4,
+        act_as_subject: SubjectBase | None = None,
+    ) -> LookupResult[AsyncGroup]:
+        """Get many groups by their exact names, in as few API calls as possible.
+
+        The names are looked up in chunks of chunk_size, with one API call per
+        chunk, and up to max_concurrency chunks are sent to Grouper at the same
+        time. Names that cannot be found do not raise an exception,
+        but are listed in the missing names of the result.
+
+        :param group_names: The names of the groups to get
+        :type group_names: list[str]
+        :param chunk_size: The maximum number of groups to look up in one API call,
+        defaults to 100
+        :type chunk_size: int, optional
+        :param max_concurrency: The maximum number of API calls to make at the
+        same time, defaults to 4
+        :type max_concurrency: int, optional
+        :param act_as_subject: Optional subject to act as, defaults to None
+        :type act_as_subject: SubjectBase | None, optional
+        :raises GrouperSuccessException: An otherwise unhandled issue with the result
+        :return: The groups found keyed by name, and the names not found
+        :rtype: LookupResult[AsyncGroup]
+        """
+        from .lookup import LookupResult
+
+        groups = await aio_group.get_groups_by_names(
+            group_names=group_names,
+            client=self,
+            act_as_subject=act_as_subject,
+            chunk_size=chunk_size,
+            max_concurrency=max_concurrency,
+        )
+        unique_names = dict.fromkeys(group_names)
+        return LookupResult(
+            found={name: groups[name] for name in unique_names if name in groups},
+            missing=[name for name in unique_names if name not in groups],
+        )
+
+    @traced
+    async def get_stem(
+        self, stem_name: str, act_as_subject: SubjectBase | None = None
+    ) -> AsyncStem:
+        """Get a stem with the given name.
+
+        :param stem_name: The name of the stem to get
+        :type stem_name: str
+        :param act_as_subject: Optional subject to act as, defaults to None
+        :type act_as_subject: SubjectBase | None, optional
+        :raises GrouperStemNotFoundException: A stem with the given name cannot be found
+        :raises GrouperSuccessException: An otherwise unhandled issue with the result
+        :return: The stem with the given name
+        :rtype: AsyncStem
+        """
+        return await self._cached(
+            ("stem", stem_name, act_as_subject.id if act_as_subject else None),
+            lambda: aio_stem.get_stem_by_name(
+                stem_name, self, act_as_subject=act_as_subject
+            ),
+        )
+
+    @traced
+    async def get_subject(
+        self,
+        subject_identifier: str,
+        resolve_group: bool = True,
+        attributes: list[str] = [],
+        act_as_subject: SubjectBase | None = None,
+    ) -> AsyncSubject:
+        """Get the subject with the given identifier.
+
+        :param subject_identifier:  Identifier of subject to get
+        :type subject_identifier: str
+        :param resolve_group: Whether to resolve subject that is a group into a Group
+        object, which will require an additional API, defaults to True
+        :type resolve_group: bool, optional
+        :param attributes: Additional attributes to return for the Subject,
+        defaults to []
+        :type attributes: list[str], optional
+        :param act_as_subject:  Optional subject to act as, defaults to None
+        :type act_as_subject: SubjectBase | None, optional
+        :raises GrouperSubjectNotFoundException: A subject cannot be found
+        with the given identifier
+        :raises GrouperSuccessException: An otherwise unhandled issue with the result
+        :return: The subject with the given name
+        :return: The subject with the given name
+        :rtype: AsyncSubject
+        """
+        return await self._cached(
+            (
+                "subject",
+                subject_identifier,
+                resolve_group,
+                frozenset(attributes),
+                act_as_subject.id if act_as_subject else None,
+            ),
+            lambda: aio_subject.get_subject_by_identifier(
+                subject_identifier=subject_identifier,
+                client=self,
+                resolve_group=resolve_group,
+                attributes=attributes,
+                act_as_subject=act_as_subject,
+            ),
+        )
+
+    @traced
+    async def get_subjects(
+        self,
+        subject_identifiers: list[str] = [],
+        subject_ids: list[str] = [],
+        resolve_groups: bool = True,
+        attributes: list[str] = [],
+        chunk_size: int = 1000,
+        max_concurrency: int = 4,
+        act_as_subject: SubjectBase | None = None,
+    ) -> LookupResult[AsyncSubject]:
+        """Get many subjects by identifier or id, in as few API calls as possible.
+
+        The subjects are looked up in chunks of chunk_size, with one API call per
+        chunk, and up to max_concurrency chunks are sent to Grouper at the same
+        time. Subjects that are groups are resolved together, rather than with
+        one API call per group. Subjects that cannot be found do not raise an
+        exception, but are listed in the missing identifiers and ids of the result.
+
+        :param subject_identifiers: Identifiers of subjects to get, defaults to []
+        :type subject_identifiers: list[str], optional
+        :param subject_ids: Ids of subjects to get, defaults to []
+        :type subject_ids: list[str], optional
+        :param resolve_groups: Whether to resolve subjects that are groups into
+        AsyncGroup objects, which will require additional API calls, defaults to True
+        :type resolve_groups: bool, optional
+        :param attributes: Additional attributes to return for the Subjects,
+        defaults to []
+        :type attributes: list[str], optional
+        :param chunk_size: The maximum number of subjects to look up in one API
+        call, defaults to 1000
+        :type chunk_size: int, optional
+        :param max_concurrency: The maximum number of API calls to make at the
+        same time, defaults to 4
+        :type max_concurrency: int, optional
+        :param act_as_subject: Optional subject to act as, defaults to None
+        :type act_as_subject: SubjectBase | None, optional
+        :raises GrouperSuccessException: An otherwise unhandled issue with the result
+        :return: The subjects found keyed by the given identifier or id,
+        and the identifiers and ids not found
+        :rtype: LookupResult[AsyncSubject]
+        """
+        return await aio_subject.get_subjects(
+            client=self,
+            subject_identifiers=subject_identifiers,
+            subject_ids=subject_ids,
+            resolve_groups=resolve_groups,
+            attributes=attributes,
+            chunk_size=chunk_size,
+            max_concurrency=max_concurrency,
+            act_as_subject=act_as_subject,
+        )
+
+    @traced
+    async def get_groups_for_subjects(
+        self,
+        subject_ids: list[str],
+        stem: str | None = None,
+        substems: bool = True,
+        chunk_size: int = 100,
+        max_concurrency: int = 4,
+        act_as_subject: SubjectBase | None = None,
+    ) -> dict[str, list[AsyncGroup]]:
+        """Get the groups that each of the given subjects is a member of.
+
+        The subjects are sent in chunks of chunk_size, with one API call per
+        chunk, and up to max_concurrency chunks are sent to Grouper at the same
+        time. A group that several subjects are members of is the same AsyncGroup
+        object in each of their lists.
+
+        :param subject_ids: Subject ids of subjects to get groups
+        :type subject_ids: list[str]
+        :param stem: Optional stem to limit the search to, defaults to None
+        :type stem: str | None, optional
+        :param substems: Whether to look recursively through substems
+        of the given stem (True), or only one level in the given stem (False),
+        defaults to True
+        :type substems: bool, optional
+        :param chunk_size: The maximum number of subjects to send in one API
+        call, defaults to 100
+        :type chunk_size: int, optional
+        :param max_concurrency: The maximum number of API calls to make at the
+        same time, defaults to 4
+        :type max_concurrency: int, optional
+        :param act_as_subject: Optional subject to act as, defaults to None
+        :type act_as_subject: SubjectBase | None, optional
+        :return: Dict keyed by the given subject ids, with the list of groups
+        each subject is a member of, which will be empty if it is in no groups
+        :rtype: dict[str, list[AsyncGroup]]
+        """
+        return await aio_subject.get_groups_for_subjects(
+            subject_ids=subject_ids,
+            client=self,
+            stem=stem,
+            substems=substems,
+            chunk_size=chunk_size,
+            max_concurrency=max_concurrency,
+            act_as_subject=act_as_subject,
+        )
+
+    @traced
+    async def find_subjects(
+        self,
+        search_string: str,
+        resolve_groups: bool = True,
+        attributes: list[str] = [],
+        act_as_subject: SubjectBase | None = None,
+    ) -> list[AsyncSubject]:
+        """Find subjects with the given search string.
+
+        :param search_string: Free-form string tos earch for
+        :type search_string: str
+        :param resolve_groups: Whether to resolve subjects that are groups into Group
+        objects, which will require an additional API call, defaults to True
+        :type resolve_groups: bool, optional
+        :param attributes: Additional attributes to return for the Subject,
+        defaults to []
+        :type attributes: list[str], optional
+        :param act_as_subject: Optional subject to act as, defaults to None
+        :type act_as_subject: SubjectBase | None, optional
+        :raises GrouperSuccessException: An otherwise unhandled issue with the result
+        :return: List of found Subjects, will be an empty list if no subjects are found
+        :rtype: list[AsyncSubject]
+        """
+        return await aio_subject.find_subjects(
+            search_string=search_string,
+            client=self,
+            resolve_groups=resolve_groups,
+            attributes=attributes,
+            act_as_subject=act_as_subject,
+        )
+
+    @traced
+    async def get_membership_table(
+        self,
+        group_names: list[str],
+        attributes: list[str] = [],
+        member_filter: str = "all",
+        act_as_subject: SubjectBase | None = None,
+    ) -> AsyncMembershipTable:
+        """Get memberships for the given groups as a columnar AsyncMembershipTable.
+
+        This holds far less in memory than getting the memberships of each group,
+        as no object is built per membership. The table can be filtered, grouped
+        and counted, and AsyncMembership objects can be built from it when needed.
+
+        :param group_names: Group names to retreive memberships for
+        :type group_names: list[str]
+        :param attributes: Additional attributes to retrieve for the Subjects,
+        defaults to []
+        :type attributes: list[str], optional
+        :param member_filter: Type of mebership to return (all, immediate, effective),
+        defaults to "all"
+        :type member_filter: str, optional
+        :param act_as_subject: Optional subject to act as, defaults to None
+        :type act_as_subject: SubjectBase | None, optional
+        :raises GrouperGroupNotFoundException: A group with the given name cannot
+        be found
+        :raises GrouperSuccessException: An otherwise unhandled issue with the result
+        :return: The memberships of the groups
+        :rtype: AsyncMembershipTable
+        """
+        return await aio_membership.get_membership_table_for_groups(
+            group_names=group_names,
+            client=self,
+            attributes=attributes,
+            member_filter=member_filter,
+            act_as_subject=act_as_subject,
+        )
+
+    @traced
+    async def get_membership_matrix(
+        self,
+        group_names: list[str],
+        subject_identifiers: list[str] = [],
+        subject_ids: list[str] = [],
+        member_filter: str = "all",
+        strategy: str = "auto",
+        chunk_size: int = 100,
+        max_concurrency: int = 4,
+        act_as_subject: SubjectBase | None = None,
+    ) -> MembershipMatrix:
+        """Determine which of the given subjects are members of which groups.
+
+        By default this chooses between memberships requests filtered to the
+        subjects and groups, and has_members requests per group, whichever
+        needs fewer requests for the number of subjects and groups given.
+
+        :param group_names: Names of groups to check members of
+        :type group_names: list[str]
+        :param subject_identifiers: Subject identifiers to check for membership,
+        defaults to []
+        :type subject_identifiers: list[str], optional
+        :param subject_ids: Subject ids to check for membership, defaults to []
+        :type subject_ids: list[str], optional
+        :param member_filter: Type of mebership to check (all, immediate, effective),
+        defaults to "all"
+        :type member_filter: str, optional
+        :param strategy: How to get the memberships
+        ("auto", "memberships" or "has_members"), defaults to "auto"
+        :type strategy: str, optional
+        :param chunk_size: The maximum number of subjects, or groups, to send in
+        one API call, defaults to 100
+        :type chunk_size: int, optional
+        :param max_concurrency: The maximum number of API calls to make at the
+        same time, defaults to 4
+        :type max_concurrency: int, optional
+        :param act_as_subject: Optional subject to act as, defaults to None
+        :type act_as_subject: SubjectBase | None, optional
+        :raises GrouperGroupNotFoundException: A group with the given name cannot
+        be found
+        :raises GrouperSuccessException: An otherwise unhandled issue with the result
+        :return: The matrix of memberships, where subjects that cannot be found
+        are not members of any group
+        :rtype: MembershipMatrix
+        """
+        return await aio_membership.get_membership_matrix(
+            group_names=group_names,
+            client=self,
+            subject_identifiers=subject_identifiers,
+            subject_ids=subject_ids,
+            member_filter=member_filter,
+            strategy=strategy,
+            chunk_size=chunk_size,
+            max_concurrency=max_concurrency,
+            act_as_subject=act_as_subject,
+        )
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        """Get statistics of the calls made by this client, per request type.
+
+        See CallStats.summary for the statistics given for each request type.
+        Use call_stats.reset() to start collecting statistics again.
+
+        :return: Dict keyed by request type (such as "WsRestGetMembersRequest"),
+        with the statistics for that type
+        :rtype: dict[str, dict[str, float]]
+        """
+        return self.call_stats.summary()
+
+    def _record_event(self, event: CallEvent) -> None:
+        """Record a finished call in the statistics and pass it to the event hooks.
+
+        :param event: The event for the call
+        :type event: CallEvent
+        """
+        self.call_stats.record(event)
+        tracing.record_call(event)
+        for hook in self.event_hooks:
+            send_event(hook, event)
+
+    async def _call_grouper(
+        self,
+        path: str,
+        body: dict[str, Any],
+        method: str = "POST",
+        act_as_subject: SubjectBase | None = None,
+        retry: RetryPolicy | None = None,
+    ) -> dict[str, Any]:
+        """Call the Grouper API.
+
+        :param path: API url suffix to call
+        :type path: str
+        :param body: body to be sent with API call
+        :type body: dict[str, Any]
+        :param method: HTTP method, defaults to "POST"
+        :type method: str, optional
+        :param act_as_subject: Optional subject to act as, defaults to None
+        :type act_as_subject: SubjectBase | None, optional
+        :param retry: Optional RetryPolicy for this call only,
+        defaults to None (use the RetryPolicy set with retry_policy,
+        or else the RetryPolicy of this client)
+        :type retry: RetryPolicy | None, optional
         :return: the full payload returned from Grouper
         :rtype: dict[str, Any]
         """
-        return call_grouper(
-            client=self.httpx_client,
-            path=path,
-            body=body,
-            method=method,
-            act_as_subject_id=(act_as_subject.id if act_as_subject else None),
+        if self.single_flight is None:
+            return await self._send_call(path, body, method, act_as_subject, retry)
+        return await self.single_flight.arun(
+            (method, path, act_as_subject.id if act_as_subject else None),
+            body,
+            lambda: self._send_call(path, body, method, act_as_subject, retry),
         )
+
+    async def _send_call(
+        self,
+        path: str,
+        body: dict[str, Any],
+        method: str,
+        act_as_subject: SubjectBase | None,
+        retry: RetryPolicy | None,
+    ) -> dict[str, Any]:
+        """Send a call to the Grouper API.
+
+        :param path: API url suffix to call
+        :type path: str
+        :param body: body to be sent with API call
+        :type body: dict[str, Any]
+        :param method: HTTP method
+        :type method: str
+        :param act_as_subject: Optional subject to act as
+        :type act_as_subject: SubjectBase | None
+        :param retry: Optional RetryPolicy for this call only
+        :type retry: RetryPolicy | None
+        :return: the full payload returned from Grouper
+        :rtype: dict[str, Any]
+        """
+        try:
+            with tracing.span(
+                next(iter(body), "call_grouper"),
+                {"http.request.method": method, "url.path": path},
+                client=True,
+            ):
+                return await aio_util.call_grouper(
+                    client=self.httpx_client,
+                    path=path,
+                    body=body,
+                    method=method,
+                    act_as_subject_id=(act_as_subject.id if act_as_subject else None),
+                    codec=self.json_codec,
+                    retry=retry or self._current_retry(),
+                    circuit_breaker=self.circuit_breaker,
+                    on_event=self._record_event,
+                )
+        finally:
+            if self.cache is not None:
+                self.cache.invalidate_for_write(body)
+
+    async def _stream_grouper(
+        self,
+        path: str,
+        body: dict[str, Any],
+        stream_paths: list[tuple[str, ...]],
+        act_as_subject: SubjectBase | None = None,
+    ) -> AsyncIterator[list[tuple[tuple[str, ...], Any]]]:
+        """Call the Grouper API, and parse the result as it downloads.
+
+        See stream_grouper in grouper_python.aio.util for what is given.
+        This should only be used for calls that do not make changes.
+        The call is made in a span that lasts until the result has been read,
+        and is only current while a chunk is being read.
+
+        :param path: API url suffix to call
+        :type path: str
+        :param body: body to be sent with API call
+        :type body: dict[str, Any]
+        :param stream_paths: Paths of the arrays in the result to give the items
+        of one at a time
+        :type stream_paths: list[tuple[str, ...]]
+        :param act_as_subject: Optional subject to act as, defaults to None
+        :type act_as_subject: SubjectBase | None, optional
+        :return: An iterator over lists of the (path, value) pairs
+        parsed from each chunk of the result
+        :rtype: AsyncIterator[list[tuple[tuple[str, ...], Any]]]
+        """
+        async for parsed in tracing.aspan_iter(
+            next(iter(body), "call_grouper"),
+            {"http.request.method": "POST", "url.path": path},
+            aio_util.stream_grouper(
+                client=self.httpx_client,
+                path=path,
+                body=body,
+                stream_paths=stream_paths,
+                act_as_subject_id=(act_as_subject.id if act_as_subject else None),
+                codec=self.json_codec,
+                retry=self._current_retry(),
+                circuit_breaker=self.circuit_breaker,
+                on_event=self._record_event,
+            ),
+        ):
+            yield parsed
+
+    async def _cached(
+        self, key: tuple[Any, ...], loader: Callable[[], Awaitable[T]]
+    ) -> T:
+        """Get a value through the cache, if this client has one.
+
+        :param key: The cache key, starting with the kind of entity
+        :type key: tuple[Any, ...]
+        :param loader: Async function to load the value if it is not cached
+        :type loader: Callable[[], Awaitable[T]]
+        :return: The cached or loaded value
+        :rtype: T
+        """
+        if self.cache is None:
+            return await loader()
+        return await self.cache.aload(key, loader)
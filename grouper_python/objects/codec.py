@@ -0,0 +1,89 @@
+"""grouper_python.objects.codec - Class definition for JSONCodec."""
+
+from __future__ import annotations
+from typing import Any
+from collections.abc import Callable
+import importlib
+import json
+
+# Backends in order of preference when the backend is "auto"
+_BACKENDS = ("orjson", "msgspec", "json")
+
+
+class JSONCodec:
+    """Encoder and decoder for the JSON sent to and received from Grouper.
+
+    Large results (such as members or memberships of big groups) can spend
+    much of their time being decoded, so a faster JSON library can be used
+    when it is installed. If the requested backend is not installed,
+    the standard library json module is used instead.
+
+    :param backend: The JSON library to use, one of "orjson", "msgspec", "json",
+    or "auto" to use the fastest one installed, defaults to "auto"
+    :type backend: str, optional
+    :raises ValueError: An unknown backend was given
+    """
+
+    def __init__(self, backend: str = "auto") -> None:
+        """Construct a JSONCodec."""
+        if backend != "auto" and backend not in _BACKENDS:
+            raise ValueError(f"Unknown JSON backend: {backend}")
+        candidates = _BACKENDS if backend == "auto" else (backend, "json")
+        for candidate in candidates:
+            functions = _load_backend(candidate)
+            if functions is not None:
+                self.backend = candidate
+                self._dumps, self._loads = functions
+                return
+
+    def __repr__(self) -> str:
+        """Return a representation of the codec including its backend."""
+        return f"JSONCodec(backend={self.backend!r})"
+
+    def dumps(self, obj: Any) -> bytes:
+        """Encode an object to JSON.
+
+        :param obj: The object to encode
+        :type obj: Any
+        :return: The UTF-8 encoded JSON
+        :rtype: bytes
+        """
+        return self._dumps(obj)
+
+    def loads(self, data: bytes | str) -> Any:
+        """Decode JSON to an object.
+
+        :param data: The JSON to decode
+        :type data: bytes | str
+        :return: The decoded object
+        :rtype: Any
+        """
+        return self._loads(data)
+
+
+def _load_backend(
+    backend: str,
+) -> tuple[Callable[[Any], bytes], Callable[[bytes | str], Any]] | None:
+    """Get the encode and decode functions for a backend, if it is installed.
+
+    :param backend: The name of the backend
+    :type backend: str
+    :return: The encode and decode functions, or None if not installed
+    :rtype: tuple[Callable[[Any], bytes], Callable[[bytes | str], Any]] | None
+    """
+    if backend == "json":
+        return (
+            lambda obj: json.dumps(
+                obj, ensure_ascii=False, separators=(",", ":"), allow_nan=False
+            ).encode("utf-8"),
+            json.loads,
+        )
+    try:
+        module = importlib.import_module(
+            "msgspec.json" if backend == "msgspec" else backend
+        )
+    except ImportError:
+        return None
+    if backend == "msgspec":
+        return module.encode, module.decode
+    return module.dumps, module.loads
@@ -1,6 +1,8 @@
 """grouper_python.objects.exceptions - Exceptions for the grouper_python package."""
 
-from typing import Any
+from typing import Any, TypeVar
+
+E = TypeVar("E", bound=BaseException)
 
 
 class GrouperException(Exception):
@@ -72,3 +74,34 @@ class GrouperStemNotFoundException(GrouperEntityNotFoundException):
         """Initialize Exception with stem name and Grouper result body."""
         self.stem_name = stem_name
         super().__init__(stem_name, grouper_result)
+
+
+class GrouperCircuitOpenException(GrouperException):
+    """Calls to Grouper are failing fast because the circuit breaker is open."""
+
+    def __init__(self, retry_in: float) -> None:
+        """Initialize Exception with the seconds until a call will be tried."""
+        self.retry_in = retry_in
+        super().__init__(
+            f"Grouper appears to be unavailable, retrying in {retry_in:.1f} seconds"
+        )
+
+
+def copy_exception(err: E) -> E:
+    """Copy an exception, so that another caller can raise it.
+
+    Raising an exception sets its traceback and context, so when several
+    callers share the outcome of one call, each caller other than the one
+    that made the call raises its own copy, chained from the original.
+    The copy is made without calling __init__, as the arguments it was
+    constructed with are not always kept.
+
+    :param err: The exception to copy
+    :type err: E
+    :return: A copy of the exception, with the same type, args and attributes
+    :rtype: E
+    """
+    copy: E = err.__class__.__new__(err.__class__, *err.args)
+    copy.args = err.args
+    copy.__dict__.update(err.__dict__)
+    return copy
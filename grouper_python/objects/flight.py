@@ -0,0 +1,209 @@
+"""grouper_python.objects.flight - Class definition for SingleFlight."""
+
+from __future__ import annotations
+from typing import Any
+from collections.abc import Awaitable, Callable, Hashable
+from threading import Event, Lock
+import asyncio
+import json
+from .exceptions import copy_exception
+
+# Requests that only read from Grouper, so identical requests made at the
+# same time can share one call. Any request not listed here is always sent.
+_READ_REQUESTS = frozenset(
+    {
+        "WsRestFindAttributeDefNamesLiteRequest",
+        "WsRestFindAttributeDefsLiteRequest",
+        "WsRestFindGroupsLiteRequest",
+        "WsRestFindGroupsRequest",
+        "WsRestFindStemsLiteRequest",
+        "WsRestGetAttributeAssignmentsRequest",
+        "WsRestGetGrouperPrivilegesLiteRequest",
+        "WsRestGetMembersRequest",
+        "WsRestGetMembershipsRequest",
+        "WsRestGetSubjectsRequest",
+        "WsRestHasMemberRequest",
+    }
+)
+
+
+class _Flight:
+    """A call that is in flight, and the callers waiting for it."""
+
+    __slots__ = ("done", "result", "error", "abandoned")
+
+    def __init__(self, event_type: Callable[[], Any]) -> None:
+        """Construct a _Flight."""
+        self.done = event_type()
+        self.result: dict[str, Any] = {}
+        self.error: Exception | None = None
+        # Whether the caller making the call stopped without an outcome
+        # to share, so the waiting callers must make the call themselves
+        self.abandoned = False
+
+
+class SingleFlight:
+    """Share one call between identical read requests made at the same time.
+
+    While a read request is in flight, an identical request (the same
+    method, path, body and act as subject) waits for it to finish and gets
+    the same result, or raises a copy of the same exception (chained from it),
+    rather than being sent again. Writes are never shared, and every write is sent.
+    If the caller making the call is cancelled or interrupted (raising a
+    BaseException that is not an Exception), that is only raised to that
+    caller, and the waiting callers make the call again.
+
+    The result given to each caller is the same object, so it must not be
+    changed by the caller.
+    """
+
+    def __init__(self) -> None:
+        """Construct a SingleFlight."""
+        self._flights: dict[Hashable, _Flight] = {}
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        """Return the number of calls in flight."""
+        return len(self._flights)
+
+    def run(
+        self,
+        key: tuple[Hashable, ...],
+        body: dict[str, Any],
+        call: Callable[[], dict[str, Any]],
+    ) -> dict[str, Any]:
+        """Make a call, or wait for the identical call already in flight.
+
+        :param key: The parts of the request other than the body,
+        such as the method, path and act as subject
+        :type key: tuple[Hashable, ...]
+        :param body: The body of the request
+        :type body: dict[str, Any]
+        :param call: Function that makes the call
+        :type call: Callable[[], dict[str, Any]]
+        :return: The result of the call
+        :rtype: dict[str, Any]
+        """
+        if not _is_read(body):
+            return call()
+        key = (*key, _canonical(body))
+        while True:
+            flight, leader = self._join(key, Event)
+            if leader:
+                try:
+                    flight.result = call()
+                except Exception as err:
+                    flight.error = err
+                except BaseException:
+                    flight.abandoned = True
+                    raise
+                finally:
+                    self._land(key, flight)
+                break
+            flight.done.wait()
+            if not flight.abandoned:
+                break
+        if flight.error is not None:
+            if leader:
+                raise flight.error
+            raise copy_exception(flight.error) from flight.error
+        return flight.result
+
+    async def arun(
+        self,
+        key: tuple[Hashable, ...],
+        body: dict[str, Any],
+        call: Callable[[], Awaitable[dict[str, Any]]],
+    ) -> dict[str, Any]:
+        """Make a call, or wait for the identical call already in flight.
+
+        Works the same as run, but for an async call.
+
+        :param key: The parts of the request other than the body,
+        such as the method, path and act as subject
+        :type key: tuple[Hashable, ...]
+        :param body: The body of the request
+        :type body: dict[str, Any]
+        :param call: Async function that makes the call
+        :type call: Callable[[], Awaitable[dict[str, Any]]]
+        :return: The result of the call
+        :rtype: dict[str, Any]
+        """
+        if not _is_read(body):
+            return await call()
+        key = (*key, _canonical(body))
+        while True:
+            flight, leader = self._join(key, asyncio.Event)
+            if leader:
+                try:
+                    flight.result = await call()
+                except Exception as err:
+                    flight.error = err
+                except BaseException:
+                    flight.abandoned = True
+                    raise
+                finally:
+                    self._land(key, flight)
+                break
+            await flight.done.wait()
+            if not flight.abandoned:
+                break
+        if flight.error is not None:
+            if leader:
+                raise flight.error
+            raise copy_exception(flight.error) from flight.error
+        return flight.result
+
+    def _join(
+        self, key: Hashable, event_type: Callable[[], Any]
+    ) -> tuple[_Flight, bool]:
+        """Get the call in flight for key, starting one if there is none.
+
+        :param key: The key of the request
+        :type key: Hashable
+        :param event_type: The type of event to signal the end of the call with
+        :type event_type: Callable[[], Any]
+        :return: The call, and whether the caller started it
+        :rtype: tuple[_Flight, bool]
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                return flight, False
+            flight = self._flights[key] = _Flight(event_type)
+            return flight, True
+
+    def _land(self, key: Hashable, flight: _Flight) -> None:
+        """Finish a call, so that later requests are sent again.
+
+        :param key: The key of the request
+        :type key: Hashable
+        :param flight: The call
+        :type flight: _Flight
+        """
+        with self._lock:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+        flight.done.set()
+
+
+def _is_read(body: dict[str, Any]) -> bool:
+    """Determine whether a request only reads from Grouper.
+
+    :param body: The body of the request
+    :type body: dict[str, Any]
+    :return: True if the request is a read
+    :rtype: bool
+    """
+    return bool(body) and all(request_type in _READ_REQUESTS for request_type in body)
+
+
+def _canonical(body: dict[str, Any]) -> str:
+    """Encode a request body the same way for any order of its keys.
+
+    :param body: The body of the request
+    :type body: dict[str, Any]
+    :return: The canonical JSON encoding of the body
+    :rtype: str
+    """
+    return json.dumps(body, sort_keys=True, separators=(",", ":"))
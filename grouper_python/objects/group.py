@@ -1,33 +1,53 @@
 """grouper_python.objects.subject - Class definition for Group and related objects."""
 
 from __future__ import annotations
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, ClassVar
 
 if TYPE_CHECKING:  # pragma: no cover
-    from .membership import Membership, HasMember
-    from .client import GrouperClient
-    from .privilege import Privilege
-    from .attribute import AttributeAssignment
-from .subject import Subject
+    from .membership import (
+        Membership,
+        AsyncMembership,
+        HasMember,
+        MemberChangeResult,
+    )
+    from .client import GrouperClient, AsyncGrouperClient
+    from .privilege import Privilege, AsyncPrivilege
+    from .attribute import AttributeAssignment, AsyncAttributeAssignment
+    from collections.abc import Iterator, AsyncIterator
+from .subject import SubjectBase, Subject, AsyncSubject
+from .base import LazyFields, read_body
 from dataclasses import dataclass
+from ..tracing import traced
 from ..membership import (
     get_members_for_groups,
     get_memberships_for_groups,
     add_members_to_group,
     delete_members_from_group,
+    bulk_add_members_to_group,
+    bulk_delete_members_from_group,
+    sync_members_of_group,
     has_members,
+    iter_members_for_group,
+    iter_memberships_for_group,
 )
 from ..attribute import assign_attribute, get_attribute_assignments
 from ..privilege import assign_privileges, get_privileges
 from ..group import delete_groups
+from ..aio import (
+    membership as aio_membership,
+    attribute as aio_attribute,
+    privilege as aio_privilege,
+    group as aio_group,
+)
 
 
 @dataclass(slots=True, eq=False)
-class Group(Subject):
-    """Group object representing a Grouper group.
+class GroupBase(SubjectBase):
+    """Fields shared by Group and AsyncGroup.
 
-    :param client: A GrouperClient object containing connection information
-    :type client: GrouperClient
+    :param client: A GrouperClient or AsyncGrouperClient object
+    containing connection information
+    :type client: GrouperClient | AsyncGrouperClient
     :param group_body: Body of the group as returned by the Grouper API
     :type group_body: dict[str, Any]
     """
@@ -41,9 +61,27 @@ class Group(Subject):
     idIndex: str
     detail: dict[str, Any] | None
 
+    _body_arg: ClassVar[str] = "group_body"
+    _body_id_key: ClassVar[str] = "uuid"
+    _lazy_fields: ClassVar[LazyFields] = {
+        "id": read_body("uuid"),
+        "description": read_body("description", ""),
+        "universal_identifier": read_body("name"),
+        "sourceId": lambda group, body: "g:gsa",
+        "name": read_body("name"),
+        "extension": read_body("extension"),
+        "displayName": read_body("displayName"),
+        "uuid": read_body("uuid"),
+        "enabled": read_body("enabled"),
+        "displayExtension": read_body("displayExtension"),
+        "typeOfGroup": read_body("typeOfGroup"),
+        "idIndex": read_body("idIndex"),
+        "detail": read_body("detail", None),
+    }
+
     def __init__(
         self,
-        client: GrouperClient,
+        client: GrouperClient | AsyncGrouperClient,
         group_body: dict[str, Any],
     ) -> None:
         """Construct a Group."""
@@ -62,6 +100,27 @@ class Group(Subject):
         self.detail = group_body.get("detail")
         self.client = client
 
+    def _init_lazy(
+        self,
+        client: GrouperClient | AsyncGrouperClient,
+        group_body: dict[str, Any],
+    ) -> None:
+        """Construct a lazily built Group, see lazy_class."""
+        self.client = client
+        self._body = group_body
+
+
+@dataclass(slots=True, eq=False, init=False)
+class Group(Subject, GroupBase):
+    """Group object representing a Grouper group.
+
+    :param client: A GrouperClient object containing connection information
+    :type client: GrouperClient
+    :param group_body: Body of the group as returned by the Grouper API
+    :type group_body: dict[str, Any]
+    """
+
+    @traced
     def get_members(
         self,
         attributes: list[str] = [],
@@ -78,7 +137,7 @@ class Group(Subject):
         defaults to "all"
         :type member_filter: str, optional
         :param resolve_groups: Whether to resolve subjects that are groups into Group
-        objects, which will require an additional API call per group, defaults to True
+        objects, which will require additional API calls, defaults to True
         :type resolve_groups: bool, optional
         :param act_as_subject: Optional subject to act as, defaults to None
         :type act_as_subject: Subject | None, optional
@@ -95,6 +154,53 @@ class Group(Subject):
         )
         return members[self]
 
+    def iter_members(
+        self,
+        attributes: list[str] = [],
+        member_filter: str = "all",
+        resolve_groups: bool = True,
+        page_size: int = 1000,
+        cursor: bool = False,
+        act_as_subject: Subject | None = None,
+    ) -> Iterator[Subject]:
+        """Iterate over the members of this Group, one page at a time.
+
+        Use this with "for" rather than get_members for very large groups.
+        Only one page of members is held at a time, and stopping iteration
+        early will not fetch the remaining pages.
+
+        :param attributes: Additional attributes to retrieve for the Subjects,
+        defaults to []
+        :type attributes: list[str], optional
+        :param member_filter: Type of mebership to return (all, immediate, effective),
+        defaults to "all"
+        :type member_filter: str, optional
+        :param resolve_groups: Whether to resolve subjects that are groups into Group
+        objects, which will require additional API calls, defaults to True
+        :type resolve_groups: bool, optional
+        :param page_size: The number of members to request per page,
+        defaults to 1000
+        :type page_size: int, optional
+        :param cursor: Whether to use cursor paging rather than page numbers,
+        defaults to False
+        :type cursor: bool, optional
+        :param act_as_subject: Optional subject to act as, defaults to None
+        :type act_as_subject: Subject | None, optional
+        :return: An iterator over the members of this group
+        :rtype: Iterator[Subject]
+        """
+        return iter_members_for_group(
+            group_name=self.name,
+            client=self.client,
+            attributes=attributes,
+            member_filter=member_filter,
+            resolve_groups=resolve_groups,
+            page_size=page_size,
+            cursor=cursor,
+            act_as_subject=act_as_subject,
+        )
+
+    @traced
     def get_memberships(
         self,
         attributes: list[str] = [],
@@ -113,7 +219,7 @@ class Group(Subject):
         defaults to "all"
         :type member_filter: str, optional
         :param resolve_groups: Whether to resolve subjects that are groups into Group
-        objects, which will require an additional API call per group, defaults to True
+        objects, which will require additional API calls, defaults to True
         :type resolve_groups: bool, optional
         :param act_as_subject: Optional subject to act as, defaults to None
         :type act_as_subject: Subject | None, optional
@@ -130,6 +236,49 @@ class Group(Subject):
         )
         return memberships[self] if memberships else []
 
+    def iter_memberships(
+        self,
+        attributes: list[str] = [],
+        member_filter: str = "all",
+        resolve_groups: bool = True,
+        page_size: int = 1000,
+        act_as_subject: Subject | None = None,
+    ) -> Iterator[Membership]:
+        """Iterate over the memberships of this Group, one page at a time.
+
+        Use this with "for" rather than get_memberships for very large groups.
+        Each page is parsed as it is received, and only one page is held
+        at a time. Stopping iteration early will not fetch the remaining pages.
+        Memberships are not given in any particular order.
+
+        :param attributes: Additional attributes to retrieve for the Subjects,
+        defaults to []
+        :type attributes: list[str], optional
+        :param member_filter: Type of mebership to return (all, immediate, effective),
+        defaults to "all"
+        :type member_filter: str, optional
+        :param resolve_groups: Whether to resolve subjects that are groups into Group
+        objects, which will require additional API calls, defaults to True
+        :type resolve_groups: bool, optional
+        :param page_size: The number of memberships to request per page,
+        defaults to 1000
+        :type page_size: int, optional
+        :param act_as_subject: Optional subject to act as, defaults to None
+        :type act_as_subject: Subject | None, optional
+        :return: An iterator over the memberships of this group
+        :rtype: Iterator[Membership]
+        """
+        return iter_memberships_for_group(
+            group_name=self.name,
+            client=self.client,
+            attributes=attributes,
+            member_filter=member_filter,
+            resolve_groups=resolve_groups,
+            page_size=page_size,
+            act_as_subject=act_as_subject,
+        )
+
+    @traced
     def create_privilege_on_this(
         self,
         entity_identifier: str,
@@ -155,6 +304,7 @@ class Group(Subject):
             act_as_subject=act_as_subject,
         )
 
+    @traced
     def delete_privilege_on_this(
         self,
         entity_identifier: str,
@@ -180,6 +330,7 @@ class Group(Subject):
             act_as_subject=act_as_subject,
         )
 
+    @traced
     def create_privileges_on_this(
         self,
         entity_identifiers: list[str],
@@ -206,6 +357,7 @@ class Group(Subject):
             act_as_subject=act_as_subject,
         )
 
+    @traced
     def delete_privileges_on_this(
         self,
         entity_identifiers: list[str],
@@ -232,6 +384,7 @@ class Group(Subject):
             act_as_subject=act_as_subject,
         )
 
+    @traced
     def get_privileges_on_this(
         self,
         subject_id: str | None = None,
@@ -269,6 +422,7 @@ class Group(Subject):
             act_as_subject=act_as_subject,
         )
 
+    @traced
     def add_members(
         self,
         subject_identifiers: list[str] = [],
@@ -300,6 +454,7 @@ class Group(Subject):
             act_as_subject=act_as_subject,
         )
 
+    @traced
     def delete_members(
         self,
         subject_identifiers: list[str] = [],
@@ -326,6 +481,151 @@ class Group(Subject):
             act_as_subject=act_as_subject,
         )
 
+    @traced
+    def bulk_add_members(
+        self,
+        subject_identifiers: list[str] = [],
+        subject_ids: list[str] = [],
+        chunk_size: int = 1000,
+        max_concurrency: int = 4,
+        act_as_subject: Subject | None = None,
+    ) -> dict[str, MemberChangeResult]:
+        """Add a large number of members to this group, with a result per subject.
+
+        A subject that cannot be added does not raise an exception,
+        instead the result for that subject says why it was not added.
+
+        :param subject_identifiers: Subject identifiers of members to add,
+        defaults to []
+        :type subject_identifiers: list[str], optional
+        :param subject_ids: Subject ids of members to add, defaults to []
+        :type subject_ids: list[str], optional
+        :param chunk_size: The number of subjects to send in each request,
+        defaults to 1000
+        :type chunk_size: int, optional
+        :param max_concurrency: The maximum number of requests to send at the same
+        time, defaults to 4
+        :type max_concurrency: int, optional
+        :param act_as_subject: Optional subject to act as, defaults to None
+        :type act_as_subject: Subject | None, optional
+        :raises GrouperSuccessException: An otherwise unhandled issue with the result
+        :return: Dict keyed by the given subject identifiers and ids,
+        with the result for each subject
+        :rtype: dict[str, MemberChangeResult]
+        """
+        return bulk_add_members_to_group(
+            group_name=self.name,
+            client=self.client,
+            subject_identifiers=subject_identifiers,
+            subject_ids=subject_ids,
+            chunk_size=chunk_size,
+            max_concurrency=max_concurrency,
+            act_as_subject=act_as_subject,
+        )
+
+    @traced
+    def bulk_delete_members(
+        self,
+        subject_identifiers: list[str] = [],
+        subject_ids: list[str] = [],
+        chunk_size: int = 1000,
+        max_concurrency: int = 4,
+        act_as_subject: Subject | None = None,
+    ) -> dict[str, MemberChangeResult]:
+        """Remove a large number of members from this group, with a result per subject.
+
+        A subject that cannot be removed does not raise an exception,
+        instead the result for that subject says why it was not removed.
+
+        :param subject_identifiers: Subject identifiers of members to remove,
+        defaults to []
+        :type subject_identifiers: list[str], optional
+        :param subject_ids: Subject ids of members to remove, defaults to []
+        :type subject_ids: list[str], optional
+        :param chunk_size: The number of subjects to send in each request,
+        defaults to 1000
+        :type chunk_size: int, optional
+        :param max_concurrency: The maximum number of requests to send at the same
+        time, defaults to 4
+        :type max_concurrency: int, optional
+        :param act_as_subject: Optional subject to act as, defaults to None
+        :type act_as_subject: Subject | None, optional
+        :raises GrouperSuccessException: An otherwise unhandled issue with the result
+        :return: Dict keyed by the given subject identifiers and ids,
+        with the result for each subject
+        :rtype: dict[str, MemberChangeResult]
+        """
+        return bulk_delete_members_from_group(
+            group_name=self.name,
+            client=self.client,
+            subject_identifiers=subject_identifiers,
+            subject_ids=subject_ids,
+            chunk_size=chunk_size,
+            max_concurrency=max_concurrency,
+            act_as_subject=act_as_subject,
+        )
+
+    @traced
+    def sync_members(
+        self,
+        subject_identifiers: list[str] = [],
+        subject_ids: list[str] = [],
+        chunk_size: int = 1000,
+        max_concurrency: int = 4,
+        allow_empty: bool = False,
+        allow_missing: bool = False,
+        act_as_subject: Subject | None = None,
+    ) -> dict[str, MemberChangeResult]:
+        """Make the immediate members of this group match the given subjects.
+
+        Only missing subjects are added and only unwanted members are removed,
+        rather than replacing the whole membership of the group.
+        Subject identifiers are first looked up to get their subject ids,
+        and members are compared by subject id. Identifiers that cannot be
+        found are given as SUBJECT_NOT_FOUND, and are not added.
+        No members are removed while any identifier cannot be found,
+        unless allow_missing is True, and ValueError is raised if no subjects
+        are wanted at all, unless allow_empty is True.
+
+        :param subject_identifiers: Subject identifiers of the wanted members,
+        defaults to []
+        :type subject_identifiers: list[str], optional
+        :param subject_ids: Subject ids of the wanted members, defaults to []
+        :type subject_ids: list[str], optional
+        :param chunk_size: The number of subjects to send in each add or delete
+        request, defaults to 1000
+        :type chunk_size: int, optional
+        :param max_concurrency: The maximum number of requests to send at the same
+        time, defaults to 4
+        :type max_concurrency: int, optional
+        :param allow_empty: Whether to remove every member when no subjects are
+        wanted, defaults to False
+        :type allow_empty: bool, optional
+        :param allow_missing: Whether to remove members that are not wanted even
+        when some subject identifiers cannot be found, defaults to False
+        :type allow_missing: bool, optional
+        :param act_as_subject: Optional subject to act as, defaults to None
+        :type act_as_subject: Subject | None, optional
+        :raises ValueError: No subjects are wanted, and allow_empty is False
+        :raises GrouperSuccessException: An otherwise unhandled issue with the result
+        :return: Dict with the result for each subject that was added or removed,
+        keyed by the given subject identifier or id for added subjects,
+        and by subject id for removed members
+        :rtype: dict[str, MemberChangeResult]
+        """
+        return sync_members_of_group(
+            group_name=self.name,
+            client=self.client,
+            subject_identifiers=subject_identifiers,
+            subject_ids=subject_ids,
+            chunk_size=chunk_size,
+            max_concurrency=max_concurrency,
+            allow_empty=allow_empty,
+            allow_missing=allow_missing,
+            act_as_subject=act_as_subject,
+        )
+
+    @traced
     def has_members(
         self,
         subject_identifiers: list[str] = [],
@@ -358,6 +658,7 @@ class Group(Subject):
             act_as_subject=act_as_subject,
         )
 
+    @traced
     def delete(
         self,
         act_as_subject: Subject | None = None,
@@ -375,6 +676,7 @@ class Group(Subject):
             act_as_subject=act_as_subject,
         )
 
+    @traced
     def assign_attribute_on_this(
         self,
         assign_operation: str,
@@ -413,6 +715,7 @@ class Group(Subject):
             act_as_subject=act_as_subject,
         )
 
+    @traced
     def get_attribute_assignments_on_this(
         self,
         attribute_def_name_names: list[str] = [],
@@ -442,6 +745,643 @@ class Group(Subject):
         )
 
 
+@dataclass(slots=True, eq=False, init=False)
+class AsyncGroup(AsyncSubject, GroupBase):
+    """Group object representing a Grouper group, with awaitable methods.
+
+    :param client: An AsyncGrouperClient object containing connection information
+    :type client: AsyncGrouperClient
+    :param group_body: Body of the group as returned by the Grouper API
+    :type group_body: dict[str, Any]
+    """
+
+    @traced
+    async def get_members(
+        self,
+        attributes: list[str] = [],
+        member_filter: str = "all",
+        resolve_groups: bool = True,
+        act_as_subject: SubjectBase | None = None,
+    ) -> list[AsyncSubject]:
+        """Get members for this Group.
+
+        :param attributes: Additional attributes to retrieve for the Subjects,
+        defaults to []
+        :type attributes: list[str], optional
+        :param member_filter: Type of mebership to return (all, immediate, effective),
+        defaults to "all"
+        :type member_filter: str, optional
+        :param resolve_groups: Whether to resolve subjects that are groups into Group
+        objects, which will require additional API calls, defaults to True
+        :type resolve_groups: bool, optional
+        :param act_as_subject: Optional subject to act as, defaults to None
+        :type act_as_subject: SubjectBase | None, optional
+        :return: List of members of this group
+        :rtype: list[AsyncSubject]
+        """
+        members = await aio_membership.get_members_for_groups(
+            group_names=[self.name],
+            client=self.client,
+            attributes=attributes,
+            member_filter=member_filter,
+            resolve_groups=resolve_groups,
+            act_as_subject=act_as_subject,
+        )
+        return members[self]
+
+    def iter_members(
+        self,
+        attributes: list[str] = [],
+        member_filter: str = "all",
+        resolve_groups: bool = True,
+        page_size: int = 1000,
+        cursor: bool = False,
+        act_as_subject: SubjectBase | None = None,
+    ) -> AsyncIterator[AsyncSubject]:
+        """Iterate over the members of this Group, one page at a time.
+
+        Use this with "async for" rather than get_members for very large groups.
+        Only one page of members is held at a time, and stopping iteration
+        early will not fetch the remaining pages.
+
+        :param attributes: Additional attributes to retrieve for the Subjects,
+        defaults to []
+        :type attributes: list[str], optional
+        :param member_filter: Type of mebership to return (all, immediate, effective),
+        defaults to "all"
+        :type member_filter: str, optional
+        :param resolve_groups: Whether to resolve subjects that are groups into
+        AsyncGroup objects, which will require additional API calls,
+        defaults to True
+        :type resolve_groups: bool, optional
+        :param page_size: The number of members to request per page,
+        defaults to 1000
+        :type page_size: int, optional
+        :param cursor: Whether to use cursor paging rather than page numbers,
+        defaults to False
+        :type cursor: bool, optional
+        :param act_as_subject: Optional subject to act as, defaults to None
+        :type act_as_subject: SubjectBase | None, optional
+        :return: An iterator over the members of this group
+        :rtype: AsyncIterator[AsyncSubject]
+        """
+        return aio_membership.iter_members_for_group(
+            group_name=self.name,
+            client=self.client,
+            attributes=attributes,
+            member_filter=member_filter,
+            resolve_groups=resolve_groups,
+            page_size=page_size,
+            cursor=cursor,
+            act_as_subject=act_as_subject,
+        )
+
+    @traced
+    async def get_memberships(
+        self,
+        attributes: list[str] = [],
+        member_filter: str = "all",
+        resolve_groups: bool = True,
+        act_as_subject: SubjectBase | None = None,
+    ) -> list[AsyncMembership]:
+        """Get memberships for this group.
+
+        Note that a "membership" includes more detail than a "member".
+
+        :param attributes: Additional attributes to retrieve for the Subjects,
+        defaults to []
+        :type attributes: list[str], optional
+        :param member_filter: Type of mebership to return (all, immediate, effective),
+        defaults to "all"
+        :type member_filter: str, optional
+        :param resolve_groups: Whether to resolve subjects that are groups into Group
+        objects, which will require additional API calls, defaults to True
+        :type resolve_groups: bool, optional
+        :param act_as_subject: Optional subject to act as, defaults to None
+        :type act_as_subject: SubjectBase | None, optional
+        :return: List of memberships for this group
+        :rtype: list[AsyncMembership]
+        """
+        memberships = await aio_membership.get_memberships_for_groups(
+            group_names=[self.name],
+            client=self.client,
+            attributes=attributes,
+            member_filter=member_filter,
+            resolve_groups=resolve_groups,
+            act_as_subject=act_as_subject,
+        )
+        return memberships[self] if memberships else []
+
+    def iter_memberships(
+        self,
+        attributes: list[str] = [],
+        member_filter: str = "all",
+        resolve_groups: bool = True,
+        page_size: int = 1000,
+        act_as_subject: SubjectBase | None = None,
+    ) -> AsyncIterator[AsyncMembership]:
+        """Iterate over the memberships of this Group, one page at a time.
+
+        Use this with "async for" rather than get_memberships for very large groups.
+        Each page is parsed as it is received, and only one page is held
+        at a time. Stopping iteration early will not fetch the remaining pages.
+        Memberships are not given in any particular order.
+
+        :param attributes: Additional attributes to retrieve for the Subjects,
+        defaults to []
+        :type attributes: list[str], optional
+        :param member_filter: Type of mebership to return (all, immediate, effective),
+        defaults to "all"
+        :type member_filter: str, optional
+        :param resolve_groups: Whether to resolve subjects that are groups into
+        AsyncGroup objects, which will require additional API calls,
+        defaults to True
+        :type resolve_groups: bool, optional
+        :param page_size: The number of memberships to request per page,
+        defaults to 1000
+        :type page_size: int, optional
+        :param act_as_subject: Optional subject to act as, defaults to None
+        :type act_as_subject: SubjectBase | None, optional
+        :return: An iterator over the memberships of this group
+        :rtype: AsyncIterator[AsyncMembership]
+        """
+        return aio_membership.iter_memberships_for_group(
+            group_name=self.name,
+            client=self.client,
+            attributes=attributes,
+            member_filter=member_filter,
+            resolve_groups=resolve_groups,
+            page_size=page_size,
+            act_as_subject=act_as_subject,
+        )
+
+    @traced
+    async def create_privilege_on_this(
+        self,
+        entity_identifier: str,
+        privilege_name: str,
+        act_as_subject: SubjectBase | None = None,
+    ) -> None:
+        """Create a privilege on this Group.
+
+        :param entity_identifier: Identifier of the entity to receive the permission
+        :type entity_identifier: str
+        :param privilege_name: Name of the privilege to assign
+        :type privilege_name: str
+        :param act_as_subject: Optional subject to act as, defaults to None
+        :type act_as_subject: SubjectBase | None, optional
+        """
+        await aio_privilege.assign_privileges(
+            target_name=self.name,
+            target_type="group",
+            privilege_names=[privilege_name],
+            entity_identifiers=[entity_identifier],
+            allowed="T",
+            client=self.client,
+            act_as_subject=act_as_subject,
+        )
+
+    @traced
+    async def delete_privilege_on_this(
+        self,
+        entity_identifier: str,
+        privilege_name: str,
+        act_as_subject: SubjectBase | None = None,
+    ) -> None:
+        """Delete a privilege on this Group.
+
+        :param entity_identifier: Identifier of the entity to remove permission for
+        :type entity_identifier: str
+        :param privilege_name: Name of the privilege to delete
+        :type privilege_name: str
+        :param act_as_subject: Optional subject to act as, defaults to None
+        :type act_as_subject: SubjectBase | None, optional
+        """
+        await aio_privilege.assign_privileges(
+            target_name=self.name,
+            target_type="group",
+            privilege_names=[privilege_name],
+            entity_identifiers=[entity_identifier],
+            allowed="F",
+            client=self.client,
+            act_as_subject=act_as_subject,
+        )
+
+    @traced
+    async def create_privileges_on_this(
+        self,
+        entity_identifiers: list[str],
+        privilege_names: list[str],
+        act_as_subject: SubjectBase | None = None,
+    ) -> None:
+        """Create privileges on this Group.
+
+        :param entity_identifiers: List of identifiers of the entities
+        to receive the permissions
+        :type entity_identifiers: list[str]
+        :param privilege_names: List of names of the privileges to assign
+        :type privilege_names: list[str]
+        :param act_as_subject: Optional subject to act as, defaults to None
+        :type act_as_subject: SubjectBase | None, optional
+        """
+        await aio_privilege.assign_privileges(
+            target_name=self.name,
+            target_type="group",
+            privilege_names=privilege_names,
+            entity_identifiers=entity_identifiers,
+            allowed="T",
+            client=self.client,
+            act_as_subject=act_as_subject,
+        )
+
+    @traced
+    async def delete_privileges_on_this(
+        self,
+        entity_identifiers: list[str],
+        privilege_names: list[str],
+        act_as_subject: SubjectBase | None = None,
+    ) -> None:
+        """Delete privileges on this Group.
+
+        :param entity_identifiers: List of identifiers of the entities
+        to receive the permissions
+        :type entity_identifiers: list[str]
+        :param privilege_names: List of names of the privileges to assign
+        :type privilege_names: list[str]
+        :param act_as_subject: Optional subject to act as, defaults to None
+        :type act_as_subject: SubjectBase | None, optional
+        """
+        await aio_privilege.assign_privileges(
+            target_name=self.name,
+            target_type="group",
+            privilege_names=privilege_names,
+            entity_identifiers=entity_identifiers,
+            allowed="F",
+            client=self.client,
+            act_as_subject=act_as_subject,
+        )
+
+    @traced
+    async def get_privileges_on_this(
+        self,
+        subject_id: str | None = None,
+        subject_identifier: str | None = None,
+        privilege_name: str | None = None,
+        attributes: list[str] = [],
+        act_as_subject: SubjectBase | None = None,
+    ) -> list[AsyncPrivilege]:
+        """Get privileges on this Group.
+
+        :param subject_id: Subject Id to limit retreived permissions to,
+        cannot be specified if subject_identifer is specified, defaults to None
+        :type subject_id: str | None, optional
+        :param subject_identifier: Subject Identifer to limit retreived permissions to,
+        cannot be specified if subject_id is specified, defaults to None
+        :type subject_identifier: str | None, optional
+        :param privilege_name: Name of privilege to get, defaults to None
+        :type privilege_name: str | None, optional
+        :param attributes: Additional attributes to retrieve for the Subjects,
+        defaults to []
+        :type attributes: list[str], optional
+        :param act_as_subject: Optional subject to act as, defaults to None
+        :type act_as_subject: SubjectBase | None, optional
+        :return: List of retreived privileges on this Group
+        satisfying the given constraints
+        :rtype: list[AsyncPrivilege]
+        """
+        return await aio_privilege.get_privileges(
+            client=self.client,
+            subject_id=subject_id,
+            subject_identifier=subject_identifier,
+            group_name=self.name,
+            privilege_name=privilege_name,
+            attributes=attributes,
+            act_as_subject=act_as_subject,
+        )
+
+    @traced
+    async def add_members(
+        self,
+        subject_identifiers: list[str] = [],
+        subject_ids: list[str] = [],
+        replace_all_existing: str = "F",
+        act_as_subject: SubjectBase | None = None,
+    ) -> None:
+        """Add members to this group.
+
+        :param subject_identifiers: Subject identifiers of members to add,
+        defaults to []
+        :type subject_identifiers: list[str], optional
+        :param subject_ids: Subject ids of members to add, defaults to []
+        :type subject_ids: list[str], optional
+        :param replace_all_existing: Whether to replace existing membership of group,
+        "T" will replace, "F" will only add members, defaults to "F"
+        :type replace_all_existing: str, optional
+        :param act_as_subject: Optional subject to act as, defaults to None
+        :type act_as_subject: SubjectBase | None, optional
+        :raises GrouperPermissionDenied: Permission denied to complete the operation
+        :raises GrouperSuccessException: An otherwise unhandled issue with the result
+        """
+        await aio_membership.add_members_to_group(
+            group_name=self.name,
+            client=self.client,
+            subject_identifiers=subject_identifiers,
+            subject_ids=subject_ids,
+            replace_all_existing=replace_all_existing,
+            act_as_subject=act_as_subject,
+        )
+
+    @traced
+    async def delete_members(
+        self,
+        subject_identifiers: list[str] = [],
+        subject_ids: list[str] = [],
+        act_as_subject: SubjectBase | None = None,
+    ) -> None:
+        """Remove members from this group.
+
+        :param subject_identifiers: Subject identifiers of members to remove,
+        defaults to []
+        :type subject_identifiers: list[str], optional
+        :param subject_ids: Subject ids of members to remove, defaults to []
+        :type subject_ids: list[str], optional
+        :param act_as_subject: Optional subject to act as, defaults to None
+        :type act_as_subject: SubjectBase | None, optional
+        :raises GrouperPermissionDenied: Permission denied to complete the operation
+        :raises GrouperSuccessException: An otherwise unhandled issue with the result
+        """
+        await aio_membership.delete_members_from_group(
+            group_name=self.name,
+            client=self.client,
+            subject_identifiers=subject_identifiers,
+            subject_ids=subject_ids,
+            act_as_subject=act_as_subject,
+        )
+
+    @traced
+    async def bulk_add_members(
+        self,
+        subject_identifiers: list[str] = [],
+        subject_ids: list[str] = [],
+        chunk_size: int = 1000,
+        max_concurrency: int = 4,
+        act_as_subject: SubjectBase | None = None,
+    ) -> dict[str, MemberChangeResult]:
+        """Add a large number of members to this group, with a result per subject.
+
+        A subject that cannot be added does not raise an exception,
+        instead the result for that subject says why it was not added.
+
+        :param subject_identifiers: Subject identifiers of members to add,
+        defaults to []
+        :type subject_identifiers: list[str], optional
+        :param subject_ids: Subject ids of members to add, defaults to []
+        :type subject_ids: list[str], optional
+        :param chunk_size: The number of subjects to send in each request,
+        defaults to 1000
+        :type chunk_size: int, optional
+        :param max_concurrency: The maximum number of requests to send at the same
+        time, defaults to 4
+        :type max_concurrency: int, optional
+        :param act_as_subject: Optional subject to act as, defaults to None
+        :type act_as_subject: SubjectBase | None, optional
+        :raises GrouperSuccessException: An otherwise unhandled issue with the result
+        :return: Dict keyed by the given subject identifiers and ids,
+        with the result for each subject
+        :rtype: dict[str, MemberChangeResult]
+        """
+        return await aio_membership.bulk_add_members_to_group(
+            group_name=self.name,
+            client=self.client,
+            subject_identifiers=subject_identifiers,
+            subject_ids=subject_ids,
+            chunk_size=chunk_size,
+            max_concurrency=max_concurrency,
+            act_as_subject=act_as_subject,
+        )
+
+    @traced
+    async def bulk_delete_members(
+        self,
+        subject_identifiers: list[str] = [],
+        subject_ids: list[str] = [],
+        chunk_size: int = 1000,
+        max_concurrency: int = 4,
+        act_as_subject: SubjectBase | None = None,
+    ) -> dict[str, MemberChangeResult]:
+        """Remove a large number of members from this group, with a result per subject.
+
+        A subject that cannot be removed does not raise an exception,
+        instead the result for that subject says why it was not removed.
+
+        :param subject_identifiers: Subject identifiers of members to remove,
+        defaults to []
+        :type subject_identifiers: list[str], optional
+        :param subject_ids: Subject ids of members to remove, defaults to []
+        :type subject_ids: list[str], optional
+        :param chunk_size: The number of subjects to send in each request,
+        defaults to 1000
+        :type chunk_size: int, optional
+        :param max_concurrency: The maximum number of requests to send at the same
+        time, defaults to 4
+        :type max_concurrency: int, optional
+        :param act_as_subject: Optional subject to act as, defaults to None
+        :type act_as_subject: SubjectBase | None, optional
+        :raises GrouperSuccessException: An otherwise unhandled issue with the result
+        :return: Dict keyed by the given subject identifiers and ids,
+        with the result for each subject
+        :rtype: dict[str, MemberChangeResult]
+        """
+        return await aio_membership.bulk_delete_members_from_group(
+            group_name=self.name,
+            client=self.client,
+            subject_identifiers=subject_identifiers,
+            subject_ids=subject_ids,
+            chunk_size=chunk_size,
+            max_concurrency=max_concurrency,
+            act_as_subject=act_as_subject,
+        )
+
+    @traced
+    async def sync_members(
+        self,
+        subject_identifiers: list[str] = [],
+        subject_ids: list[str] = [],
+        chunk_size: int = 1000,
+        max_concurrency: int = 4,
+        allow_empty: bool = False,
+        allow_missing: bool = False,
+        act_as_subject: SubjectBase | None = None,
+    ) -> dict[str, MemberChangeResult]:
+        """Make the immediate members of this group match the given subjects.
+
+        Only missing subjects are added and only unwanted members are removed,
+        rather than replacing the whole membership of the group.
+        Subject identifiers are first looked up to get their subject ids,
+        and members are compared by subject id. Identifiers that cannot be
+        found are given as SUBJECT_NOT_FOUND, and are not added.
+        No members are removed while any identifier cannot be found,
+        unless allow_missing is True, and ValueError is raised if no subjects
+        are wanted at all, unless allow_empty is True.
+
+        :param subject_identifiers: Subject identifiers of the wanted members,
+        defaults to []
+        :type subject_identifiers: list[str], optional
+        :param subject_ids: Subject ids of the wanted members, defaults to []
+        :type subject_ids: list[str], optional
+        :param chunk_size: The number of subjects to send in each add or delete
+        request, defaults to 1000
+        :type chunk_size: int, optional
+        :param max_concurrency: The maximum number of requests to send at the same
+        time, defaults to 4
+        :type max_concurrency: int, optional
+        :param allow_empty: Whether to remove every member when no subjects are
+        wanted, defaults to False
+        :type allow_empty: bool, optional
+        :param allow_missing: Whether to remove members that are not wanted even
+        when some subject identifiers cannot be found, defaults to False
+        :type allow_missing: bool, optional
+        :param act_as_subject: Optional subject to act as, defaults to None
+        :type act_as_subject: SubjectBase | None, optional
+        :raises ValueError: No subjects are wanted, and allow_empty is False
+        :raises GrouperSuccessException: An otherwise unhandled issue with the result
+        :return: Dict with the result for each subject that was added or removed,
+        keyed by the given subject identifier or id for added subjects,
+        and by subject id for removed members
+        :rtype: dict[str, MemberChangeResult]
+        """
+        return await aio_membership.sync_members_of_group(
+            group_name=self.name,
+            client=self.client,
+            subject_identifiers=subject_identifiers,
+            subject_ids=subject_ids,
+            chunk_size=chunk_size,
+            max_concurrency=max_concurrency,
+            allow_empty=allow_empty,
+            allow_missing=allow_missing,
+            act_as_subject=act_as_subject,
+        )
+
+    @traced
+    async def has_members(
+        self,
+        subject_identifiers: list[str] = [],
+        subject_ids: list[str] = [],
+        member_filter: str = "all",
+        act_as_subject: SubjectBase | None = None,
+    ) -> dict[str, HasMember]:
+        """Determine if the given subjects are members of this group.
+
+        :param subject_identifiers:Subject identifiers to check for membership,
+        defaults to []
+        :type subject_identifiers: list[str], optional
+        :param subject_ids: Subject ids to check for membership, defaults to []
+        :type subject_ids: list[str], optional
+        :param member_filter: Type of mebership to return (all, immediate, effective),
+        defaults to "all"
+        :type member_filter: str, optional
+        :param act_as_subject: Optional subject to act as, defaults to None
+        :type act_as_subject: SubjectBase | None, optional
+        :return: A dict with the key being the subject (either identifier or id)
+        and the value being a HasMember enum.
+        :rtype: dict[str, HasMember]
+        """
+        return await aio_membership.has_members(
+            group_name=self.name,
+            client=self.client,
+            subject_identifiers=subject_identifiers,
+            subject_ids=subject_ids,
+            member_filter=member_filter,
+            act_as_subject=act_as_subject,
+        )
+
+    @traced
+    async def delete(
+        self,
+        act_as_subject: SubjectBase | None = None,
+    ) -> None:
+        """Delete this group in Grouper.
+
+        :param act_as_subject: Optional subject to act as, defaults to None
+        :type act_as_subject: SubjectBase | None, optional
+        :raises GrouperPermissionDenied: Permission denied to complete the operation
+        :raises GrouperSuccessException: An otherwise unhandled issue with the result
+        """
+        await aio_group.delete_groups(
+            group_names=[self.name],
+            client=self.client,
+            act_as_subject=act_as_subject,
+        )
+
+    @traced
+    async def assign_attribute_on_this(
+        self,
+        assign_operation: str,
+        attribute_def_name_name: str,
+        value: None | str | int | float = None,
+        assign_value_operation: str | None = None,
+        act_as_subject: SubjectBase | None = None,
+    ) -> list[AsyncAttributeAssignment]:
+        """Assign an attribute on this group.
+
+        :param assign_operation: Assignment operation, one of
+        "assign_attr", "add_attr", "remove_attr", "replace_attrs"
+        :type assign_operation: str
+        :param attribute_def_name_name: Attribute definition name name to assign
+        :type attribute_def_name_name: str
+        :param value: Value to assign, also requires assign_value_operation,
+        defaults to None
+        :type value: None | str | int | float, optional
+        :param assign_value_operation: Value assignment operation, one of
+        "assign_value", "add_value", "remove_value", "replace_values",
+        requires value to be specified as well, defaults to None
+        :type assign_value_operation: str | None, optional
+        :param act_as_subject: Optional subject to act as, defaults to None
+        :type act_as_subject: SubjectBase | None, optional
+        :return: A list of modified AttributeAssignments
+        :rtype: list[AsyncAttributeAssignment]
+        """
+        return await aio_attribute.assign_attribute(
+            attribute_assign_type="group",
+            assign_operation=assign_operation,
+            client=self.client,
+            owner_name=self.name,
+            attribute_def_name_name=attribute_def_name_name,
+            value=value,
+            assign_value_operation=assign_value_operation,
+            act_as_subject=act_as_subject,
+        )
+
+    @traced
+    async def get_attribute_assignments_on_this(
+        self,
+        attribute_def_name_names: list[str] = [],
+        attribute_def_names: list[str] = [],
+        act_as_subject: SubjectBase | None = None,
+    ) -> list[AsyncAttributeAssignment]:
+        """Get attribute assignments on this group.
+
+        :param attribute_def_name_names: List of names of attribute definition names
+        to retrieve assignments for, defaults to []
+        :type attribute_def_name_names: list[str], optional
+        :param attribute_def_names:  List of names of attribute defitions
+        to retrieve assignments for, defaults to []
+        :type attribute_def_names: list[str], optional
+        :param act_as_subject: Optional subject to act as, defaults to None
+        :type act_as_subject: SubjectBase | None, optional
+        :return: A list of AttributeAssignments on this group
+        :rtype: list[AsyncAttributeAssignment]
+        """
+        return await aio_attribute.get_attribute_assignments(
+            attribute_assign_type="group",
+            client=self.client,
+            attribute_def_name_names=attribute_def_name_names,
+            attribute_def_names=attribute_def_names,
+            owner_names=[self.name],
+            act_as_subject=act_as_subject,
+        )
+
+
 @dataclass
 class CreateGroup:
     """Class representing all data needed to create a new Grouper group.
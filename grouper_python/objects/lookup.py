@@ -0,0 +1,26 @@
+"""grouper_python.objects.lookup - Class definition for LookupResult."""
+
+from __future__ import annotations
+from typing import Generic, TypeVar
+from dataclasses import dataclass
+
+T = TypeVar("T")
+
+
+@dataclass(slots=True)
+class LookupResult(Generic[T]):
+    """Result of looking up many groups or subjects at once.
+
+    Rather than raising an exception for the first name that cannot be found,
+    the names that were not found are listed in missing.
+
+    :param found: The entities that were found,
+    keyed by the name or identifier they were looked up with
+    :type found: dict[str, T]
+    :param missing: The names or identifiers that were not found,
+    in the order they were given
+    :type missing: list[str]
+    """
+
+    found: dict[str, T]
+    missing: list[str]
@@ -1,11 +1,16 @@
 """grouper_python.objects.membership - Objects related to Grouper membership."""
 
 from __future__ import annotations
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Self
 if TYPE_CHECKING:  # pragma: no cover
-    from .subject import Subject
+    from .subject import Subject, AsyncSubject
+    from .group import GroupBase, Group, AsyncGroup
+    from .client import GrouperClient, AsyncGrouperClient
+    from collections.abc import Iterable, Iterator, Sequence
 from enum import Enum, StrEnum, auto
 from dataclasses import dataclass
+from array import array
+from collections import Counter
 
 
 class HasMember(Enum):
@@ -16,6 +21,23 @@ class HasMember(Enum):
     SUBJECT_NOT_FOUND = 3
 
 
+class MemberChangeResult(Enum):
+    """Enum of per-subject results for bulk adding or deleting members.
+
+    When a chunk is retried after an attempt that reached Grouper,
+    the subjects that attempt changed are reported as ALREADY_MEMBER
+    or NOT_MEMBER, since the result describes the last attempt.
+    """
+
+    ADDED = 1
+    ALREADY_MEMBER = 2
+    DELETED = 3
+    NOT_MEMBER = 4
+    SUBJECT_NOT_FOUND = 5
+    PERMISSION_DENIED = 6
+    ERROR = 7
+
+
 class MembershipType(StrEnum):
     """Enum of membership types."""
 
@@ -37,3 +59,581 @@ class Membership:
     member: Subject
     member_type: MemberType
     membership_type: MembershipType
+
+
+@dataclass
+class AsyncMembership:
+    """Class representing a Grouper membership of an AsyncSubject."""
+
+    member: AsyncSubject
+    member_type: MemberType
+    membership_type: MembershipType
+
+
+# Member and membership types by the codes held in a MembershipTable
+_MEMBER_TYPES = (MemberType.PERSON, MemberType.GROUP)
+_MEMBERSHIP_TYPES = (MembershipType.DIRECT, MembershipType.INDIRECT)
+
+
+class SubjectTable:
+    """Table of the subjects in a MembershipTable, each held once.
+
+    Each subject is given an index when it is first seen, and its details
+    are kept in parallel lists, rather than as a Subject object.
+
+    :param attr_names: The subject attribute names of the result
+    :type attr_names: list[str]
+    """
+
+    __slots__ = (
+        "ids",
+        "source_ids",
+        "names",
+        "attribute_values",
+        "attr_names",
+        "index",
+    )
+
+    def __init__(self, attr_names: list[str] = []) -> None:
+        """Construct a SubjectTable."""
+        self.ids: list[str] = []
+        self.source_ids: list[str] = []
+        self.names: list[str] = []
+        self.attribute_values: list[tuple[str, ...]] = []
+        self.attr_names = attr_names
+        self.index: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        """Return the number of subjects in the table."""
+        return len(self.ids)
+
+    def intern(self, subject_id: str) -> int:
+        """Get the index of the subject with the given id, adding it if needed.
+
+        A subject that is added this way has no details until add is called.
+
+        :param subject_id: The id of the subject
+        :type subject_id: str
+        :return: The index of the subject
+        :rtype: int
+        """
+        i = self.index.get(subject_id)
+        if i is None:
+            i = self.index[subject_id] = len(self.ids)
+            self.ids.append(subject_id)
+            self.source_ids.append("")
+            self.names.append("")
+            self.attribute_values.append(())
+        return i
+
+    def add(self, subject_body: dict[str, Any]) -> int:
+        """Add the details of a subject from its body.
+
+        :param subject_body: The body of the subject as returned by the Grouper API
+        :type subject_body: dict[str, Any]
+        :return: The index of the subject
+        :rtype: int
+        """
+        i = self.intern(subject_body["id"])
+        self.source_ids[i] = subject_body["sourceId"]
+        self.names[i] = subject_body["name"]
+        self.attribute_values[i] = tuple(subject_body.get("attributeValues", ()))
+        return i
+
+    def body(self, i: int) -> dict[str, Any]:
+        """Get the body of a subject, in the form returned by the Grouper API.
+
+        :param i: The index of the subject
+        :type i: int
+        :return: The body of the subject
+        :rtype: dict[str, Any]
+        """
+        return {
+            "id": self.ids[i],
+            "sourceId": self.source_ids[i],
+            "name": self.names[i],
+            "attributeValues": list(self.attribute_values[i]),
+        }
+
+
+class MembershipTableBase:
+    """Memberships held in columns, shared by MembershipTable and AsyncMembershipTable.
+
+    Rather than a Membership object per membership, each membership is a row
+    across parallel arrays: the index of its group in groups, the index of its
+    subject in subjects, and codes for its member and membership types.
+    This takes far less memory than the equivalent Membership objects, and
+    filter, group_by and counts work on the arrays without building any objects.
+    Use to_memberships to get the Membership objects when they are needed.
+
+    Filtered and grouped tables share the groups and subjects of this table.
+
+    :param client: A GrouperClient or AsyncGrouperClient object
+    containing connection information
+    :type client: GrouperClient | AsyncGrouperClient
+    :param groups: The groups of the memberships
+    :type groups: Sequence[GroupBase]
+    :param subjects: The subjects of the memberships
+    :type subjects: SubjectTable
+    :param group_index: The index in groups of the group of each membership,
+    defaults to an empty array
+    :type group_index: array[int], optional
+    :param subject_index: The index in subjects of the subject of each membership,
+    defaults to an empty array
+    :type subject_index: array[int], optional
+    :param member_types: The member type of each membership,
+    0 for PERSON and 1 for GROUP, defaults to empty
+    :type member_types: bytearray, optional
+    :param membership_types: The membership type of each membership,
+    0 for DIRECT and 1 for INDIRECT, defaults to empty
+    :type membership_types: bytearray, optional
+    """
+
+    __slots__ = (
+        "client",
+        "groups",
+        "subjects",
+        "group_index",
+        "subject_index",
+        "member_types",
+        "membership_types",
+    )
+
+    client: GrouperClient | AsyncGrouperClient
+    groups: Sequence[GroupBase]
+
+    def __init__(
+        self,
+        client: GrouperClient | AsyncGrouperClient,
+        groups: Sequence[GroupBase],
+        subjects: SubjectTable,
+        group_index: array[int] | None = None,
+        subject_index: array[int] | None = None,
+        member_types: bytearray | None = None,
+        membership_types: bytearray | None = None,
+    ) -> None:
+        """Construct a MembershipTable."""
+        self.client = client
+        self.groups = groups
+        self.subjects = subjects
+        self.group_index = group_index if group_index is not None else array("I")
+        self.subject_index = (
+            subject_index if subject_index is not None else array("I")
+        )
+        self.member_types = member_types if member_types is not None else bytearray()
+        self.membership_types = (
+            membership_types if membership_types is not None else bytearray()
+        )
+
+    def __len__(self) -> int:
+        """Return the number of memberships in the table."""
+        return len(self.group_index)
+
+    def __repr__(self) -> str:
+        """Return a representation of the table with its size."""
+        return (
+            f"{type(self).__name__}(memberships={len(self)}, "
+            f"groups={len(self.groups)}, subjects={len(self.subjects)})"
+        )
+
+    def __iter__(self) -> Iterator[tuple[Any, str, MemberType, MembershipType]]:
+        """Iterate over the memberships in the table.
+
+        Each is given as (group, subject id, member type, membership type).
+        """
+        groups = self.groups
+        subject_ids = self.subjects.ids
+        for group_i, subject_i, member_type, membership_type in zip(
+            self.group_index,
+            self.subject_index,
+            self.member_types,
+            self.membership_types,
+        ):
+            yield (
+                groups[group_i],
+                subject_ids[subject_i],
+                _MEMBER_TYPES[member_type],
+                _MEMBERSHIP_TYPES[membership_type],
+            )
+
+    def filter(
+        self,
+        group_names: Iterable[str] | None = None,
+        subject_ids: Iterable[str] | None = None,
+        member_type: MemberType | None = None,
+        membership_type: MembershipType | None = None,
+    ) -> Self:
+        """Get a table of the memberships that match all of the given criteria.
+
+        :param group_names: Only include memberships of these groups,
+        defaults to None
+        :type group_names: Iterable[str] | None, optional
+        :param subject_ids: Only include memberships of these subjects,
+        defaults to None
+        :type subject_ids: Iterable[str] | None, optional
+        :param member_type: Only include memberships with this member type,
+        defaults to None
+        :type member_type: MemberType | None, optional
+        :param membership_type: Only include memberships with this membership type,
+        defaults to None
+        :type membership_type: MembershipType | None, optional
+        :return: A table of the matching memberships
+        :rtype: Self
+        """
+        rows: Iterable[int] = range(len(self))
+        if group_names is not None:
+            names = set(group_names)
+            group_codes = {
+                i for i, group in enumerate(self.groups) if group.name in names
+            }
+            rows = [i for i in rows if self.group_index[i] in group_codes]
+        if subject_ids is not None:
+            subject_codes = {
+                self.subjects.index[subject_id]
+                for subject_id in subject_ids
+                if subject_id in self.subjects.index
+            }
+            rows = [i for i in rows if self.subject_index[i] in subject_codes]
+        if member_type is not None:
+            code = _MEMBER_TYPES.index(member_type)
+            rows = [i for i in rows if self.member_types[i] == code]
+        if membership_type is not None:
+            code = _MEMBERSHIP_TYPES.index(membership_type)
+            rows = [i for i in rows if self.membership_types[i] == code]
+        return self._take(rows)
+
+    def group_by(self, column: str) -> dict[Any, Self]:
+        """Split the table into a table for each value of a column.
+
+        :param column: The column to group by, one of "group", "subject",
+        "member_type" or "membership_type"
+        :type column: str
+        :raises ValueError: The column is not known
+        :return: A table of the memberships for each value of the column,
+        keyed by the group, subject id, MemberType or MembershipType
+        :rtype: dict[Any, Self]
+        """
+        codes, values = self._column(column)
+        rows: dict[int, list[int]] = {}
+        for i, code in enumerate(codes):
+            rows.setdefault(code, []).append(i)
+        return {values[code]: self._take(code_rows) for code, code_rows in rows.items()}
+
+    def counts(self, column: str) -> dict[Any, int]:
+        """Count the memberships for each value of a column.
+
+        :param column: The column to count by, one of "group", "subject",
+        "member_type" or "membership_type"
+        :type column: str
+        :raises ValueError: The column is not known
+        :return: The number of memberships for each value of the column,
+        keyed by the group, subject id, MemberType or MembershipType
+        :rtype: dict[Any, int]
+        """
+        codes, values = self._column(column)
+        return {values[code]: count for code, count in Counter(codes).items()}
+
+    def _column(self, column: str) -> tuple[Sequence[int], Sequence[Any]]:
+        """Get the codes of a column, and the values the codes refer to.
+
+        :param column: The column, one of "group", "subject",
+        "member_type" or "membership_type"
+        :type column: str
+        :raises ValueError: The column is not known
+        :return: The code of each membership, and the values by code
+        :rtype: tuple[Sequence[int], Sequence[Any]]
+        """
+        if column == "group":
+            return self.group_index, self.groups
+        if column == "subject":
+            return self.subject_index, self.subjects.ids
+        if column == "member_type":
+            return self.member_types, _MEMBER_TYPES
+        if column == "membership_type":
+            return self.membership_types, _MEMBERSHIP_TYPES
+        raise ValueError(f"Unknown column: {column}")
+
+    def _take(self, rows: Iterable[int]) -> Self:
+        """Get a table of the given rows of this table.
+
+        :param rows: The indexes of the rows to include
+        :type rows: Iterable[int]
+        :return: A table of those rows, sharing the groups and subjects of this table
+        :rtype: Self
+        """
+        rows = rows if isinstance(rows, list) else list(rows)
+        return type(self)(
+            self.client,
+            self.groups,
+            self.subjects,
+            array("I", [self.group_index[i] for i in rows]),
+            array("I", [self.subject_index[i] for i in rows]),
+            bytearray([self.member_types[i] for i in rows]),
+            bytearray([self.membership_types[i] for i in rows]),
+        )
+
+    def _member_subjects(self) -> tuple[list[int], list[dict[str, Any]]]:
+        """Get the subjects that are members in this table.
+
+        :return: The index of each subject, and the body of each subject
+        :rtype: tuple[list[int], list[dict[str, Any]]]
+        """
+        subject_codes = list(dict.fromkeys(self.subject_index))
+        return subject_codes, [self.subjects.body(i) for i in subject_codes]
+
+
+class MembershipTable(MembershipTableBase):
+    """Columnar table of the memberships of groups from a GrouperClient.
+
+    See MembershipTableBase for how the memberships are held.
+
+    :param client: A GrouperClient object containing connection information
+    :type client: GrouperClient
+    :param groups: The groups of the memberships
+    :type groups: Sequence[Group]
+    :param subjects: The subjects of the memberships
+    :type subjects: SubjectTable
+    :param group_index: The index in groups of the group of each membership,
+    defaults to an empty array
+    :type group_index: array[int], optional
+    :param subject_index: The index in subjects of the subject of each membership,
+    defaults to an empty array
+    :type subject_index: array[int], optional
+    :param member_types: The member type of each membership,
+    0 for PERSON and 1 for GROUP, defaults to empty
+    :type member_types: bytearray, optional
+    :param membership_types: The membership type of each membership,
+    0 for DIRECT and 1 for INDIRECT, defaults to empty
+    :type membership_types: bytearray, optional
+    """
+
+    __slots__ = ()
+
+    client: GrouperClient
+    groups: Sequence[Group]
+
+    def to_memberships(
+        self, resolve_groups: bool = True
+    ) -> dict[Group, list[Membership]]:
+        """Build Membership objects for the memberships in this table.
+
+        :param resolve_groups: Whether to resolve subjects that are groups into Group
+        objects, which will require additional API calls, defaults to True
+        :type resolve_groups: bool, optional
+        :return: A dictionary with Groups as the keys
+        and those groups' memberships list as the value, like
+        get_memberships_for_groups. Groups without memberships in this table
+        are not included.
+        :rtype: dict[Group, list[Membership]]
+        """
+        from ..util import resolve_subjects
+
+        subject_codes, subject_bodies = self._member_subjects()
+        members = dict(
+            zip(
+                subject_codes,
+                resolve_subjects(
+                    subject_bodies=subject_bodies,
+                    client=self.client,
+                    subject_attr_names=self.subjects.attr_names,
+                    resolve_groups=resolve_groups,
+                ),
+            )
+        )
+        r_dict: dict[Group, list[Membership]] = {}
+        for group_i, subject_i, member_type, membership_type in zip(
+            self.group_index,
+            self.subject_index,
+            self.member_types,
+            self.membership_types,
+        ):
+            r_dict.setdefault(self.groups[group_i], []).append(
+                Membership(
+                    member=members[subject_i],
+                    member_type=_MEMBER_TYPES[member_type],
+                    membership_type=_MEMBERSHIP_TYPES[membership_type],
+                )
+            )
+        return r_dict
+
+
+class AsyncMembershipTable(MembershipTableBase):
+    """Columnar table of the memberships of groups from an AsyncGrouperClient.
+
+    See MembershipTableBase for how the memberships are held.
+
+    :param client: An AsyncGrouperClient object containing connection information
+    :type client: AsyncGrouperClient
+    :param groups: The groups of the memberships
+    :type groups: Sequence[AsyncGroup]
+    :param subjects: The subjects of the memberships
+    :type subjects: SubjectTable
+    :param group_index: The index in groups of the group of each membership,
+    defaults to an empty array
+    :type group_index: array[int], optional
+    :param subject_index: The index in subjects of the subject of each membership,
+    defaults to an empty array
+    :type subject_index: array[int], optional
+    :param member_types: The member type of each membership,
+    0 for PERSON and 1 for GROUP, defaults to empty
+    :type member_types: bytearray, optional
+    :param membership_types: The membership type of each membership,
+    0 for DIRECT and 1 for INDIRECT, defaults to empty
+    :type membership_types: bytearray, optional
+    """
+
+    __slots__ = ()
+
+    client: AsyncGrouperClient
+    groups: Sequence[AsyncGroup]
+
+    async def to_memberships(
+        self, resolve_groups: bool = True
+    ) -> dict[AsyncGroup, list[AsyncMembership]]:
+        """Build AsyncMembership objects for the memberships in this table.
+
+        :param resolve_groups: Whether to resolve subjects that are groups into
+        AsyncGroup objects, which will require additional API calls,
+        defaults to True
+        :type resolve_groups: bool, optional
+        :return: A dictionary with AsyncGroups as the keys
+        and those groups' memberships list as the value, like
+        get_memberships_for_groups. Groups without memberships in this table
+        are not included.
+        :rtype: dict[AsyncGroup, list[AsyncMembership]]
+        """
+        from ..aio.util import resolve_subjects
+
+        subject_codes, subject_bodies = self._member_subjects()
+        members = dict(
+            zip(
+                subject_codes,
+                await resolve_subjects(
+                    subject_bodies=subject_bodies,
+                    client=self.client,
+                    subject_attr_names=self.subjects.attr_names,
+                    resolve_groups=resolve_groups,
+                ),
+            )
+        )
+        r_dict: dict[AsyncGroup, list[AsyncMembership]] = {}
+        for group_i, subject_i, member_type, membership_type in zip(
+            self.group_index,
+            self.subject_index,
+            self.member_types,
+            self.membership_types,
+        ):
+            r_dict.setdefault(self.groups[group_i], []).append(
+                AsyncMembership(
+                    member=members[subject_i],
+                    member_type=_MEMBER_TYPES[member_type],
+                    membership_type=_MEMBERSHIP_TYPES[membership_type],
+                )
+            )
+        return r_dict
+
+
+class MembershipMatrix:
+    """Whether each of a list of subjects is a member of each of a list of groups.
+
+    The answers are held as a compact boolean matrix, with one byte per group
+    and subject, in rows by group.
+
+    :param group_names: The names of the groups, one per row
+    :type group_names: list[str]
+    :param subjects: The subject identifiers or ids, one per column
+    :type subjects: list[str]
+    """
+
+    __slots__ = ("groups", "subjects", "bits", "_group_index", "_subject_index")
+
+    def __init__(self, group_names: list[str], subjects: list[str]) -> None:
+        """Construct a MembershipMatrix."""
+        self.groups = group_names
+        self.subjects = subjects
+        self.bits = bytearray(len(group_names) * len(subjects))
+        self._group_index = {name: i for i, name in enumerate(group_names)}
+        self._subject_index = {subject: i for i, subject in enumerate(subjects)}
+
+    def __repr__(self) -> str:
+        """Return a representation of the matrix."""
+        return (
+            f"<MembershipMatrix {len(self.groups)} groups"
+            f" x {len(self.subjects)} subjects>"
+        )
+
+    def _set(self, group_name: str, subject: str) -> None:
+        """Record that the given subject is a member of the given group.
+
+        Groups and subjects that are not in the matrix are ignored.
+
+        :param group_name: The name of the group
+        :type group_name: str
+        :param subject: The subject identifier or id
+        :type subject: str
+        """
+        group_i = self._group_index.get(group_name)
+        subject_i = self._subject_index.get(subject)
+        if group_i is not None and subject_i is not None:
+            self.bits[group_i * len(self.subjects) + subject_i] = 1
+
+    def is_member(self, group_name: str, subject: str) -> bool:
+        """Whether the given subject is a member of the given group.
+
+        :param group_name: The name of the group
+        :type group_name: str
+        :param subject: The subject identifier or id
+        :type subject: str
+        :raises KeyError: The group or subject is not in the matrix
+        :return: True if the subject is a member of the group
+        :rtype: bool
+        """
+        i = self._group_index[group_name] * len(self.subjects)
+        return bool(self.bits[i + self._subject_index[subject]])
+
+    def groups_for(self, subject: str) -> set[str]:
+        """Get the names of the groups the given subject is a member of.
+
+        :param subject: The subject identifier or id
+        :type subject: str
+        :raises KeyError: The subject is not in the matrix
+        :return: The names of the groups
+        :rtype: set[str]
+        """
+        subject_i = self._subject_index[subject]
+        width = len(self.subjects)
+        return {
+            group_name
+            for i, group_name in enumerate(self.groups)
+            if self.bits[i * width + subject_i]
+        }
+
+    def members_of(self, group_name: str) -> set[str]:
+        """Get the subjects that are members of the given group.
+
+        :param group_name: The name of the group
+        :type group_name: str
+        :raises KeyError: The group is not in the matrix
+        :return: The subject identifiers or ids of the members
+        :rtype: set[str]
+        """
+        width = len(self.subjects)
+        start = self._group_index[group_name] * width
+        row = self.bits[start:start + width]
+        return {subject for subject, bit in zip(self.subjects, row) if bit}
+
+    def to_dict(self) -> dict[str, set[str]]:
+        """Get the names of the groups each subject is a member of.
+
+        :return: Dict keyed by subject identifier or id, with the set of names
+        of the groups that subject is a member of
+        :rtype: dict[str, set[str]]
+        """
+        r_dict: dict[str, set[str]] = {subject: set() for subject in self.subjects}
+        width = len(self.subjects)
+        for group_i, group_name in enumerate(self.groups):
+            row = self.bits[group_i * width:(group_i + 1) * width]
+            for subject, bit in zip(self.subjects, row):
+                if bit:
+                    r_dict[subject].add(group_name)
+        return r_dict
@@ -1,39 +1,160 @@
 """grouper_python.objects.person - Class definition for Person."""
 
 from __future__ import annotations
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, ClassVar
 
 if TYPE_CHECKING:  # pragma: no cover
-    from .client import GrouperClient
-from .subject import Subject
+    from .client import GrouperClient, AsyncGrouperClient
+from .subject import SubjectBase, Subject, AsyncSubject
+from .base import LazyFields, read_body
+from collections.abc import Iterable, Iterator, Mapping
 from dataclasses import dataclass
+from weakref import WeakValueDictionary
+
+
+class AttributeSchema:
+    """The subject attribute names of a result, shared by the people in it.
+
+    Schemas are interned, so all people built with the same attribute names
+    share a single schema, and each only holds its own attribute values.
+    A schema is only kept while some person (or other object) still uses it,
+    so the interned schemas do not grow without limit.
+    Use AttributeSchema.of to get the schema for some attribute names.
+
+    :param names: The subject attribute names
+    :type names: tuple[str, ...]
+    """
+
+    __slots__ = ("names", "index", "__weakref__")
+
+    _interned: ClassVar[WeakValueDictionary[tuple[str, ...], AttributeSchema]] = (
+        WeakValueDictionary()
+    )
+
+    def __init__(self, names: tuple[str, ...]) -> None:
+        """Construct an AttributeSchema."""
+        self.names = names
+        self.index = {name: i for i, name in enumerate(names)}
+
+    def __repr__(self) -> str:
+        """Return a representation of the schema including its names."""
+        return f"AttributeSchema({self.names!r})"
+
+    @classmethod
+    def of(cls, names: Iterable[str]) -> AttributeSchema:
+        """Get the shared schema for the given attribute names.
+
+        :param names: The subject attribute names
+        :type names: Iterable[str]
+        :return: The schema for those names
+        :rtype: AttributeSchema
+        """
+        key = tuple(names)
+        schema = cls._interned.get(key)
+        if schema is None:
+            schema = cls._interned.setdefault(key, cls(key))
+        return schema
+
+
+class SubjectAttributes(Mapping[str, str]):
+    """Read-only mapping of a person's subject attribute names to their values.
+
+    Only the values are held, with the names in a shared AttributeSchema,
+    so this takes much less memory than a dict for each person.
+    It compares equal to a dict with the same items.
+
+    :param schema: The schema of the attribute names
+    :type schema: AttributeSchema
+    :param values: The attribute values, in the order of the schema's names
+    :type values: tuple[str, ...]
+    """
+
+    __slots__ = ("schema", "_values")
+
+    def __init__(self, schema: AttributeSchema, values: tuple[str, ...]) -> None:
+        """Construct a SubjectAttributes."""
+        self.schema = schema
+        self._values = values
+
+    def __getitem__(self, key: str) -> str:
+        """Get the value of an attribute."""
+        return self._values[self.schema.index[key]]
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the attribute names."""
+        return iter(self.schema.index)
+
+    def __len__(self) -> int:
+        """Return the number of attributes."""
+        return len(self.schema.index)
+
+    def __repr__(self) -> str:
+        """Return a representation of the attributes, as a dict."""
+        return repr(dict(self))
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> SubjectAttributes:
+        """Return this object, as it cannot be changed."""
+        return self
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get the value of an attribute, or a default if it is not present.
+
+        :param key: The attribute name
+        :type key: str
+        :param default: The value to return if the attribute is not present,
+        defaults to None
+        :type default: Any, optional
+        :return: The value of the attribute, or the default
+        :rtype: Any
+        """
+        i = self.schema.index.get(key)
+        return default if i is None else self._values[i]
 
 
 @dataclass(eq=False, slots=True)
-class Person(Subject):
-    """Person object representing a Grouper person.
+class PersonBase(SubjectBase):
+    """Fields shared by Person and AsyncPerson.
 
-    :param client: A GrouperClient object containing connection information
-    :type client: GrouperClient
+    :param client: A GrouperClient or AsyncGrouperClient object
+    containing connection information
+    :type client: GrouperClient | AsyncGrouperClient
     :param person_body: Body of the person as returned by the Grouper API
     :type person_body: dict[str, Any]
     :param subject_attr_names: Subject attribute names for the given person body
     :type subject_attr_names: list[str]
     """
 
-    attributes: dict[str, str]
+    attributes: SubjectAttributes
+
+    _body_arg: ClassVar[str] = "person_body"
+    # A lazily built person also keeps the attribute schema of its body
+    _lazy_slots: ClassVar[tuple[str, ...]] = ("_body", "_attribute_schema")
+    if TYPE_CHECKING:
+        _attribute_schema: AttributeSchema
+    _lazy_fields: ClassVar[LazyFields] = {
+        "id": read_body("id"),
+        "name": read_body("name"),
+        "attributes": lambda person, body: SubjectAttributes(
+            person._attribute_schema, tuple(body["attributeValues"])
+        ),
+        "description": lambda person, body: person.attributes.get("description", ""),
+        "universal_identifier": lambda person, body: person.attributes.get(
+            person.client.universal_identifier_attr, ""
+        ),
+        "sourceId": read_body("sourceId"),
+    }
 
     def __init__(
         self,
-        client: GrouperClient,
+        client: GrouperClient | AsyncGrouperClient,
         person_body: dict[str, Any],
         subject_attr_names: list[str],
     ) -> None:
         """Construct a Person."""
-        attrs = {
-            subject_attr_names[i]: person_body["attributeValues"][i]
-            for i in range(len(subject_attr_names))
-        }
+        attrs = SubjectAttributes(
+            AttributeSchema.of(subject_attr_names),
+            tuple(person_body["attributeValues"]),
+        )
         self.attributes = attrs
         self.id = person_body["id"]
         self.description = attrs.get("description", "")
@@ -42,6 +163,17 @@ class Person(Subject):
         self.name = person_body["name"]
         self.client = client
         # super().__init__(client, person_body, subject_attr_names)
+
+    def _init_lazy(
+        self,
+        client: GrouperClient | AsyncGrouperClient,
+        person_body: dict[str, Any],
+        subject_attr_names: list[str],
+    ) -> None:
+        """Construct a lazily built Person, see lazy_class."""
+        self.client = client
+        self._body = person_body
+        self._attribute_schema = AttributeSchema.of(subject_attr_names)
     # attributes: dict[str, str]
 
     # @classmethod
@@ -64,3 +196,29 @@ class Person(Subject):
     #         attributes=attrs,
     #         client=client,
     #     )
+
+
+@dataclass(eq=False, slots=True, init=False)
+class Person(Subject, PersonBase):
+    """Person object representing a Grouper person.
+
+    :param client: A GrouperClient object containing connection information
+    :type client: GrouperClient
+    :param person_body: Body of the person as returned by the Grouper API
+    :type person_body: dict[str, Any]
+    :param subject_attr_names: Subject attribute names for the given person body
+    :type subject_attr_names: list[str]
+    """
+
+
+@dataclass(eq=False, slots=True, init=False)
+class AsyncPerson(AsyncSubject, PersonBase):
+    """Person object representing a Grouper person, with awaitable methods.
+
+    :param client: An AsyncGrouperClient object containing connection information
+    :type client: AsyncGrouperClient
+    :param person_body: Body of the person as returned by the Grouper API
+    :type person_body: dict[str, Any]
+    :param subject_attr_names: Subject attribute names for the given person body
+    :type subject_attr_names: list[str]
+    """
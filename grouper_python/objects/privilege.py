@@ -4,16 +4,31 @@ from __future__ import annotations
 from typing import Any, TYPE_CHECKING
 
 if TYPE_CHECKING:  # pragma: no cover
-    from .client import GrouperClient
-from .subject import Subject
-from .group import Group
-from .stem import Stem
+    from .client import GrouperClient, AsyncGrouperClient
+from .subject import SubjectBase, Subject, AsyncSubject
+from .group import GroupBase, Group, AsyncGroup
+from .stem import StemBase, Stem, AsyncStem
 from .base import GrouperBase
 from dataclasses import dataclass
 
 
 @dataclass(slots=True)
-class Privilege(GrouperBase):
+class PrivilegeBase(GrouperBase):
+    """Fields shared by Privilege and AsyncPrivilege."""
+
+    stem: StemBase | None
+    group: GroupBase | None
+    target: StemBase | GroupBase
+    revokable: str
+    owner_subject: SubjectBase
+    allowed: str
+    subject: SubjectBase
+    privilege_name: str
+    privilege_type: str
+
+
+@dataclass(slots=True, init=False)
+class Privilege(PrivilegeBase):
     """Privilege object representing a Grouper privilege.
 
     :param client: A GrouperClient object containing connection information
@@ -30,12 +45,8 @@ class Privilege(GrouperBase):
     stem: Stem | None
     group: Group | None
     target: Stem | Group
-    revokable: str
     owner_subject: Subject
-    allowed: str
     subject: Subject
-    privilege_name: str
-    privilege_type: str
 
     def __init__(
         self,
@@ -45,12 +56,72 @@ class Privilege(GrouperBase):
     ) -> None:
         """Construct a Privilege."""
         self.stem = (
-            Stem(client, privilege_body["wsStem"])
+            client._entity(Stem, privilege_body["wsStem"])
+            if "wsStem" in privilege_body
+            else None
+        )
+        self.group = (
+            client._entity(Group, privilege_body["wsGroup"])
+            if "wsGroup" in privilege_body
+            else None
+        )
+        if self.stem:
+            self.target = self.stem
+        elif self.group:
+            self.target = self.group
+        else:  # pragma: no cover
+            raise ValueError("Unknown target for privilege", privilege_body)
+        self.revokable = privilege_body["revokable"]
+        self.owner_subject = client._entity(
+            Subject,
+            subject_body=privilege_body["ownerSubject"],
+            subject_attr_names=subject_attr_names,
+        )
+        self.allowed = privilege_body["allowed"]
+        self.subject = client._entity(
+            Subject,
+            subject_body=privilege_body["wsSubject"],
+            subject_attr_names=subject_attr_names,
+        )
+        self.privilege_type = privilege_body["privilegeType"]
+        self.privilege_name = privilege_body["privilegeName"]
+
+
+@dataclass(slots=True, init=False)
+class AsyncPrivilege(PrivilegeBase):
+    """Privilege object representing a Grouper privilege, with async entities.
+
+    :param client: An AsyncGrouperClient object containing connection information
+    :type client: AsyncGrouperClient
+    :param privilege_body: Body of the privilege as returned by the Grouper API
+    :type privilege_body: dict[str, Any]
+    :param subject_attr_names: Subject attribute names to correspond with
+    attribute values from the subject_body, defaults to []
+    :type subject_attr_names: list[str], optional
+    :raises ValueError: An unknown/unsupported target for the privilege was returned
+    by Grouper
+    """
+
+    stem: AsyncStem | None
+    group: AsyncGroup | None
+    target: AsyncStem | AsyncGroup
+    owner_subject: AsyncSubject
+    subject: AsyncSubject
+
+    def __init__(
+        self,
+        client: AsyncGrouperClient,
+        privilege_body: dict[str, Any],
+        subject_attr_names: list[str] = [],
+    ) -> None:
+        """Construct an AsyncPrivilege."""
+        self.stem = (
+            client._entity(AsyncStem, privilege_body["wsStem"])
             if "wsStem" in privilege_body
             else None
         )
         self.group = (
-            Group(client, privilege_body["wsGroup"])
+            client._entity(AsyncGroup, privilege_body["wsGroup"])
             if "wsGroup" in privilege_body
             else None
         )
@@ -61,14 +132,14 @@ class Privilege(GrouperBase):
         else:  # pragma: no cover
             raise ValueError("Unknown target for privilege", privilege_body)
         self.revokable = privilege_body["revokable"]
-        self.owner_subject = Subject(
-            client=client,
+        self.owner_subject = client._entity(
+            AsyncSubject,
             subject_body=privilege_body["ownerSubject"],
             subject_attr_names=subject_attr_names,
         )
         self.allowed = privilege_body["allowed"]
-        self.subject = Subject(
-            client=client,
+        self.subject = client._entity(
+            AsyncSubject,
             subject_body=privilege_body["wsSubject"],
             subject_attr_names=subject_attr_names,
         )
@@ -0,0 +1,269 @@
+"""grouper_python.objects.retry - Classes for retrying and failing fast."""
+
+from __future__ import annotations
+from typing import Any
+from collections.abc import Collection
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from threading import Lock
+import random
+import time
+import httpx
+from .exceptions import GrouperCircuitOpenException
+
+# Requests that leave Grouper in the same state no matter how many times
+# they are sent, so they can be retried even if an earlier attempt may have
+# reached Grouper. Assigning attributes is not included, as adding an
+# attribute or value again creates another assignment. Deleting groups and
+# stems is not included either: a retry of a delete that already succeeded
+# gets a not found result, which is raised as an error for the caller.
+_IDEMPOTENT_REQUESTS = frozenset(
+    {
+        "WsRestFindAttributeDefNamesLiteRequest",
+        "WsRestFindAttributeDefsLiteRequest",
+        "WsRestFindGroupsLiteRequest",
+        "WsRestFindGroupsRequest",
+        "WsRestFindStemsLiteRequest",
+        "WsRestGetAttributeAssignmentsRequest",
+        "WsRestGetGrouperPrivilegesLiteRequest",
+        "WsRestGetMembersRequest",
+        "WsRestGetMembershipsRequest",
+        "WsRestGetSubjectsRequest",
+        "WsRestHasMemberRequest",
+        "WsRestAddMemberRequest",
+        "WsRestDeleteMemberRequest",
+        "WsRestAssignGrouperPrivilegesRequest",
+        "WsRestAssignGrouperPrivilegesLiteRequest",
+        "WsRestGroupSaveRequest",
+        "WsRestStemSaveRequest",
+    }
+)
+
+# Errors raised before the request was sent, so any request can be retried
+_NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+class RetryPolicy:
+    """Policy for retrying calls to Grouper that fail with a transient error.
+
+    Connection errors, timeouts, and responses with a status in retry_statuses
+    are retried, waiting an exponentially increasing (and by default jittered)
+    time between attempts, or the time given by a Retry-After header.
+
+    A request that may have reached Grouper is only retried if sending it
+    again is safe, meaning it is a read, or a write that leaves Grouper in the
+    same state when repeated (such as adding a member). Other writes (assigning
+    attributes, and deleting groups or stems) are only retried when the request
+    was never sent, or when Grouper responded with 429 Too Many Requests,
+    unless retry_non_idempotent is True.
+
+    Grouper describes what the last attempt did, so when an add or delete of
+    members is retried after an attempt that reached Grouper, the subjects
+    that attempt changed are reported as already a member (or not a member)
+    rather than added (or deleted).
+
+    :param max_attempts: The maximum number of attempts for each call,
+    including the first one, defaults to 3
+    :type max_attempts: int, optional
+    :param backoff_factor: Seconds to wait before the first retry, doubled for
+    each retry after that, defaults to 0.5
+    :type backoff_factor: float, optional
+    :param max_backoff: The maximum seconds to wait between attempts,
+    including waits requested by Retry-After, defaults to 30.0
+    :type max_backoff: float, optional
+    :param jitter: Whether to wait a random time between 0 and the backoff,
+    so that many clients do not retry at the same moment, defaults to True
+    :type jitter: bool, optional
+    :param retry_statuses: HTTP statuses to retry,
+    defaults to (429, 502, 503, 504)
+    :type retry_statuses: Collection[int], optional
+    :param retry_non_idempotent: Whether to also retry writes that are not
+    safe to repeat, defaults to False
+    :type retry_non_idempotent: bool, optional
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        backoff_factor: float = 0.5,
+        max_backoff: float = 30.0,
+        jitter: bool = True,
+        retry_statuses: Collection[int] = (429, 502, 503, 504),
+        retry_non_idempotent: bool = False,
+    ) -> None:
+        """Construct a RetryPolicy."""
+        self.max_attempts = max_attempts
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.retry_statuses = frozenset(retry_statuses)
+        self.retry_non_idempotent = retry_non_idempotent
+
+    def retry_delay(
+        self,
+        attempt: int,
+        body: dict[str, Any],
+        response: httpx.Response | None = None,
+        error: httpx.TransportError | None = None,
+    ) -> float | None:
+        """Get the seconds to wait before retrying a call, or None to not retry.
+
+        :param attempt: The number of the attempt that just finished, from 1
+        :type attempt: int
+        :param body: The body of the request
+        :type body: dict[str, Any]
+        :param response: The response to the attempt, if there was one,
+        defaults to None
+        :type response: httpx.Response | None, optional
+        :param error: The error raised by the attempt, if there was one,
+        defaults to None
+        :type error: httpx.TransportError | None, optional
+        :return: Seconds to wait before the next attempt,
+        or None if the call should not be retried
+        :rtype: float | None
+        """
+        if attempt >= self.max_attempts:
+            return None
+        if error is not None:
+            if not isinstance(error, _NOT_SENT_ERRORS) and not self._idempotent(body):
+                return None
+        elif response is not None:
+            if response.status_code not in self.retry_statuses:
+                return None
+            if response.status_code != 429 and not self._idempotent(body):
+                return None
+            retry_after = _retry_after(response)
+            if retry_after is not None:
+                return min(retry_after, self.max_backoff)
+        else:  # pragma: no cover
+            return None
+        backoff = min(self.backoff_factor * 2 ** (attempt - 1), self.max_backoff)
+        return random.uniform(0, backoff) if self.jitter else backoff
+
+    def _idempotent(self, body: dict[str, Any]) -> bool:
+        """Determine whether a request is safe to send more than once.
+
+        :param body: The body of the request
+        :type body: dict[str, Any]
+        :return: True if the request can be retried after it may have been sent
+        :rtype: bool
+        """
+        return self.retry_non_idempotent or all(
+            request_type in _IDEMPOTENT_REQUESTS for request_type in body
+        )
+
+
+class CircuitBreaker:
+    """Circuit breaker that fails calls fast while Grouper is unavailable.
+
+    After failure_threshold calls in a row fail with a connection error,
+    a timeout or a 5xx response, the circuit "opens" and calls raise
+    GrouperCircuitOpenException without contacting Grouper.
+    After reset_timeout seconds, one call is let through to test Grouper,
+    which closes the circuit if it succeeds, or opens it again if it fails.
+
+    A CircuitBreaker can be shared by several clients for the same Grouper.
+
+    :param failure_threshold: The number of failures in a row that opens
+    the circuit, defaults to 5
+    :type failure_threshold: int, optional
+    :param reset_timeout: Seconds to fail fast before testing Grouper again,
+    defaults to 30.0
+    :type reset_timeout: float, optional
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        """Construct a CircuitBreaker."""
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self._opened_at: float | None = None
+        self._testing = False
+        self._lock = Lock()
+
+    @property
+    def state(self) -> str:
+        """Get the state of the circuit, "closed", "open" or "half-open".
+
+        :return: The state of the circuit
+        :rtype: str
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if self._testing or self._retry_in() <= 0:
+                return "half-open"
+            return "open"
+
+    def before_call(self) -> None:
+        """Check that a call can be made, marking it as the test call if needed.
+
+        :raises GrouperCircuitOpenException: The circuit is open
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return
+            retry_in = self._retry_in()
+            if retry_in > 0:
+                raise GrouperCircuitOpenException(retry_in)
+            # Let this call test Grouper. Restarting the timeout means another
+            # test is let through if this one never records its result.
+            self._testing = True
+            self._opened_at = time.monotonic()
+
+    def record_success(self) -> None:
+        """Record a call that reached Grouper, closing the circuit."""
+        with self._lock:
+            self.failures = 0
+            self._opened_at = None
+            self._testing = False
+
+    def record_failure(self) -> None:
+        """Record a failed call, opening the circuit if there are too many."""
+        with self._lock:
+            self.failures += 1
+            if self._testing or self.failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._testing = False
+
+    def record_response(self, response: httpx.Response) -> None:
+        """Record a call that got a response, which fails if it is a 5xx.
+
+        :param response: The response to the call
+        :type response: httpx.Response
+        """
+        if response.status_code >= 500:
+            self.record_failure()
+        else:
+            self.record_success()
+
+    def _retry_in(self) -> float:
+        """Get the seconds until the open circuit lets a test call through.
+
+        :return: Seconds until a test call, zero or negative if one can be made
+        :rtype: float
+        """
+        assert self._opened_at is not None
+        return self._opened_at + self.reset_timeout - time.monotonic()
+
+
+def _retry_after(response: httpx.Response) -> float | None:
+    """Get the seconds to wait from a Retry-After header, if there is one.
+
+    :param response: The response to check
+    :type response: httpx.Response
+    :return: The seconds to wait, or None if there is no valid Retry-After
+    :rtype: float | None
+    """
+    value = response.headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
@@ -0,0 +1,162 @@
+"""grouper_python.objects.stats - Class definitions for CallEvent and CallStats."""
+
+from __future__ import annotations
+from collections import deque
+from dataclasses import dataclass
+from threading import Lock
+
+
+@dataclass(slots=True)
+class CallEvent:
+    """Details of one call to the Grouper API, given to client event hooks.
+
+    request_type is the top-level key of the request body,
+    such as "WsRestGetMembersRequest". Times and sizes cover all attempts
+    of the call, and error is set if the call raised an exception.
+    """
+
+    request_type: str
+    path: str
+    method: str
+    request_bytes: int = 0
+    response_bytes: int = 0
+    status_code: int | None = None
+    network_seconds: float = 0.0
+    decode_seconds: float = 0.0
+    result_code: str | None = None
+    attempts: int = 0
+    error: BaseException | None = None
+
+    @property
+    def retries(self) -> int:
+        """Get the number of times the call was retried.
+
+        :return: The number of attempts after the first
+        :rtype: int
+        """
+        return max(self.attempts - 1, 0)
+
+    @property
+    def total_seconds(self) -> float:
+        """Get the time spent on the network and decoding the result.
+
+        :return: Seconds spent on the call, not including waits between retries
+        :rtype: float
+        """
+        return self.network_seconds + self.decode_seconds
+
+
+class _RequestTypeStats:
+    """Running totals and recent latencies for one request type."""
+
+    __slots__ = (
+        "count",
+        "errors",
+        "retries",
+        "request_bytes",
+        "response_bytes",
+        "network_seconds",
+        "decode_seconds",
+        "latencies",
+    )
+
+    def __init__(self, window: int) -> None:
+        """Construct a _RequestTypeStats."""
+        self.count = 0
+        self.errors = 0
+        self.retries = 0
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.network_seconds = 0.0
+        self.decode_seconds = 0.0
+        self.latencies: deque[float] = deque(maxlen=window)
+
+
+class CallStats:
+    """In-memory aggregate of the calls made by a client, per request type.
+
+    Counts, errors, retries, bytes and times are totals for all calls,
+    while latency percentiles are calculated from the most recent
+    window calls of each request type.
+
+    :param window: The number of recent calls per request type
+    to calculate percentiles from, defaults to 1000
+    :type window: int, optional
+    """
+
+    def __init__(self, window: int = 1000) -> None:
+        """Construct a CallStats."""
+        self.window = window
+        self._stats: dict[str, _RequestTypeStats] = {}
+        self._lock = Lock()
+
+    def record(self, event: CallEvent) -> None:
+        """Add a call to the statistics.
+
+        :param event: The event for the call
+        :type event: CallEvent
+        """
+        with self._lock:
+            stats = self._stats.get(event.request_type)
+            if stats is None:
+                stats = self._stats[event.request_type] = _RequestTypeStats(
+                    self.window
+                )
+            stats.count += 1
+            stats.errors += event.error is not None
+            stats.retries += event.retries
+            stats.request_bytes += event.request_bytes
+            stats.response_bytes += event.response_bytes
+            stats.network_seconds += event.network_seconds
+            stats.decode_seconds += event.decode_seconds
+            stats.latencies.append(event.total_seconds)
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """Summarize the calls made so far, per request type.
+
+        Each request type has "count", "errors", "retries", "request_bytes",
+        "response_bytes", "network_seconds" and "decode_seconds" totals,
+        and "p50", "p90", "p95", "p99", "max" and "mean" latencies in seconds.
+
+        :return: Dict keyed by request type, with the statistics for that type
+        :rtype: dict[str, dict[str, float]]
+        """
+        summary: dict[str, dict[str, float]] = {}
+        with self._lock:
+            for request_type, stats in self._stats.items():
+                latencies = sorted(stats.latencies)
+                summary[request_type] = {
+                    "count": stats.count,
+                    "errors": stats.errors,
+                    "retries": stats.retries,
+                    "request_bytes": stats.request_bytes,
+                    "response_bytes": stats.response_bytes,
+                    "network_seconds": stats.network_seconds,
+                    "decode_seconds": stats.decode_seconds,
+                    "p50": _percentile(latencies, 50),
+                    "p90": _percentile(latencies, 90),
+                    "p95": _percentile(latencies, 95),
+                    "p99": _percentile(latencies, 99),
+                    "max": latencies[-1],
+                    "mean": sum(latencies) / len(latencies),
+                }
+        return summary
+
+    def reset(self) -> None:
+        """Remove all recorded calls."""
+        with self._lock:
+            self._stats.clear()
+
+
+def _percentile(latencies: list[float], percent: float) -> float:
+    """Get a percentile of sorted latencies, using the nearest rank.
+
+    :param latencies: The latencies, sorted in ascending order
+    :type latencies: list[float]
+    :param percent: The percentile to get, from 0 to 100
+    :type percent: float
+    :return: The latency at that percentile
+    :rtype: float
+    """
+    rank = max(int(-(-percent * len(latencies) // 100)), 1)
+    return latencies[rank - 1]
@@ -1,29 +1,38 @@
 """grouper_python.objects.stem - Class definition for Stem and related objects."""
 
 from __future__ import annotations
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, ClassVar
 
 if TYPE_CHECKING:  # pragma: no cover
-    from .subject import Subject
-    from .group import Group
-    from .privilege import Privilege
-    from .attribute import AttributeAssignment
+    from .subject import Subject, SubjectBase
+    from .group import Group, AsyncGroup
+    from .privilege import Privilege, AsyncPrivilege
+    from .attribute import AttributeAssignment, AsyncAttributeAssignment
+    from .client import AsyncGrouperClient
 
 from ..privilege import assign_privileges, get_privileges
 from ..stem import create_stems, get_stems_by_parent, delete_stems
 from ..group import create_groups, get_groups_by_parent
 from ..attribute import assign_attribute, get_attribute_assignments
+from ..aio import (
+    privilege as aio_privilege,
+    stem as aio_stem,
+    group as aio_group,
+    attribute as aio_attribute,
+)
 from .client import GrouperClient
-from dataclasses import dataclass
-from .base import GrouperEntity
+from dataclasses import dataclass, field
+from ..tracing import traced
+from .base import GrouperEntity, LazyFields, read_body
 
 
 @dataclass(slots=True, eq=False)
-class Stem(GrouperEntity):
-    """Stem object representing a Grouper stem.
+class StemBase(GrouperEntity):
+    """Fields shared by Stem and AsyncStem.
 
-    :param client: A GrouperClient object containing connection information
-    :type client: GrouperClient
+    :param client: A GrouperClient or AsyncGrouperClient object
+    containing connection information
+    :type client: GrouperClient | AsyncGrouperClient
     :param stem_body: Body of the stem as returned by the Grouper API
     :type stem_body: dict[str, Any]
     """
@@ -34,9 +43,22 @@ class Stem(GrouperEntity):
     displayExtension: str
     idIndex: str
 
+    _body_arg: ClassVar[str] = "stem_body"
+    _body_id_key: ClassVar[str] = "uuid"
+    _lazy_fields: ClassVar[LazyFields] = {
+        "id": read_body("uuid"),
+        "name": read_body("name"),
+        "description": read_body("description", ""),
+        "extension": read_body("extension"),
+        "displayName": read_body("displayName"),
+        "uuid": read_body("uuid"),
+        "displayExtension": read_body("displayExtension"),
+        "idIndex": read_body("idIndex"),
+    }
+
     def __init__(
         self,
-        client: GrouperClient,
+        client: GrouperClient | AsyncGrouperClient,
         stem_body: dict[str, Any],
     ) -> None:
         """Construct a Stem."""
@@ -50,6 +72,29 @@ class Stem(GrouperEntity):
         self.idIndex = stem_body["idIndex"]
         self.client = client
 
+    def _init_lazy(
+        self,
+        client: GrouperClient | AsyncGrouperClient,
+        stem_body: dict[str, Any],
+    ) -> None:
+        """Construct a lazily built Stem, see lazy_class."""
+        self.client = client
+        self._body = stem_body
+
+
+@dataclass(slots=True, eq=False, init=False)
+class Stem(StemBase):
+    """Stem object representing a Grouper stem.
+
+    :param client: A GrouperClient object containing connection information
+    :type client: GrouperClient
+    :param stem_body: Body of the stem as returned by the Grouper API
+    :type stem_body: dict[str, Any]
+    """
+
+    client: GrouperClient = field(repr=False)
+
+    @traced
     def create_privilege_on_this(
         self,
         entity_identifier: str,
@@ -75,6 +120,7 @@ class Stem(GrouperEntity):
             act_as_subject=act_as_subject,
         )
 
+    @traced
     def delete_privilege_on_this(
         self,
         entity_identifier: str,
@@ -100,6 +146,7 @@ class Stem(GrouperEntity):
             act_as_subject=act_as_subject,
         )
 
+    @traced
     def create_privileges_on_this(
         self,
         entity_identifiers: list[str],
@@ -126,6 +173,7 @@ class Stem(GrouperEntity):
             act_as_subject=act_as_subject,
         )
 
+    @traced
     def delete_privileges_on_this(
         self,
         entity_identifiers: list[str],
@@ -152,6 +200,7 @@ class Stem(GrouperEntity):
             act_as_subject=act_as_subject,
         )
 
+    @traced
     def get_privileges_on_this(
         self,
         subject_id: str | None = None,
@@ -189,6 +238,7 @@ class Stem(GrouperEntity):
             act_as_subject=act_as_subject,
         )
 
+    @traced
     def create_child_stem(
         self,
         extension: str,
@@ -221,6 +271,7 @@ class Stem(GrouperEntity):
             act_as_subject=act_as_subject,
         )[0]
 
+    @traced
     def create_child_group(
         self,
         extension: str,
@@ -255,6 +306,7 @@ class Stem(GrouperEntity):
         )
         return (create_groups([create], self.client, act_as_subject))[0]
 
+    @traced
     def get_child_stems(
         self,
         recursive: bool,
@@ -277,6 +329,7 @@ class Stem(GrouperEntity):
             act_as_subject=act_as_subject,
         )
 
+    @traced
     def get_child_groups(
         self,
         recursive: bool,
@@ -299,6 +352,7 @@ class Stem(GrouperEntity):
             act_as_subject=act_as_subject,
         )
 
+    @traced
     def delete(
         self,
         act_as_subject: Subject | None = None,
@@ -312,6 +366,7 @@ class Stem(GrouperEntity):
             stem_names=[self.name], client=self.client, act_as_subject=act_as_subject
         )
 
+    @traced
     def assign_attribute_on_this(
         self,
         assign_operation: str,
@@ -350,6 +405,7 @@ class Stem(GrouperEntity):
             act_as_subject=act_as_subject,
         )
 
+    @traced
     def get_attribute_assignments_on_this(
         self,
         attribute_def_name_names: list[str] = [],
@@ -379,6 +435,363 @@ class Stem(GrouperEntity):
         )
 
 
+@dataclass(slots=True, eq=False, init=False)
+class AsyncStem(StemBase):
+    """Stem object representing a Grouper stem, with awaitable methods.
+
+    :param client: An AsyncGrouperClient object containing connection information
+    :type client: AsyncGrouperClient
+    :param stem_body: Body of the stem as returned by the Grouper API
+    :type stem_body: dict[str, Any]
+    """
+
+    client: AsyncGrouperClient = field(repr=False)
+
+    @traced
+    async def create_privilege_on_this(
+        self,
+        entity_identifier: str,
+        privilege_name: str,
+        act_as_subject: SubjectBase | None = None,
+    ) -> None:
+        """Create a privilege on this Stem.
+
+        :param entity_identifier: Identifier of the entity to receive the permission
+        :type entity_identifier: str
+        :param privilege_name: Name of the privilege to assign
+        :type privilege_name: str
+        :param act_as_subject: Optional subject to act as, defaults to None
+        :type act_as_subject: SubjectBase | None, optional
+        """
+        await aio_privilege.assign_privileges(
+            target_name=self.name,
+            target_type="stem",
+            privilege_names=[privilege_name],
+            entity_identifiers=[entity_identifier],
+            allowed="T",
+            client=self.client,
+            act_as_subject=act_as_subject,
+        )
+
+    @traced
+    async def delete_privilege_on_this(
+        self,
+        entity_identifier: str,
+        privilege_name: str,
+        act_as_subject: SubjectBase | None = None,
+    ) -> None:
+        """Delete a privilege on this Stem.
+
+        :param entity_identifier: Identifier of the entity to remove permission for
+        :type entity_identifier: str
+        :param privilege_name: Name of the privilege to delete
+        :type privilege_name: str
+        :param act_as_subject: Optional subject to act as, defaults to None
+        :type act_as_subject: SubjectBase | None, optional
+        """
+        await aio_privilege.assign_privileges(
+            target_name=self.name,
+            target_type="stem",
+            privilege_names=[privilege_name],
+            entity_identifiers=[entity_identifier],
+            allowed="F",
+            client=self.client,
+            act_as_subject=act_as_subject,
+        )
+
+    @traced
+    async def create_privileges_on_this(
+        self,
+        entity_identifiers: list[str],
+        privilege_names: list[str],
+        act_as_subject: SubjectBase | None = None,
+    ) -> None:
+        """Create privileges on this Stem.
+
+        :param entity_identifiers: List of identifiers of the entities
+        to receive the permissions
+        :type entity_identifiers: list[str]
+        :param privilege_names: List of names of the privileges to assign
+        :type privilege_names: list[str]
+        :param act_as_subject: Optional subject to act as, defaults to None
+        :type act_as_subject: SubjectBase | None, optional
+        """
+        await aio_privilege.assign_privileges(
+            target_name=self.name,
+            target_type="stem",
+            privilege_names=privilege_names,
+            entity_identifiers=entity_identifiers,
+            allowed="T",
+            client=self.client,
+            act_as_subject=act_as_subject,
+        )
+
+    @traced
+    async def delete_privileges_on_this(
+        self,
+        entity_identifiers: list[str],
+        privilege_names: list[str],
+        act_as_subject: SubjectBase | None = None,
+    ) -> None:
+        """Delete privileges on this Stem.
+
+        :param entity_identifiers: List of identifiers of the entities
+        to receive the permissions
+        :type entity_identifiers: list[str]
+        :param privilege_names: List of names of the privileges to assign
+        :type privilege_names: list[str]
+        :param act_as_subject: Optional subject to act as, defaults to None
+        :type act_as_subject: SubjectBase | None, optional
+        """
+        await aio_privilege.assign_privileges(
+            target_name=self.name,
+            target_type="stem",
+            privilege_names=privilege_names,
+            entity_identifiers=entity_identifiers,
+            allowed="F",
+            client=self.client,
+            act_as_subject=act_as_subject,
+        )
+
+    @traced
+    async def get_privileges_on_this(
+        self,
+        subject_id: str | None = None,
+        subject_identifier: str | None = None,
+        privilege_name: str | None = None,
+        attributes: list[str] = [],
+        act_as_subject: SubjectBase | None = None,
+    ) -> list[AsyncPrivilege]:
+        """Get privileges on this Stem.
+
+        :param subject_id: Subject Id to limit retreived permissions to,
+        cannot be specified if subject_identifer is specified, defaults to None
+        :type subject_id: str | None, optional
+        :param subject_identifier: Subject Identifer to limit retreived permissions to,
+        cannot be specified if subject_id is specified, defaults to None
+        :type subject_identifier: str | None, optional
+        :param privilege_name: Name of privilege to get, defaults to None
+        :type privilege_name: str | None, optional
+        :param attributes: Additional attributes to retrieve for the Subjects,
+        defaults to []
+        :type attributes: list[str], optional
+        :param act_as_subject: Optional subject to act as, defaults to None
+        :type act_as_subject: SubjectBase | None, optional
+        :return: List of retreived privileges on this Stem
+        satisfying the given constraints
+        :rtype: list[AsyncPrivilege]
+        """
+        return await aio_privilege.get_privileges(
+            client=self.client,
+            subject_id=subject_id,
+            subject_identifier=subject_identifier,
+            stem_name=self.name,
+            privilege_name=privilege_name,
+            attributes=attributes,
+            act_as_subject=act_as_subject,
+        )
+
+    @traced
+    async def create_child_stem(
+        self,
+        extension: str,
+        display_extension: str,
+        description: str = "",
+        act_as_subject: SubjectBase | None = None,
+    ) -> AsyncStem:
+        """Create a child stem in this Stem.
+
+        :param extension: The extension (id) of the stem to create.
+        :type extension: str
+        :param display_extension: The display extension (display name)
+        of the stem to create
+        :type display_extension: str
+        :param description: Description of the stem to create, defaults to ""
+        :type description: str, optional
+        :param act_as_subject: Optional subject to act as, defaults to None
+        :type act_as_subject: SubjectBase | None, optional
+        :return: An AsyncStem object representing the newly created stem
+        :rtype: AsyncStem
+        """
+        create = CreateStem(
+            name=f"{self.name}:{extension}",
+            displayExtension=display_extension,
+            description=description,
+        )
+        return (
+            await aio_stem.create_stems(
+                [create],
+                self.client,
+                act_as_subject=act_as_subject,
+            )
+        )[0]
+
+    @traced
+    async def create_child_group(
+        self,
+        extension: str,
+        display_extension: str,
+        description: str = "",
+        detail: dict[str, Any] | None = None,
+        act_as_subject: SubjectBase | None = None,
+    ) -> AsyncGroup:
+        """Create a child group in this Stem.
+
+        :param extension: The extension (id) of the group to create.
+        :type extension: str
+        :param display_extension: The display extension (display name)
+        of the group to create
+        :type display_extension: str
+        :param description: Description of the group to create, defaults to ""
+        :type description: str, optional
+        :param detail: Dict of "details" of the group to create, defaults to None
+        :type detail: dict[str, Any] | None, optional
+        :param act_as_subject: Optional subject to act as, defaults to None
+        :type act_as_subject: SubjectBase | None, optional
+        :return: A Group object representing the newly created group
+        :rtype: AsyncGroup
+        """
+        from .group import CreateGroup
+
+        create = CreateGroup(
+            name=f"{self.name}:{extension}",
+            display_extension=display_extension,
+            description=description,
+            detail=detail,
+        )
+        return (
+            await aio_group.create_groups([create], self.client, act_as_subject)
+        )[0]
+
+    @traced
+    async def get_child_stems(
+        self,
+        recursive: bool,
+        act_as_subject: SubjectBase | None = None,
+    ) -> list[AsyncStem]:
+        """Get child stems of this Stem.
+
+        :param recursive: Whether to look recursively through the entire subtree (True),
+        or only one level in this stem (False)
+        :type recursive: bool
+        :param act_as_subject: Optional subject to act as, defaults to None
+        :type act_as_subject: SubjectBase | None, optional
+        :return: The list of Stems found
+        :rtype: list[AsyncStem]
+        """
+        return await aio_stem.get_stems_by_parent(
+            parent_name=self.name,
+            client=self.client,
+            recursive=recursive,
+            act_as_subject=act_as_subject,
+        )
+
+    @traced
+    async def get_child_groups(
+        self,
+        recursive: bool,
+        act_as_subject: SubjectBase | None = None,
+    ) -> list[AsyncGroup]:
+        """Get child groups of this Stem.
+
+        :param recursive: Whether to look recursively through the entire subtree (True),
+        or only one level in this stem (False)
+        :type recursive: bool
+        :param act_as_subject: Optional subject to act as, defaults to None
+        :type act_as_subject: SubjectBase | None, optional
+        :return: The list of Groups found
+        :rtype: list[AsyncGroup]
+        """
+        return await aio_group.get_groups_by_parent(
+            parent_name=self.name,
+            client=self.client,
+            recursive=recursive,
+            act_as_subject=act_as_subject,
+        )
+
+    @traced
+    async def delete(
+        self,
+        act_as_subject: SubjectBase | None = None,
+    ) -> None:
+        """Delete this Stem.
+
+        :param act_as_subject: Optional subject to act as, defaults to None
+        :type act_as_subject: SubjectBase | None, optional
+        """
+        await aio_stem.delete_stems(
+            stem_names=[self.name], client=self.client, act_as_subject=act_as_subject
+        )
+
+    @traced
+    async def assign_attribute_on_this(
+        self,
+        assign_operation: str,
+        attribute_def_name_name: str,
+        value: None | str | int | float = None,
+        assign_value_operation: str | None = None,
+        act_as_subject: SubjectBase | None = None,
+    ) -> list[AsyncAttributeAssignment]:
+        """Assign an attribute on this stem.
+
+        :param assign_operation: Assignment operation, one of
+        "assign_attr", "add_attr", "remove_attr", "replace_attrs"
+        :type assign_operation: str
+        :param attribute_def_name_name: Attribute definition name name to assign
+        :type attribute_def_name_name: str
+        :param value: Value to assign, also requires assign_value_operation,
+        defaults to None
+        :type value: None | str | int | float, optional
+        :param assign_value_operation: Value assignment operation, one of
+        "assign_value", "add_value", "remove_value", "replace_values",
+        requires value to be specified as well, defaults to None
+        :type assign_value_operation: str | None, optional
+        :param act_as_subject: Optional subject to act as, defaults to None
+        :type act_as_subject: SubjectBase | None, optional
+        :return: A list of modified AttributeAssignments
+        :rtype: list[AsyncAttributeAssignment]
+        """
+        return await aio_attribute.assign_attribute(
+            attribute_assign_type="stem",
+            assign_operation=assign_operation,
+            client=self.client,
+            owner_name=self.name,
+            attribute_def_name_name=attribute_def_name_name,
+            value=value,
+            assign_value_operation=assign_value_operation,
+            act_as_subject=act_as_subject,
+        )
+
+    @traced
+    async def get_attribute_assignments_on_this(
+        self,
+        attribute_def_name_names: list[str] = [],
+        attribute_def_names: list[str] = [],
+        act_as_subject: SubjectBase | None = None,
+    ) -> list[AsyncAttributeAssignment]:
+        """Get attribute assignments on this stem.
+
+        :param attribute_def_name_names: List of names of attribute definition names
+        to retrieve assignments for, defaults to []
+        :type attribute_def_name_names: list[str], optional
+        :param attribute_def_names:  List of names of attribute defitions
+        to retrieve assignments for, defaults to []
+        :type attribute_def_names: list[str], optional
+        :param act_as_subject: Optional subject to act as, defaults to None
+        :type act_as_subject: SubjectBase | None, optional
+        :return: A list of AttributeAssignments on this stem
+        :rtype: list[AsyncAttributeAssignment]
+        """
+        return await aio_attribute.get_attribute_assignments(
+            attribute_assign_type="stem",
+            client=self.client,
+            attribute_def_name_names=attribute_def_name_names,
+            attribute_def_names=attribute_def_names,
+            owner_names=[self.name],
+            act_as_subject=act_as_subject,
+        )
+
+
 @dataclass
 class CreateStem:
     """Class representing all data needed to create a new Grouper stem.
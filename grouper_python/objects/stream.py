@@ -0,0 +1,210 @@
+"""grouper_python.objects.stream - Class definition for JSONStreamParser."""
+
+from __future__ import annotations
+from typing import Any
+from collections.abc import Iterable
+import codecs
+import json
+import re
+
+# Given as the value when a streamed array ends
+END = object()
+
+_NOT_WHITESPACE = re.compile(r"[^ \t\n\r]")
+_NUMBER_START = frozenset("-0123456789")
+# States of a container being walked through
+_FIRST = 0  # just opened, expecting its first item (or key) or its end
+_NEXT = 1  # after a comma, expecting the next item (or key)
+_COLON = 2  # after a key, expecting a colon
+_AFTER = 3  # after an item (or value), expecting a comma or its end
+
+
+class _Container:
+    """An object or streamed array that is being walked through."""
+
+    __slots__ = ("path", "array", "state", "key")
+
+    def __init__(self, path: tuple[str, ...], array: bool) -> None:
+        """Construct a _Container."""
+        self.path = path
+        self.array = array
+        self.state = _FIRST
+        self.key = ""
+
+
+class JSONStreamParser:
+    """Incremental parser for a JSON document that arrives in chunks.
+
+    The arrays at the given paths are not built in full. Instead each of their
+    items is given as soon as it has been parsed, so a large result can be
+    processed while it downloads and without holding all of it in memory.
+    The objects leading to those arrays are walked through key by key,
+    and every other value is given in full once it has been parsed.
+
+    feed() and close() return a list of (path, value) pairs, where path is the
+    tuple of keys leading to the value. Items of a streamed array are given
+    with the path of the array, and when the array ends, (path, END) is given.
+
+    :param stream_paths: The paths of the arrays to give the items of
+    one at a time, such as ("WsGetMembershipsResults", "wsSubjects")
+    :type stream_paths: Iterable[tuple[str, ...]]
+    """
+
+    def __init__(self, stream_paths: Iterable[tuple[str, ...]]) -> None:
+        """Construct a JSONStreamParser."""
+        self.stream_paths = set(stream_paths)
+        self._object_paths = {
+            path[:i] for path in self.stream_paths for i in range(len(path))
+        }
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._scan = json.JSONDecoder().raw_decode
+        self._buffer = ""
+        self._pos = 0
+        self._wanted = 0
+        self._stack: list[_Container] = []
+        self._expected: tuple[str, ...] | None = ()
+        self._done = False
+
+    def feed(self, data: bytes) -> list[tuple[tuple[str, ...], Any]]:
+        """Parse the next chunk of the document.
+
+        :param data: The next chunk of the UTF-8 encoded document
+        :type data: bytes
+        :raises ValueError: The document is not valid JSON
+        :return: The values and streamed items completed by this chunk
+        :rtype: list[tuple[tuple[str, ...], Any]]
+        """
+        self._buffer = self._buffer[self._pos:] + self._decoder.decode(data)
+        self._pos = 0
+        if len(self._buffer) < self._wanted:
+            return []
+        return self._parse(final=False)
+
+    def close(self) -> list[tuple[tuple[str, ...], Any]]:
+        """Finish parsing the document after its last chunk.
+
+        :raises ValueError: The document is not valid JSON, or is incomplete
+        :return: The values and streamed items completed by the end of the document
+        :rtype: list[tuple[tuple[str, ...], Any]]
+        """
+        self._buffer = self._buffer[self._pos:] + self._decoder.decode(
+            b"", final=True
+        )
+        self._pos = 0
+        events = self._parse(final=True)
+        if not self._done:
+            raise ValueError("Incomplete JSON document")
+        return events
+
+    def _parse(self, final: bool) -> list[tuple[tuple[str, ...], Any]]:
+        """Parse as much of the buffered document as possible.
+
+        :param final: Whether the whole document has been buffered
+        :type final: bool
+        :raises ValueError: The document is not valid JSON
+        :return: The values and streamed items completed
+        :rtype: list[tuple[tuple[str, ...], Any]]
+        """
+        events: list[tuple[tuple[str, ...], Any]] = []
+        buffer = self._buffer
+        self._wanted = 0
+        while True:
+            match = _NOT_WHITESPACE.search(buffer, self._pos)
+            if match is None:
+                self._pos = len(buffer)
+                return events
+            pos = self._pos = match.start()
+            if self._done:
+                raise ValueError(f"Extra data after the JSON document: {pos}")
+            char = buffer[pos]
+            container = self._stack[-1] if self._stack else None
+            if self._expected is not None:
+                path = self._expected
+                if container is None or not container.array:
+                    if char == "{" and path in self._object_paths:
+                        self._open(_Container(path, array=False))
+                        continue
+                    if char == "[" and path in self.stream_paths:
+                        self._open(_Container(path, array=True))
+                        continue
+                decoded = self._decode(final)
+                if decoded is None:
+                    return events
+                events.append((path, decoded[0]))
+                self._expected = None
+                self._done = container is None
+            elif container is None:  # pragma: no cover
+                # Not expecting a value outside of any container means
+                # the document is done, which is checked above
+                raise ValueError(f"Unexpected character: {pos}")
+            elif container.state == _COLON:
+                if char != ":":
+                    raise ValueError(f"Expecting ':' delimiter: {pos}")
+                self._pos += 1
+                self._expected = container.path + (container.key,)
+                container.state = _AFTER
+            elif char == ("]" if container.array else "}") and container.state in (
+                _FIRST,
+                _AFTER,
+            ):
+                self._pos += 1
+                self._stack.pop()
+                if container.array:
+                    events.append((container.path, END))
+                self._done = not self._stack
+            elif container.state == _AFTER:
+                if char != ",":
+                    raise ValueError(f"Expecting ',' delimiter: {pos}")
+                self._pos += 1
+                container.state = _NEXT
+            elif container.array:
+                self._expected = container.path
+                container.state = _AFTER
+            else:
+                if char != '"':
+                    raise ValueError(f"Expecting property name: {pos}")
+                decoded = self._decode(final)
+                if decoded is None:
+                    return events
+                container.key = decoded[0]
+                container.state = _COLON
+
+    def _open(self, container: _Container) -> None:
+        """Start walking through an object or streamed array.
+
+        :param container: The object or array to walk through
+        :type container: _Container
+        """
+        self._stack.append(container)
+        self._pos += 1
+        self._expected = None
+
+    def _decode(self, final: bool) -> tuple[Any] | None:
+        """Decode the value at the current position of the buffer.
+
+        :param final: Whether the whole document has been buffered
+        :type final: bool
+        :raises ValueError: The value is not valid JSON
+        :return: A tuple of the value,
+        or None if more of the document is needed to decode it
+        :rtype: tuple[Any] | None
+        """
+        try:
+            value, end = self._scan(self._buffer, self._pos)
+        except json.JSONDecodeError:
+            if final:
+                raise
+            # Wait for the buffer to double before trying again,
+            # so a large value is not decoded over and over
+            self._wanted = 2 * (len(self._buffer) - self._pos)
+            return None
+        if (
+            not final
+            and self._buffer[self._pos] in _NUMBER_START
+            and self._buffer[end:end + 1] in ("", ".", "e", "E")
+        ):
+            # A number at the end of the buffer may continue in the next chunk
+            self._wanted = len(self._buffer) - self._pos + 1
+            return None
+        self._pos = end
+        return (value,)
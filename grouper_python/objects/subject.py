@@ -1,26 +1,33 @@
 """grouper_python.objects.subject - Class definition for Subject."""
 
 from __future__ import annotations
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, ClassVar
 
 if TYPE_CHECKING:  # pragma: no cover
-    from .group import Group
-    from .privilege import Privilege
-    from .client import GrouperClient
+    from .group import Group, AsyncGroup
+    from .privilege import Privilege, AsyncPrivilege
+    from .client import GrouperClient, AsyncGrouperClient
 from ..subject import get_groups_for_subject
 from ..membership import has_members
 from ..privilege import get_privileges
-from dataclasses import dataclass
+from ..aio import (
+    subject as aio_subject,
+    membership as aio_membership,
+    privilege as aio_privilege,
+)
+from dataclasses import dataclass, field
+from ..tracing import traced
 from .base import GrouperEntity
 from .exceptions import GrouperSubjectNotFoundException
 
 
 @dataclass(slots=True, eq=False)
-class Subject(GrouperEntity):
-    """Subject object representing a Grouper subject.
+class SubjectBase(GrouperEntity):
+    """Fields shared by Subject and AsyncSubject.
 
-    :param client: A GrouperClient object containing connection information
-    :type client: GrouperClient
+    :param client: A GrouperClient or AsyncGrouperClient object
+    containing connection information
+    :type client: GrouperClient | AsyncGrouperClient
     :param subject_body: Body of the subject as returned by the Grouper API
     :type subject_body: dict[str, Any]
     :param subject_attr_names: Subject attribute names to correspond with
@@ -31,9 +38,11 @@ class Subject(GrouperEntity):
     universal_identifier: str
     sourceId: str
 
+    _body_arg: ClassVar[str] = "subject_body"
+
     def __init__(
         self,
-        client: GrouperClient,
+        client: GrouperClient | AsyncGrouperClient,
         subject_body: dict[str, Any],
         subject_attr_names: list[str],
     ) -> None:
@@ -53,6 +62,23 @@ class Subject(GrouperEntity):
         self.name = subject_body["name"]
         self.client = client
 
+
+@dataclass(slots=True, eq=False, init=False)
+class Subject(SubjectBase):
+    """Subject object representing a Grouper subject.
+
+    :param client: A GrouperClient object containing connection information
+    :type client: GrouperClient
+    :param subject_body: Body of the subject as returned by the Grouper API
+    :type subject_body: dict[str, Any]
+    :param subject_attr_names: Subject attribute names to correspond with
+    attribute values from the subject_body
+    :type subject_attr_names: list[str]
+    """
+
+    client: GrouperClient = field(repr=False)
+
+    @traced
     def get_groups(
         self,
         stem: str | None = None,
@@ -80,6 +106,7 @@ class Subject(GrouperEntity):
             act_as_subject=act_as_subject,
         )
 
+    @traced
     def is_member(
         self,
         group_name: str,
@@ -120,6 +147,7 @@ class Subject(GrouperEntity):
                 subject_identifier=self.universal_identifier
             )
 
+    @traced
     def get_privileges_for_this_in_others(
         self,
         group_name: str | None = None,
@@ -165,3 +193,135 @@ class Subject(GrouperEntity):
             attributes=attributes,
             act_as_subject=act_as_subject,
         )
+
+
+@dataclass(slots=True, eq=False, init=False)
+class AsyncSubject(SubjectBase):
+    """Subject object representing a Grouper subject, with awaitable methods.
+
+    :param client: An AsyncGrouperClient object containing connection information
+    :type client: AsyncGrouperClient
+    :param subject_body: Body of the subject as returned by the Grouper API
+    :type subject_body: dict[str, Any]
+    :param subject_attr_names: Subject attribute names to correspond with
+    attribute values from the subject_body
+    :type subject_attr_names: list[str]
+    """
+
+    client: AsyncGrouperClient = field(repr=False)
+
+    @traced
+    async def get_groups(
+        self,
+        stem: str | None = None,
+        substems: bool = True,
+        act_as_subject: SubjectBase | None = None,
+    ) -> list[AsyncGroup]:
+        """Get groups this subject is a member of.
+
+        :param stem: Optional stem to limit the search to, defaults to None
+        :type stem: str | None, optional
+        :param substems: Whether to look recursively through substems
+        of the given stem (True), or only one level in the given stem (False),
+        defaults to True
+        :type substems: bool, optional
+        :param act_as_subject: Optional subject to act as, defaults to None
+        :type act_as_subject: SubjectBase | None, optional
+        :return: List of found groups, will be an empty list if no groups are found
+        :rtype: list[AsyncGroup]
+        """
+        return await aio_subject.get_groups_for_subject(
+            self.id,
+            self.client,
+            stem,
+            substems,
+            act_as_subject=act_as_subject,
+        )
+
+    @traced
+    async def is_member(
+        self,
+        group_name: str,
+        member_filter: str = "all",
+        act_as_subject: SubjectBase | None = None,
+    ) -> bool:
+        """Check if this subject is a member of the given group.
+
+        :param group_name: Name of group to check for membership.
+        :type group_name: str
+        :param member_filter: Type of mebership to check for
+        (all, immediate, effective), defaults to "all"
+        :type member_filter: str, optional
+        :param act_as_subject: Optional subject to act as, defaults to None
+        :type act_as_subject: SubjectBase | None, optional
+        :raises GrouperSubjectNotFoundException: This subject cannot be found
+        :raises GrouperGroupNotFoundException: A group with the given name cannot
+        be found
+        :raises GrouperSuccessException: An otherwise unhandled issue with the result
+        :return: If the user is a member of the group (True) or not (False)
+        :rtype: bool
+        """
+        from .membership import HasMember
+
+        result = await aio_membership.has_members(
+            group_name=group_name,
+            client=self.client,
+            subject_ids=[self.id],
+            member_filter=member_filter,
+            act_as_subject=act_as_subject,
+        )
+        if result[self.id] == HasMember.IS_MEMBER:
+            return True
+        elif result[self.id] == HasMember.IS_NOT_MEMBER:
+            return False
+        else:
+            raise GrouperSubjectNotFoundException(
+                subject_identifier=self.universal_identifier
+            )
+
+    @traced
+    async def get_privileges_for_this_in_others(
+        self,
+        group_name: str | None = None,
+        stem_name: str | None = None,
+        privilege_name: str | None = None,
+        privilege_type: str | None = None,
+        attributes: list[str] = [],
+        act_as_subject: SubjectBase | None = None,
+    ) -> list[AsyncPrivilege]:
+        """Get privileges this subject has in other objects.
+
+        :param group_name: Group name to limit privileges to,
+        cannot be specified if stem_name is specified, defaults to None
+        :type group_name: str | None, optional
+        :param stem_name: Stem name to limit privileges to,
+        cannot be specified if group_name is specified, defaults to None
+        :type stem_name: str | None, optional
+        :param privilege_name: Name of privilege to get, defaults to None
+        :type privilege_name: str | None, optional
+        :param privilege_type: Type of privilege to get, defaults to None
+        :type privilege_type: str | None, optional
+        :param attributes: Additional attributes to retrieve for the Subjects,
+        defaults to []
+        :type attributes: list[str], optional
+        :param act_as_subject: Optional subject to act as, defaults to None
+        :type act_as_subject: SubjectBase | None, optional
+        :raises ValueError: An invalid combination of parameters was given
+        :raises GrouperGroupNotFoundException: A group with the given name cannot
+        be found
+        :raises GrouperStemNotFoundException: A stem with the given name cannot be found
+        :raises GrouperSuccessException: An otherwise unhandled issue with the result
+        :return: A list of retreived privileges for this subject
+        satisfying any given constraints
+        :rtype: list[AsyncPrivilege]
+        """
+        return await aio_privilege.get_privileges(
+            client=self.client,
+            subject_id=self.id,
+            group_name=group_name,
+            stem_name=stem_name,
+            privilege_name=privilege_name,
+            privilege_type=privilege_type,
+            attributes=attributes,
+            act_as_subject=act_as_subject,
+        )
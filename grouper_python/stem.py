@@ -45,7 +45,7 @@ def get_stem_by_name(
     r = client._call_grouper("/stems", body, act_as_subject=act_as_subject)
     results = r["WsFindStemsResults"]["stemResults"]
     if len(results) == 1:
-        return Stem(client, r["WsFindStemsResults"]["stemResults"][0])
+        return client._entity(Stem, r["WsFindStemsResults"]["stemResults"][0])
     if len(results) == 0:
         raise GrouperStemNotFoundException(stem_name, r)
     else:  # pragma: no cover
@@ -91,7 +91,7 @@ def get_stems_by_parent(
         act_as_subject=act_as_subject,
     )
     return [
-        Stem(client, stem)
+        client._entity(Stem, stem)
         for stem in r["WsFindStemsResults"]["stemResults"]
     ]
 
@@ -128,7 +128,7 @@ def create_stems(
     body = {"WsRestStemSaveRequest": {"wsStemToSaves": stems_to_save}}
     r = client._call_grouper("/stems", body, act_as_subject=act_as_subject)
     return [
-        Stem(client, result["wsStem"])
+        client._entity(Stem, result["wsStem"])
         for result in r["WsStemSaveResults"]["results"]
     ]
 
@@ -8,14 +8,20 @@ directly if needed.
 """
 
 from __future__ import annotations
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, TypeVar
 
 if TYPE_CHECKING:  # pragma: no cover
     from .objects.group import Group
     from .objects.client import GrouperClient
     from .objects.subject import Subject
+    from .objects.lookup import LookupResult
+    from collections.abc import Callable
 from .objects.exceptions import GrouperSubjectNotFoundException
-from .util import resolve_subject
+from .util import resolve_subject, resolve_subjects, subject_lookup_chunks
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+
+G = TypeVar("G")
 
 
 def get_groups_for_subject(
@@ -44,10 +50,119 @@ def get_groups_for_subject(
     """
     from .objects.group import Group
 
+    body = groups_for_subjects_body([subject_id], stem, substems)
+    r = client._call_grouper(
+        "/memberships",
+        body,
+        act_as_subject=act_as_subject,
+    )
+    if "wsGroups" in r["WsGetMembershipsResults"]:
+        return [
+            client._entity(Group, grp)
+            for grp in r["WsGetMembershipsResults"]["wsGroups"]
+        ]
+    else:
+        return []
+
+
+def get_groups_for_subjects(
+    subject_ids: list[str],
+    client: GrouperClient,
+    stem: str | None = None,
+    substems: bool = True,
+    chunk_size: int = 100,
+    max_concurrency: int = 4,
+    act_as_subject: Subject | None = None,
+) -> dict[str, list[Group]]:
+    """Get the groups that each of the given subjects is a member of.
+
+    The subjects are sent in chunks of chunk_size, with one API call per chunk,
+    and up to max_concurrency chunks are sent to Grouper at the same time.
+    A group that several subjects are members of is the same Group object
+    in each of their lists.
+
+    :param subject_ids: Subject ids of subjects to get groups
+    :type subject_ids: list[str]
+    :param client: The GrouperClient to use
+    :type client: GrouperClient
+    :param stem: Optional stem to limit the search to, defaults to None
+    :type stem: str | None, optional
+    :param substems: Whether to look recursively through substems
+    of the given stem (True), or only one level in the given stem (False),
+    defaults to True
+    :type substems: bool, optional
+    :param chunk_size: The maximum number of subjects to send in one API call,
+    defaults to 100
+    :type chunk_size: int, optional
+    :param max_concurrency: The maximum number of API calls to make at the same
+    time, defaults to 4
+    :type max_concurrency: int, optional
+    :param act_as_subject: Optional subject to act as, defaults to None
+    :type act_as_subject: Subject | None, optional
+    :raises ValueError: chunk_size is less than 1
+    :return: Dict keyed by the given subject ids, with the list of groups
+    each subject is a member of, which will be empty if it is in no groups
+    :rtype: dict[str, list[Group]]
+    """
+    from .objects.group import Group
+
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    unique_ids = list(dict.fromkeys(subject_ids))
+    chunks = [
+        unique_ids[i:i + chunk_size] for i in range(0, len(unique_ids), chunk_size)
+    ]
+    if not chunks:
+        return {}
+
+    def get_chunk(chunk: list[str]) -> dict[str, Any]:
+        """Send one chunk to Grouper.
+
+        :param chunk: The chunk of subject ids
+        :type chunk: list[str]
+        :return: The result returned by Grouper
+        :rtype: dict[str, Any]
+        """
+        return client._call_grouper(
+            "/memberships",
+            groups_for_subjects_body(chunk, stem, substems),
+            act_as_subject=act_as_subject,
+        )
+
+    max_workers = min(max(max_concurrency, 1), len(chunks))
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        # Run each chunk in a copy of the current context,
+        # so its tracing spans are children of the current span
+        futures = [
+            pool.submit(copy_context().run, get_chunk, chunk) for chunk in chunks
+        ]
+        results = [future.result() for future in futures]
+    return groups_by_subject(
+        unique_ids, results, lambda group_body: client._entity(Group, group_body)
+    )
+
+
+def groups_for_subjects_body(
+    subject_ids: list[str], stem: str | None, substems: bool
+) -> dict[str, Any]:
+    """Build the request body to get the groups the given subjects are members of.
+
+    :param subject_ids: Subject ids of subjects to get groups
+    :type subject_ids: list[str]
+    :param stem: Optional stem to limit the search to
+    :type stem: str | None
+    :param substems: Whether to look recursively through substems
+    of the given stem (True), or only one level in the given stem (False)
+    :type substems: bool
+    :return: The request body
+    :rtype: dict[str, Any]
+    """
     body: dict[str, Any] = {
         "WsRestGetMembershipsRequest": {
             "fieldName": "members",
-            "wsSubjectLookups": [{"subjectId": subject_id}],
+            "wsSubjectLookups": [
+                {"subjectId": subject_id} for subject_id in subject_ids
+            ],
             "includeGroupDetail": "T",
         }
     }
@@ -57,18 +172,50 @@ def get_groups_for_subject(
             body["WsRestGetMembershipsRequest"]["stemScope"] = "ALL_IN_SUBTREE"
         else:
             body["WsRestGetMembershipsRequest"]["stemScope"] = "ONE_LEVEL"
-    r = client._call_grouper(
-        "/memberships",
-        body,
-        act_as_subject=act_as_subject,
-    )
-    if "wsGroups" in r["WsGetMembershipsResults"]:
-        return [
-            Group(client, grp)
-            for grp in r["WsGetMembershipsResults"]["wsGroups"]
-        ]
-    else:
-        return []
+    return body
+
+
+def groups_by_subject(
+    subject_ids: list[str],
+    results: list[dict[str, Any]],
+    build_group: Callable[[dict[str, Any]], G],
+) -> dict[str, list[G]]:
+    """Get the groups of each subject from the results of memberships requests.
+
+    Each group is built once, however many subjects or results it appears in,
+    and each subject's groups are given once, in the order first seen,
+    even if the subject is both a direct and indirect member.
+
+    :param subject_ids: The subject ids the groups were requested for
+    :type subject_ids: list[str]
+    :param results: The result returned by Grouper for each request
+    :type results: list[dict[str, Any]]
+    :param build_group: Function to build a group from its body
+    :type build_group: Callable[[dict[str, Any]], G]
+    :return: Dict keyed by the given subject ids, with the list of groups
+    each subject is a member of
+    :rtype: dict[str, list[G]]
+    """
+    groups: dict[str, G] = {}
+    subject_groups: dict[str, dict[str, G]] = {
+        subject_id: {} for subject_id in subject_ids
+    }
+    for r in results:
+        result = r["WsGetMembershipsResults"]
+        group_bodies = {
+            group_body["uuid"]: group_body for group_body in result.get("wsGroups", [])
+        }
+        for ws_membership in result.get("wsMemberships", []):
+            group_id = ws_membership["groupId"]
+            if group_id not in groups:
+                groups[group_id] = build_group(group_bodies[group_id])
+            subject_groups.setdefault(ws_membership["subjectId"], {})[group_id] = (
+                groups[group_id]
+            )
+    return {
+        subject_id: list(member_of.values())
+        for subject_id, member_of in subject_groups.items()
+    }
 
 
 def get_subject_by_identifier(
@@ -119,6 +266,152 @@ def get_subject_by_identifier(
     )
 
 
+def get_subjects(
+    client: GrouperClient,
+    subject_identifiers: list[str] = [],
+    subject_ids: list[str] = [],
+    resolve_groups: bool = True,
+    attributes: list[str] = [],
+    chunk_size: int = 1000,
+    max_concurrency: int = 4,
+    act_as_subject: Subject | None = None,
+) -> LookupResult[Subject]:
+    """Get many subjects by identifier or id, using as few API calls as possible.
+
+    The subjects are looked up in chunks of chunk_size, with one API call per
+    chunk, and up to max_concurrency chunks are sent to Grouper at the same time.
+    Subjects that are groups are then resolved together, rather than with one
+    API call per group. Subjects that cannot be found do not raise an exception,
+    but are listed in the missing identifiers and ids of the result.
+
+    :param client: The GrouperClient to use
+    :type client: GrouperClient
+    :param subject_identifiers: Identifiers of subjects to get, defaults to []
+    :type subject_identifiers: list[str], optional
+    :param subject_ids: Ids of subjects to get, defaults to []
+    :type subject_ids: list[str], optional
+    :param resolve_groups: Whether to resolve subjects that are groups into Group
+    objects, which will require additional API calls, defaults to True
+    :type resolve_groups: bool, optional
+    :param attributes: Additional attributes to return for the Subjects,
+    defaults to []
+    :type attributes: list[str], optional
+    :param chunk_size: The maximum number of subjects to look up in one API call,
+    defaults to 1000
+    :type chunk_size: int, optional
+    :param max_concurrency: The maximum number of API calls to make at the same
+    time, defaults to 4
+    :type max_concurrency: int, optional
+    :param act_as_subject: Optional subject to act as, defaults to None
+    :type act_as_subject: Subject | None, optional
+    :raises GrouperSuccessException: An otherwise unhandled issue with the result
+    :return: The subjects found keyed by the given identifier or id,
+    and the identifiers and ids not found
+    :rtype: LookupResult[Subject]
+    """
+    from .objects.lookup import LookupResult
+
+    chunks = subject_lookup_chunks(
+        list(dict.fromkeys(subject_identifiers)),
+        list(dict.fromkeys(subject_ids)),
+        chunk_size,
+    )
+    if not chunks:
+        return LookupResult(found={}, missing=[])
+    attribute_names = [
+        *set(attributes + [client.universal_identifier_attr, "name"])
+    ]
+
+    def get_chunk(chunk: list[tuple[str, dict[str, str]]]) -> dict[str, Any]:
+        """Send one chunk to Grouper.
+
+        :param chunk: The chunk of subject lookups
+        :type chunk: list[tuple[str, dict[str, str]]]
+        :return: The result returned by Grouper
+        :rtype: dict[str, Any]
+        """
+        return client._call_grouper(
+            "/subjects",
+            get_subjects_body(chunk, attribute_names),
+            act_as_subject=act_as_subject,
+        )
+
+    max_workers = min(max(max_concurrency, 1), len(chunks))
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        # Run each chunk in a copy of the current context,
+        # so its tracing spans are children of the current span
+        futures = [
+            pool.submit(copy_context().run, get_chunk, chunk) for chunk in chunks
+        ]
+        results = [future.result() for future in futures]
+    keys, subject_bodies, subject_attr_names, missing = found_subjects(
+        chunks, results
+    )
+    subjects = resolve_subjects(
+        subject_bodies=subject_bodies,
+        client=client,
+        subject_attr_names=subject_attr_names,
+        resolve_groups=resolve_groups,
+    )
+    return LookupResult(found=dict(zip(keys, subjects)), missing=missing)
+
+
+def get_subjects_body(
+    chunk: list[tuple[str, dict[str, str]]], attribute_names: list[str]
+) -> dict[str, Any]:
+    """Build the request body to get a chunk of subjects.
+
+    :param chunk: The chunk of subject lookups
+    :type chunk: list[tuple[str, dict[str, str]]]
+    :param attribute_names: Attributes to retrieve for the subjects
+    :type attribute_names: list[str]
+    :return: The request body
+    :rtype: dict[str, Any]
+    """
+    return {
+        "WsRestGetSubjectsRequest": {
+            "wsSubjectLookups": [lookup for _, lookup in chunk],
+            "includeSubjectDetail": "T",
+            "subjectAttributeNames": attribute_names,
+        }
+    }
+
+
+def found_subjects(
+    chunks: list[list[tuple[str, dict[str, str]]]], results: list[dict[str, Any]]
+) -> tuple[list[str], list[dict[str, Any]], list[str], list[str]]:
+    """Match up the subjects in the results of each chunk with their lookups.
+
+    Grouper returns subjects in the same order as the subject lookups sent.
+    Every chunk is sent with the same attributes, so the subject attribute names
+    of the first result apply to all of them.
+
+    :param chunks: The chunks of subject lookups that were sent
+    :type chunks: list[list[tuple[str, dict[str, str]]]]
+    :param results: The result returned by Grouper for each chunk
+    :type results: list[dict[str, Any]]
+    :return: The given identifier or id of each found subject, the body of each
+    found subject, the subject attribute names, and the identifiers and ids
+    that were not found
+    :rtype: tuple[list[str], list[dict[str, Any]], list[str], list[str]]
+    """
+    keys: list[str] = []
+    subject_bodies: list[dict[str, Any]] = []
+    missing: list[str] = []
+    for chunk, r in zip(chunks, results):
+        ws_subjects = r["WsGetSubjectsResults"].get("wsSubjects", [])
+        for i, (key, _) in enumerate(chunk):
+            if i < len(ws_subjects) and ws_subjects[i].get("success") != "F":
+                keys.append(key)
+                subject_bodies.append(ws_subjects[i])
+            else:
+                missing.append(key)
+    subject_attr_names: list[str] = results[0]["WsGetSubjectsResults"].get(
+        "subjectAttributeNames", []
+    )
+    return keys, subject_bodies, subject_attr_names, missing
+
+
 def find_subjects(
     search_string: str,
     client: GrouperClient,
@@ -133,7 +426,7 @@ def find_subjects(
     :param client: The GrouperClient to use
     :type client: GrouperClient
     :param resolve_groups: Whether to resolve subjects that are groups into Group
-    objects, which will require an additional API call per group, defaults to True
+    objects, which will require additional API calls, defaults to True
     :type resolve_groups: bool, optional
     :param attributes: Additional attributes to return for the Subject,
     defaults to []
@@ -155,14 +448,11 @@ def find_subjects(
     r = client._call_grouper("/subjects", body, act_as_subject=act_as_subject)
     if "wsSubjects" in r["WsGetSubjectsResults"]:
         subject_attr_names = r["WsGetSubjectsResults"]["subjectAttributeNames"]
-        return [
-            resolve_subject(
-                subject_body=subject,
-                client=client,
-                subject_attr_names=subject_attr_names,
-                resolve_group=resolve_groups,
-            )
-            for subject in r["WsGetSubjectsResults"]["wsSubjects"]
-        ]
+        return resolve_subjects(
+            subject_bodies=r["WsGetSubjectsResults"]["wsSubjects"],
+            client=client,
+            subject_attr_names=subject_attr_names,
+            resolve_groups=resolve_groups,
+        )
     else:
         return []
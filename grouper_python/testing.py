@@ -0,0 +1,2130 @@
+"""grouper-python.testing - an in-memory fake of the Grouper web services.
+
+FakeGrouper keeps stems, groups, subjects, memberships, privileges and
+attribute assignments in memory, and answers the requests this library sends
+in the same shape as Grouper does. It is an httpx transport, so a client can
+be pointed at it to test or benchmark code offline, with optional latency
+and failures injected into the responses:
+
+    fake = FakeGrouper(latency=0.01)
+    fake.add_group("test:GROUP1")
+    client = GrouperClient(base_url, username, password, transport=fake)
+
+Privileges are stored and reported, but not enforced.
+"""
+
+from __future__ import annotations
+from typing import Any
+from collections import Counter
+from collections.abc import Callable, Iterable
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from threading import Lock
+from urllib.parse import unquote
+import asyncio
+import itertools
+import json
+import random
+import re
+import time
+import uuid
+import httpx
+
+# The subject id and source of the built in Grouper system subject
+_SYSTEM_SUBJECT_ID = "GrouperSystem"
+_SYSTEM_SOURCE_ID = "g:isa"
+_GROUP_SOURCE_ID = "g:gsa"
+
+# The attribute assign action that every assignment is made with
+_ASSIGN_ACTION_ID = "ae72ff8bf5414933a9bf7fb6fdf04a28"
+
+_HAS_MEMBER_PATH = re.compile(r"/groups/(?P<group_name>[^/]+)/members$")
+
+_STEM_PRIVILEGES = frozenset(
+    {"stemAdmin", "create", "stemAttrRead", "stemAttrUpdate", "stemView"}
+)
+
+
+class FakeGrouper(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """In-memory fake of the Grouper web services, usable as an httpx transport.
+
+    Pass it as the transport of a GrouperClient or AsyncGrouperClient,
+    and seed it with add_stem, add_group, add_subject and the other add
+    methods, or through the client itself. Requests are answered from memory,
+    so bulk operations can be benchmarked offline against groups with
+    millions of memberships.
+
+    :param latency: Seconds to wait before answering each request,
+    defaults to 0.0
+    :type latency: float, optional
+    :param failure_rate: Fraction of requests (from 0 to 1) to answer with
+    failure_status instead of a result, defaults to 0.0
+    :type failure_rate: float, optional
+    :param failure_status: HTTP status of injected failures, defaults to 503
+    :type failure_status: int, optional
+    :param identifier_attr: The subject attribute holding the identifier of
+    people, which should match the client's universal_identifier_attr,
+    defaults to "description"
+    :type identifier_attr: str, optional
+    :param seed: Seed for the random choice of injected failures,
+    defaults to None
+    :type seed: int | None, optional
+    :param max_page_size: The largest page of members or memberships to answer with,
+    like Grouper's configurable maximum page size, whatever page size is
+    requested, defaults to None (no maximum)
+    :type max_page_size: int | None, optional
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        failure_rate: float = 0.0,
+        failure_status: int = 503,
+        identifier_attr: str = "description",
+        seed: int | None = None,
+        max_page_size: int | None = None,
+    ) -> None:
+        """Construct a FakeGrouper."""
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.failure_status = failure_status
+        self.identifier_attr = identifier_attr
+        self.max_page_size = max_page_size
+        self.default_subject_attributes = list(
+            dict.fromkeys([identifier_attr, "name"])
+        )
+        self.stems: dict[str, dict[str, Any]] = {}
+        self.groups: dict[str, dict[str, Any]] = {}
+        self.subjects: dict[str, dict[str, Any]] = {}
+        self.members: dict[str, dict[str, None]] = {}
+        self.privileges: set[tuple[str, str, str]] = set()
+        self.attribute_defs: dict[str, dict[str, Any]] = {}
+        self.attribute_def_names: dict[str, dict[str, Any]] = {}
+        self.attribute_assignments: dict[str, dict[str, Any]] = {}
+        self.request_counts: Counter[str] = Counter()
+        self._group_names: dict[str, str] = {}
+        self._identifiers: dict[str, str] = {}
+        self._groups_of: dict[str, set[str]] = {}
+        self._member_cache: dict[tuple[str, str, bool], Any] = {}
+        self._fail_next: list[int | None] = []
+        self._index = itertools.count(10000)
+        self._random = random.Random(seed)
+        self._lock = Lock()
+        self._handlers: dict[str, Callable[[dict[str, Any], str], dict[str, Any]]] = {
+            "WsRestFindGroupsLiteRequest": self._find_groups_lite,
+            "WsRestFindGroupsRequest": self._find_groups,
+            "WsRestGroupSaveRequest": self._group_save,
+            "WsRestGroupDeleteRequest": self._group_delete,
+            "WsRestFindStemsLiteRequest": self._find_stems_lite,
+            "WsRestStemSaveRequest": self._stem_save,
+            "WsRestStemDeleteRequest": self._stem_delete,
+            "WsRestGetMembersRequest": self._get_members,
+            "WsRestGetMembershipsRequest": self._get_memberships,
+            "WsRestHasMemberRequest": self._has_member,
+            "WsRestAddMemberRequest": self._add_member,
+            "WsRestDeleteMemberRequest": self._delete_member,
+            "WsRestGetSubjectsRequest": self._get_subjects,
+            "WsRestGetGrouperPrivilegesLiteRequest": self._get_privileges_lite,
+            "WsRestAssignGrouperPrivilegesRequest": self._assign_privileges,
+            "WsRestAssignGrouperPrivilegesLiteRequest": self._assign_privileges_lite,
+            "WsRestFindAttributeDefsLiteRequest": self._find_attribute_defs_lite,
+            "WsRestFindAttributeDefNamesLiteRequest": (
+                self._find_attribute_def_names_lite
+            ),
+            "WsRestGetAttributeAssignmentsRequest": self._get_attribute_assignments,
+            "WsRestAssignAttributesRequest": self._assign_attributes,
+        }
+        self.add_subject(
+            _SYSTEM_SUBJECT_ID,
+            identifier=_SYSTEM_SUBJECT_ID,
+            name="GrouperSysAdmin",
+            source_id=_SYSTEM_SOURCE_ID,
+        )
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        """Answer a request from a GrouperClient.
+
+        :param request: The request to answer
+        :type request: httpx.Request
+        :raises httpx.ConnectError: A connection error was injected with fail_next
+        :return: The response to the request
+        :rtype: httpx.Response
+        """
+        request.read()
+        if self.latency > 0:
+            time.sleep(self.latency)
+        return self._respond(request)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        """Answer a request from an AsyncGrouperClient.
+
+        :param request: The request to answer
+        :type request: httpx.Request
+        :raises httpx.ConnectError: A connection error was injected with fail_next
+        :return: The response to the request
+        :rtype: httpx.Response
+        """
+        await request.aread()
+        if self.latency > 0:
+            await asyncio.sleep(self.latency)
+        return self._respond(request)
+
+    def fail_next(self, count: int = 1, status: int | None = 503) -> None:
+        """Make the next requests fail, regardless of failure_rate.
+
+        :param count: The number of requests to fail, defaults to 1
+        :type count: int, optional
+        :param status: The HTTP status to answer with, or None to raise
+        httpx.ConnectError instead, defaults to 503
+        :type status: int | None, optional
+        """
+        with self._lock:
+            self._fail_next.extend([status] * count)
+
+    def add_stem(
+        self, name: str, display_extension: str | None = None, description: str = ""
+    ) -> dict[str, Any]:
+        """Add a stem, or update it if it exists, creating parent stems as needed.
+
+        :param name: The full name of the stem
+        :type name: str
+        :param display_extension: The display extension of the stem,
+        defaults to None (use the extension)
+        :type display_extension: str | None, optional
+        :param description: The description of the stem, defaults to ""
+        :type description: str, optional
+        :return: The stem, as Grouper returns it
+        :rtype: dict[str, Any]
+        """
+        with self._lock:
+            return self._save_stem(name, display_extension, description)
+
+    def add_group(
+        self,
+        name: str,
+        display_extension: str | None = None,
+        description: str = "",
+        detail: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        """Add a group, or update it if it exists, creating parent stems as needed.
+
+        :param name: The full name of the group
+        :type name: str
+        :param display_extension: The display extension of the group,
+        defaults to None (use the extension)
+        :type display_extension: str | None, optional
+        :param description: The description of the group, defaults to ""
+        :type description: str, optional
+        :param detail: Detail of the group returned when it is requested,
+        defaults to None
+        :type detail: dict[str, Any] | None, optional
+        :return: The group, as Grouper returns it
+        :rtype: dict[str, Any]
+        """
+        with self._lock:
+            return self._save_group(name, display_extension, description, detail)
+
+    def add_subject(
+        self,
+        subject_id: str,
+        identifier: str | None = None,
+        name: str | None = None,
+        source_id: str = "ldap",
+        attributes: dict[str, str] = {},
+    ) -> None:
+        """Add a subject that is a person, or replace it if it exists.
+
+        :param subject_id: The id of the subject
+        :type subject_id: str
+        :param identifier: The identifier of the subject, stored in the
+        identifier_attr attribute, defaults to None (use the subject id)
+        :type identifier: str | None, optional
+        :param name: The name of the subject, defaults to None (use the identifier)
+        :type name: str | None, optional
+        :param source_id: The source of the subject, defaults to "ldap"
+        :type source_id: str, optional
+        :param attributes: Other attributes of the subject, defaults to {}
+        :type attributes: dict[str, str], optional
+        """
+        identifier = identifier if identifier is not None else subject_id
+        name = name if name is not None else identifier
+        with self._lock:
+            self.subjects[subject_id] = {
+                "id": subject_id,
+                "name": name,
+                "sourceId": source_id,
+                "attributes": {
+                    **attributes,
+                    self.identifier_attr: identifier,
+                    "name": name,
+                },
+            }
+            self._identifiers[identifier] = subject_id
+
+    def add_members(self, group_name: str, subject_ids: Iterable[str]) -> None:
+        """Add immediate members to a group.
+
+        Members that are groups are given by their uuid.
+
+        :param group_name: The name of the group
+        :type group_name: str
+        :param subject_ids: The ids of the subjects to add
+        :type subject_ids: Iterable[str]
+        :raises KeyError: The group or one of the subjects does not exist
+        """
+        with self._lock:
+            group_id = self.groups[group_name]["uuid"]
+            for subject_id in subject_ids:
+                if not self._subject_exists(subject_id):
+                    raise KeyError(subject_id)
+                self._add_membership(group_id, subject_id)
+
+    def add_privilege(
+        self, owner_name: str, subject_id: str, privilege_name: str
+    ) -> None:
+        """Grant a privilege on a group or stem to a subject.
+
+        :param owner_name: The name of the group or stem
+        :type owner_name: str
+        :param subject_id: The id of the subject
+        :type subject_id: str
+        :param privilege_name: The name of the privilege, such as "update"
+        :type privilege_name: str
+        """
+        with self._lock:
+            self.privileges.add((owner_name, subject_id, privilege_name))
+
+    def add_attribute_def(
+        self,
+        name: str,
+        value_type: str = "string",
+        multi_assignable: bool = False,
+        multi_valued: bool = False,
+        assign_to: Iterable[str] = ("group", "stem"),
+    ) -> dict[str, Any]:
+        """Add an attribute definition.
+
+        :param name: The full name of the attribute definition
+        :type name: str
+        :param value_type: The type of values, defaults to "string"
+        :type value_type: str, optional
+        :param multi_assignable: Whether the attribute can be assigned more than
+        once to the same owner, defaults to False
+        :type multi_assignable: bool, optional
+        :param multi_valued: Whether an assignment can have more than one value,
+        defaults to False
+        :type multi_valued: bool, optional
+        :param assign_to: The types of owners the attribute can be assigned to,
+        defaults to ("group", "stem")
+        :type assign_to: Iterable[str], optional
+        :return: The attribute definition, as Grouper returns it
+        :rtype: dict[str, Any]
+        """
+        owner_types = set(assign_to)
+        attribute_def = {
+            "attributeDefType": "attr",
+            "name": name,
+            "extension": name.rpartition(":")[2],
+            "description": "",
+            "uuid": uuid.uuid4().hex,
+            "idIndex": str(next(self._index)),
+            "valueType": value_type,
+            "multiAssignable": _flag(multi_assignable),
+            "multiValued": _flag(multi_valued),
+            "assignToGroup": _flag("group" in owner_types),
+            "assignToStem": _flag("stem" in owner_types),
+            "assignToMember": _flag("member" in owner_types),
+            "assignToAttributeDef": _flag("attr_def" in owner_types),
+            "assignToImmediateMembership": "F",
+            "assignToEffectiveMembership": "F",
+            "assignToGroupAssignment": "F",
+            "assignToStemAssignment": "F",
+            "assignToMemberAssignment": "F",
+            "assignToAttributeDefAssignment": "F",
+            "assignToImmediateMembershipAssignment": "F",
+            "assignToEffectiveMembershipAssignment": "F",
+        }
+        with self._lock:
+            self.attribute_defs[name] = attribute_def
+        return attribute_def
+
+    def add_attribute_def_name(
+        self, name: str, attribute_def_name: str, description: str = ""
+    ) -> dict[str, Any]:
+        """Add an attribute definition name (an attribute that can be assigned).
+
+        :param name: The full name of the attribute definition name
+        :type name: str
+        :param attribute_def_name: The name of its attribute definition
+        :type attribute_def_name: str
+        :param description: The description, defaults to ""
+        :type description: str, optional
+        :raises KeyError: The attribute definition does not exist
+        :return: The attribute definition name, as Grouper returns it
+        :rtype: dict[str, Any]
+        """
+        with self._lock:
+            attribute_def = self.attribute_defs[attribute_def_name]
+            extension = name.rpartition(":")[2]
+            def_name = {
+                "attributeDefId": attribute_def["uuid"],
+                "attributeDefName": attribute_def_name,
+                "name": name,
+                "extension": extension,
+                "displayExtension": extension,
+                "displayName": name,
+                "description": description,
+                "idIndex": str(next(self._index)),
+                "uuid": uuid.uuid4().hex,
+            }
+            self.attribute_def_names[name] = def_name
+        return def_name
+
+    def _respond(self, request: httpx.Request) -> httpx.Response:
+        """Answer a request, injecting a failure if one is due.
+
+        :param request: The request to answer
+        :type request: httpx.Request
+        :raises httpx.ConnectError: A connection error was injected with fail_next
+        :return: The response to the request
+        :rtype: httpx.Response
+        """
+        with self._lock:
+            if self._fail_next:
+                status: int | None = self._fail_next.pop(0)
+            elif self.failure_rate > 0 and self._random.random() < self.failure_rate:
+                status = self.failure_status
+            else:
+                status = 0
+            if status is None:
+                raise httpx.ConnectError("Injected connection error", request=request)
+            if status:
+                return httpx.Response(
+                    status, json=_problem("EXCEPTION", "Injected failure")
+                )
+            if not request.content:
+                return httpx.Response(200)
+            body = json.loads(request.content)
+            request_type = next(iter(body), "")
+            self.request_counts[request_type] += 1
+            handler = self._handlers.get(request_type)
+            if handler is None:
+                return httpx.Response(
+                    400,
+                    json=_problem(
+                        "INVALID_QUERY", f"Unsupported request type: {request_type}"
+                    ),
+                )
+            return httpx.Response(
+                200, json=handler(body[request_type], unquote(request.url.path))
+            )
+
+    # Groups and stems
+
+    def _save_stem(
+        self, name: str, display_extension: str | None, description: str
+    ) -> dict[str, Any]:
+        """Create or update a stem and its parents.
+
+        :param name: The full name of the stem
+        :type name: str
+        :param display_extension: The display extension, or None for the extension
+        :type display_extension: str | None
+        :param description: The description of the stem
+        :type description: str
+        :return: The stem
+        :rtype: dict[str, Any]
+        """
+        parent, _, extension = name.rpartition(":")
+        parent_display_name = ""
+        if parent:
+            parent_stem = self.stems.get(parent) or self._save_stem(parent, None, "")
+            parent_display_name = parent_stem["displayName"] + ":"
+        display_extension = display_extension or extension
+        stem = self.stems.get(name)
+        if stem is None:
+            stem = self.stems[name] = {
+                "name": name,
+                "extension": extension,
+                "uuid": uuid.uuid4().hex,
+                "idIndex": str(next(self._index)),
+            }
+        stem["displayExtension"] = display_extension
+        stem["displayName"] = parent_display_name + display_extension
+        stem["description"] = description
+        return stem
+
+    def _save_group(
+        self,
+        name: str,
+        display_extension: str | None,
+        description: str,
+        detail: dict[str, Any] | None,
+    ) -> dict[str, Any]:
+        """Create or update a group, creating parent stems as needed.
+
+        :param name: The full name of the group
+        :type name: str
+        :param display_extension: The display extension, or None for the extension
+        :type display_extension: str | None
+        :param description: The description of the group
+        :type description: str
+        :param detail: Detail of the group, if any
+        :type detail: dict[str, Any] | None
+        :return: The group
+        :rtype: dict[str, Any]
+        """
+        parent, _, extension = name.rpartition(":")
+        parent_display_name = ""
+        if parent:
+            parent_stem = self.stems.get(parent) or self._save_stem(parent, None, "")
+            parent_display_name = parent_stem["displayName"] + ":"
+        display_extension = display_extension or extension
+        group = self.groups.get(name)
+        if group is None:
+            group = self.groups[name] = {
+                "name": name,
+                "extension": extension,
+                "uuid": uuid.uuid4().hex,
+                "enabled": "T",
+                "typeOfGroup": "group",
+                "idIndex": str(next(self._index)),
+            }
+            self._group_names[group["uuid"]] = name
+            self.members[group["uuid"]] = {}
+        group["displayExtension"] = display_extension
+        group["displayName"] = parent_display_name + display_extension
+        group["description"] = description
+        if detail is not None:
+            group["detail"] = detail
+        return group
+
+    def _remove_group(self, name: str) -> None:
+        """Delete a group, with its memberships, privileges and attributes.
+
+        :param name: The name of the group
+        :type name: str
+        """
+        group = self.groups.pop(name)
+        group_id = group["uuid"]
+        for subject_id in list(self.members[group_id]):
+            self._remove_membership(group_id, subject_id)
+        for parent_id in list(self._groups_of.get(group_id, ())):
+            self._remove_membership(parent_id, group_id)
+        del self.members[group_id]
+        del self._group_names[group_id]
+        self.privileges = {
+            privilege
+            for privilege in self.privileges
+            if privilege[0] != name and privilege[1] != group_id
+        }
+        self._remove_assignments_of(group_id)
+
+    def _remove_assignments_of(self, owner_id: str) -> None:
+        """Delete the attribute assignments of a group or stem.
+
+        :param owner_id: The uuid of the group or stem
+        :type owner_id: str
+        """
+        for assign_id, assignment in list(self.attribute_assignments.items()):
+            if owner_id in (
+                assignment.get("ownerGroupId"),
+                assignment.get("ownerStemId"),
+            ):
+                del self.attribute_assignments[assign_id]
+
+    def _lookup_group(self, lookup: dict[str, Any]) -> dict[str, Any] | None:
+        """Find the group for a group lookup.
+
+        :param lookup: The lookup, with a groupName or uuid
+        :type lookup: dict[str, Any]
+        :return: The group, or None if not found
+        :rtype: dict[str, Any] | None
+        """
+        if "groupName" in lookup:
+            return self.groups.get(lookup["groupName"])
+        name = self._group_names.get(lookup.get("uuid", ""))
+        return self.groups[name] if name else None
+
+    def _lookup_stem(self, lookup: dict[str, Any]) -> dict[str, Any] | None:
+        """Find the stem for a stem lookup.
+
+        :param lookup: The lookup, with a stemName or uuid
+        :type lookup: dict[str, Any]
+        :return: The stem, or None if not found
+        :rtype: dict[str, Any] | None
+        """
+        if "stemName" in lookup:
+            return self.stems.get(lookup["stemName"])
+        for stem in self.stems.values():
+            if stem["uuid"] == lookup.get("uuid"):
+                return stem
+        return None
+
+    def _find_groups_lite(self, request: dict[str, Any], path: str) -> dict[str, Any]:
+        """Answer a WsRestFindGroupsLiteRequest.
+
+        :param request: The request
+        :type request: dict[str, Any]
+        :param path: The path the request was sent to
+        :type path: str
+        :return: The result
+        :rtype: dict[str, Any]
+        """
+        stem_name = request.get("stemName")
+        if stem_name and stem_name not in self.stems:
+            return _failure(
+                "WsFindGroupsResults",
+                "INVALID_QUERY",
+                f"Cant find stem: '{stem_name}',",
+            )
+        filter_type = request.get("queryFilterType")
+        if filter_type == "FIND_BY_GROUP_NAME_EXACT":
+            group = self.groups.get(request.get("groupName", ""))
+            groups = [group] if group else []
+        elif filter_type == "FIND_BY_GROUP_NAME_APPROXIMATE":
+            search = request.get("groupName", "").lower()
+            groups = [
+                group
+                for name, group in self.groups.items()
+                if (search in name.lower() or search in group["displayName"].lower())
+                and _in_stem(name, stem_name or "", True)
+            ]
+        elif filter_type == "FIND_BY_STEM_NAME":
+            subtree = request.get("stemNameScope") == "ALL_IN_SUBTREE"
+            groups = [
+                group
+                for name, group in self.groups.items()
+                if _in_stem(name, stem_name or "", subtree)
+            ]
+        else:
+            return _failure(
+                "WsFindGroupsResults",
+                "INVALID_QUERY",
+                f"Unsupported queryFilterType: {filter_type}",
+            )
+        return self._group_results(groups, request)
+
+    def _find_groups(self, request: dict[str, Any], path: str) -> dict[str, Any]:
+        """Answer a WsRestFindGroupsRequest.
+
+        :param request: The request
+        :type request: dict[str, Any]
+        :param path: The path the request was sent to
+        :type path: str
+        :return: The result
+        :rtype: dict[str, Any]
+        """
+        groups = [
+            group
+            for group in map(self._lookup_group, request.get("wsGroupLookups", []))
+            if group is not None
+        ]
+        return self._group_results(groups, request)
+
+    def _group_results(
+        self, groups: list[dict[str, Any]], request: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Build the result of a find groups request.
+
+        :param groups: The groups found
+        :type groups: list[dict[str, Any]]
+        :param request: The request
+        :type request: dict[str, Any]
+        :return: The result
+        :rtype: dict[str, Any]
+        """
+        detail = request.get("includeGroupDetail") == "T"
+        result: dict[str, Any] = {"resultMetadata": _metadata()}
+        if groups:
+            result["groupResults"] = [_group_body(group, detail) for group in groups]
+        return {"WsFindGroupsResults": result}
+
+    def _group_save(self, request: dict[str, Any], path: str) -> dict[str, Any]:
+        """Answer a WsRestGroupSaveRequest.
+
+        :param request: The request
+        :type request: dict[str, Any]
+        :param path: The path the request was sent to
+        :type path: str
+        :return: The result
+        :rtype: dict[str, Any]
+        """
+        detail = request.get("includeGroupDetail") == "T"
+        results = []
+        for to_save in request.get("wsGroupToSaves", []):
+            ws_group = to_save["wsGroup"]
+            existed = ws_group["name"] in self.groups
+            group = self._save_group(
+                ws_group["name"],
+                ws_group.get("displayExtension"),
+                ws_group.get("description", ""),
+                ws_group.get("detail"),
+            )
+            results.append(
+                {
+                    "resultMetadata": _metadata(
+                        code="SUCCESS_UPDATED" if existed else "SUCCESS_INSERTED"
+                    ),
+                    "wsGroup": _group_body(group, detail),
+                }
+            )
+        return {
+            "WsGroupSaveResults": {"resultMetadata": _metadata(), "results": results}
+        }
+
+    def _group_delete(self, request: dict[str, Any], path: str) -> dict[str, Any]:
+        """Answer a WsRestGroupDeleteRequest.
+
+        :param request: The request
+        :type request: dict[str, Any]
+        :param path: The path the request was sent to
+        :type path: str
+        :return: The result
+        :rtype: dict[str, Any]
+        """
+        results = []
+        for lookup in request.get("wsGroupLookups", []):
+            group = self._lookup_group(lookup)
+            if group is None:
+                results.append(
+                    {
+                        "resultMetadata": _metadata(
+                            code="SUCCESS_GROUP_NOT_FOUND",
+                            message=(
+                                "Cant find group: 'WsGroupLookup[pitGroups=[],"
+                                f"groupName={lookup.get('groupName')},"
+                                f"uuid={lookup.get('uuid')}]'"
+                            ),
+                        )
+                    }
+                )
+                continue
+            self._remove_group(group["name"])
+            results.append(
+                {"resultMetadata": _metadata(), "wsGroup": _group_body(group, False)}
+            )
+        return {
+            "WsGroupDeleteResults": {"resultMetadata": _metadata(), "results": results}
+        }
+
+    def _find_stems_lite(self, request: dict[str, Any], path: str) -> dict[str, Any]:
+        """Answer a WsRestFindStemsLiteRequest.
+
+        :param request: The request
+        :type request: dict[str, Any]
+        :param path: The path the request was sent to
+        :type path: str
+        :return: The result
+        :rtype: dict[str, Any]
+        """
+        filter_type = request.get("stemQueryFilterType")
+        if filter_type == "FIND_BY_STEM_NAME":
+            stem = self.stems.get(request.get("stemName", ""))
+            stems = [stem] if stem else []
+        elif filter_type == "FIND_BY_PARENT_STEM_NAME":
+            parent_name = request.get("parentStemName", "")
+            subtree = request.get("parentStemNameScope") == "ALL_IN_SUBTREE"
+            stems = [
+                stem
+                for name, stem in self.stems.items()
+                if _in_stem(name, parent_name, subtree)
+            ]
+        else:
+            return _failure(
+                "WsFindStemsResults",
+                "INVALID_QUERY",
+                f"Unsupported stemQueryFilterType: {filter_type}",
+            )
+        return {
+            "WsFindStemsResults": {"resultMetadata": _metadata(), "stemResults": stems}
+        }
+
+    def _stem_save(self, request: dict[str, Any], path: str) -> dict[str, Any]:
+        """Answer a WsRestStemSaveRequest.
+
+        :param request: The request
+        :type request: dict[str, Any]
+        :param path: The path the request was sent to
+        :type path: str
+        :return: The result
+        :rtype: dict[str, Any]
+        """
+        results = []
+        for to_save in request.get("wsStemToSaves", []):
+            ws_stem = to_save["wsStem"]
+            existed = ws_stem["name"] in self.stems
+            stem = self._save_stem(
+                ws_stem["name"],
+                ws_stem.get("displayExtension"),
+                ws_stem.get("description", ""),
+            )
+            results.append(
+                {
+                    "resultMetadata": _metadata(
+                        code="SUCCESS_UPDATED" if existed else "SUCCESS_INSERTED"
+                    ),
+                    "wsStem": stem,
+                }
+            )
+        return {
+            "WsStemSaveResults": {"resultMetadata": _metadata(), "results": results}
+        }
+
+    def _stem_delete(self, request: dict[str, Any], path: str) -> dict[str, Any]:
+        """Answer a WsRestStemDeleteRequest.
+
+        Stems that still contain stems or groups are not deleted.
+
+        :param request: The request
+        :type request: dict[str, Any]
+        :param path: The path the request was sent to
+        :type path: str
+        :return: The result
+        :rtype: dict[str, Any]
+        """
+        results = []
+        success = True
+        for lookup in request.get("wsStemLookups", []):
+            stem = self._lookup_stem(lookup)
+            if stem is None:
+                results.append(
+                    {"resultMetadata": _metadata(code="SUCCESS_STEM_NOT_FOUND")}
+                )
+                continue
+            name = stem["name"]
+            if any(_in_stem(child, name, False) for child in self.stems) or any(
+                _in_stem(child, name, False) for child in self.groups
+            ):
+                success = False
+                results.append(
+                    {
+                        "resultMetadata": _metadata(
+                            False, "EXCEPTION", f"Stem {name} is not empty"
+                        ),
+                        "wsStem": stem,
+                    }
+                )
+                continue
+            del self.stems[name]
+            self.privileges = {
+                privilege for privilege in self.privileges if privilege[0] != name
+            }
+            self._remove_assignments_of(stem["uuid"])
+            results.append({"resultMetadata": _metadata(), "wsStem": stem})
+        return {
+            "WsStemDeleteResults": {
+                "resultMetadata": (
+                    _metadata()
+                    if success
+                    else _metadata(False, "PROBLEM_DELETING_STEMS")
+                ),
+                "results": results,
+            }
+        }
+
+    # Subjects and memberships
+
+    def _subject_exists(self, subject_id: str) -> bool:
+        """Determine whether a subject (a person or a group) exists.
+
+        :param subject_id: The id of the subject
+        :type subject_id: str
+        :return: True if the subject exists
+        :rtype: bool
+        """
+        return subject_id in self.subjects or subject_id in self._group_names
+
+    def _lookup_subject(self, lookup: dict[str, Any]) -> str | None:
+        """Find the id of the subject for a subject lookup.
+
+        Identifiers match the identifier of people, and the name of groups.
+
+        :param lookup: The lookup, with a subjectId or subjectIdentifier
+        :type lookup: dict[str, Any]
+        :return: The id of the subject, or None if not found
+        :rtype: str | None
+        """
+        if "subjectId" in lookup:
+            subject_id = lookup["subjectId"]
+            return subject_id if self._subject_exists(subject_id) else None
+        identifier = lookup.get("subjectIdentifier", "")
+        if identifier in self._identifiers:
+            return self._identifiers[identifier]
+        group = self.groups.get(identifier)
+        return group["uuid"] if group else None
+
+    def _subject_attribute_names(self, requested: list[str] | str) -> list[str]:
+        """Get the subject attributes to return, the defaults and those requested.
+
+        :param requested: The requested attribute names, as a list or
+        comma separated string
+        :type requested: list[str] | str
+        :return: The attribute names to return
+        :rtype: list[str]
+        """
+        if isinstance(requested, str):
+            requested = [name for name in requested.split(",") if name]
+        return list(dict.fromkeys([*self.default_subject_attributes, *requested]))
+
+    def _subject_body(
+        self, subject_id: str, attribute_names: list[str]
+    ) -> dict[str, Any]:
+        """Build the body of a subject, as Grouper returns it.
+
+        :param subject_id: The id of the subject
+        :type subject_id: str
+        :param attribute_names: The attributes to return values for
+        :type attribute_names: list[str]
+        :return: The subject body
+        :rtype: dict[str, Any]
+        """
+        group_name = self._group_names.get(subject_id)
+        if group_name is not None:
+            group = self.groups[group_name]
+            attributes = {
+                "name": group_name,
+                "description": group["description"],
+                "displayName": group["displayName"],
+                "displayExtension": group["displayExtension"],
+            }
+            name, source_id = group_name, _GROUP_SOURCE_ID
+        else:
+            subject = self.subjects[subject_id]
+            attributes = subject["attributes"]
+            name, source_id = subject["name"], subject["sourceId"]
+        return {
+            "success": "T",
+            "resultCode": "SUCCESS",
+            "id": subject_id,
+            "name": name,
+            "sourceId": source_id,
+            "attributeValues": [attributes.get(attr, "") for attr in attribute_names],
+        }
+
+    def _source_id(self, subject_id: str) -> str:
+        """Get the source of a subject.
+
+        :param subject_id: The id of the subject
+        :type subject_id: str
+        :return: The source id, "g:gsa" for groups
+        :rtype: str
+        """
+        if subject_id in self._group_names:
+            return _GROUP_SOURCE_ID
+        return str(self.subjects[subject_id]["sourceId"])
+
+    def _subject_reference(
+        self, lookup: dict[str, Any], subject_id: str | None
+    ) -> dict[str, Any]:
+        """Build the short subject body returned in member results.
+
+        :param lookup: The lookup the subject was requested with
+        :type lookup: dict[str, Any]
+        :param subject_id: The id of the subject, or None if not found
+        :type subject_id: str | None
+        :return: The subject reference
+        :rtype: dict[str, Any]
+        """
+        if subject_id is None:
+            return {
+                "id": lookup.get("subjectId", lookup.get("subjectIdentifier")),
+                "success": "F",
+                "resultCode": "SUBJECT_NOT_FOUND",
+            }
+        reference = {"id": subject_id, "sourceId": self._source_id(subject_id)}
+        if "subjectIdentifier" in lookup:
+            reference["identifierLookup"] = lookup["subjectIdentifier"]
+        return reference
+
+    def _add_membership(self, group_id: str, subject_id: str) -> bool:
+        """Add an immediate membership.
+
+        :param group_id: The uuid of the group
+        :type group_id: str
+        :param subject_id: The id of the subject
+        :type subject_id: str
+        :return: True if added, False if it already existed
+        :rtype: bool
+        """
+        members = self.members[group_id]
+        if subject_id in members:
+            return False
+        members[subject_id] = None
+        self._groups_of.setdefault(subject_id, set()).add(group_id)
+        self._member_cache.clear()
+        return True
+
+    def _remove_membership(self, group_id: str, subject_id: str) -> bool:
+        """Remove an immediate membership.
+
+        :param group_id: The uuid of the group
+        :type group_id: str
+        :param subject_id: The id of the subject
+        :type subject_id: str
+        :return: True if removed, False if it did not exist
+        :rtype: bool
+        """
+        members = self.members[group_id]
+        if subject_id not in members:
+            return False
+        del members[subject_id]
+        groups_of = self._groups_of[subject_id]
+        groups_of.discard(group_id)
+        if not groups_of:
+            del self._groups_of[subject_id]
+        self._member_cache.clear()
+        return True
+
+    def _effective_members(self, group_id: str) -> dict[str, None]:
+        """Get the members a group has through the groups that are its members.
+
+        :param group_id: The uuid of the group
+        :type group_id: str
+        :return: The ids of the effective members, in order
+        :rtype: dict[str, None]
+        """
+        effective: dict[str, None] = {}
+        seen = {group_id}
+        pending = [
+            member for member in self.members[group_id] if member in self._group_names
+        ]
+        while pending:
+            member_group_id = pending.pop()
+            if member_group_id in seen:
+                continue
+            seen.add(member_group_id)
+            for member in self.members[member_group_id]:
+                effective[member] = None
+                if member in self._group_names:
+                    pending.append(member)
+        return effective
+
+    def _member_ids(
+        self, group_id: str, member_filter: str, sort: bool = False
+    ) -> list[str]:
+        """Get the ids of the members of a group, cached until memberships change.
+
+        :param group_id: The uuid of the group
+        :type group_id: str
+        :param member_filter: "all", "immediate" or "effective"
+        :type member_filter: str
+        :param sort: Whether to sort the ids, defaults to False
+        :type sort: bool, optional
+        :return: The ids of the members
+        :rtype: list[str]
+        """
+        key = (group_id, member_filter, sort)
+        ids: list[str] | None = self._member_cache.get(key)
+        if ids is None:
+            if member_filter == "immediate":
+                ids = list(self.members[group_id])
+            elif member_filter == "effective":
+                ids = list(self._effective_members(group_id))
+            else:
+                ids = list(
+                    dict.fromkeys(
+                        itertools.chain(
+                            self.members[group_id], self._effective_members(group_id)
+                        )
+                    )
+                )
+            if sort:
+                ids.sort()
+            self._member_cache[key] = ids
+        return ids
+
+    def _member_set(self, group_id: str, member_filter: str) -> set[str]:
+        """Get the ids of the members of a group as a set, for membership checks.
+
+        :param group_id: The uuid of the group
+        :type group_id: str
+        :param member_filter: "all", "immediate" or "effective"
+        :type member_filter: str
+        :return: The ids of the members
+        :rtype: set[str]
+        """
+        key = (group_id, "set:" + member_filter, False)
+        members: set[str] | None = self._member_cache.get(key)
+        if members is None:
+            members = self._member_cache[key] = set(
+                self._member_ids(group_id, member_filter)
+            )
+        return members
+
+    def _groups_for_subject(self, subject_id: str) -> dict[str, set[str]]:
+        """Get the groups a subject is a member of, with the membership types.
+
+        :param subject_id: The id of the subject
+        :type subject_id: str
+        :return: Dict of group uuid to its membership types,
+        "immediate" and/or "effective"
+        :rtype: dict[str, set[str]]
+        """
+        groups: dict[str, set[str]] = {
+            group_id: {"immediate"} for group_id in self._groups_of.get(subject_id, ())
+        }
+        seen: set[str] = set()
+        pending = list(groups)
+        while pending:
+            group_id = pending.pop()
+            if group_id in seen:
+                continue
+            seen.add(group_id)
+            for parent_id in self._groups_of.get(group_id, ()):
+                groups.setdefault(parent_id, set()).add("effective")
+                pending.append(parent_id)
+        return groups
+
+    def _get_members(self, request: dict[str, Any], path: str) -> dict[str, Any]:
+        """Answer a WsRestGetMembersRequest, with page or cursor paging.
+
+        :param request: The request
+        :type request: dict[str, Any]
+        :param path: The path the request was sent to
+        :type path: str
+        :return: The result
+        :rtype: dict[str, Any]
+        """
+        attribute_names = self._subject_attribute_names(
+            request.get("subjectAttributeNames", [])
+        )
+        member_filter = request.get("memberFilter", "all").lower()
+        results = []
+        success = True
+        for lookup in request.get("wsGroupLookups", []):
+            group = self._lookup_group(lookup)
+            if group is None:
+                success = False
+                results.append(
+                    {
+                        "resultMetadata": _metadata(
+                            False,
+                            "GROUP_NOT_FOUND",
+                            "Invalid group for 'wsGroupLookup', "
+                            "WsGroupLookup[pitGroups=[],"
+                            f"groupName={lookup.get('groupName')},"
+                            f"uuid={lookup.get('uuid')}]",
+                        )
+                    }
+                )
+                continue
+            result: dict[str, Any] = {
+                "resultMetadata": _metadata(),
+                "wsGroup": _group_body(group, False),
+            }
+            page = self._page(group["uuid"], member_filter, request)
+            if page:
+                result["wsSubjects"] = [
+                    self._subject_body(subject_id, attribute_names)
+                    for subject_id in page
+                ]
+            results.append(result)
+        return {
+            "WsGetMembersResults": {
+                "resultMetadata": (
+                    _metadata()
+                    if success
+                    else _metadata(False, "PROBLEM_GETTING_MEMBERS")
+                ),
+                "subjectAttributeNames": attribute_names,
+                "results": results,
+            }
+        }
+
+    def _page(
+        self, group_id: str, member_filter: str, request: dict[str, Any]
+    ) -> list[str]:
+        """Get the page of member ids a get members request asks for.
+
+        :param group_id: The uuid of the group
+        :type group_id: str
+        :param member_filter: "all", "immediate" or "effective"
+        :type member_filter: str
+        :param request: The request, with any paging fields
+        :type request: dict[str, Any]
+        :return: The ids of the members in the page
+        :rtype: list[str]
+        """
+        cursor = request.get("pageIsCursor") == "T"
+        ascending = request.get("ascending", "T") != "F"
+        sorted_ids = self._member_ids(
+            group_id, member_filter, sort=cursor or "sortString" in request
+        )
+        ids = sorted_ids if ascending else sorted_ids[::-1]
+        if "pageSize" not in request:
+            return ids
+        page_size = int(request["pageSize"])
+        if self.max_page_size is not None:
+            page_size = min(page_size, self.max_page_size)
+        last = request.get("pageLastCursorField")
+        if not cursor:
+            start = (int(request.get("pageNumber", "1")) - 1) * page_size
+        elif last is None:
+            start = 0
+        else:
+            # Cursor pages start after (or at) the last subject id retrieved
+            include_last = request.get("pageCursorFieldIncludesLastRetrieved") == "T"
+            if ascending:
+                start = (bisect_left if include_last else bisect_right)(ids, last)
+            else:
+                start = len(ids) - (bisect_right if include_last else bisect_left)(
+                    sorted_ids, last
+                )
+        return ids[start:start + page_size]
+
+    def _get_memberships(self, request: dict[str, Any], path: str) -> dict[str, Any]:
+        """Answer a WsRestGetMembershipsRequest, for groups, subjects or both.
+
+        Memberships are paged by pageSize and pageNumber, if they are given.
+
+        :param request: The request
+        :type request: dict[str, Any]
+        :param path: The path the request was sent to
+        :type path: str
+        :return: The result
+        :rtype: dict[str, Any]
+        """
+        attribute_names = self._subject_attribute_names(
+            request.get("subjectAttributeNames", [])
+        )
+        member_filter = request.get("memberFilter", "all").lower()
+        memberships: list[tuple[str, str, str]] = []
+        subject_lookups = request.get("wsSubjectLookups", [])
+        requested_group_ids: set[str] = set()
+        for lookup in request.get("wsGroupLookups", []):
+            group = self._lookup_group(lookup)
+            if group is None:
+                return _failure(
+                    "WsGetMembershipsResults",
+                    "GROUP_NOT_FOUND",
+                    "Invalid group for 'group', WsGroupLookup[pitGroups=[],"
+                    f"groupName={lookup.get('groupName')},uuid={lookup.get('uuid')}]",
+                )
+            group_id = group["uuid"]
+            requested_group_ids.add(group_id)
+            if subject_lookups:
+                # With subject lookups too, only their memberships are given
+                continue
+            if member_filter in ("all", "immediate"):
+                memberships.extend(
+                    (group_id, subject_id, "immediate")
+                    for subject_id in self.members[group_id]
+                )
+            if member_filter in ("all", "effective"):
+                memberships.extend(
+                    (group_id, subject_id, "effective")
+                    for subject_id in self._effective_members(group_id)
+                )
+        stem_lookup = request.get("wsStemLookup")
+        stem_name = stem_lookup.get("stemName", "") if stem_lookup else ""
+        subtree = request.get("stemScope") != "ONE_LEVEL"
+        for lookup in subject_lookups:
+            subject_id = self._lookup_subject(lookup)
+            if subject_id is None:
+                continue
+            for group_id, types in self._groups_for_subject(subject_id).items():
+                if requested_group_ids and group_id not in requested_group_ids:
+                    continue
+                if not _in_stem(self._group_names[group_id], stem_name, subtree):
+                    continue
+                memberships.extend(
+                    (group_id, subject_id, membership_type)
+                    for membership_type in ("immediate", "effective")
+                    if membership_type in types
+                    and member_filter in ("all", membership_type)
+                )
+        if "pageSize" in request:
+            page_size = int(request["pageSize"])
+            if self.max_page_size is not None:
+                page_size = min(page_size, self.max_page_size)
+            start = (int(request.get("pageNumber", "1")) - 1) * page_size
+            memberships = memberships[start:start + page_size]
+        result: dict[str, Any] = {
+            "resultMetadata": _metadata(),
+            "subjectAttributeNames": attribute_names,
+        }
+        if memberships:
+            group_ids = dict.fromkeys(group_id for group_id, _, _ in memberships)
+            subject_ids = dict.fromkeys(subject_id for _, subject_id, _ in memberships)
+            result["wsMemberships"] = [
+                {
+                    "membershipType": membership_type,
+                    "groupId": group_id,
+                    "groupName": self._group_names[group_id],
+                    "subjectId": subject_id,
+                    "subjectSourceId": self._source_id(subject_id),
+                    "listName": "members",
+                    "listType": "list",
+                    "enabled": "T",
+                }
+                for group_id, subject_id, membership_type in memberships
+            ]
+            result["wsGroups"] = [
+                _group_body(
+                    self.groups[self._group_names[group_id]],
+                    request.get("includeGroupDetail") == "T",
+                )
+                for group_id in group_ids
+            ]
+            result["wsSubjects"] = [
+                self._subject_body(subject_id, attribute_names)
+                for subject_id in subject_ids
+            ]
+        return {"WsGetMembershipsResults": result}
+
+    def _has_member(self, request: dict[str, Any], path: str) -> dict[str, Any]:
+        """Answer a WsRestHasMemberRequest, for the group named in the path.
+
+        :param request: The request
+        :type request: dict[str, Any]
+        :param path: The path the request was sent to
+        :type path: str
+        :return: The result
+        :rtype: dict[str, Any]
+        """
+        match = _HAS_MEMBER_PATH.search(path)
+        group = self._lookup_group(
+            request.get("wsGroupLookup")
+            or {"groupName": match.group("group_name") if match else ""}
+        )
+        if group is None:
+            return _failure("WsHasMemberResults", "GROUP_NOT_FOUND")
+        members = self._member_set(
+            group["uuid"], request.get("memberFilter", "all").lower()
+        )
+        results = []
+        for lookup in request.get("subjectLookups", []):
+            subject_id = self._lookup_subject(lookup)
+            if subject_id is None:
+                metadata = _metadata(code="SUCCESS")
+                metadata["resultCode2"] = "SUBJECT_NOT_FOUND"
+            else:
+                metadata = _metadata(
+                    code="IS_MEMBER" if subject_id in members else "IS_NOT_MEMBER"
+                )
+            results.append(
+                {
+                    "resultMetadata": metadata,
+                    "wsSubject": self._subject_reference(lookup, subject_id),
+                }
+            )
+        return {
+            "WsHasMemberResults": {
+                "resultMetadata": _metadata(),
+                "wsGroup": _group_body(group, False),
+                "results": results,
+            }
+        }
+
+    def _add_member(self, request: dict[str, Any], path: str) -> dict[str, Any]:
+        """Answer a WsRestAddMemberRequest.
+
+        :param request: The request
+        :type request: dict[str, Any]
+        :param path: The path the request was sent to
+        :type path: str
+        :return: The result
+        :rtype: dict[str, Any]
+        """
+        group = self._lookup_group(request.get("wsGroupLookup", {}))
+        if group is None:
+            return _failure("WsAddMemberResults", "GROUP_NOT_FOUND")
+        group_id = group["uuid"]
+        results = []
+        added: set[str] = set()
+        for lookup in request.get("subjectLookups", []):
+            subject_id = self._lookup_subject(lookup)
+            if subject_id is None:
+                metadata = _metadata(False, "SUBJECT_NOT_FOUND")
+            elif subject_id == group_id:
+                metadata = _metadata(False, "EXCEPTION", "Cannot add group to itself")
+            else:
+                added.add(subject_id)
+                metadata = _metadata(
+                    code=(
+                        "SUCCESS"
+                        if self._add_membership(group_id, subject_id)
+                        else "SUCCESS_ALREADY_EXISTED"
+                    )
+                )
+            results.append(
+                {
+                    "resultMetadata": metadata,
+                    "wsSubject": self._subject_reference(lookup, subject_id),
+                }
+            )
+        if request.get("replaceAllExisting") == "T":
+            for subject_id in list(self.members[group_id]):
+                if subject_id not in added:
+                    self._remove_membership(group_id, subject_id)
+        success = all(result["resultMetadata"]["success"] == "T" for result in results)
+        return {
+            "WsAddMemberResults": {
+                "resultMetadata": (
+                    _metadata()
+                    if success
+                    else _metadata(False, "PROBLEM_WITH_ASSIGNMENT")
+                ),
+                "wsGroupAssigned": _group_body(
+                    group, request.get("includeGroupDetail") == "T"
+                ),
+                "results": results,
+            }
+        }
+
+    def _delete_member(self, request: dict[str, Any], path: str) -> dict[str, Any]:
+        """Answer a WsRestDeleteMemberRequest.
+
+        :param request: The request
+        :type request: dict[str, Any]
+        :param path: The path the request was sent to
+        :type path: str
+        :return: The result
+        :rtype: dict[str, Any]
+        """
+        group = self._lookup_group(request.get("wsGroupLookup", {}))
+        if group is None:
+            return _failure("WsDeleteMemberResults", "GROUP_NOT_FOUND")
+        group_id = group["uuid"]
+        results = []
+        for lookup in request.get("subjectLookups", []):
+            subject_id = self._lookup_subject(lookup)
+            if subject_id is None:
+                metadata = _metadata(False, "SUBJECT_NOT_FOUND")
+            elif self._remove_membership(group_id, subject_id):
+                metadata = _metadata()
+            elif subject_id in self._effective_members(group_id):
+                metadata = _metadata(code="SUCCESS_WASNT_IMMEDIATE_BUT_HAS_EFFECTIVE")
+            else:
+                metadata = _metadata(code="SUCCESS_WASNT_IMMEDIATE")
+            results.append(
+                {
+                    "resultMetadata": metadata,
+                    "wsSubject": self._subject_reference(lookup, subject_id),
+                }
+            )
+        success = all(result["resultMetadata"]["success"] == "T" for result in results)
+        return {
+            "WsDeleteMemberResults": {
+                "resultMetadata": (
+                    _metadata()
+                    if success
+                    else _metadata(False, "PROBLEM_DELETING_MEMBERS")
+                ),
+                "wsGroup": _group_body(group, request.get("includeGroupDetail") == "T"),
+                "results": results,
+            }
+        }
+
+    def _get_subjects(self, request: dict[str, Any], path: str) -> dict[str, Any]:
+        """Answer a WsRestGetSubjectsRequest, by lookups or by search string.
+
+        :param request: The request
+        :type request: dict[str, Any]
+        :param path: The path the request was sent to
+        :type path: str
+        :return: The result
+        :rtype: dict[str, Any]
+        """
+        attribute_names = self._subject_attribute_names(
+            request.get("subjectAttributeNames", [])
+        )
+        subjects = []
+        for lookup in request.get("wsSubjectLookups", []):
+            subject_id = self._lookup_subject(lookup)
+            if subject_id is None:
+                subjects.append(self._subject_reference(lookup, None))
+                continue
+            subject = self._subject_body(subject_id, attribute_names)
+            if "subjectIdentifier" in lookup:
+                subject["identifierLookup"] = lookup["subjectIdentifier"]
+            subjects.append(subject)
+        if "searchString" in request:
+            search = request["searchString"].lower()
+            subject_ids = [
+                subject_id
+                for subject_id, subject in self.subjects.items()
+                if subject_id != _SYSTEM_SUBJECT_ID
+                and any(
+                    search in str(value).lower()
+                    for value in (subject_id, *subject["attributes"].values())
+                )
+            ] + [
+                group["uuid"]
+                for name, group in self.groups.items()
+                if search in name.lower()
+            ]
+            subjects.extend(
+                self._subject_body(subject_id, attribute_names)
+                for subject_id in subject_ids
+            )
+        result: dict[str, Any] = {
+            "resultMetadata": _metadata(),
+            "subjectAttributeNames": attribute_names,
+        }
+        if subjects:
+            result["wsSubjects"] = subjects
+        return {"WsGetSubjectsResults": result}
+
+    # Privileges
+
+    def _privilege_owner(
+        self, group_name: str | None, stem_name: str | None
+    ) -> tuple[dict[str, Any] | None, str | None]:
+        """Find the group or stem a privilege request is for.
+
+        :param group_name: The name of the group, if given
+        :type group_name: str | None
+        :param stem_name: The name of the stem, if given
+        :type stem_name: str | None
+        :return: The group or stem (None if none was given), and the result code
+        if the given group or stem does not exist
+        :rtype: tuple[dict[str, Any] | None, str | None]
+        """
+        if group_name:
+            group = self.groups.get(group_name)
+            return group, None if group else "GROUP_NOT_FOUND"
+        if stem_name:
+            stem = self.stems.get(stem_name)
+            return stem, None if stem else "STEM_NOT_FOUND"
+        return None, None
+
+    def _privilege_body(
+        self,
+        owner_name: str,
+        subject_id: str,
+        privilege_name: str,
+        attribute_names: list[str],
+        allowed: bool = True,
+    ) -> dict[str, Any]:
+        """Build the body of a privilege, as Grouper returns it.
+
+        :param owner_name: The name of the group or stem
+        :type owner_name: str
+        :param subject_id: The id of the subject with the privilege
+        :type subject_id: str
+        :param privilege_name: The name of the privilege
+        :type privilege_name: str
+        :param attribute_names: The subject attributes to return values for
+        :type attribute_names: list[str]
+        :param allowed: Whether the privilege is allowed, defaults to True
+        :type allowed: bool, optional
+        :return: The privilege body
+        :rtype: dict[str, Any]
+        """
+        privilege: dict[str, Any] = {
+            "privilegeName": privilege_name,
+            "revokable": "T",
+            "allowed": _flag(allowed),
+            "wsSubject": self._subject_body(subject_id, attribute_names),
+            "ownerSubject": self._subject_body(_SYSTEM_SUBJECT_ID, attribute_names),
+        }
+        if owner_name in self.groups:
+            privilege["privilegeType"] = "access"
+            privilege["wsGroup"] = _group_body(self.groups[owner_name], False)
+        else:
+            privilege["privilegeType"] = "naming"
+            privilege["wsStem"] = self.stems[owner_name]
+        return privilege
+
+    def _get_privileges_lite(
+        self, request: dict[str, Any], path: str
+    ) -> dict[str, Any]:
+        """Answer a WsRestGetGrouperPrivilegesLiteRequest.
+
+        :param request: The request
+        :type request: dict[str, Any]
+        :param path: The path the request was sent to
+        :type path: str
+        :return: The result
+        :rtype: dict[str, Any]
+        """
+        result_type = "WsGetGrouperPrivilegesLiteResult"
+        subject_id = None
+        if "subjectId" in request or "subjectIdentifier" in request:
+            subject_id = self._lookup_subject(request)
+            if subject_id is None:
+                return _failure(result_type, "SUBJECT_NOT_FOUND")
+        owner, not_found = self._privilege_owner(
+            request.get("groupName"), request.get("stemName")
+        )
+        if not_found:
+            return _failure(result_type, not_found)
+        attribute_names = self._subject_attribute_names(
+            request.get("subjectAttributeNames", "")
+        )
+        privilege_type = request.get("privilegeType")
+        privileges = [
+            self._privilege_body(
+                owner_name, privilege_subject_id, privilege_name, attribute_names
+            )
+            for owner_name, privilege_subject_id, privilege_name in sorted(
+                self.privileges
+            )
+            if (owner is None or owner_name == owner["name"])
+            and subject_id in (None, privilege_subject_id)
+            and request.get("privilegeName") in (None, privilege_name)
+            and (owner_name in self.groups or owner_name in self.stems)
+        ]
+        if privilege_type:
+            privileges = [
+                privilege
+                for privilege in privileges
+                if privilege["privilegeType"] == privilege_type
+            ]
+        result: dict[str, Any] = {
+            "resultMetadata": _metadata(),
+            "subjectAttributeNames": attribute_names,
+        }
+        if privileges:
+            result["privilegeResults"] = privileges
+        return {result_type: result}
+
+    def _change_privileges(
+        self,
+        owner: dict[str, Any],
+        subject_id: str,
+        privilege_names: list[str],
+        allowed: bool,
+    ) -> None:
+        """Grant or revoke privileges on a group or stem.
+
+        :param owner: The group or stem
+        :type owner: dict[str, Any]
+        :param subject_id: The id of the subject
+        :type subject_id: str
+        :param privilege_names: The names of the privileges
+        :type privilege_names: list[str]
+        :param allowed: True to grant the privileges, False to revoke them
+        :type allowed: bool
+        """
+        for privilege_name in privilege_names:
+            privilege = (owner["name"], subject_id, privilege_name)
+            if allowed:
+                self.privileges.add(privilege)
+            else:
+                self.privileges.discard(privilege)
+
+    def _assign_privileges(self, request: dict[str, Any], path: str) -> dict[str, Any]:
+        """Answer a WsRestAssignGrouperPrivilegesRequest.
+
+        :param request: The request
+        :type request: dict[str, Any]
+        :param path: The path the request was sent to
+        :type path: str
+        :return: The result
+        :rtype: dict[str, Any]
+        """
+        result_type = "WsAssignGrouperPrivilegesResults"
+        owner, not_found = self._privilege_owner(
+            request.get("wsGroupLookup", {}).get("groupName"),
+            request.get("wsStemLookup", {}).get("stemName"),
+        )
+        if owner is None:
+            return _failure(result_type, not_found or "INVALID_QUERY")
+        allowed = request.get("allowed") == "T"
+        privilege_names = request.get("privilegeNames", [])
+        results = []
+        for lookup in request.get("wsSubjectLookups", []):
+            subject_id = self._lookup_subject(lookup)
+            if subject_id is None:
+                metadata = _metadata(False, "SUBJECT_NOT_FOUND")
+            else:
+                self._change_privileges(owner, subject_id, privilege_names, allowed)
+                metadata = _metadata()
+            results.append(
+                {
+                    "resultMetadata": metadata,
+                    "wsSubject": self._subject_reference(lookup, subject_id),
+                }
+            )
+        success = all(result["resultMetadata"]["success"] == "T" for result in results)
+        return {
+            result_type: {
+                "resultMetadata": (
+                    _metadata()
+                    if success
+                    else _metadata(False, "PROBLEM_ASSIGNING_PRIVILEGES")
+                ),
+                "results": results,
+            }
+        }
+
+    def _assign_privileges_lite(
+        self, request: dict[str, Any], path: str
+    ) -> dict[str, Any]:
+        """Answer a WsRestAssignGrouperPrivilegesLiteRequest.
+
+        :param request: The request
+        :type request: dict[str, Any]
+        :param path: The path the request was sent to
+        :type path: str
+        :return: The result
+        :rtype: dict[str, Any]
+        """
+        result_type = "WsAssignGrouperPrivilegesLiteResult"
+        owner, not_found = self._privilege_owner(
+            request.get("groupName"), request.get("stemName")
+        )
+        if owner is None:
+            return _failure(result_type, not_found or "INVALID_QUERY")
+        subject_id = self._lookup_subject(request)
+        if subject_id is None:
+            return _failure(result_type, "SUBJECT_NOT_FOUND")
+        self._change_privileges(
+            owner, subject_id, [request["privilegeName"]], request.get("allowed") == "T"
+        )
+        return {result_type: {"resultMetadata": _metadata()}}
+
+    # Attributes
+
+    def _find_attribute_defs_lite(
+        self, request: dict[str, Any], path: str
+    ) -> dict[str, Any]:
+        """Answer a WsRestFindAttributeDefsLiteRequest.
+
+        As with Grouper, if the named definition does not exist,
+        all definitions matching the rest of the request are returned.
+
+        :param request: The request
+        :type request: dict[str, Any]
+        :param path: The path the request was sent to
+        :type path: str
+        :return: The result
+        :rtype: dict[str, Any]
+        """
+        attribute_def = self.attribute_defs.get(request.get("nameOfAttributeDef", ""))
+        if attribute_def is not None:
+            attribute_defs = [attribute_def]
+        else:
+            attribute_defs = list(self.attribute_defs.values())
+            scope = request.get("scope", "").lower()
+            if scope:
+                attribute_defs = [
+                    attribute_def
+                    for attribute_def in attribute_defs
+                    if scope in attribute_def["name"].lower()
+                    or scope in attribute_def["description"].lower()
+                ]
+            stem = self._lookup_stem({"uuid": request.get("parentStemId")})
+            if stem is not None:
+                subtree = request.get("stemScope") == "ALL_IN_SUBTREE"
+                attribute_defs = [
+                    attribute_def
+                    for attribute_def in attribute_defs
+                    if _in_stem(attribute_def["name"], stem["name"], subtree)
+                ]
+        result: dict[str, Any] = {"resultMetadata": _metadata()}
+        if attribute_defs:
+            result["attributeDefResults"] = attribute_defs
+        return {"WsFindAttributeDefsResults": result}
+
+    def _find_attribute_def_names_lite(
+        self, request: dict[str, Any], path: str
+    ) -> dict[str, Any]:
+        """Answer a WsRestFindAttributeDefNamesLiteRequest.
+
+        :param request: The request
+        :type request: dict[str, Any]
+        :param path: The path the request was sent to
+        :type path: str
+        :return: The result
+        :rtype: dict[str, Any]
+        """
+        def_names = list(self.attribute_def_names.values())
+        if "attributeDefNameName" in request:
+            def_names = [
+                def_name
+                for def_name in def_names
+                if def_name["name"] == request["attributeDefNameName"]
+            ]
+        if "nameOfAttributeDef" in request:
+            def_names = [
+                def_name
+                for def_name in def_names
+                if def_name["attributeDefName"] == request["nameOfAttributeDef"]
+            ]
+        if "scope" in request:
+            scope = request["scope"].lower()
+            def_names = [
+                def_name
+                for def_name in def_names
+                if scope in def_name["name"].lower()
+                or scope in def_name["description"].lower()
+            ]
+        result: dict[str, Any] = {"resultMetadata": _metadata()}
+        if def_names:
+            result["attributeDefNameResults"] = def_names
+            result["attributeDefs"] = [
+                self.attribute_defs[name]
+                for name in dict.fromkeys(
+                    def_name["attributeDefName"] for def_name in def_names
+                )
+            ]
+        return {"WsFindAttributeDefNamesResults": result}
+
+    def _assignment_owners(
+        self, attribute_assign_type: str, request: dict[str, Any]
+    ) -> list[dict[str, Any] | None] | None:
+        """Find the owners given in an attribute request.
+
+        :param attribute_assign_type: "group" or "stem"
+        :type attribute_assign_type: str
+        :param request: The request
+        :type request: dict[str, Any]
+        :return: The owners (None for any that do not exist),
+        or None if the assign type is not supported
+        :rtype: list[dict[str, Any] | None] | None
+        """
+        if attribute_assign_type == "group":
+            return [
+                self._lookup_group(lookup)
+                for lookup in request.get("wsOwnerGroupLookups", [])
+            ]
+        if attribute_assign_type == "stem":
+            return [
+                self._lookup_stem(lookup)
+                for lookup in request.get("wsOwnerStemLookups", [])
+            ]
+        return None
+
+    def _assignment_results(
+        self,
+        attribute_assign_type: str,
+        assignments: list[dict[str, Any]],
+        result: dict[str, Any],
+    ) -> None:
+        """Add the definitions, names and owners of assignments to a result.
+
+        :param attribute_assign_type: "group" or "stem"
+        :type attribute_assign_type: str
+        :param assignments: The assignments in the result
+        :type assignments: list[dict[str, Any]]
+        :param result: The result to add to
+        :type result: dict[str, Any]
+        """
+        def_names = dict.fromkeys(
+            assignment["attributeDefNameName"] for assignment in assignments
+        )
+        result["wsAttributeDefNames"] = [
+            self.attribute_def_names[name] for name in def_names
+        ]
+        result["wsAttributeDefs"] = [
+            self.attribute_defs[name]
+            for name in dict.fromkeys(
+                assignment["attributeDefName"] for assignment in assignments
+            )
+        ]
+        if attribute_assign_type == "group":
+            result["wsGroups"] = [
+                _group_body(self.groups[name], False)
+                for name in dict.fromkeys(
+                    assignment["ownerGroupName"] for assignment in assignments
+                )
+            ]
+        else:
+            result["wsStems"] = [
+                self.stems[name]
+                for name in dict.fromkeys(
+                    assignment["ownerStemName"] for assignment in assignments
+                )
+            ]
+
+    def _get_attribute_assignments(
+        self, request: dict[str, Any], path: str
+    ) -> dict[str, Any]:
+        """Answer a WsRestGetAttributeAssignmentsRequest, for groups or stems.
+
+        :param request: The request
+        :type request: dict[str, Any]
+        :param path: The path the request was sent to
+        :type path: str
+        :return: The result
+        :rtype: dict[str, Any]
+        """
+        result_type = "WsGetAttributeAssignmentsResults"
+        attribute_assign_type = request.get("attributeAssignType", "")
+        owners = self._assignment_owners(attribute_assign_type, request)
+        if owners is None:
+            return _failure(
+                result_type,
+                "INVALID_QUERY",
+                f"Unsupported attributeAssignType: {attribute_assign_type}",
+            )
+        owner_ids = {owner["uuid"] for owner in owners if owner is not None}
+        def_names = {
+            lookup["name"] for lookup in request.get("wsAttributeDefNameLookups", [])
+        }
+        attribute_defs = {
+            lookup["name"] for lookup in request.get("wsAttributeDefLookups", [])
+        }
+        assignments = [
+            assignment
+            for assignment in self.attribute_assignments.values()
+            if assignment["attributeAssignType"] == attribute_assign_type
+            and (not owners or _owner_id(assignment) in owner_ids)
+            and (not def_names or assignment["attributeDefNameName"] in def_names)
+            and (not attribute_defs or assignment["attributeDefName"] in attribute_defs)
+        ]
+        result: dict[str, Any] = {"resultMetadata": _metadata()}
+        if assignments:
+            result["wsAttributeAssigns"] = assignments
+            self._assignment_results(attribute_assign_type, assignments, result)
+        return {result_type: result}
+
+    def _assign_attributes(self, request: dict[str, Any], path: str) -> dict[str, Any]:
+        """Answer a WsRestAssignAttributesRequest, for groups or stems.
+
+        :param request: The request
+        :type request: dict[str, Any]
+        :param path: The path the request was sent to
+        :type path: str
+        :return: The result
+        :rtype: dict[str, Any]
+        """
+        result_type = "WsAssignAttributesResults"
+        attribute_assign_type = request.get("attributeAssignType", "")
+        owners = self._assignment_owners(attribute_assign_type, request)
+        if owners is None:
+            return _failure(
+                result_type,
+                "INVALID_QUERY",
+                f"Unsupported attributeAssignType: {attribute_assign_type}",
+            )
+        if None in owners:
+            return _failure(
+                result_type, "INVALID_QUERY", f"Cant find {attribute_assign_type}"
+            )
+        def_names = []
+        for lookup in request.get("wsAttributeDefNameLookups", []):
+            def_name = self.attribute_def_names.get(lookup.get("name", ""))
+            if def_name is None:
+                return _failure(
+                    result_type,
+                    "INVALID_QUERY",
+                    f"Cant find attribute def name: {lookup.get('name')}",
+                )
+            def_names.append(def_name)
+        operation = request.get("attributeAssignOperation")
+        targets: list[tuple[dict[str, Any], bool]] = [
+            (self.attribute_assignments[lookup["uuid"]], False)
+            for lookup in request.get("wsAttributeAssignLookups", [])
+            if lookup.get("uuid") in self.attribute_assignments
+        ]
+        for owner in owners:
+            assert owner is not None
+            for def_name in def_names:
+                existing = [
+                    assignment
+                    for assignment in self.attribute_assignments.values()
+                    if _owner_id(assignment) == owner["uuid"]
+                    and assignment["attributeDefNameId"] == def_name["uuid"]
+                ]
+                if operation in ("remove_attr", "replace_attrs"):
+                    targets.extend((assignment, False) for assignment in existing)
+                if operation == "add_attr" or (
+                    operation in ("assign_attr", "replace_attrs") and not existing
+                ):
+                    assignment = self._new_assignment(
+                        attribute_assign_type, owner, def_name
+                    )
+                    targets.append((assignment, True))
+                elif operation == "assign_attr":
+                    targets.extend((assignment, False) for assignment in existing)
+        value_operation = request.get("attributeAssignValueOperation")
+        values = [str(value["valueSystem"]) for value in request.get("values", [])]
+        assign_results = []
+        for assignment, created in targets:
+            deleted = operation == "remove_attr" or (
+                operation == "replace_attrs" and not created
+            )
+            if deleted:
+                self.attribute_assignments.pop(assignment["id"], None)
+            elif value_operation and values:
+                _change_values(assignment, value_operation, values)
+            assign_results.append(
+                {
+                    "changed": _flag(created or deleted or bool(value_operation)),
+                    "deleted": _flag(deleted),
+                    "wsAttributeAssigns": [assignment],
+                }
+            )
+        assignments = [assignment for assignment, _ in targets]
+        result: dict[str, Any] = {
+            "resultMetadata": _metadata(),
+            "wsAttributeAssignResults": assign_results,
+        }
+        self._assignment_results(attribute_assign_type, assignments, result)
+        return {result_type: result}
+
+    def _new_assignment(
+        self,
+        attribute_assign_type: str,
+        owner: dict[str, Any],
+        def_name: dict[str, Any],
+    ) -> dict[str, Any]:
+        """Create an attribute assignment.
+
+        :param attribute_assign_type: "group" or "stem"
+        :type attribute_assign_type: str
+        :param owner: The group or stem the attribute is assigned to
+        :type owner: dict[str, Any]
+        :param def_name: The attribute definition name assigned
+        :type def_name: dict[str, Any]
+        :return: The assignment
+        :rtype: dict[str, Any]
+        """
+        now = datetime.now().strftime("%Y/%m/%d %H:%M:%S.%f")[:-3]
+        owner_key = "ownerGroup" if attribute_assign_type == "group" else "ownerStem"
+        assignment = {
+            "id": uuid.uuid4().hex,
+            "attributeAssignType": attribute_assign_type,
+            "attributeAssignDelegatable": "FALSE",
+            "disallowed": "F",
+            "enabled": "T",
+            "createdOn": now,
+            "lastUpdated": now,
+            "attributeAssignActionId": _ASSIGN_ACTION_ID,
+            "attributeAssignActionName": "assign",
+            "attributeAssignActionType": "immediate",
+            "attributeDefId": def_name["attributeDefId"],
+            "attributeDefName": def_name["attributeDefName"],
+            "attributeDefNameId": def_name["uuid"],
+            "attributeDefNameName": def_name["name"],
+            owner_key + "Id": owner["uuid"],
+            owner_key + "Name": owner["name"],
+            "wsAttributeAssignValues": [],
+        }
+        self.attribute_assignments[assignment["id"]] = assignment
+        return assignment
+
+
+def _metadata(
+    success: bool = True, code: str = "SUCCESS", message: str | None = None
+) -> dict[str, str]:
+    """Build the resultMetadata of a result.
+
+    :param success: Whether the request succeeded, defaults to True
+    :type success: bool, optional
+    :param code: The result code, defaults to "SUCCESS"
+    :type code: str, optional
+    :param message: The result message, defaults to None
+    :type message: str | None, optional
+    :return: The result metadata
+    :rtype: dict[str, str]
+    """
+    metadata = {"success": _flag(success), "resultCode": code}
+    if message is not None:
+        metadata["resultMessage"] = message
+    return metadata
+
+
+def _failure(result_type: str, code: str, message: str | None = None) -> dict[str, Any]:
+    """Build the result of a request that failed as a whole.
+
+    :param result_type: The top-level key of the result
+    :type result_type: str
+    :param code: The result code
+    :type code: str
+    :param message: The result message, defaults to None
+    :type message: str | None, optional
+    :return: The result
+    :rtype: dict[str, Any]
+    """
+    return {result_type: {"resultMetadata": _metadata(False, code, message)}}
+
+
+def _problem(code: str, message: str) -> dict[str, Any]:
+    """Build the result Grouper returns for a request it could not process.
+
+    :param code: The result code
+    :type code: str
+    :param message: The result message
+    :type message: str
+    :return: The result
+    :rtype: dict[str, Any]
+    """
+    return _failure("WsRestResultProblem", code, message)
+
+
+def _flag(value: bool) -> str:
+    """Convert a bool to a Grouper "T" or "F" flag.
+
+    :param value: The value to convert
+    :type value: bool
+    :return: "T" or "F"
+    :rtype: str
+    """
+    return "T" if value else "F"
+
+
+def _in_stem(name: str, stem_name: str, subtree: bool) -> bool:
+    """Determine whether a name is in a stem.
+
+    :param name: The full name of the group, stem or attribute
+    :type name: str
+    :param stem_name: The name of the stem, "" for the root stem
+    :type stem_name: str
+    :param subtree: Whether to include names in child stems at any depth,
+    or only names directly in the stem
+    :type subtree: bool
+    :return: True if the name is in the stem
+    :rtype: bool
+    """
+    if subtree:
+        return not stem_name or name.startswith(stem_name + ":")
+    return name.rpartition(":")[0] == stem_name
+
+
+def _group_body(group: dict[str, Any], detail: bool) -> dict[str, Any]:
+    """Get a group as Grouper returns it, with or without its detail.
+
+    :param group: The group
+    :type group: dict[str, Any]
+    :param detail: Whether to include the detail of the group
+    :type detail: bool
+    :return: The group body
+    :rtype: dict[str, Any]
+    """
+    if detail or "detail" not in group:
+        return group
+    return {key: value for key, value in group.items() if key != "detail"}
+
+
+def _owner_id(assignment: dict[str, Any]) -> str:
+    """Get the uuid of the group or stem an attribute is assigned to.
+
+    :param assignment: The assignment
+    :type assignment: dict[str, Any]
+    :return: The uuid of the owner
+    :rtype: str
+    """
+    return str(assignment.get("ownerGroupId") or assignment.get("ownerStemId"))
+
+
+def _change_values(
+    assignment: dict[str, Any], value_operation: str, values: list[str]
+) -> None:
+    """Change the values of an attribute assignment.
+
+    :param assignment: The assignment
+    :type assignment: dict[str, Any]
+    :param value_operation: "assign_value", "add_value", "remove_value"
+    or "replace_values"
+    :type value_operation: str
+    :param values: The values
+    :type values: list[str]
+    """
+    current = assignment["wsAttributeAssignValues"]
+    existing = {value["valueSystem"] for value in current}
+    if value_operation == "replace_values":
+        current.clear()
+        existing.clear()
+    if value_operation == "remove_value":
+        current[:] = [value for value in current if value["valueSystem"] not in values]
+        return
+    for value in values:
+        if value not in existing or value_operation == "add_value":
+            current.append({"id": uuid.uuid4().hex, "valueSystem": value})
+            existing.add(value)
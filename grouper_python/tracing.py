@@ -0,0 +1,212 @@
+"""grouper-python.tracing - optional OpenTelemetry tracing for grouper_python.
+
+When the opentelemetry-api package is installed, object and client methods
+create a span for the operation, with a child span for each call to the
+Grouper API and for each resolution of subjects that are groups.
+Spans are sent to whatever tracer provider the application has configured.
+When the package is not installed, these functions do nothing.
+"""
+
+from __future__ import annotations
+from typing import Any, TypeVar, cast, TYPE_CHECKING
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .objects.stats import CallEvent
+from collections.abc import AsyncIterator, Callable, Iterator
+from contextlib import contextmanager
+import functools
+import inspect
+
+try:
+    from opentelemetry import trace
+except ImportError:  # pragma: no cover
+    trace = None  # type: ignore[assignment]
+
+F = TypeVar("F", bound=Callable[..., Any])
+T = TypeVar("T")
+
+_tracer = trace.get_tracer("grouper_python") if trace is not None else None
+
+
+def traced(func: F) -> F:
+    """Decorate a function or method to run it in a span named for it.
+
+    The span is named with the qualified name of the function,
+    such as "Group.get_members". Coroutine functions are supported.
+
+    :param func: The function to decorate
+    :type func: F
+    :return: The decorated function,
+    or the same function if OpenTelemetry is not installed
+    :rtype: F
+    """
+    if _tracer is None:  # pragma: no cover
+        return func
+    name = func.__qualname__
+
+    if inspect.iscoroutinefunction(func):
+
+        @functools.wraps(func)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            """Await the function in a span.
+
+            :param args: Positional arguments for the function
+            :type args: Any
+            :param kwargs: Keyword arguments for the function
+            :type kwargs: Any
+            :return: The result of the function
+            :rtype: Any
+            """
+            with span(name):
+                return await func(*args, **kwargs)
+
+        return cast(F, async_wrapper)
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        """Call the function in a span.
+
+        :param args: Positional arguments for the function
+        :type args: Any
+        :param kwargs: Keyword arguments for the function
+        :type kwargs: Any
+        :return: The result of the function
+        :rtype: Any
+        """
+        with span(name):
+            return func(*args, **kwargs)
+
+    return cast(F, wrapper)
+
+
+@contextmanager
+def span(
+    name: str, attributes: dict[str, Any] = {}, client: bool = False
+) -> Iterator[None]:
+    """Run the enclosed code in a span, if OpenTelemetry is installed.
+
+    :param name: The name of the span
+    :type name: str
+    :param attributes: Attributes to set on the span, defaults to {}
+    :type attributes: dict[str, Any], optional
+    :param client: Whether the span is for a call to Grouper (a client span),
+    defaults to False
+    :type client: bool, optional
+    :return: A context manager for the span
+    :rtype: Iterator[None]
+    """
+    if _tracer is None:  # pragma: no cover
+        yield
+        return
+    with _tracer.start_as_current_span(
+        name,
+        kind=trace.SpanKind.CLIENT if client else trace.SpanKind.INTERNAL,
+        attributes=attributes,
+    ):
+        yield
+
+
+def span_iter(
+    name: str, attributes: dict[str, Any], iterator: Iterator[T]
+) -> Iterator[T]:
+    """Give the items of a streamed call to Grouper, in a client span.
+
+    The span lasts until the iterator is finished or closed,
+    but is only the current span while the next item is being read,
+    so spans started by the caller between items are not its children.
+
+    :param name: The name of the span
+    :type name: str
+    :param attributes: Attributes to set on the span
+    :type attributes: dict[str, Any]
+    :param iterator: The iterator for the call
+    :type iterator: Iterator[T]
+    :return: An iterator over the same items
+    :rtype: Iterator[T]
+    """
+    if _tracer is None:  # pragma: no cover
+        yield from iterator
+        return
+    call_span = _tracer.start_span(
+        name, kind=trace.SpanKind.CLIENT, attributes=attributes
+    )
+    try:
+        while True:
+            with trace.use_span(call_span):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+    finally:
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            with trace.use_span(call_span):
+                close()
+        call_span.end()
+
+
+async def aspan_iter(
+    name: str, attributes: dict[str, Any], iterator: AsyncIterator[T]
+) -> AsyncIterator[T]:
+    """Give the items of a streamed async call to Grouper, in a client span.
+
+    See span_iter for when the span is current.
+
+    :param name: The name of the span
+    :type name: str
+    :param attributes: Attributes to set on the span
+    :type attributes: dict[str, Any]
+    :param iterator: The async iterator for the call
+    :type iterator: AsyncIterator[T]
+    :return: An async iterator over the same items
+    :rtype: AsyncIterator[T]
+    """
+    if _tracer is None:  # pragma: no cover
+        async for item in iterator:
+            yield item
+        return
+    call_span = _tracer.start_span(
+        name, kind=trace.SpanKind.CLIENT, attributes=attributes
+    )
+    try:
+        while True:
+            with trace.use_span(call_span):
+                try:
+                    item = await iterator.__anext__()
+                except StopAsyncIteration:
+                    return
+            yield item
+    finally:
+        aclose = getattr(iterator, "aclose", None)
+        if aclose is not None:
+            with trace.use_span(call_span):
+                await aclose()
+        call_span.end()
+
+
+def record_call(event: CallEvent) -> None:
+    """Set the details of a finished call to Grouper on the current span.
+
+    :param event: The event for the call
+    :type event: CallEvent
+    """
+    if trace is None:  # pragma: no cover
+        return
+    current = trace.get_current_span()
+    if not current.is_recording():
+        return
+    current.set_attributes(
+        {
+            "grouper.request_type": event.request_type,
+            "grouper.attempts": event.attempts,
+            "grouper.request_bytes": event.request_bytes,
+            "grouper.response_bytes": event.response_bytes,
+            "grouper.network_seconds": event.network_seconds,
+            "grouper.decode_seconds": event.decode_seconds,
+        }
+    )
+    if event.status_code is not None:
+        current.set_attribute("http.response.status_code", event.status_code)
+    if event.result_code is not None:
+        current.set_attribute("grouper.result_code", event.result_code)
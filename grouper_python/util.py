@@ -12,11 +12,27 @@ from typing import Any, TYPE_CHECKING
 
 if TYPE_CHECKING:  # pragma: no cover
     from .objects.client import GrouperClient
+    from .objects.codec import JSONCodec
+    from .objects.retry import RetryPolicy, CircuitBreaker
+    from collections.abc import Callable, Iterator
+    from .objects.group import Group
     from .objects.subject import Subject
 import httpx
+import json
+import logging
+import time
 from copy import deepcopy
-from .objects.exceptions import GrouperAuthException, GrouperSuccessException
-from .group import get_group_by_name
+from .objects.exceptions import (
+    GrouperAuthException,
+    GrouperCircuitOpenException,
+    GrouperSuccessException,
+)
+from .objects.stats import CallEvent
+from .objects.stream import JSONStreamParser
+from . import tracing
+from .group import get_group_by_name, get_groups_by_names
+
+logger = logging.getLogger(__name__)
 
 
 def call_grouper(
@@ -26,6 +42,10 @@ def call_grouper(
     method: str = "POST",
     act_as_subject_id: str | None = None,
     act_as_subject_identifier: str | None = None,
+    codec: JSONCodec | None = None,
+    retry: RetryPolicy | None = None,
+    circuit_breaker: CircuitBreaker | None = None,
+    on_event: Callable[[CallEvent], None] | None = None,
 ) -> dict[str, Any]:
     """Call the Grouper API.
 
@@ -45,13 +65,297 @@ def call_grouper(
     cannot be specified if act_as_subject_id is specified
     defaults to None
     :type act_as_subject_identifier: str | None, optional
+    :param codec: Optional JSONCodec to encode the body and decode the result,
+    defaults to None (use httpx's JSON handling)
+    :type codec: JSONCodec | None, optional
+    :param retry: Optional RetryPolicy for retrying transient failures,
+    defaults to None (make a single attempt)
+    :type retry: RetryPolicy | None, optional
+    :param circuit_breaker: Optional CircuitBreaker to fail fast while Grouper
+    is unavailable, defaults to None
+    :type circuit_breaker: CircuitBreaker | None, optional
+    :param on_event: Optional function to call with a CallEvent describing
+    the call once it finishes, whether or not it succeeded. An exception it
+    raises is logged rather than raised. Defaults to None
+    :type on_event: Callable[[CallEvent], None] | None, optional
     :raises ValueError: Both act_as_subject_id and act_as_subject_identifier
-    were specified.
+    were specified, or the result is not valid JSON.
+    :raises GrouperCircuitOpenException: The circuit breaker is open
+    :raises httpx.TransportError: Grouper could not be reached,
+    and the call was not retried or ran out of attempts
     :raises GrouperAuthException: There is an issue authenticating to the Grouper API
     :raises GrouperSuccessException: The result was not "succesful"
     :return: the full payload returned from Grouper
     :rtype: dict[str, Any]
     """
+    body = prepare_body(body, act_as_subject_id, act_as_subject_identifier)
+    event = CallEvent(request_type=next(iter(body), ""), path=path, method=method)
+    content = codec.dumps(body) if codec is not None else None
+    try:
+        while True:
+            event.attempts += 1
+            if circuit_breaker is not None:
+                try:
+                    circuit_breaker.before_call()
+                except GrouperCircuitOpenException as err:
+                    event.error = err
+                    raise
+            started = time.perf_counter()
+            try:
+                if content is None:
+                    result = client.request(method=method, url=path, json=body)
+                else:
+                    result = client.request(
+                        method=method, url=path, content=content
+                    )
+            except httpx.TransportError as err:
+                event.network_seconds += time.perf_counter() - started
+                if circuit_breaker is not None:
+                    circuit_breaker.record_failure()
+                delay = (
+                    retry.retry_delay(event.attempts, body, error=err)
+                    if retry
+                    else None
+                )
+                if delay is None:
+                    event.error = err
+                    raise
+                time.sleep(delay)
+                continue
+            event.network_seconds += time.perf_counter() - started
+            event.status_code = result.status_code
+            event.request_bytes += len(result.request.content)
+            event.response_bytes += len(result.content)
+            if circuit_breaker is not None:
+                circuit_breaker.record_response(result)
+            delay = (
+                retry.retry_delay(event.attempts, body, response=result)
+                if retry
+                else None
+            )
+            if delay is None:
+                try:
+                    return process_result(result, codec, event)
+                except (
+                    GrouperAuthException,
+                    GrouperSuccessException,
+                    ValueError,
+                ) as err:
+                    event.error = err
+                    raise
+            time.sleep(delay)
+    finally:
+        if on_event is not None:
+            send_event(on_event, event)
+
+
+def stream_grouper(
+    client: httpx.Client,
+    path: str,
+    body: dict[str, Any],
+    stream_paths: list[tuple[str, ...]],
+    method: str = "POST",
+    act_as_subject_id: str | None = None,
+    act_as_subject_identifier: str | None = None,
+    codec: JSONCodec | None = None,
+    retry: RetryPolicy | None = None,
+    circuit_breaker: CircuitBreaker | None = None,
+    on_event: Callable[[CallEvent], None] | None = None,
+) -> Iterator[list[tuple[tuple[str, ...], Any]]]:
+    """Call the Grouper API, and parse the result as it downloads.
+
+    Works like call_grouper, but rather than returning the full payload,
+    gives the parts of it that have been parsed after each chunk of the result
+    is received, as (path, value) pairs from a JSONStreamParser.
+    The items of the arrays at stream_paths are given one at a time,
+    so the full payload is never held in memory.
+    Nothing is given until the resultMetadata of the result shows it was
+    succesful. Retries are only made before any of the result is given.
+
+    :param client: httpx Client object to use
+    :type client: httpx.Client
+    :param path: API url suffix to call
+    :type path: str
+    :param body: body to be sent with API call
+    :type body: dict[str, Any]
+    :param stream_paths: Paths of the arrays in the result to give the items
+    of one at a time, such as ("WsGetMembershipsResults", "wsSubjects")
+    :type stream_paths: list[tuple[str, ...]]
+    :param method: HTTP method, defaults to "POST"
+    :type method: str, optional
+    :param act_as_subject_id: Optional subject id to act as,
+    cannot be specified if act_as_subject_identifer is specified,
+    defaults to None
+    :type act_as_subject_id: str | None, optional
+    :param act_as_subject_identifier: Optional subject identifier to act as,
+    cannot be specified if act_as_subject_id is specified
+    defaults to None
+    :type act_as_subject_identifier: str | None, optional
+    :param codec: Optional JSONCodec to encode the body and decode
+    an unsuccesful result, defaults to None (use the standard library)
+    :type codec: JSONCodec | None, optional
+    :param retry: Optional RetryPolicy for retrying transient failures,
+    defaults to None (make a single attempt)
+    :type retry: RetryPolicy | None, optional
+    :param circuit_breaker: Optional CircuitBreaker to fail fast while Grouper
+    is unavailable, defaults to None
+    :type circuit_breaker: CircuitBreaker | None, optional
+    :param on_event: Optional function to call with a CallEvent describing
+    the call once it finishes, whether or not it succeeded. An exception it
+    raises is logged rather than raised. Defaults to None
+    :type on_event: Callable[[CallEvent], None] | None, optional
+    :raises ValueError: Both act_as_subject_id and act_as_subject_identifier
+    were specified, or the result is not valid JSON.
+    :raises GrouperCircuitOpenException: The circuit breaker is open
+    :raises httpx.TransportError: Grouper could not be reached,
+    and the call was not retried or ran out of attempts,
+    or the connection failed while receiving the result
+    :raises GrouperAuthException: There is an issue authenticating to the Grouper API
+    :raises GrouperSuccessException: The result was not "succesful"
+    :return: An iterator over lists of the (path, value) pairs
+    parsed from each chunk of the result
+    :rtype: Iterator[list[tuple[tuple[str, ...], Any]]]
+    """
+    body = prepare_body(body, act_as_subject_id, act_as_subject_identifier)
+    event = CallEvent(request_type=next(iter(body), ""), path=path, method=method)
+    request = client.build_request(
+        method=method,
+        url=path,
+        **({"json": body} if codec is None else {"content": codec.dumps(body)}),
+    )
+    try:
+        while True:
+            event.attempts += 1
+            if circuit_breaker is not None:
+                try:
+                    circuit_breaker.before_call()
+                except GrouperCircuitOpenException as err:
+                    event.error = err
+                    raise
+            started = time.perf_counter()
+            try:
+                result = client.send(request, stream=True)
+            except httpx.TransportError as err:
+                event.network_seconds += time.perf_counter() - started
+                if circuit_breaker is not None:
+                    circuit_breaker.record_failure()
+                delay = (
+                    retry.retry_delay(event.attempts, body, error=err)
+                    if retry
+                    else None
+                )
+                if delay is None:
+                    event.error = err
+                    raise
+                time.sleep(delay)
+                continue
+            event.network_seconds += time.perf_counter() - started
+            event.status_code = result.status_code
+            event.request_bytes += len(request.content)
+            if circuit_breaker is not None:
+                circuit_breaker.record_response(result)
+            delay = (
+                retry.retry_delay(event.attempts, body, response=result)
+                if retry
+                else None
+            )
+            if delay is None:
+                break
+            result.close()
+            time.sleep(delay)
+        streamed = StreamedResult(result, stream_paths, codec, event)
+        try:
+            chunks = result.iter_bytes()
+            while True:
+                started = time.perf_counter()
+                try:
+                    chunk = next(chunks, None)
+                finally:
+                    event.network_seconds += time.perf_counter() - started
+                if chunk is None:
+                    break
+                parsed = streamed.feed(chunk)
+                if parsed:
+                    yield parsed
+            parsed = streamed.close()
+            if parsed:
+                yield parsed
+        finally:
+            result.close()
+    except (
+        httpx.TransportError,
+        GrouperAuthException,
+        GrouperSuccessException,
+        ValueError,
+    ) as err:
+        if event.error is None:
+            event.error = err
+        raise
+    finally:
+        if on_event is not None:
+            send_event(on_event, event)
+
+
+def subject_lookup_chunks(
+    subject_identifiers: list[str], subject_ids: list[str], chunk_size: int
+) -> list[list[tuple[str, dict[str, str]]]]:
+    """Split subjects into chunks of (given identifier or id, subject lookup).
+
+    :param subject_identifiers: Subject identifiers to look up
+    :type subject_identifiers: list[str]
+    :param subject_ids: Subject ids to look up
+    :type subject_ids: list[str]
+    :param chunk_size: The maximum number of subjects in each chunk
+    :type chunk_size: int
+    :raises ValueError: chunk_size is less than 1
+    :return: The chunks of subject lookups
+    :rtype: list[list[tuple[str, dict[str, str]]]]
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    lookups = [
+        (ident, {"subjectIdentifier": ident}) for ident in subject_identifiers
+    ] + [(sid, {"subjectId": sid}) for sid in subject_ids]
+    return [
+        lookups[i:i + chunk_size] for i in range(0, len(lookups), chunk_size)
+    ]
+
+
+def send_event(on_event: Callable[[CallEvent], None], event: CallEvent) -> None:
+    """Pass a CallEvent to an event hook, logging any exception it raises.
+
+    The hook only observes the call, so an exception it raises must not
+    replace the result or exception of the call itself.
+
+    :param on_event: The function to call with the event
+    :type on_event: Callable[[CallEvent], None]
+    :param event: The event for the call
+    :type event: CallEvent
+    """
+    try:
+        on_event(event)
+    except Exception:
+        logger.exception("Event hook %r raised an exception", on_event)
+
+
+def prepare_body(
+    body: dict[str, Any],
+    act_as_subject_id: str | None,
+    act_as_subject_identifier: str | None,
+) -> dict[str, Any]:
+    """Add any act as subject information to a request body.
+
+    :param body: body to be sent with API call
+    :type body: dict[str, Any]
+    :param act_as_subject_id: Optional subject id to act as
+    :type act_as_subject_id: str | None
+    :param act_as_subject_identifier: Optional subject identifier to act as
+    :type act_as_subject_identifier: str | None
+    :raises ValueError: Both act_as_subject_id and act_as_subject_identifier
+    were specified.
+    :return: The body to send, a copy of the original if it was modified
+    :rtype: dict[str, Any]
+    """
     if act_as_subject_id or act_as_subject_identifier:
         if act_as_subject_id and act_as_subject_identifier:
             raise ValueError(
@@ -75,17 +379,139 @@ def call_grouper(
                 body[request_type]["actAsSubjectLookup"] = {
                     "subjectIdentifier": act_as_subject_identifier
                 }
+    return body
+
+
+def process_result(
+    result: httpx.Response,
+    codec: JSONCodec | None = None,
+    event: CallEvent | None = None,
+) -> dict[str, Any]:
+    """Check an httpx Response from Grouper and return its payload.
 
-    result = client.request(method=method, url=path, json=body)
+    :param result: The httpx Response returned by Grouper
+    :type result: httpx.Response
+    :param codec: Optional JSONCodec to decode the result, defaults to None
+    :type codec: JSONCodec | None, optional
+    :param event: Optional CallEvent to record the decode time and result code in,
+    defaults to None
+    :type event: CallEvent | None, optional
+    :raises GrouperAuthException: There is an issue authenticating to the Grouper API
+    :raises GrouperSuccessException: The result was not "succesful"
+    :return: the full payload returned from Grouper
+    :rtype: dict[str, Any]
+    """
     if result.status_code == 401:
         raise GrouperAuthException(result.text)
-    data: dict[str, Any] = result.json()
+    started = time.perf_counter()
+    data: dict[str, Any] = (
+        result.json() if codec is None else codec.loads(result.content)
+    )
     result_type = list(data.keys())[0]
+    if event is not None:
+        event.decode_seconds += time.perf_counter() - started
+        event.result_code = data[result_type]["resultMetadata"].get("resultCode")
     if data[result_type]["resultMetadata"]["success"] != "T":
         raise GrouperSuccessException(data)
     return data
 
 
+class StreamedResult:
+    """Check and parse an httpx Response from Grouper as it downloads.
+
+    Parsed values are held back until the resultMetadata shows whether
+    the result was succesful. If it was not, the rest of the result is
+    collected, so it can be raised in a GrouperSuccessException in full.
+
+    :param result: The streaming httpx Response returned by Grouper
+    :type result: httpx.Response
+    :param stream_paths: Paths of the arrays in the result to give the items
+    of one at a time
+    :type stream_paths: list[tuple[str, ...]]
+    :param codec: Optional JSONCodec to decode an unsuccesful result
+    :type codec: JSONCodec | None
+    :param event: CallEvent to record the size, decode time and result code in
+    :type event: CallEvent
+    """
+
+    def __init__(
+        self,
+        result: httpx.Response,
+        stream_paths: list[tuple[str, ...]],
+        codec: JSONCodec | None,
+        event: CallEvent,
+    ) -> None:
+        """Construct a StreamedResult."""
+        self.parser = JSONStreamParser(stream_paths)
+        self.codec = codec
+        self.event = event
+        self.unauthorized = result.status_code == 401
+        self.succesful: bool | None = None
+        self._chunks: list[bytes] = []
+        self._held: list[tuple[tuple[str, ...], Any]] = []
+
+    def feed(self, chunk: bytes) -> list[tuple[tuple[str, ...], Any]]:
+        """Parse the next chunk of the result.
+
+        :param chunk: The next chunk of the result
+        :type chunk: bytes
+        :return: The parsed values that can be given
+        :rtype: list[tuple[tuple[str, ...], Any]]
+        """
+        self.event.response_bytes += len(chunk)
+        if self.succesful is not True:
+            self._chunks.append(chunk)
+        if self.unauthorized or self.succesful is False:
+            return []
+        started = time.perf_counter()
+        parsed = self.parser.feed(chunk)
+        self.event.decode_seconds += time.perf_counter() - started
+        return self._check(parsed)
+
+    def close(self) -> list[tuple[tuple[str, ...], Any]]:
+        """Finish parsing the result after its last chunk.
+
+        :raises GrouperAuthException: There is an issue authenticating
+        to the Grouper API
+        :raises GrouperSuccessException: The result was not "succesful"
+        :return: The parsed values that can be given
+        :rtype: list[tuple[tuple[str, ...], Any]]
+        """
+        if self.unauthorized:
+            raise GrouperAuthException(b"".join(self._chunks).decode(errors="replace"))
+        parsed = [] if self.succesful is False else self._check(self.parser.close())
+        if not self.succesful:
+            content = b"".join(self._chunks)
+            raise GrouperSuccessException(
+                json.loads(content) if self.codec is None else self.codec.loads(content)
+            )
+        return parsed
+
+    def _check(
+        self, parsed: list[tuple[tuple[str, ...], Any]]
+    ) -> list[tuple[tuple[str, ...], Any]]:
+        """Hold back parsed values until the result is known to be succesful.
+
+        :param parsed: Newly parsed values
+        :type parsed: list[tuple[tuple[str, ...], Any]]
+        :return: The parsed values that can be given
+        :rtype: list[tuple[tuple[str, ...], Any]]
+        """
+        if self.succesful is None:
+            for path, value in parsed:
+                if len(path) == 2 and path[1] == "resultMetadata":
+                    self.event.result_code = value.get("resultCode")
+                    self.succesful = value["success"] == "T"
+                    break
+            if not self.succesful:
+                self._held.extend(parsed)
+                return []
+            parsed = self._held + parsed
+            self._held = []
+            self._chunks = []
+        return parsed
+
+
 def resolve_subject(
     subject_body: dict[str, Any],
     client: GrouperClient,
@@ -113,16 +539,74 @@ def resolve_subject(
 
     if subject_body["sourceId"] == "g:gsa":
         if resolve_group:
-            return get_group_by_name(subject_body["name"], client)
+            with tracing.span(
+                "resolve_subject", {"grouper.group_name": subject_body["name"]}
+            ):
+                return get_group_by_name(subject_body["name"], client)
         else:
-            return Subject(
-                client=client,
+            return client._entity(
+                Subject,
                 subject_body=subject_body,
                 subject_attr_names=subject_attr_names,
             )
     else:
-        return Person(
-            client=client,
+        return client._entity(
+            Person,
             person_body=subject_body,
             subject_attr_names=subject_attr_names,
         )
+
+
+def resolve_subjects(
+    subject_bodies: list[dict[str, Any]],
+    client: GrouperClient,
+    subject_attr_names: list[str],
+    resolve_groups: bool,
+) -> list[Subject]:
+    """Resolve the given subjects.
+
+    Works like resolve_subject, but subjects that are groups are resolved together
+    using as few API calls as possible, rather than with one API call per group.
+    Groups that cannot be found this way are looked up individually.
+
+    :param subject_bodies: The bodies of the subjects to resolve
+    :type subject_bodies: list[dict[str, Any]]
+    :param client: The GrouperClient to use
+    :type client: GrouperClient
+    :param subject_attr_names: Subject attribute names for the given subject bodies
+    :type subject_attr_names: list[str]
+    :param resolve_groups: Whether to resolve subjects that are groups to Group
+    objects. If False, groups will be returned as Subjects.
+    :type resolve_groups: bool
+    :return: The final "resolved" Subjects, in the same order as the given bodies
+    :rtype: list[Subject]
+    """
+    groups: dict[str, Group] = {}
+    if resolve_groups:
+        group_names = [
+            body["name"] for body in subject_bodies if body["sourceId"] == "g:gsa"
+        ]
+        if group_names:
+            with tracing.span(
+                "resolve_subjects", {"grouper.group_count": len(group_names)}
+            ):
+                try:
+                    groups = get_groups_by_names(group_names, client)
+                except GrouperSuccessException:
+                    groups = {}
+                for group_name in group_names:
+                    if group_name not in groups:
+                        groups[group_name] = get_group_by_name(
+                            group_name, client
+                        )
+    return [
+        groups[body["name"]]
+        if resolve_groups and body["sourceId"] == "g:gsa"
+        else resolve_subject(
+            subject_body=body,
+            client=client,
+            subject_attr_names=subject_attr_names,
+            resolve_group=False,
+        )
+        for body in subject_bodies
+    ]
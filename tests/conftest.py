@@ -1,7 +1,15 @@
-from collections.abc import Iterable
+from collections.abc import Iterable, AsyncIterable
 
-from grouper_python import GrouperClient
-from grouper_python.objects import Group, Stem, Person, Subject
+from grouper_python import GrouperClient, AsyncGrouperClient
+from grouper_python.objects import (
+    Group,
+    Stem,
+    Person,
+    Subject,
+    AsyncGroup,
+    AsyncStem,
+    AsyncSubject,
+)
 import pytest
 from . import data
 
@@ -46,3 +54,39 @@ def grouper_person() -> Iterable[Person]:
             subject_attr_names=["description", "name"],
         )
         yield person
+
+
+@pytest.fixture()
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+@pytest.fixture()
+async def async_grouper_client() -> AsyncIterable[AsyncGrouperClient]:
+    async with AsyncGrouperClient(data.URI_BASE, "username", "password") as client:
+        yield client
+
+
+@pytest.fixture()
+async def async_grouper_group() -> AsyncIterable[AsyncGroup]:
+    async with AsyncGrouperClient(data.URI_BASE, "username", "password") as client:
+        group = AsyncGroup(client=client, group_body=data.grouper_group_result1)
+        yield group
+
+
+@pytest.fixture()
+async def async_grouper_stem() -> AsyncIterable[AsyncStem]:
+    async with AsyncGrouperClient(data.URI_BASE, "username", "password") as client:
+        stem = AsyncStem(client=client, stem_body=data.grouper_stem_1)
+        yield stem
+
+
+@pytest.fixture()
+async def async_grouper_subject() -> AsyncIterable[AsyncSubject]:
+    async with AsyncGrouperClient(data.URI_BASE, "username", "password") as client:
+        subject = AsyncSubject(
+            client=client,
+            subject_body=data.ws_subject4,
+            subject_attr_names=["description", "name"],
+        )
+        yield subject
@@ -225,6 +225,62 @@ get_members_result_valid_one_group = {
     }
 }
 
+ws_subject5 = {
+    "sourceId": "g:gsa",
+    "attributeValues": ["Group 1 Test description", "test:GROUP1"],
+    "name": "test:GROUP1",
+    "id": "1ab0482715c74f51bc32822a70bf8f77",
+}
+
+get_members_result_valid_nested_groups = {
+    "WsGetMembersResults": {
+        "resultMetadata": {"success": "T"},
+        "subjectAttributeNames": subject_attribute_names,
+        "results": [
+            {
+                "resultMetadata": {"success": "T"},
+                "wsGroup": grouper_group_result3,
+                "wsSubjects": [ws_subject1, ws_subject5, ws_subject2],
+            }
+        ],
+    }
+}
+
+find_groups_by_names_request = {
+    "WsRestFindGroupsRequest": {
+        "wsGroupLookups": [{"groupName": "test:GROUP2"}, {"groupName": "test:GROUP1"}],
+        "includeGroupDetail": "T",
+    }
+}
+
+get_members_result_page_1 = {
+    "WsGetMembersResults": {
+        "resultMetadata": {"success": "T"},
+        "subjectAttributeNames": subject_attribute_names,
+        "results": [
+            {
+                "resultMetadata": {"success": "T"},
+                "wsGroup": grouper_group_result1,
+                "wsSubjects": [ws_subject2, ws_subject3],
+            }
+        ],
+    }
+}
+
+get_members_result_page_2 = {
+    "WsGetMembersResults": {
+        "resultMetadata": {"success": "T"},
+        "subjectAttributeNames": subject_attribute_names,
+        "results": [
+            {
+                "resultMetadata": {"success": "T"},
+                "wsGroup": grouper_group_result1,
+                "wsSubjects": [ws_subject4],
+            }
+        ],
+    }
+}
+
 get_members_result_empty = {
     "WsGetMembersResults": {
         "resultMetadata": {"success": "T"},
@@ -370,6 +426,45 @@ remove_member_result_valid = {
     }
 }
 
+add_member_result_mixed = {
+    "WsAddMemberResults": {
+        "resultMetadata": {"success": "F", "resultCode": "PROBLEM_WITH_ASSIGNMENT"},
+        "results": [
+            {"resultMetadata": {"success": "T", "resultCode": "SUCCESS"}},
+            {
+                "resultMetadata": {
+                    "success": "T",
+                    "resultCode": "SUCCESS_ALREADY_EXISTED",
+                }
+            },
+            {"resultMetadata": {"success": "F", "resultCode": "SUBJECT_NOT_FOUND"}},
+            {
+                "resultMetadata": {
+                    "success": "F",
+                    "resultCode": "INSUFFICIENT_PRIVILEGES",
+                }
+            },
+        ],
+    }
+}
+
+remove_member_result_mixed = {
+    "WsDeleteMemberResults": {
+        "resultMetadata": {"success": "F", "resultCode": "PROBLEM_DELETING_MEMBERS"},
+        "results": [
+            {"resultMetadata": {"success": "T", "resultCode": "SUCCESS"}},
+            {
+                "resultMetadata": {
+                    "success": "T",
+                    "resultCode": "SUCCESS_WASNT_IMMEDIATE",
+                }
+            },
+            {"resultMetadata": {"success": "F", "resultCode": "SUBJECT_NOT_FOUND"}},
+            {"resultMetadata": {"success": "F", "resultCode": "EXCEPTION"}},
+        ],
+    }
+}
+
 has_member_result_identifier = {
     "WsHasMemberResults": {
         "resultMetadata": {"success": "T"},
@@ -0,0 +1,157 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from grouper_python import AsyncGrouperClient
+from grouper_python.objects import AsyncGroup, AsyncStem, AsyncSubject, AsyncPerson
+from grouper_python.aio.util import call_grouper
+from . import data
+import pytest
+import respx
+from httpx import Response
+from grouper_python.objects.exceptions import (
+    GrouperAuthException,
+    GrouperSubjectNotFoundException,
+    GrouperGroupNotFoundException,
+)
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_context_manager():
+    from grouper_python import AsyncGrouperClient
+
+    async with AsyncGrouperClient("url", "username", "password") as client:
+        assert client.httpx_client.is_closed is False
+
+    assert client.httpx_client.is_closed is True
+
+
+async def test_close():
+    from grouper_python import AsyncGrouperClient
+
+    client = AsyncGrouperClient("url", "username", "password")
+    assert client.httpx_client.is_closed is False
+    await client.close()
+    assert client.httpx_client.is_closed is True
+
+
+@respx.mock
+async def test_warmup(async_grouper_client: AsyncGrouperClient):
+    warmup_call = respx.get(url=data.URI_BASE + "/").mock(
+        return_value=Response(404)
+    )
+
+    await async_grouper_client.warmup(connections=3)
+    assert warmup_call.call_count == 3
+
+
+@respx.mock
+async def test_get_group(async_grouper_client: AsyncGrouperClient):
+    respx.post(url=data.URI_BASE + "/groups").mock(
+        return_value=Response(200, json=data.find_groups_result_valid_one_group_1)
+    )
+    group = await async_grouper_client.get_group("test:GROUP1")
+
+    assert type(group) is AsyncGroup
+
+
+@respx.mock
+async def test_get_group_not_found(async_grouper_client: AsyncGrouperClient):
+    respx.post(url=data.URI_BASE + "/groups").mock(
+        return_value=Response(200, json=data.find_groups_result_valid_no_groups)
+    )
+
+    with pytest.raises(GrouperGroupNotFoundException) as excinfo:
+        await async_grouper_client.get_group("test:NOT")
+
+    assert excinfo.value.group_name == "test:NOT"
+
+
+@respx.mock
+async def test_get_groups(async_grouper_client: AsyncGrouperClient):
+    respx.post(url=data.URI_BASE + "/groups").mock(
+        return_value=Response(200, json=data.find_groups_result_valid_two_groups)
+    )
+
+    groups = await async_grouper_client.get_groups("GROUP", stem="test")
+    assert len(groups) == 2
+    assert type(groups[0]) is AsyncGroup
+
+
+@respx.mock
+async def test_get_stem(async_grouper_client: AsyncGrouperClient):
+    respx.post(url=data.URI_BASE + "/stems").mock(
+        return_value=Response(200, json=data.find_stem_result_valid_1)
+    )
+    stem = await async_grouper_client.get_stem("test:child")
+
+    assert type(stem) is AsyncStem
+    assert stem.name == "test:child"
+
+
+@respx.mock
+async def test_get_subject(async_grouper_client: AsyncGrouperClient):
+    respx.post(url=data.URI_BASE + "/subjects").mock(
+        return_value=Response(200, json=data.get_subject_result_valid_person)
+    )
+    subject = await async_grouper_client.get_subject("user3333")
+
+    assert type(subject) is AsyncPerson
+    assert isinstance(subject, AsyncSubject) is True
+    assert subject.description == subject.universal_identifier == "user3333"
+
+
+@respx.mock
+async def test_get_subject_is_group(async_grouper_client: AsyncGrouperClient):
+    respx.post(url=data.URI_BASE + "/subjects").mock(
+        return_value=Response(200, json=data.get_subject_result_valid_group)
+    )
+    respx.post(url=data.URI_BASE + "/groups").mock(
+        return_value=Response(200, json=data.find_groups_result_valid_one_group_1)
+    )
+
+    subject = await async_grouper_client.get_subject("test:GROUP1")
+    assert type(subject) is AsyncGroup
+
+    subject = await async_grouper_client.get_subject(
+        "test:GROUP1", resolve_group=False
+    )
+    assert type(subject) is AsyncSubject
+
+
+@respx.mock
+async def test_get_subject_not_found(async_grouper_client: AsyncGrouperClient):
+    respx.post(url=data.URI_BASE + "/subjects").mock(
+        return_value=Response(200, json=data.get_subject_result_subject_not_found)
+    )
+
+    with pytest.raises(GrouperSubjectNotFoundException) as excinfo:
+        await async_grouper_client.get_subject("notauser")
+
+    assert excinfo.value.subject_identifier == "notauser"
+
+
+@respx.mock
+async def test_find_subjects(async_grouper_client: AsyncGrouperClient):
+    respx.post(url=data.URI_BASE + "/subjects").mock(
+        return_value=Response(
+            200, json=data.get_subject_result_valid_search_multiple_subjects
+        )
+    )
+    respx.post(url=data.URI_BASE + "/groups").mock(
+        return_value=Response(200, json=data.find_groups_result_valid_one_group_1)
+    )
+
+    subjects = await async_grouper_client.find_subjects("user")
+    assert len(subjects) == 3
+
+
+@respx.mock
+async def test_grouper_auth_exception(async_grouper_client: AsyncGrouperClient):
+    respx.post(url=data.URI_BASE + "/groups").mock(
+        return_value=Response(401, text="<html>Unauthorized</html>")
+    )
+
+    with pytest.raises(GrouperAuthException):
+        await call_grouper(async_grouper_client.httpx_client, body={}, path="/groups")
@@ -0,0 +1,278 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from grouper_python import AsyncGrouperClient
+from grouper_python.aio.membership import get_members_for_groups
+from grouper_python.objects.membership import HasMember, MemberChangeResult
+from grouper_python.objects.exceptions import GrouperGroupNotFoundException
+from grouper_python.objects import (
+    AsyncGroup,
+    AsyncStem,
+    AsyncSubject,
+    AsyncPerson,
+    AsyncPrivilege,
+)
+from . import data
+import json
+import pytest
+import respx
+from httpx import Response
+
+pytestmark = pytest.mark.anyio
+
+
+@respx.mock
+async def test_group_get_members(async_grouper_group: AsyncGroup):
+    group_call = respx.post(url=data.URI_BASE + "/groups").mock(
+        side_effect=[
+            Response(200, json=data.get_members_result_valid_one_group),
+            Response(200, json=data.find_groups_result_valid_one_group_2),
+        ]
+    )
+    members = await async_grouper_group.get_members()
+    assert len(members) == 2
+    assert group_call.call_count == 2
+    assert {type(member) for member in members} == {AsyncPerson, AsyncGroup}
+
+
+@respx.mock
+async def test_get_members_nested_groups(async_grouper_client: AsyncGrouperClient):
+    group_call = respx.post(url=data.URI_BASE + "/groups").mock(
+        side_effect=[
+            Response(200, json=data.get_members_result_valid_nested_groups),
+            Response(200, json=data.find_groups_result_valid_two_groups),
+        ]
+    )
+    members = await get_members_for_groups(
+        ["test:child:GROUP3"], async_grouper_client
+    )
+
+    assert [type(member) for member in list(members.values())[0]] == [
+        AsyncGroup,
+        AsyncGroup,
+        AsyncPerson,
+    ]
+    assert group_call.call_count == 2
+
+
+@respx.mock
+async def test_group_iter_members(async_grouper_group: AsyncGroup):
+    group_call = respx.post(url=data.URI_BASE + "/groups").mock(
+        side_effect=[
+            Response(200, json=data.get_members_result_page_1),
+            Response(200, json=data.get_members_result_page_2),
+            Response(200, json=data.get_members_result_empty),
+        ]
+    )
+    members = [
+        member async for member in async_grouper_group.iter_members(page_size=2)
+    ]
+
+    assert len(members) == 3
+    assert type(members[0]) is AsyncPerson
+    assert group_call.call_count == 3
+
+
+@respx.mock
+async def test_group_iter_members_cursor_not_advancing(
+    async_grouper_group: AsyncGroup,
+):
+    group_call = respx.post(url=data.URI_BASE + "/groups").mock(
+        return_value=Response(200, json=data.get_members_result_page_1)
+    )
+    members = [
+        member
+        async for member in async_grouper_group.iter_members(page_size=2, cursor=True)
+    ]
+
+    assert [member.id for member in members] == ["abcdefgh1", "abcdefgh2"]
+    assert group_call.call_count == 2
+
+
+@respx.mock
+async def test_group_get_memberships(async_grouper_group: AsyncGroup):
+    respx.post(url=data.URI_BASE + "/memberships").mock(
+        return_value=Response(200, json=data.get_membership_result_valid_one_group)
+    )
+    respx.post(url=data.URI_BASE + "/groups").mock(
+        return_value=Response(200, json=data.find_groups_result_valid_one_group_2)
+    )
+    memberships = await async_grouper_group.get_memberships(resolve_groups=False)
+    assert len(memberships) == 5
+    assert len([m for m in memberships if type(m.member) is AsyncPerson]) == 4
+
+
+@respx.mock
+async def test_group_iter_memberships(async_grouper_group: AsyncGroup):
+    raw = json.dumps(data.get_membership_result_valid_one_group).encode()
+    respx.post(url=data.URI_BASE + "/memberships").mock(
+        side_effect=[
+            Response(200, content=raw),
+            Response(200, json=data.get_membership_result_valid_no_memberships),
+            Response(200, json=data.get_membership_result_group_not_found),
+        ]
+    )
+    memberships = [
+        m async for m in async_grouper_group.iter_memberships(resolve_groups=False)
+    ]
+    assert len(memberships) == 5
+    assert len([m for m in memberships if type(m.member) is AsyncPerson]) == 4
+
+    with pytest.raises(GrouperGroupNotFoundException):
+        [m async for m in async_grouper_group.iter_memberships()]
+
+
+@respx.mock
+async def test_get_membership_table(async_grouper_client: AsyncGrouperClient):
+    respx.post(url=data.URI_BASE + "/memberships").mock(
+        return_value=Response(200, json=data.get_membership_result_valid_one_group)
+    )
+    table = await async_grouper_client.get_membership_table(["test:GROUP1"])
+    assert len(table) == 5
+
+    memberships = await table.to_memberships(resolve_groups=False)
+    group = table.groups[0]
+    assert type(group) is AsyncGroup
+    assert len(memberships[group]) == 5
+    assert len([m for m in memberships[group] if type(m.member) is AsyncPerson]) == 4
+
+
+@respx.mock
+async def test_group_privileges(async_grouper_group: AsyncGroup):
+    respx.route(
+        method="POST",
+        url=data.URI_BASE + "/grouperPrivileges",
+        json=data.create_priv_group_request,
+    ).mock(Response(200, json=data.assign_priv_result_valid))
+    respx.route(
+        method="POST",
+        url=data.URI_BASE + "/grouperPrivileges",
+        json=data.get_priv_for_group_request,
+    ).mock(return_value=Response(200, json=data.get_priv_for_group_result))
+
+    await async_grouper_group.create_privilege_on_this("user3333", "update")
+    privs = await async_grouper_group.get_privileges_on_this()
+
+    assert len(privs) == 1
+    assert type(privs[0]) is AsyncPrivilege
+
+
+@respx.mock
+async def test_group_add_and_delete_members(async_grouper_group: AsyncGroup):
+    respx.post(url=data.URI_BASE + "/groups").mock(
+        side_effect=[
+            Response(200, json=data.add_member_result_valid),
+            Response(200, json=data.remove_member_result_valid),
+        ]
+    )
+
+    await async_grouper_group.add_members(["user3333"])
+    await async_grouper_group.delete_members(["user3333"])
+
+
+@respx.mock
+async def test_group_bulk_add_and_delete_members(async_grouper_group: AsyncGroup):
+    group_call = respx.post(url=data.URI_BASE + "/groups").mock(
+        side_effect=[
+            Response(200, json=data.add_member_result_mixed),
+            Response(200, json=data.remove_member_result_mixed),
+            Response(200, json=data.remove_member_result_mixed),
+        ]
+    )
+
+    added = await async_grouper_group.bulk_add_members(
+        ["user1111", "user2222", "user3333", "user4444"]
+    )
+    assert added == {
+        "user1111": MemberChangeResult.ADDED,
+        "user2222": MemberChangeResult.ALREADY_MEMBER,
+        "user3333": MemberChangeResult.SUBJECT_NOT_FOUND,
+        "user4444": MemberChangeResult.PERMISSION_DENIED,
+    }
+
+    deleted = await async_grouper_group.bulk_delete_members(
+        subject_ids=["abcdefgh1", "abcdefgh2", "abcdefgh3", "abcdefgh4"],
+        chunk_size=2,
+        max_concurrency=1,
+    )
+    assert group_call.call_count == 3
+    assert deleted == {
+        "abcdefgh1": MemberChangeResult.DELETED,
+        "abcdefgh2": MemberChangeResult.NOT_MEMBER,
+        "abcdefgh3": MemberChangeResult.DELETED,
+        "abcdefgh4": MemberChangeResult.NOT_MEMBER,
+    }
+
+
+@respx.mock
+async def test_group_sync_members(async_grouper_group: AsyncGroup):
+    group_call = respx.post(url=data.URI_BASE + "/groups").mock(
+        side_effect=[
+            Response(200, json=data.get_members_result_valid_one_group),
+            Response(200, json=data.remove_member_result_mixed),
+        ]
+    )
+
+    results = await async_grouper_group.sync_members(subject_ids=["abcdefgh1"])
+
+    assert results == {
+        "61db7e3435864838b039a7fce155d49c": MemberChangeResult.DELETED
+    }
+    assert group_call.call_count == 2
+
+
+@respx.mock
+async def test_group_has_members(async_grouper_group: AsyncGroup):
+    respx.post(url=data.URI_BASE + "/groups/test:GROUP1/members").mock(
+        return_value=Response(200, json=data.has_member_result_identifier)
+    )
+
+    has_members = await async_grouper_group.has_members(["user3333"])
+
+    assert has_members["user3333"] == HasMember.IS_MEMBER
+
+
+@respx.mock
+async def test_stem_create_children(async_grouper_stem: AsyncStem):
+    respx.post(url=data.URI_BASE + "/stems").mock(
+        return_value=Response(200, json=data.create_stems_result_success_one_stem)
+    )
+    respx.post(url=data.URI_BASE + "/groups").mock(
+        return_value=Response(200, json=data.group_save_result_success_one_group)
+    )
+
+    new_stem = await async_grouper_stem.create_child_stem(
+        "second", "Second Child Stem", "a second child stem"
+    )
+    new_group = await async_grouper_stem.create_child_group(
+        "GROUP3", "Test3 Display Name", "Group 3 Test description"
+    )
+
+    assert type(new_stem) is AsyncStem
+    assert type(new_group) is AsyncGroup
+
+
+@respx.mock
+async def test_stem_get_child_groups(async_grouper_stem: AsyncStem):
+    respx.post(url=data.URI_BASE + "/groups").mock(
+        return_value=Response(200, json=data.find_groups_result_valid_one_group_3)
+    )
+
+    groups = await async_grouper_stem.get_child_groups(recursive=False)
+
+    assert len(groups) == 1
+    assert type(groups[0]) is AsyncGroup
+
+
+@respx.mock
+async def test_subject_get_privileges(async_grouper_subject: AsyncSubject):
+    respx.route(
+        method="POST",
+        url=data.URI_BASE + "/grouperPrivileges",
+        json=data.get_priv_for_subject_request,
+    ).mock(return_value=Response(200, json=data.get_priv_for_subject_result))
+
+    privs = await async_grouper_subject.get_privileges_for_this_in_others()
+
+    assert len(privs) == 2
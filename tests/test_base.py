@@ -2,7 +2,14 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
-    from grouper_python.objects import Subject
+    from grouper_python.objects import Subject, Group
+from grouper_python.objects import Privilege
+from grouper_python.objects.base import write_json
+from . import data
+import io
+import json
+import respx
+from httpx import Response
 
 
 def test_object_equality(grouper_subject: Subject):
@@ -18,3 +25,52 @@ def test_dict_output(grouper_subject: Subject):
         "description": "user3333",
         "universal_identifier": "user3333",
     }
+
+
+def test_export(grouper_subject: Subject, grouper_group: Group):
+    assert grouper_subject.export() == grouper_subject.dict()
+
+    privilege = Privilege(
+        grouper_group.client, data.priv_result_group, data.subject_attribute_names
+    )
+    copied = privilege.dict()
+    assert copied["target"] is copied["group"]
+    assert copied["target"] is not privilege.target
+    exported = privilege.export()
+    assert exported["target"] is exported["group"]
+    assert exported["target"] == privilege.target.dict()
+    assert exported["subject"]["id"] == "abcdefgh3"
+
+
+@respx.mock
+def test_export_attribute_assignment(grouper_group: Group):
+    respx.post(url=data.URI_BASE + "/attributeAssignments").mock(
+        return_value=Response(200, json=data.get_attribute_assignment_result_group)
+    )
+    assignment = grouper_group.get_attribute_assignments_on_this()[0]
+
+    exported = assignment.export()
+    assert exported["owner"] is exported["group"]
+    assert exported["owner"]["name"] == "test:GROUP1"
+    assert exported["attribute_definition_name"]["attribute_definition"] is (
+        exported["attribute_definition"]
+    )
+    assert all(type(value) is dict for value in exported["values"])
+
+
+def test_write_json(grouper_group: Group):
+    privileges = [
+        Privilege(
+            grouper_group.client, data.priv_result_group, data.subject_attribute_names
+        )
+        for _ in range(5)
+    ]
+    stream = io.BytesIO()
+    write_json(privileges, stream, batch_size=2)
+    assert json.loads(stream.getvalue()) == [
+        json.loads(json.dumps(privilege.export())) for privilege in privileges
+    ]
+
+    stream = io.BytesIO()
+    write_json([], stream)
+    assert stream.getvalue() == b"[]"
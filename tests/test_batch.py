@@ -0,0 +1,158 @@
+from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
+from threading import Barrier
+from grouper_python import GrouperClient, AsyncGrouperClient, HasMemberBatcher
+from grouper_python.testing import FakeGrouper
+from grouper_python.objects.exceptions import GrouperGroupNotFoundException
+from grouper_python.objects.membership import HasMember
+from . import data
+import asyncio
+import pytest
+
+
+@pytest.fixture()
+def fake() -> FakeGrouper:
+    fake = FakeGrouper()
+    fake.add_group("test:GROUP1")
+    fake.add_group("test:GROUP2")
+    for i in range(20):
+        fake.add_subject(f"id{i}", f"user{i}")
+    fake.add_members("test:GROUP1", [f"id{i}" for i in range(0, 20, 2)])
+    fake.add_members("test:GROUP2", ["id1"])
+    return fake
+
+
+def test_batcher_coalesces_checks():
+    batcher = HasMemberBatcher(window=0.2)
+    sent: list[tuple[list[str], list[str]]] = []
+    barrier = Barrier(5)
+
+    def send(identifiers: list[str], ids: list[str]) -> dict[str, int]:
+        sent.append((identifiers, ids))
+        return {key: len(key) for key in identifiers + ids}
+
+    def check(key: str) -> dict[str, int]:
+        barrier.wait()
+        return batcher.run("group", [key], ["id"], send)
+
+    keys = ["a", "bb", "ccc", "dddd", "eeeee"]
+    with ThreadPoolExecutor(max_workers=5) as pool:
+        results = list(pool.map(check, keys))
+
+    assert results == [{key: len(key), "id": 2} for key in keys]
+    assert len(sent) == 1
+    assert sorted(sent[0][0]) == keys
+    assert sent[0][1] == ["id"]
+
+
+def test_batcher_max_batch_size():
+    batcher = HasMemberBatcher(window=10, max_batch_size=2)
+    sent: list[list[str]] = []
+
+    def send(identifiers: list[str], ids: list[str]) -> dict[str, bool]:
+        sent.append(ids)
+        return dict.fromkeys(ids, True)
+
+    # A full batch is sent without waiting for the window
+    assert batcher.run("group", [], ["a", "b"], send) == {"a": True, "b": True}
+    assert sent == [["a", "b"]]
+
+
+def test_batcher_error():
+    batcher = HasMemberBatcher(window=0)
+
+    def send(identifiers: list[str], ids: list[str]) -> dict[str, bool]:
+        raise RuntimeError("failed")
+
+    with pytest.raises(RuntimeError):
+        batcher.run("group", ["a"], [], send)
+    # The failed batch is not reused
+    assert batcher.run("group", ["a"], [], lambda i, _: dict.fromkeys(i, 1)) == {
+        "a": 1
+    }
+
+
+def test_batcher_error_shared():
+    batcher = HasMemberBatcher(window=0.2)
+    barrier = Barrier(2)
+
+    def send(identifiers: list[str], ids: list[str]) -> dict[str, bool]:
+        raise GrouperGroupNotFoundException("test:NOT")
+
+    def check(key: str) -> BaseException:
+        barrier.wait()
+        with pytest.raises(GrouperGroupNotFoundException) as excinfo:
+            batcher.run("group", [key], [], send)
+        return excinfo.value
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        errors = list(pool.map(check, ["a", "b"]))
+
+    # Only the caller that sent the batch raises the original exception
+    original = next(err for err in errors if err.__cause__ is None)
+    copy = next(err for err in errors if err is not original)
+    assert copy.__cause__ is original
+    assert isinstance(copy, GrouperGroupNotFoundException)
+    assert copy.group_name == "test:NOT"
+    assert str(copy) == "test:NOT not found"
+
+
+def test_client_is_member_batched(fake: FakeGrouper):
+    with GrouperClient(
+        data.URI_BASE,
+        "username",
+        "password",
+        transport=fake,
+        has_member_batcher=HasMemberBatcher(window=0.2),
+    ) as client:
+        subjects = [client.get_subject(f"user{i}") for i in range(10)]
+        barrier = Barrier(len(subjects) + 1)
+
+        def is_member(args: tuple[int, str]) -> bool:
+            i, group_name = args
+            barrier.wait()
+            return subjects[i].is_member(group_name)
+
+        def has_members() -> dict[str, HasMember]:
+            barrier.wait()
+            return client.get_group("test:GROUP1").has_members(
+                subject_identifiers=["user2", "user3", "nobody"]
+            )
+
+        group_checks = [(i, "test:GROUP1") for i in range(10)]
+        with ThreadPoolExecutor(max_workers=len(subjects) + 1) as pool:
+            members = pool.submit(has_members)
+            results = list(pool.map(is_member, group_checks))
+
+    assert results == [i % 2 == 0 for i in range(10)]
+    assert members.result() == {
+        "user2": HasMember.IS_MEMBER,
+        "user3": HasMember.IS_NOT_MEMBER,
+        "nobody": HasMember.SUBJECT_NOT_FOUND,
+    }
+    assert fake.request_counts["WsRestHasMemberRequest"] == 1
+
+
+@pytest.mark.anyio
+async def test_async_client_is_member_batched(fake: FakeGrouper):
+    async with AsyncGrouperClient(
+        data.URI_BASE,
+        "username",
+        "password",
+        transport=fake,
+        has_member_batcher=HasMemberBatcher(window=0.05),
+    ) as client:
+        subjects = [await client.get_subject(f"user{i}") for i in range(4)]
+        results = await asyncio.gather(
+            *(subject.is_member("test:GROUP1") for subject in subjects),
+            *(subject.is_member("test:GROUP2") for subject in subjects),
+        )
+        assert fake.request_counts["WsRestHasMemberRequest"] == 2
+
+        with pytest.raises(GrouperGroupNotFoundException):
+            await asyncio.gather(
+                *(subject.is_member("test:NOT") for subject in subjects)
+            )
+
+    assert results == [True, False, True, False, False, True, False, False]
+    assert fake.request_counts["WsRestHasMemberRequest"] == 3
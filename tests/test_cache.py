@@ -0,0 +1,146 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from grouper_python.objects import Group
+from grouper_python import GrouperClient, AsyncGrouperClient, GrouperCache
+from grouper_python.objects.exceptions import (
+    GrouperGroupNotFoundException,
+    GrouperStemNotFoundException,
+)
+from . import data
+import pytest
+import respx
+from httpx import Response
+
+
+def test_cache_lru_eviction():
+    cache = GrouperCache(maxsize=2)
+    cache.load(("group", "a"), lambda: 1)
+    cache.load(("group", "b"), lambda: 2)
+    # Touch "a" so "b" is the least recently used
+    assert cache.load(("group", "a"), lambda: 0) == 1
+    cache.load(("group", "c"), lambda: 3)
+
+    assert len(cache) == 2
+    assert cache.load(("group", "a"), lambda: 0) == 1
+    assert cache.load(("group", "b"), lambda: 0) == 0
+
+
+def test_cache_ttl(monkeypatch: pytest.MonkeyPatch):
+    now = 1000.0
+    monkeypatch.setattr("grouper_python.objects.cache.time.monotonic", lambda: now)
+    cache = GrouperCache(group_ttl=10, stem_ttl=100, subject_ttl=0)
+    cache.load(("group", "a"), lambda: 1)
+    cache.load(("stem", "a"), lambda: 1)
+    cache.load(("subject", "a"), lambda: 1)
+    # A ttl of 0 disables caching for that kind
+    assert len(cache) == 2
+
+    now = 1050.0
+    assert cache.load(("group", "a"), lambda: 2) == 2
+    assert cache.load(("stem", "a"), lambda: 2) == 1
+
+
+def test_cache_invalidate():
+    cache = GrouperCache()
+    cache.load(("group", "a"), lambda: 1)
+    cache.load(("stem", "a"), lambda: 1)
+    cache.invalidate("group")
+    assert len(cache) == 1
+    cache.clear()
+    assert len(cache) == 0
+
+
+@respx.mock
+def test_client_get_group_cached():
+    group_call = respx.post(url=data.URI_BASE + "/groups").mock(
+        return_value=Response(200, json=data.find_groups_result_valid_one_group_1)
+    )
+    with GrouperClient(
+        data.URI_BASE, "username", "password", cache=GrouperCache()
+    ) as client:
+        group = client.get_group("test:GROUP1")
+        assert client.get_group("test:GROUP1") is group
+        assert group_call.call_count == 1
+
+        # A different act as subject is cached separately
+        client.get_group("test:GROUP1", act_as_subject=group)
+        assert group_call.call_count == 2
+
+
+@respx.mock
+def test_client_negative_cache():
+    stem_call = respx.post(url=data.URI_BASE + "/stems").mock(
+        return_value=Response(200, json=data.find_stem_result_valid_empty)
+    )
+    with GrouperClient(
+        data.URI_BASE, "username", "password", cache=GrouperCache()
+    ) as client:
+        for _ in range(2):
+            with pytest.raises(GrouperStemNotFoundException) as excinfo:
+                client.get_stem("invalid")
+            assert excinfo.value.stem_name == "invalid"
+        assert stem_call.call_count == 1
+
+
+@respx.mock
+def test_client_negative_cache_disabled():
+    group_call = respx.post(url=data.URI_BASE + "/groups").mock(
+        return_value=Response(200, json=data.find_groups_result_valid_no_groups)
+    )
+    with GrouperClient(
+        data.URI_BASE, "username", "password", cache=GrouperCache(negative_ttl=0)
+    ) as client:
+        for _ in range(2):
+            with pytest.raises(GrouperGroupNotFoundException):
+                client.get_group("test:NOT")
+        assert group_call.call_count == 2
+
+
+@respx.mock
+def test_client_subject_cached():
+    subject_call = respx.post(url=data.URI_BASE + "/subjects").mock(
+        return_value=Response(200, json=data.get_subject_result_valid_person)
+    )
+    with GrouperClient(
+        data.URI_BASE, "username", "password", cache=GrouperCache()
+    ) as client:
+        client.get_subject("user3333")
+        client.get_subject("user3333")
+        assert subject_call.call_count == 1
+        client.get_subject("user3333", attributes=["mail"])
+        assert subject_call.call_count == 2
+
+
+@respx.mock
+def test_client_write_invalidates():
+    group_call = respx.post(url=data.URI_BASE + "/groups").mock(
+        side_effect=[
+            Response(200, json=data.find_groups_result_valid_one_group_1),
+            Response(200, json=data.delete_groups_result_success),
+            Response(200, json=data.find_groups_result_valid_no_groups),
+        ]
+    )
+    cache = GrouperCache()
+    with GrouperClient(data.URI_BASE, "username", "password", cache=cache) as client:
+        group: Group = client.get_group("test:GROUP1")
+        group.delete()
+        assert len(cache) == 0
+        with pytest.raises(GrouperGroupNotFoundException):
+            client.get_group("test:GROUP1")
+        assert group_call.call_count == 3
+
+
+@pytest.mark.anyio
+@respx.mock
+async def test_async_client_get_group_cached():
+    group_call = respx.post(url=data.URI_BASE + "/groups").mock(
+        return_value=Response(200, json=data.find_groups_result_valid_one_group_1)
+    )
+    async with AsyncGrouperClient(
+        data.URI_BASE, "username", "password", cache=GrouperCache()
+    ) as client:
+        group = await client.get_group("test:GROUP1")
+        assert await client.get_group("test:GROUP1") is group
+        assert group_call.call_count == 1
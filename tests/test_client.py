@@ -8,6 +8,7 @@ from . import data
 import pytest
 import respx
 from httpx import Response
+import httpx
 from grouper_python.objects.exceptions import (
     GrouperSubjectNotFoundException,
     GrouperStemNotFoundException,
@@ -39,6 +40,40 @@ def test_close():
     assert client.httpx_client.is_closed is True
 
 
+def test_connection_limits():
+    from grouper_python import GrouperClient
+
+    with GrouperClient(
+        "url",
+        "username",
+        "password",
+        max_connections=50,
+        max_keepalive_connections=10,
+        keepalive_expiry=30.0,
+    ) as client:
+        transport = client.httpx_client._transport
+        assert isinstance(transport, httpx.HTTPTransport)
+        assert transport._pool._max_connections == 50
+        assert transport._pool._max_keepalive_connections == 10
+        assert transport._pool._keepalive_expiry == 30.0
+
+
+@respx.mock
+def test_warmup(grouper_client: GrouperClient):
+    warmup_call = respx.get(url=data.URI_BASE + "/").mock(
+        return_value=Response(404)
+    )
+
+    grouper_client.warmup(connections=3)
+    assert warmup_call.call_count == 3
+
+    grouper_client.warmup(connections=0)
+    assert warmup_call.call_count == 3
+
+    grouper_client.warmup(connections=1000)
+    assert warmup_call.call_count == 35
+
+
 @respx.mock
 def test_get_group(grouper_client: GrouperClient):
     respx.post(url=data.URI_BASE + "/groups").mock(
@@ -201,3 +236,178 @@ def test_find_subjects_no_result(grouper_client: GrouperClient):
 
     subjects = grouper_client.find_subjects("user")
     assert len(subjects) == 0
+
+
+@respx.mock
+def test_identity_map():
+    from grouper_python import GrouperClient
+
+    respx.post(url=data.URI_BASE + "/groups").mock(
+        side_effect=[
+            Response(200, json=data.find_groups_result_valid_one_group_1),
+            Response(
+                200,
+                json={
+                    "WsFindGroupsResults": {
+                        "resultMetadata": {"success": "T"},
+                        "groupResults": [
+                            data.grouper_group_result1
+                            | {"description": "Updated description"}
+                        ],
+                    }
+                },
+            ),
+        ]
+    )
+    with GrouperClient(
+        data.URI_BASE, "username", "password", identity_map=True
+    ) as client:
+        group = client.get_group("test:GROUP1")
+        same_group = client.get_group("test:GROUP1")
+
+        assert same_group is group
+        assert group.description == "Updated description"
+        # A Subject for the same entity is a different type, so is not shared
+        subject = Subject(client, data.ws_subject5, data.subject_attribute_names)
+        assert type(subject) is Subject
+        assert subject is not group
+
+
+def test_lazy_entities():
+    from grouper_python import GrouperClient
+
+    with GrouperClient(data.URI_BASE, "username", "password") as client:
+        eager = [
+            Group(client, data.grouper_group_result1),
+            Stem(client, data.grouper_stem_1),
+            Person(client, data.ws_subject4, data.subject_attribute_names),
+        ]
+    with GrouperClient(
+        data.URI_BASE, "username", "password", lazy_entities=True
+    ) as client:
+        group = client._entity(Group, data.grouper_group_result1)
+        assert isinstance(group, Group)
+        assert group._body is data.grouper_group_result1
+        # Fields, including the id and name, are only read from the body
+        # when first accessed
+        for name in ["id", "name", "displayName"]:
+            with pytest.raises(AttributeError):
+                object.__getattribute__(group, name)
+        assert group == eager[0]
+        assert group.displayName == data.grouper_group_result1["displayName"]
+        assert object.__getattribute__(group, "displayName") == group.displayName
+        lazy = [
+            group,
+            client._entity(Stem, data.grouper_stem_1),
+            client._entity(Person, data.ws_subject4, data.subject_attribute_names),
+        ]
+        for lazy_entity, eager_entity in zip(lazy, eager):
+            assert lazy_entity.dict() == eager_entity.dict()
+            assert repr(lazy_entity) == repr(eager_entity)
+        with pytest.raises(AttributeError):
+            group.not_a_field  # type: ignore[attr-defined]
+
+
+def test_lazy_entities_identity_map():
+    from grouper_python import GrouperClient
+
+    with GrouperClient(
+        data.URI_BASE,
+        "username",
+        "password",
+        identity_map=True,
+        lazy_entities=True,
+    ) as client:
+        group = client._entity(Group, data.grouper_group_result1)
+        assert group.description == "Group 1 Test description"
+        same_group = client._entity(
+            Group,
+            data.grouper_group_result1 | {"description": "Updated description"},
+        )
+        assert same_group is group
+        assert group.description == "Updated description"
+        # Entities built directly are never looked up in the identity map
+        assert Group(client, data.grouper_group_result1) is not group
+
+
+def test_identity_map_privileges():
+    from grouper_python import GrouperClient
+    from grouper_python.objects import Privilege
+
+    with GrouperClient(
+        data.URI_BASE, "username", "password", identity_map=True
+    ) as client:
+        privs = [
+            Privilege(client, data.priv_result_group, data.subject_attribute_names)
+            for _ in range(2)
+        ]
+        assert privs[0].group is privs[1].group
+        assert privs[0].subject is privs[1].subject
+        assert privs[0].owner_subject is privs[1].owner_subject
+
+    with GrouperClient(data.URI_BASE, "username", "password") as client:
+        privs = [
+            Privilege(client, data.priv_result_group, data.subject_attribute_names)
+            for _ in range(2)
+        ]
+        assert privs[0].group is not privs[1].group
+        assert privs[0].group == privs[1].group
+
+
+@respx.mock
+def test_get_membership_table(grouper_client: GrouperClient):
+    from grouper_python.objects import MemberType, MembershipType
+
+    respx.post(url=data.URI_BASE + "/memberships").mock(
+        side_effect=[
+            Response(200, json=data.get_membership_result_valid_one_group),
+            Response(200, json=data.get_membership_result_group_not_found),
+        ]
+    )
+
+    table = grouper_client.get_membership_table(["test:GROUP1"])
+    assert len(table) == 5
+    assert len(table.subjects) == 4
+    assert [group.name for group in table.groups] == ["test:GROUP1"]
+    group = table.groups[0]
+    assert list(table)[:2] == [
+        (
+            group,
+            "61db7e3435864838b039a7fce155d49c",
+            MemberType.GROUP,
+            MembershipType.DIRECT,
+        ),
+        (group, "abcdefgh1", MemberType.PERSON, MembershipType.INDIRECT),
+    ]
+
+    direct = table.filter(membership_type=MembershipType.DIRECT)
+    assert [row[1] for row in direct] == [
+        "61db7e3435864838b039a7fce155d49c",
+        "abcdefgh2",
+        "abcdefgh3",
+    ]
+    assert direct.subjects is table.subjects
+    assert len(table.filter(member_type=MemberType.GROUP)) == 1
+    assert len(table.filter(subject_ids=["abcdefgh3", "nobody"])) == 2
+    assert len(table.filter(group_names=["test:GROUP2"])) == 0
+    assert table.counts("membership_type") == {
+        MembershipType.DIRECT: 3,
+        MembershipType.INDIRECT: 2,
+    }
+    by_subject = table.group_by("subject")
+    assert len(by_subject["abcdefgh3"]) == 2
+    assert {len(t) for t in table.group_by("group").values()} == {5}
+    with pytest.raises(ValueError):
+        table.counts("nothing")
+
+    memberships = direct.to_memberships(resolve_groups=False)
+    assert [m.member.id for m in memberships[group]] == [
+        "61db7e3435864838b039a7fce155d49c",
+        "abcdefgh2",
+        "abcdefgh3",
+    ]
+    assert type(memberships[group][1].member) is Person
+    assert memberships[group][1].member.universal_identifier == "user2222"
+
+    with pytest.raises(GrouperGroupNotFoundException):
+        grouper_client.get_membership_table(["test:NOT"])
@@ -0,0 +1,70 @@
+from __future__ import annotations
+from grouper_python import GrouperClient, AsyncGrouperClient, JSONCodec
+from . import data
+import importlib
+import json
+import pytest
+import respx
+from httpx import Response
+
+
+@pytest.mark.parametrize("backend", ["auto", "orjson", "msgspec", "json"])
+def test_codec_round_trip(backend: str):
+    codec = JSONCodec(backend)
+    encoded = codec.dumps(data.get_members_result_valid_one_group)
+
+    assert isinstance(encoded, bytes)
+    assert json.loads(encoded) == data.get_members_result_valid_one_group
+    assert codec.loads(encoded) == data.get_members_result_valid_one_group
+    assert codec.loads(encoded.decode()) == data.get_members_result_valid_one_group
+
+
+def test_codec_fallback(monkeypatch: pytest.MonkeyPatch):
+    import_module = importlib.import_module
+
+    def no_fast_json(name: str):
+        if name in ("orjson", "msgspec.json"):
+            raise ImportError(name)
+        return import_module(name)
+
+    monkeypatch.setattr(
+        "grouper_python.objects.codec.importlib.import_module", no_fast_json
+    )
+
+    assert JSONCodec("orjson").backend == "json"
+    assert JSONCodec("msgspec").backend == "json"
+    assert repr(JSONCodec()) == "JSONCodec(backend='json')"
+
+
+def test_codec_unknown_backend():
+    with pytest.raises(ValueError):
+        JSONCodec("yaml")
+
+
+@respx.mock
+def test_client_with_codec():
+    group_call = respx.post(url=data.URI_BASE + "/groups").mock(
+        return_value=Response(200, json=data.find_groups_result_valid_one_group_1)
+    )
+    with GrouperClient(
+        data.URI_BASE, "username", "password", json_codec=JSONCodec()
+    ) as client:
+        group = client.get_group("test:GROUP1")
+
+    assert group.name == "test:GROUP1"
+    body = json.loads(group_call.calls[0].request.content)
+    assert body["WsRestFindGroupsLiteRequest"]["groupName"] == "test:GROUP1"
+
+
+@pytest.mark.anyio
+@respx.mock
+async def test_async_client_with_codec():
+    respx.post(url=data.URI_BASE + "/groups").mock(
+        return_value=Response(200, json=data.find_groups_result_valid_one_group_1)
+    )
+    async with AsyncGrouperClient(
+        data.URI_BASE, "username", "password", json_codec=JSONCodec("json")
+    ) as client:
+        group = await client.get_group("test:GROUP1")
+
+    assert group.name == "test:GROUP1"
@@ -0,0 +1,231 @@
+from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
+from threading import Barrier, Event
+from typing import Any
+from grouper_python import GrouperClient, AsyncGrouperClient
+from grouper_python.testing import FakeGrouper
+from grouper_python.objects.flight import SingleFlight
+from grouper_python.objects.exceptions import (
+    GrouperCircuitOpenException,
+    GrouperGroupNotFoundException,
+)
+from . import data
+import asyncio
+import time
+import pytest
+
+READ = {
+    "WsRestFindGroupsRequest": {
+        "wsGroupLookups": [{"groupName": "a"}],
+        "includeGroupDetail": "T",
+    }
+}
+WRITE = {"WsRestGroupSaveRequest": {"wsGroupToSaves": [{"groupName": "a"}]}}
+
+
+@pytest.fixture()
+def fake() -> FakeGrouper:
+    fake = FakeGrouper(latency=0.1)
+    fake.add_group("test:GROUP1")
+    fake.add_subject("abcdefgh1", "user1111")
+    return fake
+
+
+def test_single_flight_shares_reads():
+    flight = SingleFlight()
+    started = Event()
+    release = Event()
+    calls: list[int] = []
+
+    def call() -> dict[str, Any]:
+        calls.append(1)
+        started.set()
+        release.wait()
+        return {"result": len(calls)}
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        first = pool.submit(flight.run, ("POST", "/groups", None), READ, call)
+        started.wait()
+        # The same body with its keys in another order is the same request
+        reordered = {
+            "WsRestFindGroupsRequest": {
+                "includeGroupDetail": "T",
+                "wsGroupLookups": [{"groupName": "a"}],
+            }
+        }
+        second = pool.submit(flight.run, ("POST", "/groups", None), reordered, call)
+        other = pool.submit(flight.run, ("POST", "/groups", "someone"), READ, call)
+        while len(flight) < 2:
+            time.sleep(0.01)
+        # Give the second request time to start waiting for the first
+        time.sleep(0.1)
+        release.set()
+        results = [first.result(), second.result(), other.result()]
+
+    assert len(calls) == 2
+    assert results[0] is results[1]
+    assert len(flight) == 0
+
+
+def test_single_flight_never_shares_writes():
+    flight = SingleFlight()
+    calls: list[int] = []
+    barrier = Barrier(3)
+
+    def call() -> dict[str, Any]:
+        calls.append(1)
+        barrier.wait()
+        return {}
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        futures = [
+            pool.submit(flight.run, ("POST", "/groups", None), WRITE, call)
+            for _ in range(3)
+        ]
+        for future in futures:
+            future.result()
+
+    assert len(calls) == 3
+    assert len(flight) == 0
+
+
+def test_single_flight_error():
+    flight = SingleFlight()
+
+    def call() -> dict[str, Any]:
+        raise RuntimeError("failed")
+
+    with pytest.raises(RuntimeError):
+        flight.run(("POST", "/groups", None), READ, call)
+    assert flight.run(("POST", "/groups", None), READ, lambda: {"a": 1}) == {"a": 1}
+
+
+def test_single_flight_error_shared():
+    flight = SingleFlight()
+    started = Event()
+    release = Event()
+
+    def call() -> dict[str, Any]:
+        started.set()
+        release.wait()
+        raise GrouperCircuitOpenException(1.5)
+
+    def run() -> BaseException:
+        with pytest.raises(GrouperCircuitOpenException) as excinfo:
+            flight.run(("POST", "/groups", None), READ, call)
+        return excinfo.value
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        first = pool.submit(run)
+        started.wait()
+        second = pool.submit(run)
+        # Give the second request time to start waiting for the first
+        time.sleep(0.1)
+        release.set()
+        leader_error, follower_error = first.result(), second.result()
+
+    # The waiting caller raises its own copy, so the tracebacks of the
+    # callers are kept apart
+    assert follower_error is not leader_error
+    assert follower_error.__cause__ is leader_error
+    assert isinstance(follower_error, GrouperCircuitOpenException)
+    assert follower_error.retry_in == 1.5
+    assert follower_error.args == leader_error.args
+
+
+def test_single_flight_leader_interrupted():
+    flight = SingleFlight()
+    started = Event()
+    release = Event()
+    calls: list[int] = []
+
+    def call() -> dict[str, Any]:
+        calls.append(1)
+        if len(calls) == 1:
+            started.set()
+            release.wait()
+            raise KeyboardInterrupt
+        return {"result": len(calls)}
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        first = pool.submit(flight.run, ("POST", "/groups", None), READ, call)
+        started.wait()
+        second = pool.submit(flight.run, ("POST", "/groups", None), READ, call)
+        # Give the second request time to start waiting for the first
+        time.sleep(0.1)
+        release.set()
+        # The interrupt is only raised in the caller that made the call,
+        # and the waiting caller makes the call again
+        with pytest.raises(KeyboardInterrupt):
+            first.result()
+        assert second.result() == {"result": 2}
+
+    assert len(flight) == 0
+
+
+@pytest.mark.anyio
+async def test_single_flight_leader_cancelled():
+    flight = SingleFlight()
+    started = asyncio.Event()
+    calls: list[int] = []
+
+    async def call() -> dict[str, Any]:
+        calls.append(1)
+        if len(calls) == 1:
+            started.set()
+            await asyncio.sleep(10)
+        return {"result": len(calls)}
+
+    first = asyncio.create_task(flight.arun(("POST", "/groups", None), READ, call))
+    await started.wait()
+    second = asyncio.create_task(flight.arun(("POST", "/groups", None), READ, call))
+    await asyncio.sleep(0)
+    first.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await first
+    assert await second == {"result": 2}
+    assert len(flight) == 0
+
+
+def test_client_single_flight(fake: FakeGrouper):
+    with GrouperClient(
+        data.URI_BASE, "username", "password", transport=fake, single_flight=True
+    ) as client:
+        barrier = Barrier(8)
+
+        def get_group(name: str) -> str:
+            barrier.wait()
+            return client.get_group(name).id
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            ids = list(pool.map(get_group, ["test:GROUP1"] * 8))
+        reads = sum(fake.request_counts.values())
+
+        group = client.get_group("test:GROUP1")
+
+        def add_member(_: int) -> None:
+            barrier.wait()
+            group.add_members(subject_identifiers=["user1111"])
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(add_member, range(8)))
+
+    assert len(set(ids)) == 1
+    assert reads == 1
+    assert fake.request_counts["WsRestAddMemberRequest"] == 8
+
+
+@pytest.mark.anyio
+async def test_async_client_single_flight(fake: FakeGrouper):
+    async with AsyncGrouperClient(
+        data.URI_BASE, "username", "password", transport=fake, single_flight=True
+    ) as client:
+        groups = await asyncio.gather(
+            *(client.get_group("test:GROUP1") for _ in range(5))
+        )
+        with pytest.raises(GrouperGroupNotFoundException):
+            await asyncio.gather(*(client.get_group("test:NOT") for _ in range(5)))
+
+    assert {group.id for group in groups} == {groups[0].id}
+    assert sum(fake.request_counts.values()) == 2
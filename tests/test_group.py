@@ -1,15 +1,21 @@
 # mypy: allow_untyped_defs
 from __future__ import annotations
-from grouper_python.objects.membership import HasMember
+from typing import Any
+from collections.abc import Iterator
+from grouper_python.objects.membership import HasMember, MemberChangeResult
 from grouper_python.objects.exceptions import (
+    GrouperAuthException,
     GrouperPermissionDenied,
     GrouperGroupNotFoundException,
 )
 from grouper_python.objects import Person, Group, Subject
 from . import data
+import json
 import pytest
+import tracemalloc
 import respx
 from httpx import Response
+import httpx
 
 
 @respx.mock
@@ -59,6 +65,84 @@ def test_get_members_group_not_found(grouper_group: Group):
     # assert len(members) == 0
 
 
+@respx.mock
+def test_iter_members(grouper_group: Group):
+    group_call = respx.post(url=data.URI_BASE + "/groups").mock(
+        side_effect=[
+            Response(200, json=data.get_members_result_page_1),
+            Response(200, json=data.get_members_result_page_2),
+            Response(200, json=data.get_members_result_empty),
+        ]
+    )
+    members = list(grouper_group.iter_members(page_size=2))
+
+    assert [member.id for member in members] == ["abcdefgh1", "abcdefgh2", "abcdefgh3"]
+    # A short page does not end paging, as Grouper may cap the page size
+    assert group_call.call_count == 3
+    page_numbers = [
+        json.loads(call.request.content)["WsRestGetMembersRequest"]["pageNumber"]
+        for call in group_call.calls
+    ]
+    assert page_numbers == ["1", "2", "3"]
+
+
+@respx.mock
+def test_iter_members_cursor(grouper_group: Group):
+    group_call = respx.post(url=data.URI_BASE + "/groups").mock(
+        side_effect=[
+            Response(200, json=data.get_members_result_page_1),
+            Response(200, json=data.get_members_result_page_2),
+            Response(200, json=data.get_members_result_empty),
+        ]
+    )
+    members = list(grouper_group.iter_members(page_size=2, cursor=True))
+
+    assert len(members) == 3
+    requests = [
+        json.loads(call.request.content)["WsRestGetMembersRequest"]
+        for call in group_call.calls
+    ]
+    assert requests[0]["pageIsCursor"] == "T"
+    assert "pageLastCursorField" not in requests[0]
+    assert requests[1]["pageLastCursorField"] == "abcdefgh2"
+    assert requests[2]["pageLastCursorField"] == "abcdefgh3"
+
+
+@respx.mock
+def test_iter_members_cursor_not_advancing(grouper_group: Group):
+    group_call = respx.post(url=data.URI_BASE + "/groups").mock(
+        return_value=Response(200, json=data.get_members_result_page_1)
+    )
+    members = list(grouper_group.iter_members(page_size=2, cursor=True))
+
+    # The same page again means the cursor is not moving on, so paging stops
+    # without yielding the repeated members
+    assert [member.id for member in members] == ["abcdefgh1", "abcdefgh2"]
+    assert group_call.call_count == 2
+
+
+@respx.mock
+def test_iter_members_stop_early(grouper_group: Group):
+    group_call = respx.post(url=data.URI_BASE + "/groups").mock(
+        return_value=Response(200, json=data.get_members_result_page_1)
+    )
+    for member in grouper_group.iter_members(page_size=2):
+        break
+
+    assert member.id == "abcdefgh1"
+    assert group_call.call_count == 1
+
+
+@respx.mock
+def test_iter_members_group_not_found(grouper_group: Group):
+    respx.post(url=data.URI_BASE + "/groups").mock(
+        return_value=Response(200, json=data.get_members_result_group_not_found)
+    )
+
+    with pytest.raises(GrouperGroupNotFoundException):
+        list(grouper_group.iter_members())
+
+
 @respx.mock
 def test_get_memberships(grouper_group: Group):
     membership_call = respx.post(url=data.URI_BASE + "/memberships").mock(
@@ -124,6 +208,201 @@ def test_get_memberships_valid_no_memberships(grouper_group: Group):
     assert len(memberships) == 0
 
 
+def chunked(result: dict[str, Any], size: int = 50) -> Iterator[bytes]:
+    raw = json.dumps(result).encode()
+    return (raw[i:i + size] for i in range(0, len(raw), size))
+
+
+@respx.mock
+def test_iter_memberships(grouper_group: Group):
+    respx.post(url=data.URI_BASE + "/memberships").mock(
+        side_effect=lambda request: Response(
+            200,
+            content=chunked(
+                data.get_membership_result_valid_one_group
+                if json.loads(request.content)["WsRestGetMembershipsRequest"].get(
+                    "pageNumber", "1"
+                )
+                == "1"
+                else data.get_membership_result_valid_no_memberships
+            ),
+        )
+    )
+    group_call = respx.post(url=data.URI_BASE + "/groups").mock(
+        return_value=Response(200, json=data.find_groups_result_valid_one_group_2)
+    )
+    memberships = list(grouper_group.iter_memberships())
+    assert len(memberships) == 5
+    assert len([m for m in memberships if type(m.member) is Person]) == 4
+    assert len([m for m in memberships if type(m.member) is Group]) == 1
+    assert group_call.call_count == 1
+
+    memberships = list(grouper_group.iter_memberships(resolve_groups=False))
+    assert sorted(m.member.id for m in memberships) == sorted(
+        m.member.id for m in grouper_group.get_memberships(resolve_groups=False)
+    )
+    assert group_call.call_count == 1
+    stats = grouper_group.client.stats()["WsRestGetMembershipsRequest"]
+    # Each iteration ends with an empty page
+    assert stats["response_bytes"] == 3 * len(
+        json.dumps(data.get_membership_result_valid_one_group)
+    ) + 2 * len(json.dumps(data.get_membership_result_valid_no_memberships))
+
+
+@respx.mock
+def test_iter_memberships_subjects_first(grouper_group: Group):
+    result = data.get_membership_result_valid_one_group["WsGetMembershipsResults"]
+    reordered = {
+        "WsGetMembershipsResults": {
+            "wsSubjects": result["wsSubjects"],
+            **{key: value for key, value in result.items() if key != "wsSubjects"},
+        }
+    }
+    respx.post(url=data.URI_BASE + "/memberships").mock(
+        side_effect=[
+            Response(200, content=chunked(reordered, 10)),
+            Response(200, json=data.get_membership_result_valid_no_memberships),
+        ]
+    )
+    memberships = list(grouper_group.iter_memberships(resolve_groups=False))
+    assert len(memberships) == 5
+
+
+@respx.mock
+def test_iter_memberships_key_order(grouper_group: Group):
+    sent = [0]
+
+    def counted(result: dict[str, Any]) -> Iterator[bytes]:
+        for chunk in chunked(result, 10):
+            sent[0] += len(chunk)
+            yield chunk
+
+    def subjects_at(result: dict[str, Any]) -> int:
+        return json.dumps(result).index('"wsSubjects"')
+
+    # Grouper's order, with wsMemberships before wsSubjects, means every
+    # membership is held until the subjects are parsed
+    result = data.get_membership_result_valid_one_group
+    keys = list(result["WsGetMembershipsResults"])
+    assert keys.index("wsMemberships") < keys.index("wsSubjects")
+    respx.post(url=data.URI_BASE + "/memberships").mock(
+        side_effect=[
+            Response(200, content=counted(result)),
+            Response(200, json=data.get_membership_result_valid_no_memberships),
+        ]
+    )
+    memberships = grouper_group.iter_memberships(resolve_groups=False)
+    next(memberships)
+    assert sent[0] > subjects_at(result)
+    assert len([*memberships]) == 4
+
+    # With the subjects first, memberships are given as they are parsed
+    ws_result = result["WsGetMembershipsResults"]
+    reordered = {
+        "WsGetMembershipsResults": {
+            "resultMetadata": ws_result["resultMetadata"],
+            "subjectAttributeNames": ws_result["subjectAttributeNames"],
+            "wsSubjects": ws_result["wsSubjects"],
+            "wsMemberships": ws_result["wsMemberships"],
+        }
+    }
+    sent[0] = 0
+    respx.post(url=data.URI_BASE + "/memberships").mock(
+        side_effect=[
+            Response(200, content=counted(reordered)),
+            Response(200, json=data.get_membership_result_valid_no_memberships),
+        ]
+    )
+    memberships = grouper_group.iter_memberships(resolve_groups=False)
+    next(memberships)
+    assert sent[0] < len(json.dumps(reordered))
+    assert len([*memberships]) == 4
+
+
+def memberships_page(subject_ids: list[str]) -> bytes:
+    if not subject_ids:
+        return json.dumps(data.get_membership_result_valid_no_memberships).encode()
+    group_id = data.grouper_group_result1["uuid"]
+    result = {
+        "WsGetMembershipsResults": {
+            "resultMetadata": {"success": "T"},
+            "wsMemberships": [
+                {
+                    "membershipType": "immediate",
+                    "groupId": group_id,
+                    "subjectId": subject_id,
+                    "subjectSourceId": "ldap",
+                }
+                for subject_id in subject_ids
+            ],
+            "subjectAttributeNames": data.subject_attribute_names,
+            "wsGroups": [data.grouper_group_result1],
+            "wsSubjects": [
+                {
+                    "sourceId": "ldap",
+                    "attributeValues": [subject_id, f"{subject_id} Name"],
+                    "name": f"{subject_id} Name",
+                    "id": subject_id,
+                }
+                for subject_id in subject_ids
+            ],
+        }
+    }
+    return json.dumps(result).encode()
+
+
+@respx.mock
+def test_iter_memberships_peak_memory(grouper_group: Group):
+    def peak(group_size: int, page_size: int) -> int:
+        subject_ids = [f"subject{i:06}" for i in range(group_size)]
+        pages = [
+            memberships_page(subject_ids[i:i + page_size])
+            for i in range(0, group_size + 1, page_size)
+        ]
+        respx.post(url=data.URI_BASE + "/memberships").mock(
+            side_effect=[Response(200, content=page) for page in pages]
+        )
+        tracemalloc.start()
+        count = 0
+        for _ in grouper_group.iter_memberships(
+            resolve_groups=False, page_size=page_size
+        ):
+            count += 1
+        # respx keeps every request it answers,
+        # so only count memory that was freed again
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        assert count == group_size
+        return peak - current
+
+    # Only one page is held at a time, so peak memory does not grow
+    # with the size of the group
+    small = peak(1000, 100)
+    large = peak(10000, 100)
+    assert large < small * 1.5
+    # Whereas a single page holds every membership of the group
+    assert peak(10000, 10000) > large * 10
+
+
+@respx.mock
+def test_iter_memberships_errors(grouper_group: Group):
+    respx.post(url=data.URI_BASE + "/memberships").mock(
+        side_effect=[
+            Response(200, json=data.get_membership_result_group_not_found),
+            Response(200, json=data.get_membership_result_valid_no_memberships),
+            Response(401, text="Unauthorized"),
+        ]
+    )
+    with pytest.raises(GrouperGroupNotFoundException) as excinfo:
+        list(grouper_group.iter_memberships())
+    assert excinfo.value.group_name == "test:NOT"
+
+    assert list(grouper_group.iter_memberships()) == []
+
+    with pytest.raises(GrouperAuthException):
+        list(grouper_group.iter_memberships())
+
+
 @respx.mock
 def test_create_privilege(grouper_group: Group):
     respx.route(
@@ -192,6 +471,193 @@ def test_add_members_permission_denied(grouper_group: Group):
         grouper_group.add_members(["user3333"])
 
 
+@respx.mock
+def test_bulk_add_members(grouper_group: Group):
+    codes = {
+        "user1111": "SUCCESS",
+        "user2222": "SUCCESS_ALREADY_EXISTED",
+        "user3333": "SUBJECT_NOT_FOUND",
+        "abcdefgh4": "INSUFFICIENT_PRIVILEGES",
+        "abcdefgh5": "SUCCESS",
+    }
+
+    def add_members(request: httpx.Request) -> Response:
+        lookups = json.loads(request.content)["WsRestAddMemberRequest"][
+            "subjectLookups"
+        ]
+        assert len(lookups) <= 2
+        results = [
+            {"resultMetadata": {"resultCode": codes[next(iter(lookup.values()))]}}
+            for lookup in lookups
+        ]
+        return Response(
+            200,
+            json={
+                "WsAddMemberResults": {
+                    "resultMetadata": {
+                        "success": "F",
+                        "resultCode": "PROBLEM_WITH_ASSIGNMENT",
+                    },
+                    "results": results,
+                }
+            },
+        )
+
+    add_call = respx.post(url=data.URI_BASE + "/groups").mock(side_effect=add_members)
+
+    results = grouper_group.bulk_add_members(
+        subject_identifiers=["user1111", "user2222", "user3333"],
+        subject_ids=["abcdefgh4", "abcdefgh5"],
+        chunk_size=2,
+    )
+
+    assert add_call.call_count == 3
+    assert results == {
+        "user1111": MemberChangeResult.ADDED,
+        "user2222": MemberChangeResult.ALREADY_MEMBER,
+        "user3333": MemberChangeResult.SUBJECT_NOT_FOUND,
+        "abcdefgh4": MemberChangeResult.PERMISSION_DENIED,
+        "abcdefgh5": MemberChangeResult.ADDED,
+    }
+
+
+@respx.mock
+def test_bulk_add_members_mixed_result(grouper_group: Group):
+    respx.post(url=data.URI_BASE + "/groups").mock(
+        return_value=Response(200, json=data.add_member_result_mixed)
+    )
+
+    results = grouper_group.bulk_add_members(
+        ["user1111", "user2222", "user3333", "user4444"]
+    )
+
+    assert results == {
+        "user1111": MemberChangeResult.ADDED,
+        "user2222": MemberChangeResult.ALREADY_MEMBER,
+        "user3333": MemberChangeResult.SUBJECT_NOT_FOUND,
+        "user4444": MemberChangeResult.PERMISSION_DENIED,
+    }
+
+
+@respx.mock
+def test_bulk_add_members_group_not_found(grouper_group: Group):
+    respx.post(url=data.URI_BASE + "/groups").mock(
+        return_value=Response(200, json=data.add_member_result_group_not_found)
+    )
+
+    with pytest.raises(GrouperGroupNotFoundException):
+        grouper_group.bulk_add_members(["user3333"])
+
+
+def test_bulk_add_members_invalid_chunk_size(grouper_group: Group):
+    with pytest.raises(ValueError):
+        grouper_group.bulk_add_members(["user3333"], chunk_size=0)
+
+    assert grouper_group.bulk_add_members() == {}
+
+
+@respx.mock
+def test_bulk_delete_members(grouper_group: Group):
+    respx.post(url=data.URI_BASE + "/groups").mock(
+        return_value=Response(200, json=data.remove_member_result_mixed)
+    )
+
+    results = grouper_group.bulk_delete_members(
+        ["user1111", "user2222"], ["abcdefgh3", "abcdefgh4"]
+    )
+
+    assert results == {
+        "user1111": MemberChangeResult.DELETED,
+        "user2222": MemberChangeResult.NOT_MEMBER,
+        "abcdefgh3": MemberChangeResult.SUBJECT_NOT_FOUND,
+        "abcdefgh4": MemberChangeResult.ERROR,
+    }
+
+
+@respx.mock
+def test_sync_members(grouper_group: Group):
+    subjects_call = respx.post(url=data.URI_BASE + "/subjects").mock(
+        return_value=Response(
+            200,
+            json={
+                "WsGetSubjectsResults": {
+                    "resultMetadata": {"success": "T"},
+                    "subjectAttributeNames": data.subject_attribute_names,
+                    "wsSubjects": [
+                        data.ws_subject2 | {"success": "T"},
+                        data.ws_subject3 | {"success": "T"},
+                    ],
+                }
+            },
+        )
+    )
+    group_call = respx.post(url=data.URI_BASE + "/groups").mock(
+        side_effect=[
+            Response(200, json=data.get_members_result_valid_one_group),
+            Response(
+                200,
+                json={
+                    "WsAddMemberResults": {
+                        "resultMetadata": {"success": "T"},
+                        "results": [
+                            {"resultMetadata": {"resultCode": "SUCCESS"}},
+                            {"resultMetadata": {"resultCode": "SUCCESS"}},
+                        ],
+                    }
+                },
+            ),
+            Response(
+                200,
+                json={
+                    "WsDeleteMemberResults": {
+                        "resultMetadata": {"success": "T"},
+                        "results": [{"resultMetadata": {"resultCode": "SUCCESS"}}],
+                    }
+                },
+            ),
+        ]
+    )
+
+    results = grouper_group.sync_members(
+        subject_identifiers=["user1111", "user2222"], subject_ids=["abcdefgh3"]
+    )
+
+    assert results == {
+        "user2222": MemberChangeResult.ADDED,
+        "abcdefgh3": MemberChangeResult.ADDED,
+        "61db7e3435864838b039a7fce155d49c": MemberChangeResult.DELETED,
+    }
+    get_members_request = json.loads(group_call.calls[0].request.content)
+    assert get_members_request["WsRestGetMembersRequest"]["memberFilter"] == "immediate"
+    assert subjects_call.call_count == 1
+    add_request = json.loads(group_call.calls[1].request.content)
+    assert add_request["WsRestAddMemberRequest"]["subjectLookups"] == [
+        {"subjectIdentifier": "user2222"},
+        {"subjectId": "abcdefgh3"},
+    ]
+    delete_request = json.loads(group_call.calls[2].request.content)
+    assert delete_request["WsRestDeleteMemberRequest"]["subjectLookups"] == [
+        {"subjectId": "61db7e3435864838b039a7fce155d49c"}
+    ]
+
+
+@respx.mock
+def test_sync_members_no_changes(grouper_group: Group):
+    respx.post(url=data.URI_BASE + "/subjects").mock(
+        return_value=Response(200, json=data.get_subject_result_valid_group)
+    )
+    group_call = respx.post(url=data.URI_BASE + "/groups").mock(
+        return_value=Response(200, json=data.get_members_result_valid_one_group)
+    )
+
+    results = grouper_group.sync_members(
+        subject_identifiers=["test:GROUP2"], subject_ids=["abcdefgh1"]
+    )
+
+    assert results == {}
+    assert group_call.call_count == 1
+
+
 @respx.mock
 def test_delete_members(grouper_group: Group):
     respx.post(url=data.URI_BASE + "/groups").mock(
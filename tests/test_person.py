@@ -1,10 +1,9 @@
 from __future__ import annotations
-from typing import TYPE_CHECKING
-
-if TYPE_CHECKING:
-    from grouper_python.objects import Person
-from grouper_python.objects import Group
+from grouper_python.objects import Group, Person
+from grouper_python.objects.person import AttributeSchema
 from . import data
+import gc
+import json
 import pytest
 import respx
 from httpx import Response
@@ -74,3 +73,43 @@ def test_is_member_not_found(grouper_person: Person):
         grouper_person.is_member("test:GROUP2")
 
     assert excinfo.value.subject_identifier == "user3333"
+
+
+def test_attributes(grouper_person: Person):
+    other = Person(
+        client=grouper_person.client,
+        person_body=data.ws_subject3,
+        subject_attr_names=["description", "name"],
+    )
+
+    assert grouper_person.attributes == {
+        "description": "user3333",
+        "name": "User 3 Name",
+    }
+    assert other.attributes["description"] == "user2222"
+    assert other.attributes.get("missing", "default") == "default"
+    assert "name" in other.attributes
+    assert list(other.attributes) == ["description", "name"]
+    assert other.attributes.schema is grouper_person.attributes.schema
+    assert repr(other.attributes) == repr(
+        {"description": "user2222", "name": "User 2 Name"}
+    )
+    with pytest.raises(KeyError):
+        other.attributes["missing"]
+
+
+def test_dict_json(grouper_person: Person):
+    person_dict = grouper_person.dict()
+    assert type(person_dict["attributes"]) is dict
+    assert json.loads(json.dumps(person_dict))["attributes"] == {
+        "description": "user3333",
+        "name": "User 3 Name",
+    }
+
+
+def test_attribute_schema_not_kept():
+    schema = AttributeSchema.of(["unused1", "unused2"])
+    assert AttributeSchema.of(("unused1", "unused2")) is schema
+    del schema
+    gc.collect()
+    assert ("unused1", "unused2") not in AttributeSchema._interned
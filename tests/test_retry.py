@@ -0,0 +1,290 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from grouper_python import AsyncGrouperClient
+from grouper_python import GrouperClient, RetryPolicy, CircuitBreaker
+from grouper_python.objects import Group
+from grouper_python.objects.exceptions import GrouperCircuitOpenException
+from grouper_python.util import call_grouper
+from . import data
+import asyncio
+import httpx
+import pytest
+import respx
+from httpx import Response
+
+assign_attributes_body: dict[str, Any] = {"WsRestAssignAttributesRequest": {}}
+
+
+@pytest.fixture()
+def sleeps(monkeypatch: pytest.MonkeyPatch) -> list[float]:
+    sleeps: list[float] = []
+    monkeypatch.setattr("grouper_python.util.time.sleep", sleeps.append)
+    return sleeps
+
+
+@respx.mock
+def test_retry_transient_status(sleeps: list[float]):
+    group_call = respx.post(url=data.URI_BASE + "/groups").mock(
+        side_effect=[
+            Response(503),
+            Response(502),
+            Response(200, json=data.find_groups_result_valid_one_group_1),
+        ]
+    )
+    with GrouperClient(
+        data.URI_BASE, "username", "password", retry=RetryPolicy(jitter=False)
+    ) as client:
+        group = client.get_group("test:GROUP1")
+
+    assert group.name == "test:GROUP1"
+    assert group_call.call_count == 3
+    assert sleeps == [0.5, 1.0]
+
+
+@respx.mock
+def test_retry_after(sleeps: list[float]):
+    respx.post(url=data.URI_BASE + "/groups").mock(
+        side_effect=[
+            Response(429, headers={"Retry-After": "7"}),
+            Response(503, headers={"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}),
+            Response(200, json=data.find_groups_result_valid_one_group_1),
+        ]
+    )
+    with GrouperClient(
+        data.URI_BASE,
+        "username",
+        "password",
+        retry=RetryPolicy(max_attempts=5, max_backoff=5.0),
+    ) as client:
+        client.get_group("test:GROUP1")
+
+    # Retry-After is capped at max_backoff, and a date in the past means now
+    assert sleeps == [5.0, 0.0]
+
+
+@respx.mock
+def test_retry_attempts_exhausted(sleeps: list[float]):
+    group_call = respx.post(url=data.URI_BASE + "/groups").mock(
+        side_effect=httpx.ReadTimeout("timed out")
+    )
+    with GrouperClient(
+        data.URI_BASE, "username", "password", retry=RetryPolicy(max_attempts=4)
+    ) as client:
+        with pytest.raises(httpx.ReadTimeout):
+            client.get_group("test:GROUP1")
+
+    assert group_call.call_count == 4
+    assert len(sleeps) == 3
+    assert all(0 <= sleep <= 0.5 * 2**i for i, sleep in enumerate(sleeps))
+
+
+@respx.mock
+def test_retry_per_call(sleeps: list[float]):
+    group_call = respx.post(url=data.URI_BASE + "/groups").mock(
+        side_effect=httpx.ConnectError("refused")
+    )
+    with GrouperClient(
+        data.URI_BASE, "username", "password", retry=RetryPolicy()
+    ) as client:
+        with pytest.raises(httpx.ConnectError):
+            client._call_grouper(
+                "/groups",
+                data.find_groups_by_names_request,
+                retry=RetryPolicy(max_attempts=1),
+            )
+
+    assert group_call.call_count == 1
+
+
+@respx.mock
+def test_retry_policy_override(sleeps: list[float]):
+    group_call = respx.post(url=data.URI_BASE + "/groups").mock(
+        side_effect=httpx.ConnectError("refused")
+    )
+    membership_call = respx.post(url=data.URI_BASE + "/memberships").mock(
+        side_effect=[
+            Response(503),
+            Response(200, json=data.get_membership_result_valid_one_group),
+            Response(200, json=data.get_membership_result_valid_no_memberships),
+        ]
+    )
+    with GrouperClient(
+        data.URI_BASE, "username", "password", retry=RetryPolicy(max_attempts=3)
+    ) as client:
+        with client.retry_policy(None):
+            with pytest.raises(httpx.ConnectError):
+                client.get_group("test:GROUP1")
+        assert group_call.call_count == 1
+
+        with pytest.raises(httpx.ConnectError):
+            client.get_group("test:GROUP1")
+        assert group_call.call_count == 4
+
+        # Streamed calls are retried too
+        group = Group(client, data.grouper_group_result1)
+        with client.retry_policy(RetryPolicy(jitter=False)):
+            memberships = list(group.iter_memberships(resolve_groups=False))
+
+    assert len(memberships) == 5
+    assert membership_call.call_count == 3
+    assert sleeps[-1] == 0.5
+
+
+@respx.mock
+def test_retry_policy_override_bulk_add_members(sleeps: list[float]):
+    add_call = respx.post(url=data.URI_BASE + "/groups").mock(
+        side_effect=[
+            Response(503),
+            Response(200, json=data.add_member_result_mixed),
+        ]
+    )
+    with GrouperClient(data.URI_BASE, "username", "password") as client:
+        group = Group(client, data.grouper_group_result1)
+        # The override applies to chunks sent on the worker threads
+        with client.retry_policy(RetryPolicy(max_attempts=3, jitter=False)):
+            results = group.bulk_add_members(
+                ["user1111", "user2222", "user3333", "user4444"]
+            )
+
+    assert add_call.call_count == 2
+    assert sleeps == [0.5]
+    assert len(results) == 4
+
+
+@respx.mock
+def test_retry_non_idempotent(sleeps: list[float]):
+    attribute_call = respx.post(url=data.URI_BASE + "/attributeAssignments").mock(
+        side_effect=[
+            httpx.ConnectError("refused"),
+            httpx.ReadTimeout("timed out"),
+        ]
+    )
+    with httpx.Client(base_url=data.URI_BASE) as client:
+        # A request that was never sent is retried, but one that may have
+        # reached Grouper is not, since assigning again is not safe
+        with pytest.raises(httpx.ReadTimeout):
+            call_grouper(
+                client,
+                "/attributeAssignments",
+                assign_attributes_body,
+                retry=RetryPolicy(),
+            )
+    assert attribute_call.call_count == 2
+
+    policy = RetryPolicy(retry_non_idempotent=True, jitter=False)
+    assert policy.retry_delay(1, assign_attributes_body, response=Response(503)) == 0.5
+    assert RetryPolicy().retry_delay(1, assign_attributes_body, Response(503)) is None
+    assert RetryPolicy().retry_delay(1, assign_attributes_body, Response(500)) is None
+
+
+@respx.mock
+def test_retry_delete_timeout(sleeps: list[float]):
+    delete_call = respx.post(url=data.URI_BASE + "/groups").mock(
+        side_effect=[
+            httpx.ConnectError("refused"),
+            httpx.ReadTimeout("timed out"),
+        ]
+    )
+    with GrouperClient(
+        data.URI_BASE, "username", "password", retry=RetryPolicy(jitter=False)
+    ) as client:
+        # A delete that was never sent is retried, but one that may have
+        # reached Grouper is not, since a retry of a delete that succeeded
+        # would report the group as not found
+        with pytest.raises(httpx.ReadTimeout):
+            Group(client, data.grouper_group_result1).delete()
+    assert delete_call.call_count == 2
+    assert sleeps == [0.5]
+
+
+@respx.mock
+def test_circuit_breaker(monkeypatch: pytest.MonkeyPatch):
+    now = 1000.0
+    monkeypatch.setattr("grouper_python.objects.retry.time.monotonic", lambda: now)
+    group_call = respx.post(url=data.URI_BASE + "/groups").mock(
+        side_effect=[
+            httpx.ConnectError("refused"),
+            httpx.ConnectError("refused"),
+            httpx.ConnectError("refused"),
+            Response(200, json=data.find_groups_result_valid_one_group_1),
+        ]
+    )
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10.0)
+    with GrouperClient(
+        data.URI_BASE, "username", "password", circuit_breaker=breaker
+    ) as client:
+        for _ in range(2):
+            with pytest.raises(httpx.ConnectError):
+                client.get_group("test:GROUP1")
+        assert breaker.state == "open"
+
+        with pytest.raises(GrouperCircuitOpenException) as excinfo:
+            client.get_group("test:GROUP1")
+        assert excinfo.value.retry_in == 10.0
+        assert group_call.call_count == 2
+
+        # The test call after the timeout fails, so the circuit opens again
+        now = 1010.0
+        assert breaker.state == "half-open"
+        with pytest.raises(httpx.ConnectError):
+            client.get_group("test:GROUP1")
+        assert breaker.state == "open"
+
+        now = 1020.0
+        client.get_group("test:GROUP1")
+        assert breaker.state == "closed"
+        assert group_call.call_count == 4
+
+
+@pytest.mark.anyio
+@respx.mock
+async def test_async_retry(
+    async_grouper_client: AsyncGrouperClient, monkeypatch: pytest.MonkeyPatch
+):
+    sleeps: list[float] = []
+
+    async def sleep(delay: float) -> None:
+        sleeps.append(delay)
+
+    monkeypatch.setattr("grouper_python.aio.util.asyncio.sleep", sleep)
+    group_call = respx.post(url=data.URI_BASE + "/groups").mock(
+        side_effect=[
+            Response(504),
+            Response(200, json=data.find_groups_result_valid_one_group_1),
+        ]
+    )
+    async_grouper_client.retry = RetryPolicy(jitter=False, backoff_factor=2.0)
+    async_grouper_client.circuit_breaker = CircuitBreaker()
+
+    group = await async_grouper_client.get_group("test:GROUP1")
+
+    assert group.name == "test:GROUP1"
+    assert group_call.call_count == 2
+    assert sleeps == [2.0]
+    assert async_grouper_client.circuit_breaker.state == "closed"
+
+
+@pytest.mark.anyio
+@respx.mock
+async def test_async_retry_policy_override(
+    async_grouper_client: AsyncGrouperClient, monkeypatch: pytest.MonkeyPatch
+):
+    async def sleep(delay: float) -> None:
+        pass
+
+    monkeypatch.setattr("grouper_python.aio.util.asyncio.sleep", sleep)
+    group_call = respx.post(url=data.URI_BASE + "/groups").mock(
+        side_effect=httpx.ConnectError("refused")
+    )
+
+    async def get_group(retry: RetryPolicy | None) -> None:
+        with async_grouper_client.retry_policy(retry):
+            with pytest.raises(httpx.ConnectError):
+                await async_grouper_client.get_group("test:GROUP1")
+
+    # Each task uses its own RetryPolicy
+    await asyncio.gather(get_group(RetryPolicy(max_attempts=3)), get_group(None))
+
+    assert group_call.call_count == 4
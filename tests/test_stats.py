@@ -0,0 +1,147 @@
+from __future__ import annotations
+from grouper_python import GrouperClient, RetryPolicy, CallEvent, CallStats
+from grouper_python.objects.exceptions import GrouperGroupNotFoundException
+from grouper_python.membership import add_members_to_group
+from . import data
+import httpx
+import pytest
+import respx
+from httpx import Response
+
+
+@respx.mock
+def test_event_hooks(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr("grouper_python.util.time.sleep", lambda _: None)
+    respx.post(url=data.URI_BASE + "/groups").mock(
+        side_effect=[
+            Response(503),
+            Response(200, json=data.find_groups_result_valid_one_group_1),
+        ]
+    )
+    events: list[CallEvent] = []
+    with GrouperClient(
+        data.URI_BASE,
+        "username",
+        "password",
+        retry=RetryPolicy(),
+        event_hooks=[events.append],
+    ) as client:
+        client.get_group("test:GROUP1")
+
+    assert len(events) == 1
+    event = events[0]
+    assert event.request_type == "WsRestFindGroupsLiteRequest"
+    assert event.path == "/groups"
+    assert event.method == "POST"
+    assert event.status_code == 200
+    assert event.attempts == 2
+    assert event.retries == 1
+    assert event.request_bytes > 0
+    assert event.response_bytes > 0
+    assert event.network_seconds > 0
+    assert event.decode_seconds > 0
+    assert event.total_seconds == event.network_seconds + event.decode_seconds
+    assert event.error is None
+
+
+@respx.mock
+def test_event_hooks_error(grouper_client: GrouperClient):
+    respx.post(url=data.URI_BASE + "/groups").mock(
+        side_effect=[
+            Response(200, json=data.add_member_result_group_not_found),
+            httpx.ConnectError("refused"),
+        ]
+    )
+    events: list[CallEvent] = []
+    grouper_client.event_hooks.append(events.append)
+
+    with pytest.raises(GrouperGroupNotFoundException):
+        add_members_to_group("test:GROUP1", grouper_client, ["user3333"])
+    with pytest.raises(httpx.ConnectError):
+        add_members_to_group("test:GROUP1", grouper_client, ["user3333"])
+
+    assert [event.result_code for event in events] == ["GROUP_NOT_FOUND", None]
+    assert [event.status_code for event in events] == [200, None]
+    assert all(event.error is not None for event in events)
+    stats = grouper_client.stats()["WsRestAddMemberRequest"]
+    assert stats["count"] == 2
+    assert stats["errors"] == 2
+
+
+@respx.mock
+def test_event_hooks_raising(
+    grouper_client: GrouperClient, caplog: pytest.LogCaptureFixture
+):
+    respx.post(url=data.URI_BASE + "/groups").mock(
+        side_effect=[
+            Response(200, json=data.find_groups_result_valid_one_group_1),
+            Response(200, json=data.add_member_result_group_not_found),
+        ]
+    )
+    events: list[CallEvent] = []
+
+    def broken_hook(event: CallEvent) -> None:
+        raise RuntimeError("broken hook")
+
+    grouper_client.event_hooks[:] = [broken_hook, events.append]
+
+    # A hook that raises does not replace the result or error of the call,
+    # or stop the other hooks
+    assert grouper_client.get_group("test:GROUP1").name == "test:GROUP1"
+    with pytest.raises(GrouperGroupNotFoundException):
+        add_members_to_group("test:GROUP1", grouper_client, ["user3333"])
+
+    assert len(events) == 2
+    logged = [record for record in caplog.records if record.exc_info is not None]
+    assert len(logged) == 2
+
+
+@respx.mock
+def test_client_stats(grouper_client: GrouperClient):
+    respx.post(url=data.URI_BASE + "/groups").mock(
+        return_value=Response(200, json=data.find_groups_result_valid_one_group_1)
+    )
+    respx.post(url=data.URI_BASE + "/stems").mock(
+        return_value=Response(200, json=data.find_stem_result_valid_1)
+    )
+    for _ in range(3):
+        grouper_client.get_group("test:GROUP1")
+    grouper_client.get_stem("test:child stem")
+
+    stats = grouper_client.stats()
+    assert set(stats) == {"WsRestFindGroupsLiteRequest", "WsRestFindStemsLiteRequest"}
+    group_stats = stats["WsRestFindGroupsLiteRequest"]
+    assert group_stats["count"] == 3
+    assert group_stats["errors"] == 0
+    assert group_stats["p50"] <= group_stats["p99"] <= group_stats["max"]
+
+    grouper_client.call_stats.reset()
+    assert grouper_client.stats() == {}
+
+
+def test_call_stats_percentiles():
+    call_stats = CallStats(window=100)
+    for i in range(1, 201):
+        call_stats.record(
+            CallEvent(
+                "WsRestGetMembersRequest",
+                "/groups",
+                "POST",
+                request_bytes=10,
+                response_bytes=100,
+                network_seconds=i / 1000,
+                attempts=2 if i % 50 == 0 else 1,
+            )
+        )
+
+    stats = call_stats.summary()["WsRestGetMembersRequest"]
+    assert stats["count"] == 200
+    assert stats["retries"] == 4
+    assert stats["request_bytes"] == 2000
+    assert stats["response_bytes"] == 20000
+    # Percentiles only cover the 100 most recent calls
+    assert stats["p50"] == pytest.approx(0.150)
+    assert stats["p90"] == pytest.approx(0.190)
+    assert stats["p99"] == pytest.approx(0.199)
+    assert stats["max"] == pytest.approx(0.200)
+    assert stats["mean"] == pytest.approx(0.1505)
@@ -0,0 +1,75 @@
+from __future__ import annotations
+from typing import Any
+from grouper_python.objects.stream import JSONStreamParser, END
+from . import data
+import json
+import pytest
+
+STREAM_PATHS = [
+    ("WsGetMembershipsResults", "wsMemberships"),
+    ("WsGetMembershipsResults", "wsSubjects"),
+]
+
+
+def parse_in_chunks(raw: bytes, size: int, stream_paths=STREAM_PATHS) -> list[Any]:
+    parser = JSONStreamParser(stream_paths)
+    parsed = []
+    for i in range(0, len(raw), size):
+        parsed.extend(parser.feed(raw[i:i + size]))
+    parsed.extend(parser.close())
+    return parsed
+
+
+@pytest.mark.parametrize("size", [1, 7, 64, 100000])
+def test_parse_membership_result(size: int):
+    result = data.get_membership_result_valid_one_group
+    raw = json.dumps(result, indent=1).encode()
+
+    parsed = parse_in_chunks(raw, size)
+
+    expected = result["WsGetMembershipsResults"]
+    rebuilt: dict[str, Any] = {"wsMemberships": [], "wsSubjects": []}
+    for path, value in parsed:
+        assert path[0] == "WsGetMembershipsResults"
+        if value is END:
+            assert path[1] in ("wsMemberships", "wsSubjects")
+        elif path[1] in ("wsMemberships", "wsSubjects"):
+            rebuilt[path[1]].append(value)
+        else:
+            rebuilt[path[1]] = value
+    assert rebuilt == expected
+    assert (("WsGetMembershipsResults", "wsSubjects"), END) in parsed
+
+
+@pytest.mark.parametrize("size", [1, 3, 1000])
+def test_parse_values(size: int):
+    raw = '{"a": {"b": [1.5e3, -2, "é\\"]}", [3], {"c": null}], "d": 10}, "e": []}'
+
+    parsed = parse_in_chunks(raw.encode(), size, [("a", "b"), ("e",), ("f",)])
+
+    assert parsed == [
+        (("a", "b"), 1500.0),
+        (("a", "b"), -2),
+        (("a", "b"), 'é"]}'),
+        (("a", "b"), [3]),
+        (("a", "b"), {"c": None}),
+        (("a", "b"), END),
+        (("a", "d"), 10),
+        (("e",), END),
+    ]
+
+
+@pytest.mark.parametrize(
+    "raw",
+    [
+        b'{"a": [1,]}',
+        b'{"a": {"b": [1 2]}}',
+        b'{"a" 1}',
+        b'{"a": 1} x',
+        b'{"a": {"b": [1',
+        b'{1: 2}',
+    ],
+)
+def test_parse_invalid(raw: bytes):
+    with pytest.raises(ValueError):
+        parse_in_chunks(raw, 2, [("a", "b")])
@@ -0,0 +1,592 @@
+from __future__ import annotations
+from collections.abc import Iterable
+from grouper_python import GrouperClient, AsyncGrouperClient, RetryPolicy
+from grouper_python.testing import FakeGrouper
+from grouper_python.objects import Group
+from grouper_python.attribute import assign_attribute, get_attribute_assignments
+from grouper_python.objects.exceptions import (
+    GrouperGroupNotFoundException,
+    GrouperSuccessException,
+)
+from grouper_python.objects.membership import (
+    HasMember,
+    MemberChangeResult,
+    MembershipType,
+)
+from . import data
+import httpx
+import pytest
+
+
+@pytest.fixture()
+def fake() -> FakeGrouper:
+    fake = FakeGrouper()
+    fake.add_group("test:GROUP1", "Test1 Display Name", "Group 1 Test description")
+    fake.add_group("test:child:GROUP3")
+    for i in range(1, 6):
+        fake.add_subject(f"abcdefgh{i}", f"user{i}{i}{i}{i}", f"User {i} Name")
+    fake.add_members("test:GROUP1", ["abcdefgh1", "abcdefgh2"])
+    fake.add_members("test:child:GROUP3", ["abcdefgh3"])
+    fake.add_members("test:GROUP1", [fake.groups["test:child:GROUP3"]["uuid"]])
+    return fake
+
+
+@pytest.fixture()
+def fake_client(fake: FakeGrouper) -> Iterable[GrouperClient]:
+    with GrouperClient(
+        data.URI_BASE, "username", "password", transport=fake
+    ) as client:
+        yield client
+
+
+def test_get_group_and_members(fake_client: GrouperClient):
+    group = fake_client.get_group("test:GROUP1")
+    assert group.description == "Group 1 Test description"
+    assert group.displayName == "test:Test1 Display Name"
+
+    members = group.get_members()
+    assert {member.universal_identifier for member in members} == {
+        "user1111",
+        "user2222",
+        "user3333",
+        "test:child:GROUP3",
+    }
+    immediate = group.get_members(member_filter="immediate", resolve_groups=False)
+    assert len(immediate) == 3
+
+    with pytest.raises(GrouperGroupNotFoundException):
+        fake_client.get_group("test:NOT")
+
+
+@pytest.mark.parametrize("cursor", [False, True])
+def test_iter_members_pages(fake: FakeGrouper, cursor: bool):
+    fake.add_group("test:BIG")
+    subject_ids = [f"big{i:04d}" for i in range(250)]
+    for subject_id in subject_ids:
+        fake.add_subject(subject_id)
+    fake.add_members("test:BIG", reversed(subject_ids))
+    with GrouperClient(
+        data.URI_BASE, "username", "password", transport=fake
+    ) as client:
+        group = client.get_group("test:BIG")
+        members = list(group.iter_members(page_size=100, cursor=cursor))
+
+    assert [member.id for member in members] == subject_ids
+    assert fake.request_counts["WsRestGetMembersRequest"] == 4
+
+
+@pytest.mark.parametrize("cursor", [False, True])
+def test_iter_members_capped_page_size(cursor: bool):
+    fake = FakeGrouper(max_page_size=40)
+    fake.add_group("test:BIG")
+    subject_ids = [f"big{i:04d}" for i in range(250)]
+    for subject_id in subject_ids:
+        fake.add_subject(subject_id)
+    fake.add_members("test:BIG", subject_ids)
+    with GrouperClient(
+        data.URI_BASE, "username", "password", transport=fake
+    ) as client:
+        group = client.get_group("test:BIG")
+        members = list(group.iter_members(page_size=100, cursor=cursor))
+
+    assert [member.id for member in members] == subject_ids
+    assert fake.request_counts["WsRestGetMembersRequest"] == 8
+
+
+def test_get_groups_by_names(fake: FakeGrouper, fake_client: GrouperClient):
+    names = [f"test:many:GROUP{i}" for i in range(250)]
+    for name in names:
+        fake.add_group(name)
+
+    result = fake_client.get_groups_by_names(
+        ["test:NOT1", *names, "test:GROUP1", names[0], "test:NOT2"], chunk_size=100
+    )
+    assert list(result.found) == [*names, "test:GROUP1"]
+    assert result.found["test:GROUP1"].description == "Group 1 Test description"
+    assert result.missing == ["test:NOT1", "test:NOT2"]
+    assert fake.request_counts["WsRestFindGroupsRequest"] == 3
+
+
+def test_get_subjects(fake: FakeGrouper, fake_client: GrouperClient):
+    group3_id = fake.groups["test:child:GROUP3"]["uuid"]
+
+    result = fake_client.get_subjects(
+        subject_identifiers=["user1111", "nobody", "user2222", "user1111"],
+        subject_ids=["abcdefgh3", group3_id, "missing"],
+        chunk_size=2,
+    )
+    assert list(result.found) == ["user1111", "user2222", "abcdefgh3", group3_id]
+    assert result.found["user2222"].id == "abcdefgh2"
+    assert result.found["abcdefgh3"].universal_identifier == "user3333"
+    assert type(result.found[group3_id]) is Group
+    assert result.found[group3_id].name == "test:child:GROUP3"
+    assert result.missing == ["nobody", "missing"]
+    assert fake.request_counts["WsRestGetSubjectsRequest"] == 3
+    assert fake.request_counts["WsRestFindGroupsRequest"] == 1
+    assert fake.request_counts.get("WsRestFindGroupsLiteRequest", 0) == 0
+
+
+def test_member_changes(fake_client: GrouperClient):
+    group = fake_client.get_group("test:GROUP1")
+    assert group.has_members(
+        subject_identifiers=["user1111", "user3333", "user4444", "nobody"]
+    ) == {
+        "user1111": HasMember.IS_MEMBER,
+        "user3333": HasMember.IS_MEMBER,
+        "user4444": HasMember.IS_NOT_MEMBER,
+        "nobody": HasMember.SUBJECT_NOT_FOUND,
+    }
+    assert group.bulk_add_members(
+        subject_identifiers=["user4444", "user1111", "nobody"], chunk_size=2
+    ) == {
+        "user4444": MemberChangeResult.ADDED,
+        "user1111": MemberChangeResult.ALREADY_MEMBER,
+        "nobody": MemberChangeResult.SUBJECT_NOT_FOUND,
+    }
+    assert group.bulk_delete_members(subject_ids=["abcdefgh4", "abcdefgh3"]) == {
+        "abcdefgh4": MemberChangeResult.DELETED,
+        "abcdefgh3": MemberChangeResult.NOT_MEMBER,
+    }
+    assert group.sync_members(subject_identifiers=["user1111", "user5555"]) == {
+        "user5555": MemberChangeResult.ADDED,
+        "abcdefgh2": MemberChangeResult.DELETED,
+        group.client.get_group("test:child:GROUP3").id: MemberChangeResult.DELETED,
+    }
+    members = group.get_members(member_filter="immediate")
+    assert {member.id for member in members} == {"abcdefgh1", "abcdefgh5"}
+
+
+def test_sync_members_other_identifier_attr():
+    # The client compares people by its default "description" attribute,
+    # while the identifiers held by Grouper are in "uid"
+    fake = FakeGrouper(identifier_attr="uid")
+    fake.add_group("test:g")
+    fake.add_subject("id1", "alice")
+    fake.add_subject("id2", "bob")
+    fake.add_members("test:g", ["id1", "id2"])
+    with GrouperClient(
+        data.URI_BASE, "username", "password", transport=fake
+    ) as client:
+        group = client.get_group("test:g")
+        results = group.sync_members(
+            subject_identifiers=["alice", "nobody"], allow_missing=True
+        )
+        members = group.get_members(member_filter="immediate")
+
+    assert results == {
+        "id2": MemberChangeResult.DELETED,
+        "nobody": MemberChangeResult.SUBJECT_NOT_FOUND,
+    }
+    assert [member.id for member in members] == ["id1"]
+
+
+def test_sync_members_guards(fake: FakeGrouper, fake_client: GrouperClient):
+    group = fake_client.get_group("test:GROUP1")
+
+    # Nothing is removed while a wanted identifier cannot be found
+    results = group.sync_members(subject_identifiers=["user1111", "user4444", "nobody"])
+    assert results == {
+        "user4444": MemberChangeResult.ADDED,
+        "nobody": MemberChangeResult.SUBJECT_NOT_FOUND,
+    }
+    members = group.get_members(member_filter="immediate", resolve_groups=False)
+    assert len(members) == 4
+
+    # Nothing wanted at all would remove every member
+    with pytest.raises(ValueError):
+        group.sync_members()
+    with pytest.raises(ValueError):
+        group.sync_members(subject_identifiers=["nobody"], allow_missing=True)
+    members = group.get_members(member_filter="immediate", resolve_groups=False)
+    assert len(members) == 4
+
+    results = group.sync_members(allow_empty=True)
+    assert set(results.values()) == {MemberChangeResult.DELETED}
+    assert group.get_members(member_filter="immediate") == []
+
+
+def test_memberships_and_groups_for_subject(fake_client: GrouperClient):
+    group = fake_client.get_group("test:GROUP1")
+    memberships = {
+        membership.member.id: membership.membership_type
+        for membership in group.get_memberships()
+        if membership.member.id == "abcdefgh3"
+    }
+    assert memberships == {"abcdefgh3": MembershipType.INDIRECT}
+    assert sorted(
+        (membership.member.id, membership.membership_type)
+        for membership in group.iter_memberships(resolve_groups=False)
+    ) == sorted(
+        (membership.member.id, membership.membership_type)
+        for membership in group.get_memberships(resolve_groups=False)
+    )
+
+    subject = fake_client.get_subject("user3333")
+    assert subject.name == "User 3 Name"
+    assert {grp.name for grp in subject.get_groups()} == {
+        "test:GROUP1",
+        "test:child:GROUP3",
+    }
+    assert [grp.name for grp in subject.get_groups(stem="test", substems=False)] == [
+        "test:GROUP1"
+    ]
+    assert [s.id for s in fake_client.find_subjects("user 1")] == ["abcdefgh1"]
+
+
+def test_get_groups_for_subjects(fake: FakeGrouper, fake_client: GrouperClient):
+    groups = fake_client.get_groups_for_subjects(
+        ["abcdefgh3", "abcdefgh1", "abcdefgh4", "abcdefgh3", "abcdefgh2"], chunk_size=2
+    )
+    assert list(groups) == ["abcdefgh3", "abcdefgh1", "abcdefgh4", "abcdefgh2"]
+    assert {grp.name for grp in groups["abcdefgh3"]} == {
+        "test:GROUP1",
+        "test:child:GROUP3",
+    }
+    assert [grp.name for grp in groups["abcdefgh1"]] == ["test:GROUP1"]
+    assert groups["abcdefgh4"] == []
+    group1 = groups["abcdefgh1"][0]
+    assert groups["abcdefgh2"][0] is group1
+    assert any(grp is group1 for grp in groups["abcdefgh3"])
+    assert fake.request_counts["WsRestGetMembershipsRequest"] == 2
+
+    scoped = fake_client.get_groups_for_subjects(
+        ["abcdefgh3", "abcdefgh1"], stem="test", substems=False
+    )
+    assert {
+        subject_id: [grp.name for grp in member_of]
+        for subject_id, member_of in scoped.items()
+    } == {"abcdefgh3": ["test:GROUP1"], "abcdefgh1": ["test:GROUP1"]}
+    assert fake_client.get_groups_for_subjects([]) == {}
+
+
+def test_membership_table(fake_client: GrouperClient):
+    table = fake_client.get_membership_table(["test:GROUP1", "test:child:GROUP3"])
+    memberships = fake_client.get_group("test:GROUP1").get_memberships()
+
+    group1, group3 = table.groups
+    assert (group1.name, group3.name) == ("test:GROUP1", "test:child:GROUP3")
+    assert table.counts("group") == {group1: 4, group3: 1}
+    converted = table.group_by("group")
+    assert sorted(
+        (m.member.id, m.member_type, m.membership_type)
+        for m in converted[group1].to_memberships()[group1]
+    ) == sorted((m.member.id, m.member_type, m.membership_type) for m in memberships)
+
+
+@pytest.mark.parametrize("strategy", ["memberships", "has_members"])
+def test_membership_matrix(fake_client: GrouperClient, strategy: str):
+    group_names = ["test:GROUP1", "test:child:GROUP3"]
+    matrix = fake_client.get_membership_matrix(
+        group_names,
+        subject_identifiers=["user1111", "user3333", "nobody"],
+        subject_ids=["abcdefgh2", "abcdefgh4"],
+        strategy=strategy,
+        chunk_size=2,
+    )
+    assert matrix.subjects == [
+        "user1111",
+        "user3333",
+        "nobody",
+        "abcdefgh2",
+        "abcdefgh4",
+    ]
+    assert matrix.to_dict() == {
+        "user1111": {"test:GROUP1"},
+        "user3333": {"test:GROUP1", "test:child:GROUP3"},
+        "nobody": set(),
+        "abcdefgh2": {"test:GROUP1"},
+        "abcdefgh4": set(),
+    }
+    assert matrix.members_of("test:GROUP1") == {"user1111", "user3333", "abcdefgh2"}
+    assert matrix.groups_for("user3333") == set(group_names)
+    assert matrix.is_member("test:child:GROUP3", "user3333")
+    assert not matrix.is_member("test:child:GROUP3", "user1111")
+
+    immediate = fake_client.get_membership_matrix(
+        group_names,
+        subject_ids=["abcdefgh3"],
+        member_filter="immediate",
+        strategy=strategy,
+    )
+    assert immediate.groups_for("abcdefgh3") == {"test:child:GROUP3"}
+
+    with pytest.raises(GrouperGroupNotFoundException):
+        fake_client.get_membership_matrix(
+            ["test:NOT"], subject_ids=["abcdefgh1"], strategy=strategy
+        )
+
+
+def test_membership_matrix_strategy(fake: FakeGrouper, fake_client: GrouperClient):
+    group_names = [f"test:many:GROUP{i}" for i in range(40)]
+    for name in group_names:
+        fake.add_group(name)
+    fake.add_members(group_names[5], ["abcdefgh1"])
+
+    matrix = fake_client.get_membership_matrix(
+        group_names, subject_identifiers=["user1111"]
+    )
+    assert matrix.groups_for("user1111") == {group_names[5]}
+    assert fake.request_counts["WsRestGetMembershipsRequest"] == 1
+    assert fake.request_counts.get("WsRestHasMemberRequest", 0) == 0
+
+    matrix = fake_client.get_membership_matrix(
+        ["test:GROUP1"], subject_ids=[f"abcdefgh{i}" for i in range(1, 6)]
+    )
+    assert matrix.members_of("test:GROUP1") == {
+        "abcdefgh1",
+        "abcdefgh2",
+        "abcdefgh3",
+    }
+    assert fake.request_counts["WsRestHasMemberRequest"] == 1
+    assert fake.request_counts["WsRestGetMembershipsRequest"] == 1
+
+    with pytest.raises(ValueError):
+        fake_client.get_membership_matrix(
+            ["test:GROUP1"], subject_ids=["abcdefgh1"], strategy="other"
+        )
+
+
+def test_stems_groups_and_privileges(fake_client: GrouperClient):
+    stem = fake_client.get_stem("test")
+    child = stem.create_child_stem("new", "New Stem", "a new stem")
+    assert child.displayName == "test:New Stem"
+    group = child.create_child_group("GROUP4", "Group 4")
+    assert [grp.name for grp in stem.get_child_groups(recursive=True)] == [
+        "test:GROUP1",
+        "test:child:GROUP3",
+        "test:new:GROUP4",
+    ]
+
+    group.create_privilege_on_this("user2222", "update")
+    privileges = group.get_privileges_on_this()
+    assert [(priv.subject.id, priv.privilege_name) for priv in privileges] == [
+        ("abcdefgh2", "update")
+    ]
+    group.delete_privilege_on_this("user2222", "update")
+    assert group.get_privileges_on_this() == []
+
+    with pytest.raises(GrouperSuccessException):
+        child.delete()
+    group.delete()
+    child.delete()
+    assert [s.name for s in stem.get_child_stems(recursive=False)] == ["test:child"]
+
+
+def test_attribute_assignments(fake: FakeGrouper, fake_client: GrouperClient):
+    fake.add_attribute_def("etc:attr_def")
+    fake.add_attribute_def_name("etc:attr", "etc:attr_def")
+
+    assigned = assign_attribute(
+        "group",
+        "assign_attr",
+        fake_client,
+        owner_name="test:GROUP1",
+        attribute_def_name_name="etc:attr",
+        value="value",
+        assign_value_operation="assign_value",
+    )
+    assert len(assigned) == 1
+    assert assigned[0].group is not None
+    assert assigned[0].group.name == "test:GROUP1"
+
+    assignments = get_attribute_assignments(
+        "group", fake_client, attribute_def_name_names=["etc:attr"]
+    )
+    assert [assg.id for assg in assignments] == [assigned[0].id]
+    assert [value.valueSystem for value in assignments[0].values] == ["value"]
+
+    assign_attribute(
+        "group",
+        "remove_attr",
+        fake_client,
+        owner_name="test:GROUP1",
+        attribute_def_name_name="etc:attr",
+    )
+    assert (
+        get_attribute_assignments("group", fake_client, owner_names=["test:GROUP1"])
+        == []
+    )
+
+
+def test_injected_failures(fake: FakeGrouper):
+    with GrouperClient(
+        data.URI_BASE,
+        "username",
+        "password",
+        transport=fake,
+        retry=RetryPolicy(backoff_factor=0),
+    ) as client:
+        fake.fail_next(1)
+        fake.fail_next(1, status=None)
+        group = client.get_group("test:GROUP1")
+        assert group.name == "test:GROUP1"
+        assert client.stats()["WsRestFindGroupsLiteRequest"]["retries"] == 2
+        fake.fail_next(1)
+        fake.fail_next(1, status=None)
+        assert len(list(group.iter_memberships())) == 4
+        assert client.stats()["WsRestGetMembershipsRequest"]["retries"] == 2
+
+    failing = FakeGrouper(failure_rate=1.0, failure_status=500)
+    with GrouperClient(
+        data.URI_BASE, "username", "password", transport=failing
+    ) as client:
+        with pytest.raises(GrouperSuccessException):
+            client.get_group("test:GROUP1")
+    with GrouperClient(
+        data.URI_BASE, "username", "password", transport=fake
+    ) as client:
+        fake.fail_next(1, status=None)
+        with pytest.raises(httpx.ConnectError):
+            client.get_group("test:GROUP1")
+
+
+def test_bulk_add_members_chunk_fails(
+    fake: FakeGrouper, fake_client: GrouperClient, caplog: pytest.LogCaptureFixture
+):
+    group = fake_client.get_group("test:GROUP1")
+    fake.fail_next(1, status=None)
+    fake.fail_next(1)
+    results = group.bulk_add_members(
+        subject_ids=["abcdefgh3", "abcdefgh4", "abcdefgh5"],
+        chunk_size=1,
+        max_concurrency=1,
+    )
+    assert results == {
+        "abcdefgh3": MemberChangeResult.ERROR,
+        "abcdefgh4": MemberChangeResult.ERROR,
+        "abcdefgh5": MemberChangeResult.ADDED,
+    }
+    assert caplog.text.count("Changing a chunk of 1 members failed") == 2
+    members = group.get_members(member_filter="immediate", resolve_groups=False)
+    assert "abcdefgh5" in {member.id for member in members}
+
+
+def test_unsupported_request(fake: FakeGrouper, fake_client: GrouperClient):
+    with pytest.raises(GrouperSuccessException) as excinfo:
+        fake_client._call_grouper("/groups", {"WsRestUnknownRequest": {}})
+    assert excinfo.value.grouper_result["WsRestResultProblem"]["resultMetadata"][
+        "resultCode"
+    ] == "INVALID_QUERY"
+
+
+@pytest.mark.anyio
+async def test_async_client(fake: FakeGrouper):
+    fake.latency = 0.001
+    async with AsyncGrouperClient(
+        data.URI_BASE, "username", "password", transport=fake
+    ) as client:
+        group = await client.get_group("test:GROUP1")
+        results = await group.bulk_add_members(
+            subject_ids=["abcdefgh4", "abcdefgh5"], chunk_size=1
+        )
+        members = await group.get_members(member_filter="immediate")
+
+    assert results == {
+        "abcdefgh4": MemberChangeResult.ADDED,
+        "abcdefgh5": MemberChangeResult.ADDED,
+    }
+    assert len(members) == 5
+
+
+@pytest.mark.anyio
+async def test_async_bulk_add_members_chunk_fails(fake: FakeGrouper):
+    async with AsyncGrouperClient(
+        data.URI_BASE, "username", "password", transport=fake
+    ) as client:
+        group = await client.get_group("test:GROUP1")
+        fake.fail_next(1, status=None)
+        results = await group.bulk_add_members(
+            subject_ids=["abcdefgh4", "abcdefgh5"], chunk_size=1, max_concurrency=1
+        )
+
+    assert results == {
+        "abcdefgh4": MemberChangeResult.ERROR,
+        "abcdefgh5": MemberChangeResult.ADDED,
+    }
+
+
+@pytest.mark.anyio
+async def test_async_sync_members_guards(fake: FakeGrouper):
+    async with AsyncGrouperClient(
+        data.URI_BASE, "username", "password", transport=fake
+    ) as client:
+        group = await client.get_group("test:GROUP1")
+        results = await group.sync_members(subject_identifiers=["user1111", "nobody"])
+        with pytest.raises(ValueError):
+            await group.sync_members()
+        members = await group.get_members(member_filter="immediate")
+
+    assert results == {"nobody": MemberChangeResult.SUBJECT_NOT_FOUND}
+    assert len(members) == 3
+
+
+@pytest.mark.anyio
+async def test_async_batch_lookups(fake: FakeGrouper):
+    async with AsyncGrouperClient(
+        data.URI_BASE, "username", "password", transport=fake
+    ) as client:
+        result = await client.get_groups_by_names(
+            ["test:GROUP1", "test:NOT", "test:child:GROUP3"], chunk_size=1
+        )
+
+    assert list(result.found) == ["test:GROUP1", "test:child:GROUP3"]
+    assert result.missing == ["test:NOT"]
+    assert fake.request_counts["WsRestFindGroupsRequest"] == 3
+
+    async with AsyncGrouperClient(
+        data.URI_BASE, "username", "password", transport=fake
+    ) as client:
+        subjects = await client.get_subjects(
+            subject_identifiers=["user1111", "nobody"], subject_ids=["abcdefgh2"]
+        )
+
+    assert list(subjects.found) == ["user1111", "abcdefgh2"]
+    assert subjects.missing == ["nobody"]
+
+    async with AsyncGrouperClient(
+        data.URI_BASE, "username", "password", transport=fake
+    ) as client:
+        member_of = await client.get_groups_for_subjects(
+            ["abcdefgh1", "abcdefgh2", "abcdefgh5"], chunk_size=1
+        )
+
+    assert member_of["abcdefgh1"][0] is member_of["abcdefgh2"][0]
+    assert member_of["abcdefgh1"][0].name == "test:GROUP1"
+    assert member_of["abcdefgh5"] == []
+
+    async with AsyncGrouperClient(
+        data.URI_BASE, "username", "password", transport=fake
+    ) as client:
+        matrices = [
+            await client.get_membership_matrix(
+                ["test:GROUP1", "test:child:GROUP3"],
+                subject_identifiers=["user3333"],
+                subject_ids=["abcdefgh1"],
+                strategy=strategy,
+            )
+            for strategy in ("memberships", "has_members")
+        ]
+
+    for matrix in matrices:
+        assert matrix.to_dict() == {
+            "user3333": {"test:GROUP1", "test:child:GROUP3"},
+            "abcdefgh1": {"test:GROUP1"},
+        }
+
+
+@pytest.mark.anyio
+async def test_async_sync_members_other_identifier_attr():
+    fake = FakeGrouper(identifier_attr="uid")
+    fake.add_group("test:g")
+    fake.add_subject("id1", "alice")
+    fake.add_subject("id2", "bob")
+    fake.add_members("test:g", ["id1"])
+    async with AsyncGrouperClient(
+        data.URI_BASE, "username", "password", transport=fake
+    ) as client:
+        group = await client.get_group("test:g")
+        results = await group.sync_members(subject_identifiers=["alice", "bob"])
+        members = await group.get_members(member_filter="immediate")
+
+    assert results == {"bob": MemberChangeResult.ADDED}
+    assert sorted(member.id for member in members) == ["id1", "id2"]
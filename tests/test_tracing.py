@@ -0,0 +1,243 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Iterable
+
+if TYPE_CHECKING:
+    from grouper_python import GrouperClient, AsyncGrouperClient
+from grouper_python.objects import Group, AsyncGroup
+import contextvars
+import json
+from . import data
+import pytest
+import respx
+from httpx import Response
+
+pytest.importorskip("opentelemetry.sdk")
+from opentelemetry import trace  # noqa: E402
+from opentelemetry.sdk.trace import TracerProvider  # noqa: E402
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor  # noqa: E402
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import (  # noqa: E402
+    InMemorySpanExporter,
+)
+
+_exporter = InMemorySpanExporter()
+_provider = TracerProvider()
+_provider.add_span_processor(SimpleSpanProcessor(_exporter))
+trace.set_tracer_provider(_provider)
+
+
+@pytest.fixture()
+def exporter() -> Iterable[InMemorySpanExporter]:
+    _exporter.clear()
+    yield _exporter
+    _exporter.clear()
+
+
+@respx.mock
+def test_spans(grouper_client: GrouperClient, exporter: InMemorySpanExporter):
+    respx.post(url=data.URI_BASE + "/groups").mock(
+        side_effect=[
+            Response(200, json=data.get_members_result_valid_nested_groups),
+            Response(200, json=data.find_groups_result_valid_two_groups),
+        ]
+    )
+
+    group = Group(grouper_client, data.grouper_group_result3)
+    group.get_members()
+
+    spans = {span.name: span for span in exporter.get_finished_spans()}
+    assert set(spans) == {
+        "Group.get_members",
+        "WsRestGetMembersRequest",
+        "resolve_subjects",
+        "WsRestFindGroupsRequest",
+    }
+
+    def parent(name: str) -> str:
+        parent = spans[name].parent
+        assert parent is not None
+        return next(
+            span.name
+            for span in spans.values()
+            if span.context.span_id == parent.span_id
+        )
+
+    assert parent("WsRestGetMembersRequest") == "Group.get_members"
+    assert parent("resolve_subjects") == "Group.get_members"
+    assert parent("WsRestFindGroupsRequest") == "resolve_subjects"
+    assert spans["Group.get_members"].parent is None
+
+    call = spans["WsRestGetMembersRequest"]
+    assert call.kind == trace.SpanKind.CLIENT
+    assert call.attributes is not None
+    assert call.attributes["url.path"] == "/groups"
+    assert call.attributes["http.response.status_code"] == 200
+    assert call.attributes["grouper.attempts"] == 1
+    response_bytes = call.attributes["grouper.response_bytes"]
+    assert isinstance(response_bytes, int) and response_bytes > 0
+    assert spans["resolve_subjects"].attributes == {"grouper.group_count": 2}
+
+
+@respx.mock
+def test_span_error(grouper_client: GrouperClient, exporter: InMemorySpanExporter):
+    respx.post(url=data.URI_BASE + "/groups").mock(
+        return_value=Response(200, json=data.find_groups_result_valid_no_groups)
+    )
+
+    with pytest.raises(Exception):
+        grouper_client.get_group("test:GROUP1")
+
+    spans = {span.name: span for span in exporter.get_finished_spans()}
+    assert spans["GrouperClient.get_group"].status.status_code == (
+        trace.StatusCode.ERROR
+    )
+    call = spans["WsRestFindGroupsLiteRequest"]
+    assert call.parent is not None
+    assert call.parent.span_id == spans["GrouperClient.get_group"].context.span_id
+
+
+@respx.mock
+def test_stream_span(grouper_client: GrouperClient, exporter: InMemorySpanExporter):
+    respx.post(url=data.URI_BASE + "/memberships").mock(
+        side_effect=[
+            Response(
+                200, content=json.dumps(data.get_membership_result_valid_one_group)
+            ),
+            Response(200, json=data.get_membership_result_valid_no_memberships),
+        ]
+    )
+
+    group = Group(grouper_client, data.grouper_group_result1)
+    memberships = group.iter_memberships(resolve_groups=False)
+    assert not [
+        span
+        for span in exporter.get_finished_spans()
+        if span.name == "WsRestGetMembershipsRequest"
+    ]
+    assert len(list(memberships)) == 5
+
+    call = next(
+        span
+        for span in exporter.get_finished_spans()
+        if span.name == "WsRestGetMembershipsRequest"
+    )
+    assert call.kind == trace.SpanKind.CLIENT
+    assert call.attributes is not None
+    assert call.attributes["url.path"] == "/memberships"
+    assert call.attributes["http.response.status_code"] == 200
+    assert call.attributes["grouper.attempts"] == 1
+
+
+@respx.mock
+def test_stream_span_not_current_in_loop(
+    grouper_client: GrouperClient,
+    exporter: InMemorySpanExporter,
+    caplog: pytest.LogCaptureFixture,
+):
+    respx.post(url=data.URI_BASE + "/memberships").mock(
+        side_effect=[
+            Response(
+                200, content=json.dumps(data.get_membership_result_valid_one_group)
+            ),
+            Response(200, json=data.get_membership_result_valid_no_memberships),
+        ]
+    )
+
+    tracer = trace.get_tracer("test")
+    group = Group(grouper_client, data.grouper_group_result1)
+    memberships = group.iter_memberships(resolve_groups=False)
+    contextvars.copy_context().run(next, memberships)
+    assert not trace.get_current_span().is_recording()
+    with tracer.start_as_current_span("loop_body"):
+        pass
+    assert len(list(memberships)) == 4
+
+    spans = {span.name: span for span in exporter.get_finished_spans()}
+    assert spans["loop_body"].parent is None
+    assert spans["WsRestGetMembershipsRequest"].end_time is not None
+    assert "Failed to detach context" not in caplog.text
+
+
+@pytest.mark.anyio
+@respx.mock
+async def test_async_spans(
+    async_grouper_client: AsyncGrouperClient, exporter: InMemorySpanExporter
+):
+    respx.post(url=data.URI_BASE + "/groups").mock(
+        side_effect=[
+            Response(200, json=data.find_groups_result_valid_one_group_1),
+            Response(200, json=data.get_members_result_valid_one_group),
+            Response(200, json=data.find_groups_result_valid_one_group_2),
+        ]
+    )
+
+    group = await async_grouper_client.get_group("test:GROUP1")
+    await group.get_members()
+
+    names = [span.name for span in exporter.get_finished_spans()]
+    assert "AsyncGrouperClient.get_group" in names
+    assert "AsyncGroup.get_members" in names
+    assert names.count("WsRestFindGroupsLiteRequest") == 1
+
+
+@pytest.mark.anyio
+@respx.mock
+async def test_async_stream_span(
+    async_grouper_client: AsyncGrouperClient, exporter: InMemorySpanExporter
+):
+    respx.post(url=data.URI_BASE + "/memberships").mock(
+        side_effect=[
+            Response(
+                200, content=json.dumps(data.get_membership_result_valid_one_group)
+            ),
+            Response(200, json=data.get_membership_result_valid_no_memberships),
+        ]
+    )
+
+    group = AsyncGroup(async_grouper_client, data.grouper_group_result1)
+    memberships = [m async for m in group.iter_memberships(resolve_groups=False)]
+    assert len(memberships) == 5
+
+    calls = [
+        span
+        for span in exporter.get_finished_spans()
+        if span.name == "WsRestGetMembershipsRequest"
+    ]
+    # One call for the page of memberships, and one for the empty page after it
+    assert len(calls) == 2
+    assert calls[0].kind == trace.SpanKind.CLIENT
+    assert calls[0].attributes is not None
+    assert calls[0].attributes["http.response.status_code"] == 200
+
+
+@pytest.mark.anyio
+@respx.mock
+async def test_async_stream_span_not_current_in_loop(
+    async_grouper_client: AsyncGrouperClient, exporter: InMemorySpanExporter
+):
+    respx.post(url=data.URI_BASE + "/memberships").mock(
+        side_effect=[
+            Response(
+                200, content=json.dumps(data.get_membership_result_valid_one_group)
+            ),
+            Response(200, json=data.get_membership_result_valid_no_memberships),
+        ]
+    )
+
+    tracer = trace.get_tracer("test")
+    group = AsyncGroup(async_grouper_client, data.grouper_group_result1)
+    with tracer.start_as_current_span("caller"):
+        async for _ in group.iter_memberships(resolve_groups=False):
+            assert trace.get_current_span().is_recording()
+            with tracer.start_as_current_span("loop_body"):
+                pass
+
+    spans = exporter.get_finished_spans()
+    call = next(span for span in spans if span.name == "WsRestGetMembershipsRequest")
+    caller = next(span for span in spans if span.name == "caller")
+    assert call.parent is not None
+    assert call.parent.span_id == caller.context.span_id
+    loop_spans = [span for span in spans if span.name == "loop_body"]
+    assert len(loop_spans) == 5
+    for span in loop_spans:
+        assert span.parent is not None
+        assert span.parent.span_id == caller.context.span_id
@@ -6,18 +6,20 @@ from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from grouper_python import GrouperClient
-    from grouper_python.objects import Person
+import json
 import respx
 from httpx import Response
 from . import data
 import pytest
-from grouper_python.util import call_grouper
+from grouper_python.util import call_grouper, resolve_subjects
+from grouper_python.group import get_groups_by_names
 from grouper_python.privilege import assign_privileges
 from grouper_python.membership import has_members, get_members_for_groups
 from grouper_python.objects.exceptions import (
     GrouperAuthException,
     GrouperGroupNotFoundException,
 )
+from grouper_python.objects import Group, Person, Subject
 
 
 def test_both_act_as_id_and_identifier(grouper_client: GrouperClient):
@@ -204,3 +206,87 @@ def test_get_members_second_group_not_found(grouper_client: GrouperClient):
         get_members_for_groups(["test:GROUP1", "test:NOT"], grouper_client)
 
     assert excinfo.value.group_name == "test:NOT"
+
+
+@respx.mock
+def test_get_members_nested_groups_one_lookup(grouper_client: GrouperClient):
+    group_call = respx.post(url=data.URI_BASE + "/groups").mock(
+        side_effect=[
+            Response(200, json=data.get_members_result_valid_nested_groups),
+            Response(200, json=data.find_groups_result_valid_two_groups),
+        ]
+    )
+    members = get_members_for_groups(["test:child:GROUP3"], grouper_client)
+
+    subjects = list(members.values())[0]
+    assert [type(subject) for subject in subjects] == [Group, Group, Person]
+    assert [subject.name for subject in subjects[:2]] == ["test:GROUP2", "test:GROUP1"]
+    # One call for the members, and only one more for both nested groups
+    assert group_call.call_count == 2
+    assert (
+        json.loads(group_call.calls[1].request.content)
+        == data.find_groups_by_names_request
+    )
+
+
+@respx.mock
+def test_get_groups_by_names_chunked(grouper_client: GrouperClient):
+    group_call = respx.post(url=data.URI_BASE + "/groups").mock(
+        side_effect=[
+            Response(200, json=data.find_groups_result_valid_one_group_1),
+            Response(200, json=data.find_groups_result_valid_no_groups),
+        ]
+    )
+    groups = get_groups_by_names(
+        ["test:GROUP1", "test:NOT", "test:GROUP1"], grouper_client, chunk_size=1
+    )
+
+    assert list(groups.keys()) == ["test:GROUP1"]
+    assert group_call.call_count == 2
+
+
+@respx.mock
+def test_resolve_subjects_falls_back_to_single_lookup(grouper_client: GrouperClient):
+    group_call = respx.post(url=data.URI_BASE + "/groups").mock(
+        side_effect=[
+            Response(200, json=data.find_groups_result_valid_no_groups),
+            Response(200, json=data.find_groups_result_valid_one_group_2),
+        ]
+    )
+    subjects = resolve_subjects(
+        [data.ws_subject1, data.ws_subject2],
+        grouper_client,
+        data.subject_attribute_names,
+        resolve_groups=True,
+    )
+
+    assert [type(subject) for subject in subjects] == [Group, Person]
+    assert group_call.call_count == 2
+
+    subjects = resolve_subjects(
+        [data.ws_subject1, data.ws_subject2],
+        grouper_client,
+        data.subject_attribute_names,
+        resolve_groups=False,
+    )
+    assert [type(subject) for subject in subjects] == [Subject, Person]
+    assert group_call.call_count == 2
+
+
+@respx.mock
+def test_resolve_subjects_batch_failure(grouper_client: GrouperClient):
+    group_call = respx.post(url=data.URI_BASE + "/groups").mock(
+        side_effect=[
+            Response(200, json=data.find_groups_result_stem_not_found),
+            Response(200, json=data.find_groups_result_valid_one_group_2),
+        ]
+    )
+    subjects = resolve_subjects(
+        [data.ws_subject1],
+        grouper_client,
+        data.subject_attribute_names,
+        resolve_groups=True,
+    )
+
+    assert type(subjects[0]) is Group
+    assert group_call.call_count == 2